@@ -4,7 +4,7 @@ PCB 검사 시스템 - 양면 동시 촬영 클라이언트 (제품별 부품 
 
 워크플로우:
     1. 좌측 카메라 (앞면) + 우측 카메라 (뒷면) 동시 촬영
-    2. 양면 이미지를 Base64 인코딩
+    2. 양면 이미지를 JPEG 인코딩 (multipart 원본 전송 또는 Base64 JSON)
     3. /predict_dual 엔드포인트로 전송
     4. 서버가 뒷면 시리얼 넘버 OCR → 제품 코드 추출 → 앞면 부품 검증
     5. GPIO 제어 신호 수신 → 아두이노로 전송
@@ -20,6 +20,8 @@ PCB 검사 시스템 - 양면 동시 촬영 클라이언트 (제품별 부품 
     CAMERA_HEIGHT=480
     JPEG_QUALITY=85
     TARGET_FPS=10
+    UPLOAD_MODE=multipart  # multipart (JPEG 원본, 권장) 또는 json (Base64, 구버전 서버)
+    SERVER_READY_TIMEOUT=120  # 시작 시 서버 모델 워밍업 대기 한도 (초)
     ARDUINO_ENABLED=true
     ARDUINO_PORT=/dev/ttyACM0
 """
@@ -46,6 +48,8 @@ CAMERA_WIDTH = int(os.getenv('CAMERA_WIDTH', 640))
 CAMERA_HEIGHT = int(os.getenv('CAMERA_HEIGHT', 480))
 JPEG_QUALITY = int(os.getenv('JPEG_QUALITY', 85))
 TARGET_FPS = int(os.getenv('TARGET_FPS', 10))
+UPLOAD_MODE = os.getenv('UPLOAD_MODE', 'multipart').lower()  # multipart / json
+SERVER_READY_TIMEOUT = float(os.getenv('SERVER_READY_TIMEOUT', 120))  # 서버 모델 워밍업 대기 한도 (초)
 
 # 아두이노 시리얼 통신 설정
 ARDUINO_ENABLED = os.getenv('ARDUINO_ENABLED', 'false').lower() == 'true'
@@ -238,26 +242,34 @@ class DualCameraClient:
     def send_frames(self, left_frame, right_frame):
         """양면 프레임을 서버로 전송 (단일 카메라 지원)"""
         try:
-            # 프레임 인코딩
-            left_image_base64 = None
-            right_image_base64 = None
+            # 프레임 JPEG 인코딩
+            left_jpeg = None
+            right_jpeg = None
 
             if left_frame is not None:
                 _, left_buffer = cv2.imencode('.jpg', left_frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
-                left_image_base64 = base64.b64encode(left_buffer).decode('utf-8')
+                left_jpeg = left_buffer.tobytes()
 
             if right_frame is not None:
                 _, right_buffer = cv2.imencode('.jpg', right_frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
-                right_image_base64 = base64.b64encode(right_buffer).decode('utf-8')
-
-            # 요청 데이터 구성 (None도 전송 가능)
-            payload = {
-                'left_image': left_image_base64,
-                'right_image': right_image_base64
-            }
+                right_jpeg = right_buffer.tobytes()
 
             # 서버로 전송
-            response = requests.post(self.api_endpoint, json=payload, timeout=10)
+            if UPLOAD_MODE == 'multipart':
+                # JPEG 원본을 multipart 파트로 전송 (Base64 오버헤드 없음) ⭐
+                files = {}
+                if left_jpeg is not None:
+                    files['left_image'] = ('left.jpg', left_jpeg, 'image/jpeg')
+                if right_jpeg is not None:
+                    files['right_image'] = ('right.jpg', right_jpeg, 'image/jpeg')
+                response = requests.post(self.api_endpoint, files=files, timeout=10)
+            else:
+                # 구버전 서버 호환: Base64 JSON (None도 전송 가능)
+                payload = {
+                    'left_image': base64.b64encode(left_jpeg).decode('utf-8') if left_jpeg else None,
+                    'right_image': base64.b64encode(right_jpeg).decode('utf-8') if right_jpeg else None
+                }
+                response = requests.post(self.api_endpoint, json=payload, timeout=10)
 
             if response.status_code == 200:
                 result = response.json()
@@ -290,6 +302,12 @@ class DualCameraClient:
                     logger.error(f"❌ 서버 처리 실패: {error_msg}")
                     self.error_count += 1
                     return False
+            elif response.status_code == 503:
+                # 서버 모델 워밍업 중 (Retry-After 만큼 대기)
+                retry_after = float(response.headers.get('Retry-After', 1))
+                logger.warning(f"⏳ 서버 워밍업 중, {retry_after:.0f}초 후 재시도")
+                time.sleep(retry_after)
+                return False
             else:
                 logger.error(f"❌ HTTP 오류: {response.status_code}")
                 self.error_count += 1
@@ -304,6 +322,30 @@ class DualCameraClient:
             self.error_count += 1
             return False
 
+    def wait_for_server_ready(self, timeout=SERVER_READY_TIMEOUT):
+        """
+        서버 /health의 ready가 true가 될 때까지 대기 (모델 로드 / 워밍업 완료)
+
+        Returns:
+            준비 완료 여부 (timeout 초과 시 False, 이후 요청은 503이면 재시도)
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                health = requests.get(f"{self.server_url}/health", timeout=3).json()
+                # 구버전 서버는 ready 필드가 없음 → 바로 시작
+                if health.get('ready', True):
+                    logger.info("✅ 서버 준비 완료")
+                    return True
+                pending = [name for name, info in health.get('components', {}).items() if not info.get('ready')]
+                logger.info(f"⏳ 서버 워밍업 대기 중: {', '.join(pending)}")
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.info(f"⏳ 서버 연결 대기 중: {e}")
+            time.sleep(2)
+
+        logger.warning(f"⚠️  서버 준비 대기 시간 초과 ({timeout:.0f}초), 촬영을 시작합니다")
+        return False
+
     def run(self):
         """메인 루프 실행"""
         logger.info("=" * 60)
@@ -312,6 +354,7 @@ class DualCameraClient:
         logger.info(f"좌측 카메라 (앞면): index {self.left_camera_index}")
         logger.info(f"우측 카메라 (뒷면): index {self.right_camera_index}")
         logger.info(f"API 엔드포인트: {self.api_endpoint}")
+        logger.info(f"업로드 방식: {UPLOAD_MODE}")
         logger.info(f"아두이노 연결: {'활성화' if self.arduino_handler else '비활성화'}")
         logger.info("=" * 60)
 
@@ -319,6 +362,8 @@ class DualCameraClient:
             logger.error("카메라 초기화 실패. 종료합니다.")
             return
 
+        self.wait_for_server_ready()
+
         logger.info("🎬 양면 촬영 시작...")
 
         frame_interval = 1.0 / TARGET_FPS
@@ -13,7 +13,7 @@ PCB 불량 검사 Flask 추론 서버
 # import eventlet
 # eventlet.monkey_patch()
 
-from flask import Flask, request, jsonify, Response, render_template_string, render_template
+from flask import Flask, request, jsonify, Response, render_template_string, render_template, stream_with_context
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit  # WebSocket 지원
 import base64
@@ -25,7 +25,9 @@ import time
 import os
 from pathlib import Path
 import threading
+import uuid
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # .env 파일 로드
 try:
@@ -41,15 +43,37 @@ except ImportError:
 # 로컬 모듈 임포트
 from db_manager import DatabaseManager
 from pcb_alignment import PCBAligner
+from pcb_edge_detector import detect_pcb_edges
+from pcb_roi import locate_pcb_roi, roi_mask_from_slices
 from component_verification import ComponentVerifier
-from template_based_alignment import TemplateBasedAlignment
+from reference_store import ReferenceStore
+from batch_verification import BatchReverifier, ChunkExecutor
+from template_registry import TemplateRegistry
 from serial_number_detector import SerialNumberDetector
+from frame_codec import parse_frame_upload
+from detections import Detections
+from object_tracker import ObjectTracker
+from frame_publisher import FramePublisher, JPEG_ENCODE_PARAMS
+from frame_preprocess import FramePreprocessor
+from inspection_pipeline import InspectionPipeline, PipelineContext, Stage, get_pipeline_stats
+from server_config import get_config_value
+from inference_batcher import InferenceBatcher
+from detector_backends import load_configured_detector
+from inference_service import get_inference_client, RemoteDetector, RemoteSerialDetector
+from model_warmup import ReadinessTracker
+from motion_gate import MotionGate, REASON_MOTION
+from result_cache import FrameResultCache, frame_hash
+from metrics import metrics, InstrumentedLock, CONTENT_TYPE as METRICS_CONTENT_TYPE, gauge_lines, counter_lines
 import json
 
 # Flask 앱 초기화
 app = Flask(__name__)
 CORS(app)  # C# WinForms 연동을 위한 CORS 활성화
 
+# 멀티 프로세스 서빙 모드 (serve.py): 모델은 전용 추론 프로세스가 보유 ⭐
+# 단일 프로세스 모드(python app.py)에서는 None
+inference_client = get_inference_client()
+
 # SocketIO 초기화 (WebSocket 실시간 프레임 스트리밍)
 socketio = SocketIO(
     app,
@@ -62,11 +86,19 @@ socketio = SocketIO(
     ping_interval=25,           # 25초마다 ping 전송
     # 연결 설정
     max_http_buffer_size=10 * 1024 * 1024,  # 10MB (프레임 크기 고려)
-    async_handlers=True         # 비동기 핸들러 사용 (성능 향상)
+    async_handlers=True,        # 비동기 핸들러 사용 (성능 향상)
+    # 멀티 프로세스 모드: 워커 간 broadcast 공유 (예: redis://localhost:6379/0)
+    message_queue=get_config_value('serving.socketio_message_queue') if inference_client else None
 )
 logger_socketio = logging.getLogger('socketio')
 logger_socketio.setLevel(logging.INFO)
 
+# 성능 지표 수집 (Prometheus 형식 /metrics) ⭐
+METRICS_ENABLED = bool(get_config_value('monitoring.enable_metrics', True))
+if METRICS_ENABLED:
+    metrics.init_app(app)           # 엔드포인트별 요청 수 / 지연 시간
+    metrics.init_socketio(socketio)  # SocketIO 이벤트 전송 횟수
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -86,49 +118,186 @@ DB_CONFIG = {
 
 db = DatabaseManager(**DB_CONFIG)
 
-# YOLO 모델 로드
-try:
-    from ultralytics import YOLO
-    model_path = '../models/component_detector_v5_best.pt'  # v5 모델 ⭐
-    yolo_model = YOLO(model_path)
-    logger.info(f"✅ YOLO 모델 로드 완료: {model_path}")
-    logger.info(f"   - 모델 타입: YOLOv11l")
-    logger.info(f"   - 클래스 수: 9개 (PCB 부품 검출)")
-except Exception as e:
-    logger.error(f"⚠️  YOLO 모델 로드 실패: {e}")
-    logger.warning("   - 추론 시 더미 결과 반환됨")
-    yolo_model = None
+# 모델 준비 상태 (YOLO / OCR은 백그라운드 스레드에서 로드 + 워밍업) ⭐
+# 워밍업 전까지 yolo_model / serial_detector는 None이며, 추론 엔드포인트는 503을 반환
+readiness = ReadinessTracker(warmup_iterations=get_config_value('startup.warmup_iterations', 2))
+readiness.register('yolo', 'ocr', 'template', 'references')
+
+WARMUP_CAMERA_WIDTH, WARMUP_CAMERA_HEIGHT = get_config_value('startup.warmup_frame_size', [640, 480])
+
+yolo_model = None
+inference_batcher = None
+serial_detector = None
+
 
-# 템플릿 기반 정렬 시스템 초기화
-template_alignment = None
+def load_yolo_model():
+    """YOLO 모델 로드 + 배칭 스케줄러 생성 (워밍업 스레드에서 실행)"""
+    global yolo_model, inference_batcher
+
+    if inference_client is not None:
+        # 멀티 프로세스 모드: 추론 프로세스의 모델 / 배칭 스케줄러 사용 (프레임은 공유 메모리로 전달)
+        model = RemoteDetector(inference_client, startup_timeout=get_config_value('serving.startup_timeout', 300))
+        logger.info(f"✅ 원격 YOLO 검출기 연결 완료 (추론 프로세스, 클래스 {len(model.names)}개)")
+        yolo_model = model
+        return model
+
+    try:
+        # 검출기 백엔드 선택 (pytorch / onnxruntime / openvino - configs/server_config.yaml model.backend) ⭐
+        model, model_path, backend = load_configured_detector()
+        logger.info(f"✅ YOLO 모델 로드 완료: {model_path} (백엔드: {backend})")
+        logger.info(f"   - 모델 타입: YOLOv11l")
+        logger.info(f"   - 클래스 수: {len(model.names)}개 (PCB 부품 검출)")
+    except Exception as e:
+        logger.error(f"⚠️  YOLO 모델 로드 실패: {e}")
+        logger.warning("   - 추론 시 더미 결과 반환됨")
+        raise
+
+    # YOLO 배칭 스케줄러 초기화 (동시 요청 프레임을 모아 한 번에 추론) ⭐
+    inference_batcher = InferenceBatcher(
+        model,
+        max_batch_size=get_config_value('inference.max_batch_size', 2),
+        batch_window_ms=get_config_value('inference.batch_window_ms', 5.0),
+        timeout=get_config_value('inference.timeout', 5.0)
+    )
+    yolo_model = model
+    return model
+
+
+def warmup_yolo_model(model):
+    """
+    YOLO 워밍업 (실제 입력 크기 640x640의 더미 프레임)
+
+    배칭 스케줄러가 사용하는 배치 크기(1 ~ max_batch_size)를 모두 한 번씩 실행해
+    배치 크기별 그래프 초기화와 메모리 할당을 첫 실제 요청 전에 끝냅니다.
+    """
+    frame = np.zeros((640, 640, 3), dtype=np.uint8)  # crop 단계(frame_preprocessor) 출력 크기
+    max_batch_size = inference_batcher.max_batch_size if inference_batcher is not None else 1
+    for batch_size in range(1, max_batch_size + 1):
+        model.predict([frame] * batch_size, conf=0.3, iou=0.7, verbose=False)
+
+
+def run_yolo(frame, conf=0.3, iou=0.7):
+    """
+    YOLO 추론 (배칭 스케줄러 경유)
+
+    Args:
+        frame: BGR 이미지
+        conf: confidence threshold
+        iou: NMS IoU threshold
+
+    Returns:
+        yolo_model.predict()와 같은 형식의 결과 리스트
+    """
+    if inference_batcher is not None:
+        return inference_batcher.predict(frame, conf=conf, iou=iou)
+    return yolo_model.predict(frame, conf=conf, iou=iou, verbose=False)
+
+# 템플릿 기반 정렬 시스템 초기화 (제품 코드 / 카메라 면별 기준점 템플릿 레지스트리)
+# 기본 템플릿: server/reference_hole.jpg, 제품별 템플릿: alignment.template_dir (예: BC_left.jpg)
+template_registry = None
 try:
     template_path = Path(__file__).parent / 'reference_hole.jpg'
-    if template_path.exists():
-        template_alignment = TemplateBasedAlignment(str(template_path), threshold=0.82)  # 신뢰도 임계값 0.82 (82%) ⭐
+    template_dir = Path(__file__).parent / get_config_value('alignment.template_dir', 'fiducial_templates')
+    template_registry = TemplateRegistry(
+        template_dir=str(template_dir),
+        default_template_path=str(template_path),
+        reload_interval_s=get_config_value('alignment.reload_interval_s', 5.0),
+        threshold=0.82,  # 신뢰도 임계값 0.82 (82%) ⭐
+        search_mode=get_config_value('alignment.search_mode', 'full'),
+        pyramid_levels=get_config_value('alignment.pyramid_levels', 1),
+        refine_margin=get_config_value('alignment.refine_margin', 6),
+        tracking_margin=get_config_value('alignment.tracking_margin', 40),
+        tracking_refresh=get_config_value('alignment.tracking_refresh', 30),
+        scales=get_config_value('alignment.scales', [1.0])
+    )
+    if template_registry.has_templates():
         logger.info(f"✅ 템플릿 기반 정렬 시스템 로드 완료")
-        logger.info(f"   - 템플릿 경로: {template_path}")
-        logger.info(f"   - 템플릿 크기: {template_alignment.template.shape if template_alignment.template is not None else 'N/A'}")
-        logger.info(f"   - 신뢰도 임계값: {template_alignment.threshold:.2f} (82%)")
+        logger.info(f"   - 기본 템플릿: {template_path if template_registry.default is not None else '없음'}")
+        logger.info(f"   - 템플릿 디렉토리: {template_dir} (기본 포함 {len(template_registry.all())}개)")
+        logger.info("   - 신뢰도 임계값: 0.82 (82%)")
+        logger.info(f"   - 검색 모드: {get_config_value('alignment.search_mode', 'full')}")
     else:
-        logger.warning(f"⚠️  템플릿 파일 없음: {template_path}")
+        logger.warning(f"⚠️  템플릿 파일 없음: {template_path}, {template_dir}")
         logger.warning("   - 템플릿 매칭 기능 비활성화")
 except Exception as e:
     logger.error(f"⚠️  템플릿 기반 정렬 시스템 초기화 실패: {e}")
-    template_alignment = None
+    template_registry = None
 
-# 시리얼 넘버 OCR 검출기 초기화 (PaddleOCR 3.3.2 버전 + GPU)
-serial_detector = None
-try:
-    serial_detector = SerialNumberDetector()  # EasyOCR GPU 자동 사용 ⭐
-    logger.info("✅ 시리얼 넘버 OCR 검출기 초기화 완료 (PaddleOCR 3.3.2 + GPU)")
-except Exception as e:
-    logger.error(f"⚠️  시리얼 넘버 OCR 검출기 초기화 실패: {e}")
-    logger.exception(e)
-    serial_detector = None
+
+def default_template_alignment():
+    """기본 템플릿 정렬 시스템 (WebSocket 템플릿 매칭 / 워밍업용, 핫 리로드 시 교체되므로 매번 조회)"""
+    return template_registry.default if template_registry is not None else None
+
+# 게이트 키별 마지막 OCR 제품 코드 (predict_dual은 OCR이 정렬과 병렬이므로 직전 보드의 제품 템플릿으로 먼저 정렬,
+# OCR 제품의 템플릿과 다르면 realign 단계에서 다시 정렬)
+last_product_codes = {}
+
+
+
+# 시리얼 라벨 영역 OCR 설정 (라벨만 잘라서 업스케일 / OCR, 실패 시 전체 프레임)
+SERIAL_DETECTOR_OPTIONS = {
+    'label_mode': get_config_value('ocr.label_mode', 'auto'),
+    'label_roi': get_config_value('ocr.label_roi', None),
+    'label_padding': get_config_value('ocr.label_padding', 0.5),
+}
+
+
+def load_serial_detector():
+    """시리얼 넘버 OCR 검출기 초기화 (PaddleOCR 3.3.2 버전 + GPU, 워밍업 스레드에서 실행)"""
+    global serial_detector
+
+    if inference_client is not None:
+        # 멀티 프로세스 모드: 추론 프로세스의 OCR 사용
+        serial_detector = RemoteSerialDetector(inference_client,
+                                               startup_timeout=get_config_value('serving.startup_timeout', 300))
+        logger.info("✅ 원격 시리얼 넘버 OCR 검출기 연결 완료 (추론 프로세스)")
+        return serial_detector
+
+    try:
+        detector = SerialNumberDetector(**SERIAL_DETECTOR_OPTIONS)  # EasyOCR GPU 자동 사용 ⭐
+        logger.info("✅ 시리얼 넘버 OCR 검출기 초기화 완료 (PaddleOCR 3.3.2 + GPU)")
+    except Exception as e:
+        logger.error(f"⚠️  시리얼 넘버 OCR 검출기 초기화 실패: {e}")
+        logger.exception(e)
+        raise
+
+    serial_detector = detector
+    return detector
+
+
+def warmup_serial_detector(detector):
+    """OCR 워밍업 (카메라 해상도의 더미 뒷면 프레임으로 전처리 + 인식 1회)"""
+    frame = np.full((WARMUP_CAMERA_HEIGHT, WARMUP_CAMERA_WIDTH, 3), 255, dtype=np.uint8)
+    cv2.putText(frame, 'MBBC-00000001', (60, WARMUP_CAMERA_HEIGHT // 2),
+                cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 0), 3)
+    detector.detect_serial_number(frame, learn_label=False)  # 더미 프레임의 글자 위치는 라벨 위치로 학습하지 않음
+
+
+def warmup_template_alignment(alignment):
+    """템플릿 매칭 워밍업 (OpenCV matchTemplate 초기화)"""
+    frame = np.zeros((640, 640, 3), dtype=np.uint8)
+    alignment.find_reference_point(frame)
+
+# 카메라 프레임 → 640x640 검사 / 모델 입력 (크롭 + 리사이즈 1회, 호출마다 새 배열 할당) ⭐
+# (YOLO / 템플릿 ROI 좌표가 640 기준이므로 크기는 고정, ONNX 백엔드는 imgsz 640이면 추가 리사이즈 없음)
+frame_preprocessor = FramePreprocessor(target_size=640)
+
+# 양면 검사 병렬 처리용 워커 풀 (뒷면 OCR을 앞면 검출과 동시에 실행) ⭐
+dual_branch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='dual-ocr')
 
 # PCB 정렬 및 컴포넌트 검증 모듈 초기화
 pcb_aligner_left = None
 pcb_aligner_right = None
+
+# 나사 구멍 검출 / 변환 행렬 재사용 설정 (server/pcb_alignment.py)
+PCB_ALIGNER_OPTIONS = {
+    'hole_search': get_config_value('pcb_alignment.hole_search', 'window'),
+    'window_radius': get_config_value('pcb_alignment.window_radius', 40),
+    'downscale': get_config_value('pcb_alignment.downscale', 1.0),
+    'subpixel': get_config_value('pcb_alignment.subpixel', True),
+    'reuse_threshold': get_config_value('pcb_alignment.reuse_threshold', 2.0),
+    'reuse_max_frames': get_config_value('pcb_alignment.reuse_max_frames', 30),
+}
 component_verifier_left = None
 component_verifier_right = None
 
@@ -140,7 +309,7 @@ try:
             left_reference_data = json.load(f)
 
         # PCBAligner 초기화 (좌측)
-        pcb_aligner_left = PCBAligner(left_reference_data)
+        pcb_aligner_left = PCBAligner(left_reference_data, **PCB_ALIGNER_OPTIONS)
 
         # ComponentVerifier 초기화 (좌측)
         component_verifier_left = ComponentVerifier(
@@ -167,7 +336,7 @@ try:
             right_reference_data = json.load(f)
 
         # PCBAligner 초기화 (우측)
-        pcb_aligner_right = PCBAligner(right_reference_data)
+        pcb_aligner_right = PCBAligner(right_reference_data, **PCB_ALIGNER_OPTIONS)
 
         # ComponentVerifier 초기화 (우측)
         component_verifier_right = ComponentVerifier(
@@ -186,22 +355,70 @@ except Exception as e:
     logger.error(f"⚠️  우측 기준 데이터 로드 실패: {e}")
     logger.warning("   - PCB 정렬 및 컴포넌트 검증 비활성화 (우측)")
 
+if pcb_aligner_left is not None or pcb_aligner_right is not None:
+    readiness.mark_ready('references')
+else:
+    readiness.mark_disabled('references', '기준 데이터 파일 없음 (reference_data/reference_*.json)')
+
+# 모델 로드 / 워밍업 시작 (GPU 경합을 피하기 위해 순차 실행) ⭐
+readiness.start(
+    [
+        lambda: readiness.run_component('yolo', load_yolo_model, warmup_yolo_model),
+        lambda: readiness.run_component('template', default_template_alignment, warmup_template_alignment),
+        lambda: readiness.run_component('ocr', load_serial_detector, warmup_serial_detector),
+    ],
+    background=get_config_value('startup.background_warmup', True)
+)
+
 # 실시간 뷰어를 위한 전역 변수
 latest_frames = {
     'left': None,
     'right': None
 }
-# JPEG 캐싱 (WebSocket 성능 최적화) ⭐
-latest_frames_jpeg = {
-    'left': None,  # Base64 encoded JPEG 문자열
-    'right': None
+# 카메라별 프레임 ID (latest_frames 교체마다 1씩 증가, 뷰어 조건부 요청 / 캐시 키용)
+latest_frame_ids = {
+    'left': 0,
+    'right': 0
 }
+# latest_results 변경 버전 (/api/latest_results ETag) + 버전별 직렬화 결과
+# ETag는 프로세스 시작마다 바뀌는 접두어 + 버전 (재시작 후 이전 태그로 304를 받지 않도록)
+LATEST_RESULTS_ETAG_PREFIX = uuid.uuid4().hex[:12]
+latest_results_version = 0
+latest_results_body = (None, None)  # (version, JSON bytes)
 latest_results = {
     'left': {},
     'right': {},
     'serial_ocr': {}  # 시리얼 넘버 OCR 결과 (우측 카메라)
 }
-frame_lock = threading.Lock()
+frame_lock = InstrumentedLock('frame_lock') if METRICS_ENABLED else threading.Lock()
+
+
+def next_frame_id(camera_id):
+    """latest_frames 교체 시 새 프레임 ID 발급 (frame_lock 안에서 호출)"""
+    latest_frame_ids[camera_id] += 1
+    return latest_frame_ids[camera_id]
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match 헤더(쉼표로 구분된 태그 목록, W/ 약한 태그, '*')에 etag가 있는지"""
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*' or (tag[2:] if tag.startswith('W/') else tag) == etag:
+            return True
+    return False
+
+
+def mark_results_changed():
+    """latest_results 변경 표시 (frame_lock 안에서 호출, ETag 갱신)"""
+    global latest_results_version
+    latest_results_version += 1
+
+# MJPEG 스트림: 프레임이 바뀌지 않아도 이 간격(초)마다 재전송 (프록시 / 클라이언트 연결 유지)
+MJPEG_KEEPALIVE_S = get_config_value('viewer.mjpeg_keepalive_s', 2.0)
+
+# JPEG 인코딩 + SocketIO broadcast 전용 스레드 (frame_lock 밖에서 처리) ⭐
+# 인코딩된 최신 JPEG를 카메라별로 캐시 (WebSocket / MJPEG 스트림 성능 최적화)
+frame_publisher = FramePublisher(socketio)
 
 # Temporal Smoothing 설정 (깜빡거림 최소화)
 HISTORY_SIZE = 15         # 최근 15프레임 저장
@@ -211,29 +428,94 @@ IOU_THRESHOLD = 0.05      # 5% 이상만 겹쳐도 같은 객체로 판단 (극
 CONFIDENCE_THRESHOLD = 0.3  # 신뢰도 30% 이상만 사용
 FREEZE_AFTER_FRAMES = 9999  # 프로즌 기능 비활성화 (사용자 요청) ⭐⭐⭐
 
-# ROI 설정 (PCB 자동 감지 및 내부 영역만 검출) ⭐⭐⭐
-PCB_COLOR_LOWER_HSV = np.array([35, 40, 40])    # 초록색 하한 (HSV)
-PCB_COLOR_UPPER_HSV = np.array([85, 255, 255])  # 초록색 상한 (HSV)
-PCB_INNER_MARGIN_PERCENT = 0.03  # PCB 테두리 3% 제외 (파란색 선에 가깝게) ⭐
-PCB_EDGE_THRESHOLD = 10  # PCB가 프레임 경계에서 최소 10픽셀 떨어져야 전체로 간주
+# YOLO 검출 ROI 설정 (좌우 확장 + 위로 70픽셀 이동) ⭐⭐⭐
+YOLO_ROI_WIDTH = 600      # 550 → 600 (+50)
+YOLO_ROI_HEIGHT = 415
+YOLO_ROI_OFFSET_Y = 70    # 중앙에서 위로 이동할 픽셀
+TEMPLATE_ROI_SIZE = 60    # 템플릿 매칭 ROI 크기 (YOLO ROI 왼쪽 상단 모서리에 정렬된 정사각형)
+
+# ROI 설정 (PCB 자동 감지 및 내부 영역만 검출, 색상 / 경계 값은 server/pcb_roi.py) ⭐⭐⭐
+PCB_ROI_DOWNSCALE = get_config_value('pcb_roi.downscale', 0.25)  # PCB 분할 해상도 비율
 
 # 모션 감지 설정 (새 PCB 진입 감지) ⭐⭐⭐
 MOTION_THRESHOLD = 30.0    # 프레임 차이 임계값 (픽셀 평균 차이)
 STABLE_FRAMES_FOR_FREEZE = 10  # 10프레임 동안 안정 시 frozen 모드
 
+# 모션 게이트 (정지 프레임은 템플릿 매칭 + YOLO 생략, 캐시된 검출/검증 결과 재사용) ⭐
+MOTION_GATE_ENABLED = bool(get_config_value('motion_gate.enabled', True))
+motion_gate = MotionGate(
+    threshold=get_config_value('motion_gate.threshold', 8.0),
+    max_reuse_frames=get_config_value('motion_gate.max_reuse_frames', 30),
+    max_age_s=get_config_value('motion_gate.max_age_s', 3.0),
+    min_stable_inferences=get_config_value('motion_gate.min_stable_inferences', MIN_DETECTION_FRAMES),
+    thumbnail_width=get_config_value('motion_gate.thumbnail_width', 160)
+)
+# 프레임 내용 기반 YOLO 결과 캐시 (거의 같은 프레임 반복 시 YOLO + 파싱 생략) ⭐
+# 엔드포인트(파이프라인 이름)별로 켜고 끔 - 운영용 predict_dual은 별도로 opt-in
+result_cache = FrameResultCache(
+    max_entries=get_config_value('result_cache.max_entries', 256),
+    ttl_s=get_config_value('result_cache.ttl_s', 2.0)
+)
+RESULT_CACHE_HASH_SIZE = get_config_value('result_cache.hash_size', 16)
+RESULT_CACHE_ENDPOINTS = {
+    name for name, enabled in (get_config_value('result_cache.endpoints', None) or {
+        'predict_test': True, 'predict': True, 'predict_dual': False
+    }).items() if enabled
+}
+
+# WebSocket request_frame 테두리 검출 결과 캐시 (C# 모니터 100ms 폴링) ⭐
+# 키: (카메라, 프레임 ID, thresholds, rois) - 프레임이 바뀌면 ID가 달라져 자연히 무효화됨
+edge_result_cache = FrameResultCache(
+    max_entries=get_config_value('edge_cache.max_entries', 16),
+    ttl_s=get_config_value('edge_cache.ttl_s', 60.0)
+)
+
+# 제품별 기준 부품 배치 캐시 (보드마다 DB 조회 + 재그룹화 생략, /save_reference_components 저장 시 무효화) ⭐
+# 다른 프로세스에서 저장한 배치는 revalidate_s마다 DB 버전(db.get_reference_version)을 확인해서 반영
+reference_store = ReferenceStore(
+    db.get_reference_components,
+    ttl_s=get_config_value('reference_cache.ttl_s', 300.0),
+    negative_ttl_s=get_config_value('reference_cache.negative_ttl_s', 10.0),
+    max_products=get_config_value('reference_cache.max_products', 64),
+    version_loader=db.get_reference_version,
+    revalidate_s=get_config_value('reference_cache.revalidate_s', 2.0)
+)
+
+# 저장된 검사 이력 일괄 재검증 (/api/reverify, 워커 프로세스 수 / 묶음 크기 / 요청당 최대 검사 수)
+REVERIFY_WORKERS = get_config_value('batch_verification.workers', 2)
+REVERIFY_CHUNK_SIZE = get_config_value('batch_verification.chunk_size', 256)
+REVERIFY_MAX_INSPECTIONS = get_config_value('batch_verification.max_inspections', 20000)
+# 모든 /api/reverify 요청이 공유하는 워커 프로세스 (첫 요청 때 시작, 요청마다 풀을 만들지 않음)
+reverify_executor = ChunkExecutor(REVERIFY_WORKERS) if REVERIFY_WORKERS > 0 else None
+
+# 게이트가 재사용하는 컨텍스트 필드 (검출 / 검증)
+GATE_DETECTION_FIELDS = (
+    'alignment', 'reference_point', 'should_run_yolo', 'roi_status', 'yolo_roi', 'raw_detections',
+    'filtered_detections', 'detections', 'defect_type', 'confidence'
+)
+GATE_VERIFICATION_FIELDS = (
+    'verified_product_code', 'verification_result', 'missing_count',
+    'position_error_count', 'extra_count', 'correct_count'
+)
+
 # 검출 히스토리 (카메라별)
 detection_history = {
     'left': deque(maxlen=HISTORY_SIZE),
     'right': deque(maxlen=HISTORY_SIZE)
 }
 
-# 추적 중인 객체 (카메라별)
-tracked_objects = {
-    'left': {},   # {object_id: {'box': {...}, 'class_id': int, 'class_name': str, 'confidence': float, 'count': int, 'missing': int}}
-    'right': {}
+# 추적 중인 객체 (카메라별, 배열 기반 추적기 + 헝가리안 매칭) ⭐
+object_trackers = {
+    camera_id: ObjectTracker(
+        iou_threshold=IOU_THRESHOLD,
+        min_hits=MIN_DETECTION_FRAMES,
+        max_missing=MAX_MISSING_FRAMES,
+        freeze_after=FREEZE_AFTER_FRAMES,
+        name=camera_id
+    )
+    for camera_id in ('left', 'right')
 }
-next_object_id = 0
-tracking_lock = threading.Lock()
+tracking_lock = InstrumentedLock('tracking_lock') if METRICS_ENABLED else threading.Lock()
 
 # 완전 정지 모드 (모든 객체가 frozen 상태가 되면 프레임 업데이트 중지) ⭐⭐⭐
 camera_frozen_state = {
@@ -256,15 +538,47 @@ stable_frame_count = {
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    """서버 상태 체크"""
+    """
+    서버 상태 체크
+
+    서버 프로세스가 살아 있으면 항상 200을 반환하고,
+    모델 준비 여부는 ready / components 필드로 알립니다 (클라이언트는 ready가 true가 될 때까지 대기).
+    """
+    readiness_state = readiness.snapshot()
+    components = readiness_state['components']
     return jsonify({
-        'status': 'ok',
+        'status': 'ok' if readiness_state['ready'] else 'warming_up',
+        'ready': readiness_state['ready'],
+        'warmup_elapsed_s': readiness_state['elapsed_s'],
+        'components': components,
+        'models_loaded': {name: info['ready'] for name, info in components.items()},
         'timestamp': datetime.now().isoformat(),
         'server': 'Flask PCB Inspection Server',
         'version': '1.0.0'
     })
 
 
+# 모델 워밍업 중에는 503 + Retry-After 반환 (첫 프레임 타임아웃 방지) ⭐
+READINESS_GATED_ENDPOINTS = {'predict_single', 'predict_test', 'predict_dual', 'predict_serial'}
+
+
+@app.before_request
+def gate_until_ready():
+    """워밍업이 끝나기 전의 추론 요청 거절"""
+    if not get_config_value('startup.gate_requests', True):
+        return None
+    if request.endpoint in READINESS_GATED_ENDPOINTS and not readiness.is_settled():
+        response = jsonify({
+            'status': 'warming_up',
+            'error': '모델 워밍업 중입니다. 잠시 후 다시 시도하세요.',
+            'components': readiness.snapshot()['components']
+        })
+        response.status_code = 503
+        response.headers['Retry-After'] = '2'
+        return response
+    return None
+
+
 @app.route('/save_reference_components', methods=['POST'])
 def save_reference_components():
     """
@@ -356,6 +670,8 @@ def save_reference_components():
             """
             cursor.execute(update_product_query, (saved_count, product_code))
 
+        # 캐시된 기준 배치 무효화 (다음 보드부터 새 배치 사용)
+        reference_store.invalidate(product_code)
         logger.info(f"✅ 기준 부품 배치 저장 완료: {product_code} ({saved_count}개 부품)")
 
         return jsonify({
@@ -483,6 +799,7 @@ def predict_serial():
                 'error': ocr_result.get('error'),
                 'image': frame_base64_for_debug  # Base64 인코딩된 원본 이미지
             }
+            mark_results_changed()
 
         # 성공 시 로그
         if ocr_result['status'] == 'ok':
@@ -517,9 +834,12 @@ def predict_test():
     Request JSON:
         {
             "camera_id": "left" or "right",
-            "image": "base64_encoded_jpeg_image"
+            "image": "base64_encoded_jpeg_image",
+            "product_code": "BC"  # 선택: 제품별 기준점 템플릿 사용
         }
 
+    Request multipart/form-data: camera_id=<left|right>, image=<JPEG 파일>, product_code=<선택>
+
     Response JSON:
         {
             "status": "ok",
@@ -534,30 +854,35 @@ def predict_test():
     start_time = time.time()
 
     try:
-        # 1. 요청 데이터 검증
-        data = request.get_json()
-        if not data:
+        # 1. 요청 데이터 검증 (JSON / multipart / octet-stream)
+        try:
+            upload = parse_frame_upload(request, ('image',))
+        except ValueError as parse_error:
+            return jsonify({
+                'status': 'error',
+                'error': f'Failed to decode image: {str(parse_error)}'
+            }), 400
+
+        if upload is None:
             return jsonify({
                 'status': 'error',
                 'error': 'Request body is empty'
             }), 400
 
-        camera_id = data.get('camera_id')
-        image_base64 = data.get('image')
+        camera_id = upload.fields.get('camera_id')
+        image_buffer = upload.get('image')
 
-        if not camera_id or not image_base64:
+        if not camera_id or not image_buffer:
             return jsonify({
                 'status': 'error',
                 'error': 'Missing required fields: camera_id, image'
             }), 400
 
-        # 2. Base64 디코딩 및 프레임 검증
+        # 2. JPEG 디코딩 및 프레임 검증
         try:
-            image_bytes = base64.b64decode(image_base64)
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            frame = upload.decode('image')
 
-            if frame is None or frame.size == 0:
+            if frame is None:
                 return jsonify({
                     'status': 'error',
                     'error': 'Invalid image data: failed to decode'
@@ -565,284 +890,62 @@ def predict_test():
 
             logger.info(f"[TEST] 프레임 수신 성공: {camera_id} (원본 shape: {frame.shape})")
 
-            # 중앙 크롭 (640x480 → 640x640) ⭐⭐⭐
-            frame = crop_to_square(frame, target_size=640)
-            logger.info(f"[TEST] 중앙 크롭 완료: {camera_id} (크롭 후 shape: {frame.shape})")
-
         except Exception as decode_error:
             return jsonify({
                 'status': 'error',
                 'error': f'Failed to decode image: {str(decode_error)}'
             }), 400
 
-        # 2-1. 모션 감지 (새 PCB 진입 확인) ⭐⭐⭐
-        motion_detected, motion_value = detect_motion(frame, previous_frames.get(camera_id), camera_id)
-
-        if motion_detected:
-            # 큰 움직임 감지 → 새 PCB 진입!
-            logger.info(f"🚨 [{camera_id}] 모션 감지! (차이: {motion_value:.1f}) → 추론 재개")
-
-            # frozen 상태 리셋
-            with tracking_lock:
-                camera_frozen_state[camera_id] = False
-                stable_frame_count[camera_id] = 0
-                tracked_objects[camera_id].clear()  # 모든 추적 객체 초기화
-                logger.info(f"🔓 [{camera_id}] frozen 상태 리셋 완료")
-        else:
-            # 움직임 없음 → 안정 프레임 증가
-            stable_frame_count[camera_id] += 1
-
-        # 이전 프레임 업데이트
-        previous_frames[camera_id] = frame.copy()
-
-        # 2-2. 완전 정지 모드 확인 (모든 객체가 frozen 상태면 추론 건너뛰기) ⭐⭐⭐
-        if camera_frozen_state.get(camera_id, False):
-            # 이미 frozen 상태 - 추론하지 않고 기존 결과 반환
-            with frame_lock:
-                existing_result = latest_results.get(camera_id, {})
-
-            if existing_result:
-                logger.info(f"🔒 [{camera_id}] 정지 모드 - 기존 결과 반환 (추론 생략)")
-                return jsonify(existing_result)
-            else:
-                # 결과가 없으면 한 번만 추론 실행 (초기화)
-                logger.info(f"⚠️  [{camera_id}] 정지 모드지만 기존 결과 없음 - 초기 추론 실행")
-
-        # 3. PCB ROI 감지 (비활성화 - 암막 준비 후 활성화 예정) ⭐⭐⭐
-        # roi_mask, pcb_bbox, roi_bbox = detect_pcb_roi(frame)
-        # if pcb_bbox is not None:
-        #     logger.info(f"[TEST] PCB 감지 성공: {camera_id} → PCB {pcb_bbox}, ROI {roi_bbox}")
-        # else:
-        #     logger.warning(f"[TEST] PCB 감지 실패: {camera_id} → 전체 프레임 사용")
-
-        # ROI 비활성화 - 전체 프레임 사용
-        pcb_bbox, roi_bbox = None, None
-
-        # 3-1. 템플릿 매칭 + ROI 체크 ⭐⭐⭐
-        should_run_yolo = False
-        roi_status = "unknown"
-        reference_point = None
-
-        if template_alignment and template_alignment.template is not None:
-            # YOLO 검출용 ROI 영역 정의 (좌우 확장 + 위로 70픽셀 이동)
-            img_h, img_w = frame.shape[:2]
-            yolo_width = 600  # 550 → 600 (+50)
-            yolo_height = 415
-            yolo_roi_x1 = (img_w - yolo_width) // 2   # 20
-            yolo_roi_y1 = (img_h - yolo_height) // 2 - 70  # 42 (112-70)
-            yolo_roi_x2 = yolo_roi_x1 + yolo_width    # 620
-            yolo_roi_y2 = yolo_roi_y1 + yolo_height   # 457
-
-            # 템플릿 매칭용 ROI 영역 정의 (YOLO ROI 왼쪽 상단 모서리에 정렬)
-            roi_size = 60       # ROI 크기 (정사각형)
-            # YOLO ROI 왼쪽 상단 모서리 좌표를 그대로 사용
-            roi_x1 = yolo_roi_x1                    # 20
-            roi_y1 = yolo_roi_y1                    # 42
-            roi_x2 = roi_x1 + roi_size              # 80
-            roi_y2 = roi_y1 + roi_size              # 102
-
-            # 템플릿 매칭
-            reference_point = template_alignment.find_reference_point(
-                frame,
-                method=cv2.TM_CCORR_NORMED,
-                roi=None
-            )
-
-            if reference_point:
-                ref_x, ref_y = reference_point
-                is_in_roi = (roi_x1 <= ref_x <= roi_x2 and roi_y1 <= ref_y <= roi_y2)
-
-                if is_in_roi:
-                    should_run_yolo = True
-                    roi_status = "in_roi"
-                    logger.info(f"[TEST] ✅ 템플릿이 ROI 안: {camera_id} ({ref_x}, {ref_y}) → YOLO 실행")
-                else:
-                    should_run_yolo = False
-                    roi_status = "out_of_roi"
-                    logger.warning(f"[TEST] ⚠️ 템플릿이 ROI 밖: {camera_id} ({ref_x}, {ref_y}) → YOLO 건너뛰기")
-
-                # ROI 상태 broadcast
-                socketio.emit('roi_status', {
-                    'camera_id': camera_id,
-                    'status': roi_status,
-                    'reference_point': [int(ref_x), int(ref_y)],
-                    'roi': [roi_x1, roi_y1, roi_x2, roi_y2]
-                })
-
-        # 3-2. 템플릿 매칭 실패 처리
-        if template_alignment and template_alignment.template is not None:
-            if not reference_point:
-                logger.warning(f"[TEST] 템플릿 매칭 실패: {camera_id}")
-                should_run_yolo = False
-                roi_status = "template_not_found"
-        else:
-            # 템플릿이 없으면 항상 YOLO 실행 (기존 동작 유지)
-            should_run_yolo = True
-            roi_status = "no_template"
-            logger.info(f"[TEST] 템플릿 없음 → 항상 YOLO 실행: {camera_id}")
-
-        # 4. AI 추론 (YOLO 모델, ROI 조건부 실행) ⭐⭐⭐
-        boxes_data = []
-        if yolo_model is not None and should_run_yolo:
-            try:
-                # YOLO 추론 실행 (ROI 영역만 사용)
-                # 참고: ROI 마스크를 직접 적용하지 않고, 추론 후 필터링으로 처리
-                results = yolo_model.predict(frame, conf=0.3, iou=0.7, verbose=False)
-                defect_type, confidence, raw_boxes_data = parse_yolo_results(results)
-
-                # 신뢰도 필터링 (낮은 신뢰도 제거)
-                filtered_boxes = [box for box in raw_boxes_data if box['confidence'] >= CONFIDENCE_THRESHOLD]
-
-                # YOLO ROI 필터링 (템플릿이 ROI 안에 있을 때만) ⭐⭐⭐
-                if template_alignment and template_alignment.template is not None and reference_point:
-                    roi_filtered_boxes = []
-                    for box in filtered_boxes:
-                        # 바운딩 박스 중심점이 YOLO ROI 안에 있는지 확인
-                        cx = (box['x1'] + box['x2']) / 2
-                        cy = (box['y1'] + box['y2']) / 2
-                        if yolo_roi_x1 <= cx <= yolo_roi_x2 and yolo_roi_y1 <= cy <= yolo_roi_y2:
-                            roi_filtered_boxes.append(box)
-                    logger.info(f"[TEST] YOLO ROI 필터링: {camera_id} → {len(filtered_boxes)}개 → {len(roi_filtered_boxes)}개")
-                    filtered_boxes = roi_filtered_boxes
-
-                # 검출 결과 평활화 (Temporal Smoothing)
-                smoothed_boxes = smooth_detections(camera_id, filtered_boxes)
-
-                # 평활화된 결과로 바운딩 박스 그리기 (PCB, ROI 박스도 함께 표시)
-                annotated_frame = draw_bounding_boxes(frame.copy(), smoothed_boxes, pcb_bbox, roi_bbox)
-
-                logger.info(f"[TEST] YOLO 추론 완료: {camera_id} → 원본 {len(raw_boxes_data)}개 → 필터링 {len(filtered_boxes)}개 → 평활화 {len(smoothed_boxes)}개 객체")
-
-                # 디버그 뷰어용 데이터 구조 변환 (JavaScript가 기대하는 형식으로) ⭐
-                # smoothed_boxes를 사용해야 이미지에 그려진 박스와 테이블이 일치함
-                boxes_data = []
-                for box in smoothed_boxes:
-                    cx = (box['x1'] + box['x2']) / 2
-                    cy = (box['y1'] + box['y2']) / 2
-
-                    box_data = {
-                        'class_name': box['class_name'],
-                        'bbox': [box['x1'], box['y1'], box['x2'], box['y2']],
-                        'center': [cx, cy],
-                        'confidence': box['confidence']
-                    }
-
-                    # 템플릿 기준점을 (0,0)으로 하는 상대 좌표 추가 ⭐
-                    if reference_point:
-                        ref_x, ref_y = reference_point
-                        rel_x = cx - ref_x
-                        rel_y = cy - ref_y
-                        box_data['relative_center'] = [rel_x, rel_y]
-
-                    boxes_data.append(box_data)
-            except Exception as yolo_error:
-                logger.error(f"[TEST] YOLO 추론 실패: {yolo_error}")
-                defect_type = "정상"
-                confidence = 0.0
-                annotated_frame = frame.copy()
-        elif not should_run_yolo:
-            # ROI 밖 또는 템플릿 매칭 실패 - YOLO 실행하지 않음
-            logger.info(f"[TEST] YOLO 건너뛰기: {camera_id} (ROI 상태: {roi_status})")
-            defect_type = "정상"
-            confidence = 0.0
-            annotated_frame = frame.copy()
-        else:
-            logger.warning("[TEST] YOLO 모델이 로드되지 않음 - 더미 결과 반환")
-            defect_type = "정상"
-            confidence = 0.95
-            annotated_frame = frame.copy()
-
-        # 5. ROI + 템플릿 시각화 오버레이 (annotated_frame 위에 그리기) ⭐⭐⭐
-        if template_alignment and template_alignment.template is not None:
-            img_h, img_w = annotated_frame.shape[:2]
-
-            # YOLO 검출용 ROI 재계산 (시각화용, 좌우 확장 + 위로 70픽셀 이동)
-            yolo_width = 600  # 550 → 600 (+50)
-            yolo_height = 415
-            yolo_roi_x1 = (img_w - yolo_width) // 2   # 20
-            yolo_roi_y1 = (img_h - yolo_height) // 2 - 70  # 42 (112-70)
-            yolo_roi_x2 = yolo_roi_x1 + yolo_width    # 620
-            yolo_roi_y2 = yolo_roi_y1 + yolo_height   # 457
-
-            # 템플릿 매칭용 ROI 재계산 (시각화용, YOLO ROI 왼쪽 상단 모서리에 정렬)
-            roi_size = 60       # ROI 크기 (정사각형)
-            roi_x1 = yolo_roi_x1                    # 20
-            roi_y1 = yolo_roi_y1                    # 42
-            roi_x2 = roi_x1 + roi_size              # 80
-            roi_y2 = roi_y1 + roi_size              # 102
-
-            # YOLO ROI 박스 그리기 (초록색, 먼저 그려서 뒤에 표시)
-            cv2.rectangle(annotated_frame, (yolo_roi_x1, yolo_roi_y1), (yolo_roi_x2, yolo_roi_y2), (0, 255, 0), 2)
-            cv2.putText(annotated_frame, "YOLO ROI", (yolo_roi_x1 + 10, yolo_roi_y1 + 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-
-            # 템플릿 ROI 박스 그리기 (노란색, 나중에 그려서 앞에 표시)
-            cv2.rectangle(annotated_frame, (roi_x1, roi_y1), (roi_x2, roi_y2), (0, 255, 255), 3)
-            cv2.putText(annotated_frame, "Template ROI", (roi_x1 + 10, roi_y1 + 50),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-
-            # 템플릿 매칭 결과 그리기
-            if reference_point:
-                ref_x, ref_y = reference_point
-
-                # 템플릿 영역 그리기 (보라색)
-                template_h, template_w = template_alignment.template.shape[:2]
-                top_left_x = ref_x - template_w // 2
-                top_left_y = ref_y - template_h // 2
-                cv2.rectangle(annotated_frame,
-                            (top_left_x, top_left_y),
-                            (top_left_x + template_w, top_left_y + template_h),
-                            (255, 0, 255), 3)
+        # 3. 검사 파이프라인 실행 ⭐⭐⭐
+        # 중앙 크롭 (640x480 → 640x640) → 모션 감지 → 템플릿 매칭 + ROI 체크
+        # → YOLO (ROI 조건부 실행) → ROI 필터링 → 평활화 → ROI/템플릿 시각화
+        # PCB ROI 감지(detect_pcb_roi)는 비활성화 - 암막 준비 후 활성화 예정
+        ctx = predict_test_pipeline.run(
+            new_inspection_context(camera_id, frame, '[TEST]', emit_roi_status=True,
+                                   product_code=upload.fields.get('product_code') or None)
+        )
 
-                # 기준점 원 그리기 (빨간색)
-                cv2.circle(annotated_frame, (ref_x, ref_y), 10, (0, 0, 255), -1)
+        if ctx.stopped_at == 'motion':
+            # 정지 모드 - 추론하지 않고 기존 결과 반환
+            return jsonify(ctx.frozen_result)
 
-                # 좌표축 그리기
-                cv2.arrowedLine(annotated_frame, (ref_x, ref_y), (ref_x + 50, ref_y), (255, 0, 0), 2)
-                cv2.arrowedLine(annotated_frame, (ref_x, ref_y), (ref_x, ref_y + 50), (0, 255, 0), 2)
+        defect_type = ctx.defect_type
+        confidence = ctx.confidence
+        annotated_frame = ctx.annotated_frame
+        roi_status = ctx.roi_status
+        should_run_yolo = ctx.should_run_yolo
 
-                # ROI 상태 텍스트
-                status_text = "✅ IN ROI" if roi_status == "in_roi" else "⚠️ OUT OF ROI"
-                status_color = (0, 255, 0) if roi_status == "in_roi" else (0, 0, 255)
-                cv2.putText(annotated_frame, status_text, (10, img_h - 10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, status_color, 2)
+        # 디버그 뷰어용 데이터 구조 변환 (JavaScript가 기대하는 형식으로) ⭐
+        # 평활화 결과를 사용해야 이미지에 그려진 박스와 테이블이 일치함
+        # 템플릿 기준점이 있으면 (0,0)으로 하는 상대 좌표(relative_center)도 추가 ⭐
+        boxes_data = ctx.detections.to_component_dicts(ctx.reference_point) if ctx.detections is not None else []
+        add_source_bboxes(boxes_data, ctx.detections, ctx.geometry)
 
         gpio_pin = get_gpio_pin(defect_type)
 
-        # 뷰어를 위해 바운딩 박스가 그려진 프레임 저장
+        # 뷰어를 위해 바운딩 박스가 그려진 프레임 저장 (락 안에서는 참조 교체만) ⭐
         with frame_lock:
             latest_frames[camera_id] = annotated_frame
+            frame_id = next_frame_id(camera_id)
 
-            # JPEG 인코딩 및 캐싱 (WebSocket 성능 최적화) ⭐
-            encode_params = [
-                cv2.IMWRITE_JPEG_QUALITY, 85,
-                cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
-                cv2.IMWRITE_JPEG_OPTIMIZE, 1
-            ]
-            ret, buffer = cv2.imencode('.jpg', annotated_frame, encode_params)
-            if ret:
-                frame_base64 = base64.b64encode(buffer.tobytes()).decode('utf-8')
-                latest_frames_jpeg[camera_id] = frame_base64
-                logger.debug(f"[TEST] JPEG 캐싱 완료: {camera_id} ({len(frame_base64)} bytes)")
-
-                # 최종 프레임을 viewer에 broadcast (ROI+템플릿+YOLO 박싱 모두 포함) ⭐⭐⭐
-                socketio.emit('frame_update', {
-                    'camera_id': camera_id,
-                    'image': frame_base64,
-                    'defect_type': defect_type,
-                    'confidence': confidence,
-                    'boxes_count': len(boxes_data),
-                    'boxes_data': boxes_data,  # 컴포넌트 상세 정보 추가
-                    'roi_status': roi_status,
-                    'frame_shape': list(annotated_frame.shape),  # 프레임 크기 [height, width, channels]
-                    'timestamp': datetime.now().isoformat(),
-                    'type': 'final_frame'
-                })
+        # 최종 프레임을 viewer에 broadcast (ROI+템플릿+YOLO 박싱 모두 포함) ⭐⭐⭐
+        # JPEG 인코딩/캐싱과 SocketIO 전송은 퍼블리셔 스레드에서 처리
+        frame_publisher.publish(camera_id, annotated_frame, {
+            'camera_id': camera_id,
+            'defect_type': defect_type,
+            'confidence': confidence,
+            'boxes_count': len(boxes_data),
+            'boxes_data': boxes_data,  # 컴포넌트 상세 정보 추가
+            'roi_status': roi_status,
+            'frame_shape': list(annotated_frame.shape),  # 프레임 크기 [height, width, channels]
+            'timestamp': datetime.now().isoformat(),
+            'type': 'final_frame'
+        }, frame_id=frame_id)
 
-                if should_run_yolo:
-                    logger.info(f"[TEST] 최종 프레임 broadcast: {camera_id} (YOLO: {len(boxes_data)}개 부품, ROI: {roi_status})")
-                else:
-                    logger.info(f"[TEST] 최종 프레임 broadcast: {camera_id} (YOLO 건너뛰기, ROI: {roi_status})")
+        if should_run_yolo:
+            logger.info(f"[TEST] 최종 프레임 퍼블리시: {camera_id} (YOLO: {len(boxes_data)}개 부품, ROI: {roi_status})")
+        else:
+            logger.info(f"[TEST] 최종 프레임 퍼블리시: {camera_id} (YOLO 건너뛰기, ROI: {roi_status})")
 
         # 4. 추론 시간 계산
         inference_time_ms = (time.time() - start_time) * 1000
@@ -855,6 +958,11 @@ def predict_test():
             'confidence': confidence,
             'gpio_pin': gpio_pin,
             'inference_time_ms': round(inference_time_ms, 2),
+            'stage_timings_ms': {name: round(ms, 2) for name, ms in ctx.timings.items()},
+            'inference_reused': ctx.gate_result == 'reused',  # 모션 게이트: 캐시된 검출 결과 재사용 여부
+            'result_cache_hit': ctx.result_cache_hit,  # 프레임 결과 캐시 적중 여부 (YOLO 생략)
+            'frame_id': frame_id,  # 뷰어 프레임 ID (request_frame since_frame_id 비교용)
+            'frame_geometry': ctx.geometry.to_dict() if ctx.geometry is not None else None,  # 640 좌표 ↔ 원본 카메라 좌표
             'timestamp': datetime.now().isoformat(),
             'note': '테스트 모드 (DB 저장 안 함)'
         }
@@ -862,6 +970,7 @@ def predict_test():
         # 뷰어를 위해 결과 저장
         with frame_lock:
             latest_results[camera_id] = response.copy()
+            mark_results_changed()
 
         logger.info(f"[TEST] 추론 완료: {camera_id} → {defect_type} (time: {inference_time_ms:.1f}ms)")
         return jsonify(response)
@@ -886,12 +995,21 @@ def predict_dual():
     뒷면: 시리얼 넘버 OCR → 제품 코드 추출 → 제품별 부품 배치 기준 로드
     앞면: YOLO 부품 검출 → 부품 위치 검증 → 최종 판정
 
+    뒷면 OCR 브랜치와 앞면 검출 브랜치(크롭 → 템플릿 매칭 → YOLO → 평활화)는
+    서로 독립적이므로 동시에 실행하고, 부품 검증 단계에서 합류합니다.
+
     Request JSON:
         {
             "left_image": "base64_encoded_jpeg_image",  # 앞면 (부품 검증용)
             "right_image": "base64_encoded_jpeg_image"  # 뒷면 (시리얼 넘버 OCR용)
         }
 
+    Request multipart/form-data (권장 ⭐, Base64 없이 JPEG 원본 전송):
+        left_image=<JPEG 파일>, right_image=<JPEG 파일>
+
+    Request application/octet-stream:
+        본문 = 좌측 JPEG + 우측 JPEG, 헤더 X-Left-Length = 좌측 JPEG 바이트 수
+
     Response JSON:
         {
             "status": "ok",
@@ -906,23 +1024,38 @@ def predict_dual():
             "gpio_signal": {
                 "pin": 23,
                 "duration_ms": 300
+            },
+            "timings": {
+                "ocr_ms": 180.2,     # 뒷면 OCR 브랜치
+                "align_ms": 6.1,     # 앞면 크롭 + 템플릿 매칭
+                "yolo_ms": 42.7,     # 앞면 YOLO + 필터링 + 평활화
+                "verify_ms": 1.3,    # 기준 부품 로드 + 위치 검증
+                "total_ms": 190.5    # 요청 전체 (병렬 실행이므로 합계보다 작음)
             }
         }
     """
     start_time = time.time()
 
     try:
-        # 1. 요청 데이터 검증
-        data = request.get_json()
-        if not data:
+        # 1. 요청 데이터 검증 (JSON / multipart / octet-stream)
+        try:
+            upload = parse_frame_upload(request, ('left_image', 'right_image'))
+        except ValueError as parse_error:
+            logger.error(f"요청 파싱 실패: {parse_error}")
+            return jsonify({
+                'status': 'error',
+                'error': f'Failed to parse request: {str(parse_error)}'
+            }), 400
+
+        if upload is None:
             logger.error("요청 데이터가 비어있음")
             return jsonify({
                 'status': 'error',
                 'error': 'Request body is empty'
             }), 400
 
-        left_image = data.get('left_image')
-        right_image = data.get('right_image')
+        left_image = upload.get('left_image')
+        right_image = upload.get('right_image')
 
         if not left_image or not right_image:
             logger.error(f"필수 필드 누락: left_image={'있음' if left_image else '없음'}, right_image={'있음' if right_image else '없음'}")
@@ -933,14 +1066,12 @@ def predict_dual():
 
         # 2. 좌측 프레임 처리 (앞면 - 부품 검증용)
         try:
-            left_bytes = base64.b64decode(left_image)
-            left_nparr = np.frombuffer(left_bytes, np.uint8)
-            left_frame = cv2.imdecode(left_nparr, cv2.IMREAD_COLOR)
+            left_frame = upload.decode('left_image')
 
-            if left_frame is None or left_frame.size == 0:
+            if left_frame is None:
                 raise ValueError("좌측 프레임 디코딩 실패")
 
-            logger.info(f"좌측 프레임 (앞면) 수신 성공 (shape: {left_frame.shape})")
+            logger.info(f"좌측 프레임 (앞면) 수신 성공 (shape: {left_frame.shape}, 업로드: {upload.mode}, {upload.wire_bytes} bytes)")
         except Exception as e:
             logger.error(f"좌측 이미지 처리 실패: {e}")
             return jsonify({
@@ -950,11 +1081,9 @@ def predict_dual():
 
         # 3. 우측 프레임 처리 (뒷면 - 시리얼 넘버 OCR용)
         try:
-            right_bytes = base64.b64decode(right_image)
-            right_nparr = np.frombuffer(right_bytes, np.uint8)
-            right_frame = cv2.imdecode(right_nparr, cv2.IMREAD_COLOR)
+            right_frame = upload.decode('right_image')
 
-            if right_frame is None or right_frame.size == 0:
+            if right_frame is None:
                 raise ValueError("우측 프레임 디코딩 실패")
 
             logger.info(f"우측 프레임 (뒷면) 수신 성공 (shape: {right_frame.shape})")
@@ -965,329 +1094,84 @@ def predict_dual():
                 'error': f'Failed to process right image: {str(e)}'
             }), 400
 
-        # 4. 뒷면 처리: 시리얼 넘버 OCR
-        serial_number = None
-        product_code = None
-        ocr_confidence = 0.0
-        ocr_error = None
-        ocr_result = None  # 초기화 추가
-
-        # OCR이 처리한 이미지 (전처리된 이미지 - 디버그 뷰어용)
-        ocr_processed_image = None
-
-        # 디버그: serial_detector 상태 확인
-        logger.info(f"[DEBUG] serial_detector is None: {serial_detector is None}")
+        # 4. 뒷면 처리: 시리얼 넘버 OCR (워커 풀에서 앞면 처리와 동시에 실행) ⭐
+        ocr_future = dual_branch_executor.submit(run_serial_ocr_branch, right_frame)
 
-        if serial_detector is not None:
-            try:
-                # OCR 처리 (회전은 serial_detector 내부에서 처리)
-                ocr_result = serial_detector.detect_serial_number(right_frame)
-
-                # OCR이 실제로 처리한 전처리된 이미지 가져오기
-                ocr_processed_image = ocr_result.get('preprocessed_image')
-
-                # 디버그: OCR 전처리된 이미지를 파일로 저장 (사용자 확인용)
-                if ocr_processed_image is not None:
-                    try:
-                        cv2.imwrite('/tmp/ocr_debug.jpg', ocr_processed_image)
-                        logger.info(f"[OCR-DEBUG] 전처리 이미지 저장: /tmp/ocr_debug.jpg (shape: {ocr_processed_image.shape})")
-                    except Exception as save_err:
-                        logger.warning(f"[OCR-DEBUG] 이미지 저장 실패: {save_err}")
-
-                if ocr_result['status'] == 'ok':
-                    serial_number = ocr_result.get('serial_number')
-                    product_code = ocr_result.get('product_code')
-                    ocr_confidence = ocr_result.get('confidence', 0.0)
-                    logger.info(f"✅ 시리얼 넘버 검출 성공: {serial_number} (제품: {product_code}, 신뢰도: {ocr_confidence:.2%})")
-                else:
-                    ocr_error = ocr_result.get('error', 'OCR 실패')
-                    logger.warning(f"⚠️ 시리얼 넘버 검출 실패: {ocr_error}")
-            except Exception as e:
-                ocr_error = f"OCR 처리 중 예외 발생: {str(e)}"
-                logger.error(ocr_error, exc_info=True)
-                return jsonify({
-                    'status': 'error',
-                    'error': ocr_error
-                }), 500
-        else:
-            ocr_error = "시리얼 넘버 검출기가 초기화되지 않았습니다"
-            logger.error(ocr_error)
-
-        # 5. 제품 데이터베이스 조회 (TODO: 실제 DB 구현)
-        # if product_code:
-        #     product_components = db.get_product_components(product_code)
-
-        # 6. 앞면 처리: 정사각형 크롭 (640x480 → 640x640)
-        logger.info(f"[DUAL-LEFT] 원본 프레임 shape: {left_frame.shape}")
-        left_frame = crop_to_square(left_frame, target_size=640)
-        logger.info(f"[DUAL-LEFT] 크롭 후 shape: {left_frame.shape}")
-
-        # 6-1. 템플릿 매칭 + ROI 체크
-        should_run_yolo = False
-        roi_status = "unknown"
-        reference_point = None
+        # 5~8. 앞면 검사 파이프라인 실행 ⭐⭐⭐
+        # 정사각형 크롭 (640x480 → 640x640) → 템플릿 매칭 + ROI 체크 → YOLO → (뒷면 OCR 브랜치 합류)
+        # → OCR 제품 템플릿과 다르면 재정렬 + YOLO → ROI 필터링 → 평활화 → 시각화 → 부품 위치 검증 → 최종 판정
+        ctx = predict_dual_pipeline.run(
+            new_inspection_context('left', left_frame, '[DUAL-LEFT]', ocr_future=ocr_future, gate_key='dual')
+        )
 
-        if template_alignment and template_alignment.template is not None:
-            # YOLO 검출용 ROI 영역 정의 (좌우 확장 + 위로 70픽셀 이동)
-            img_h, img_w = left_frame.shape[:2]
-            yolo_width = 600
-            yolo_height = 415
-            yolo_roi_x1 = (img_w - yolo_width) // 2
-            yolo_roi_y1 = (img_h - yolo_height) // 2 - 70
-            yolo_roi_x2 = yolo_roi_x1 + yolo_width
-            yolo_roi_y2 = yolo_roi_y1 + yolo_height
-
-            # 템플릿 매칭용 ROI 영역 정의
-            roi_size = 60
-            roi_x1 = yolo_roi_x1
-            roi_y1 = yolo_roi_y1
-            roi_x2 = roi_x1 + roi_size
-            roi_y2 = roi_y1 + roi_size
-
-            # 템플릿 매칭
-            reference_point = template_alignment.find_reference_point(
-                left_frame,
-                method=cv2.TM_CCORR_NORMED,
-                roi=None
-            )
+        ocr_branch = ctx.ocr_branch
+        predict_dual_pipeline.record('ocr', ocr_branch['ocr_ms'])
+        if ctx.stopped_at == 'ocr_join':
+            return jsonify({
+                'status': 'error',
+                'error': ocr_branch['ocr_error']
+            }), 500
 
-            if reference_point:
-                ref_x, ref_y = reference_point
-                is_in_roi = (roi_x1 <= ref_x <= roi_x2 and roi_y1 <= ref_y <= roi_y2)
+        serial_number = ocr_branch['serial_number']
+        product_code = ocr_branch['product_code']
+        ocr_confidence = ocr_branch['ocr_confidence']
+        ocr_error = ocr_branch['ocr_error']
+        ocr_result = ocr_branch['ocr_result']
+        ocr_processed_image = ocr_branch['ocr_processed_image']
+
+        left_frame = ctx.frame
+        annotated_frame = ctx.annotated_frame
+        reference_point = ctx.reference_point
+        roi_status = ctx.roi_status
+        verification_result = ctx.verification_result
+        missing_count = ctx.missing_count
+        position_error_count = ctx.position_error_count
+        extra_count = ctx.extra_count
+        correct_count = ctx.correct_count
+        decision = ctx.decision
+        gpio_pin = ctx.gpio_pin
+
+        # 단계별 처리 시간 (OCR은 앞면 처리와 병렬 실행)
+        ocr_ms = ocr_branch['ocr_ms']
+        align_ms = ctx.stage_ms('crop', 'align', 'realign')
+        yolo_ms = ctx.stage_ms('yolo', 'roi_filter', 'smooth')
+        verify_ms = ctx.stage_ms('verify')
+
+        # 디버그 뷰어 / 응답 / DB 저장용 dict 변환 (절대좌표 + 템플릿 기준 상대좌표)
+        detections = ctx.detections if ctx.detections is not None else Detections.empty()
+        boxes_data = detections.to_component_dicts(reference_point)
 
-                if is_in_roi:
-                    should_run_yolo = True
-                    roi_status = "in_roi"
-                    logger.info(f"[DUAL-LEFT] ✅ 템플릿이 ROI 안: ({ref_x}, {ref_y}) → YOLO 실행")
-                else:
-                    should_run_yolo = False
-                    roi_status = "out_of_roi"
-                    logger.warning(f"[DUAL-LEFT] ⚠️ 템플릿이 ROI 밖: ({ref_x}, {ref_y}) → YOLO 건너뛰기")
+        # 9. 전역 변수 업데이트 (디버그 뷰어용)
+        # 우측 프레임 (뒷면) - OCR 전처리된 이미지 사용
+        if ocr_processed_image is not None:
+            # OCR이 처리한 전처리된 이미지 사용 (그레이스케일 + 2배 업스케일)
+            # 그레이스케일 → BGR 변환 (디버그 뷰어 표시용)
+            if len(ocr_processed_image.shape) == 2:
+                rotated_right_display = cv2.cvtColor(ocr_processed_image, cv2.COLOR_GRAY2BGR)
             else:
-                should_run_yolo = False
-                roi_status = "no_template"
-                logger.warning(f"[DUAL-LEFT] ⚠️ 템플릿 매칭 실패 → YOLO 건너뛰기")
-        else:
-            should_run_yolo = True
-            roi_status = "no_template_checker"
-            logger.warning(f"[DUAL-LEFT] ⚠️ 템플릿 체커 없음 → YOLO 강제 실행")
-
-        # 6-2. YOLO 부품 검출 (원래 /predict_test 방식)
-        boxes_data = []
-        if yolo_model is not None and should_run_yolo:
-            try:
-                # YOLO 추론 실행
-                results = yolo_model.predict(left_frame, conf=0.3, iou=0.7, verbose=False)
-                defect_type, confidence, raw_boxes_data = parse_yolo_results(results)
-
-                # 신뢰도 필터링 (낮은 신뢰도 제거)
-                filtered_boxes = [box for box in raw_boxes_data if box['confidence'] >= CONFIDENCE_THRESHOLD]
-
-                # YOLO ROI 필터링 (템플릿이 ROI 안에 있을 때만)
-                if template_alignment and template_alignment.template is not None and reference_point:
-                    roi_filtered_boxes = []
-                    for box in filtered_boxes:
-                        # 바운딩 박스 중심점이 YOLO ROI 안에 있는지 확인
-                        cx = (box['x1'] + box['x2']) / 2
-                        cy = (box['y1'] + box['y2']) / 2
-                        if yolo_roi_x1 <= cx <= yolo_roi_x2 and yolo_roi_y1 <= cy <= yolo_roi_y2:
-                            roi_filtered_boxes.append(box)
-                    logger.info(f"[DUAL-LEFT] YOLO ROI 필터링: {len(filtered_boxes)}개 → {len(roi_filtered_boxes)}개")
-                    filtered_boxes = roi_filtered_boxes
-
-                # 검출 결과 평활화 (Temporal Smoothing)
-                smoothed_boxes = smooth_detections('left', filtered_boxes)
-
-                # 평활화된 결과로 바운딩 박스 그리기
-                annotated_frame = draw_bounding_boxes(left_frame.copy(), smoothed_boxes, None, None)
-
-                logger.info(f"[DUAL-LEFT] YOLO 추론 완료: 원본 {len(raw_boxes_data)}개 → 필터링 {len(filtered_boxes)}개 → 평활화 {len(smoothed_boxes)}개 객체")
-
-                # 디버그 뷰어용 데이터 구조 변환 (절대좌표 + 상대좌표)
-                boxes_data = []
-                for box in smoothed_boxes:
-                    cx = (box['x1'] + box['x2']) / 2
-                    cy = (box['y1'] + box['y2']) / 2
-
-                    box_data = {
-                        'class_name': box['class_name'],
-                        'bbox': [box['x1'], box['y1'], box['x2'], box['y2']],
-                        'center': [cx, cy],  # 절대좌표 (디버그 뷰어용)
-                        'confidence': box['confidence']
-                    }
-
-                    # 템플릿 기준점을 (0,0)으로 하는 상대 좌표 추가 (ComponentVerifier용)
-                    if reference_point:
-                        ref_x, ref_y = reference_point
-                        rel_x = cx - ref_x
-                        rel_y = cy - ref_y
-                        box_data['relative_center'] = [rel_x, rel_y]
-
-                    boxes_data.append(box_data)
-            except Exception as yolo_error:
-                logger.error(f"[DUAL-LEFT] YOLO 추론 실패: {yolo_error}")
-                defect_type = "정상"
-                confidence = 0.0
-                annotated_frame = left_frame.copy()
-        elif not should_run_yolo:
-            # ROI 밖 또는 템플릿 매칭 실패 - YOLO 실행하지 않음
-            logger.info(f"[DUAL-LEFT] YOLO 건너뛰기 (ROI 상태: {roi_status})")
-            defect_type = "정상"
-            confidence = 0.0
-            annotated_frame = left_frame.copy()
+                rotated_right_display = ocr_processed_image
         else:
-            logger.warning("[DUAL-LEFT] YOLO 모델이 로드되지 않음 - 더미 결과 반환")
-            defect_type = "정상"
-            confidence = 0.95
-            annotated_frame = left_frame.copy()
-
-        # 6-3. ROI + 템플릿 시각화 오버레이
-        if template_alignment and template_alignment.template is not None:
-            img_h, img_w = annotated_frame.shape[:2]
+            # OCR 실패 시 원본 회전 이미지 사용
+            rotated_right_display = cv2.rotate(right_frame, cv2.ROTATE_90_CLOCKWISE)
 
-            # YOLO ROI 재계산
-            yolo_width = 600
-            yolo_height = 415
-            yolo_roi_x1 = (img_w - yolo_width) // 2
-            yolo_roi_y1 = (img_h - yolo_height) // 2 - 70
-            yolo_roi_x2 = yolo_roi_x1 + yolo_width
-            yolo_roi_y2 = yolo_roi_y1 + yolo_height
-
-            # 템플릿 ROI 재계산
-            roi_size = 60
-            roi_x1 = yolo_roi_x1
-            roi_y1 = yolo_roi_y1
-            roi_x2 = roi_x1 + roi_size
-            roi_y2 = roi_y1 + roi_size
-
-            # YOLO ROI 박스 그리기 (초록색)
-            cv2.rectangle(annotated_frame, (yolo_roi_x1, yolo_roi_y1), (yolo_roi_x2, yolo_roi_y2), (0, 255, 0), 2)
-            cv2.putText(annotated_frame, "YOLO ROI", (yolo_roi_x1 + 10, yolo_roi_y1 + 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-
-            # 템플릿 ROI 박스 그리기 (노란색)
-            cv2.rectangle(annotated_frame, (roi_x1, roi_y1), (roi_x2, roi_y2), (0, 255, 255), 3)
-            cv2.putText(annotated_frame, "Template ROI", (roi_x1 + 10, roi_y1 + 50),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-
-            # 템플릿 매칭 결과 그리기
-            if reference_point:
-                ref_x, ref_y = reference_point
+        detected_text = ocr_result.get('detected_text', '') if serial_detector and ocr_result else ''
 
-                # 템플릿 영역 그리기 (보라색)
-                template_h, template_w = template_alignment.template.shape[:2]
-                top_left_x = ref_x - template_w // 2
-                top_left_y = ref_y - template_h // 2
-                cv2.rectangle(annotated_frame,
-                            (top_left_x, top_left_y),
-                            (top_left_x + template_w, top_left_y + template_h),
-                            (255, 0, 255), 3)
-
-                # 기준점 원 그리기 (빨간색)
-                cv2.circle(annotated_frame, (ref_x, ref_y), 10, (0, 0, 255), -1)
-
-                # 좌표축 그리기
-                cv2.arrowedLine(annotated_frame, (ref_x, ref_y), (ref_x + 50, ref_y), (255, 0, 0), 2)
-                cv2.arrowedLine(annotated_frame, (ref_x, ref_y), (ref_x, ref_y + 50), (0, 255, 0), 2)
-
-                # ROI 상태 텍스트
-                status_text = "✅ IN ROI" if roi_status == "in_roi" else "⚠️ OUT OF ROI"
-                status_color = (0, 255, 0) if roi_status == "in_roi" else (0, 0, 255)
-                cv2.putText(annotated_frame, status_text, (10, img_h - 10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, status_color, 2)
-
-        # 7. 부품 위치 검증 (ComponentVerifier 통합)
-        missing_count = 0
-        position_error_count = 0
-        extra_count = 0
-        correct_count = 0
-        verification_result = None
-
-        # 제품 코드가 있으면 DB에서 기준 부품 배치 로드
-        if product_code:
-            try:
-                reference_components = db.get_reference_components(product_code)
-
-                if reference_components:
-                    logger.info(f"✅ 제품 '{product_code}' 기준 부품 {len(reference_components)}개 로드 완료")
-
-                    # ComponentVerifier 동적 생성 (템플릿 기준 상대좌표 사용)
-                    verifier = ComponentVerifier(
-                        reference_components=reference_components,
-                        position_threshold=20.0,  # 20픽셀 허용 오차
-                        confidence_threshold=0.25,
-                        reference_point=reference_point  # ⭐ 템플릿 기준점 전달 (검출 좌표 → 상대좌표 변환)
-                    )
-
-                    # 부품 검증 실행 (DB와 검출 모두 상대좌표 사용)
-                    verification_result = verifier.verify_components(boxes_data, debug=False)
-
-                    # 검증 결과 추출
-                    missing_count = verification_result['summary']['missing_count']
-                    position_error_count = verification_result['summary']['misplaced_count']
-                    extra_count = verification_result['summary']['extra_count']
-                    correct_count = verification_result['summary']['correct_count']
-
-                    logger.info(
-                        f"✅ 부품 검증 완료: 정상 {correct_count}개, "
-                        f"위치오류 {position_error_count}개, "
-                        f"누락 {missing_count}개, "
-                        f"추가 {extra_count}개"
-                    )
-                else:
-                    logger.warning(f"⚠️ 제품 코드 '{product_code}'의 기준 데이터가 DB에 없습니다")
-                    correct_count = len(boxes_data)
-            except Exception as e:
-                logger.error(f"부품 검증 중 오류: {e}", exc_info=True)
-                correct_count = len(boxes_data)
-        else:
-            logger.warning("⚠️ 제품 코드가 없어 부품 검증을 건너뜁니다")
-            correct_count = len(boxes_data)
-
-        # 8. 최종 판정
-        if missing_count >= 3 or position_error_count >= 5 or (missing_count + position_error_count) >= 7:
-            decision = "discard"
-            gpio_pin = 22
-            logger.warning(f"🔴 치명적 불량 (폐기): 누락 {missing_count}개, 위치오류 {position_error_count}개")
-        elif missing_count > 0:
-            decision = "missing"
-            gpio_pin = 17
-            logger.warning(f"🟡 부품 누락: {missing_count}개")
-        elif position_error_count > 0:
-            decision = "position_error"
-            gpio_pin = 27
-            logger.warning(f"🟡 위치 오류: {position_error_count}개")
-        else:
-            decision = "normal"
-            gpio_pin = 23
-            logger.info("🟢 정상 제품")
+        # 우측 프레임 결과 (OCR용) - 'image'는 퍼블리셔가 인코딩 후 채움
+        right_result = {
+            'serial_number': serial_number,
+            'product_code': product_code,
+            'confidence': ocr_confidence,
+            'error': ocr_error,
+            'detected_text': detected_text,
+            'image': None  # 디버그 뷰어용
+        }
 
-        # 9. 전역 변수 업데이트 (디버그 뷰어용)
+        # 락 안에서는 참조 교체만 수행 (인코딩/broadcast는 퍼블리셔 스레드) ⭐
         with frame_lock:
-            # 좌측 프레임 (앞면) - annotated_frame 사용 (ROI+템플릿+박싱 모두 포함)
-            _, left_buffer = cv2.imencode('.jpg', annotated_frame, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
-            left_frame_base64 = base64.b64encode(left_buffer).decode('utf-8')
-
             latest_frames['left'] = annotated_frame
-            latest_frames_jpeg['left'] = left_frame_base64
-
-            # 우측 프레임 (뒷면) - OCR 전처리된 이미지 사용
-            if ocr_processed_image is not None:
-                # OCR이 처리한 전처리된 이미지 사용 (그레이스케일 + 2배 업스케일)
-                # 그레이스케일 → BGR 변환 (디버그 뷰어 표시용)
-                if len(ocr_processed_image.shape) == 2:
-                    rotated_right_display = cv2.cvtColor(ocr_processed_image, cv2.COLOR_GRAY2BGR)
-                else:
-                    rotated_right_display = ocr_processed_image
-            else:
-                # OCR 실패 시 원본 회전 이미지 사용
-                rotated_right_display = cv2.rotate(right_frame, cv2.ROTATE_90_CLOCKWISE)
-
-            _, right_buffer = cv2.imencode('.jpg', rotated_right_display, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
-            right_frame_base64 = base64.b64encode(right_buffer).decode('utf-8')
-
             latest_frames['right'] = rotated_right_display
-            latest_frames_jpeg['right'] = right_frame_base64
+            left_frame_id = next_frame_id('left')
+            right_frame_id = next_frame_id('right')
 
             # 좌측 검증 결과
             latest_results['left'] = {
@@ -1301,15 +1185,7 @@ def predict_dual():
                 }
             }
 
-            # 우측 프레임 결과 (OCR용)
-            latest_results['right'] = {
-                'serial_number': serial_number,
-                'product_code': product_code,
-                'confidence': ocr_confidence,
-                'error': ocr_error,
-                'detected_text': ocr_result.get('detected_text', '') if serial_detector else '',
-                'image': right_frame_base64  # 디버그 뷰어용
-            }
+            latest_results['right'] = right_result
 
             # 우측 OCR 결과 (하위 호환성 유지)
             latest_results['serial_ocr'] = {
@@ -1318,38 +1194,43 @@ def predict_dual():
                 'product_code': product_code,
                 'confidence': ocr_confidence,
                 'error': ocr_error,
-                'detected_text': ocr_result.get('detected_text', '') if serial_detector and ocr_result else ''
+                'detected_text': detected_text
             }
+            mark_results_changed()
 
-            # SocketIO: 좌측 프레임 broadcast (디버그 뷰어용)
-            socketio.emit('frame_update', {
-                'camera_id': 'left',
-                'image': left_frame_base64,
-                'defect_type': decision,
-                'confidence': 1.0 if decision == 'normal' else 0.0,
-                'boxes_count': len(boxes_data),
-                'boxes_data': boxes_data,
-                'roi_status': roi_status,
-                'frame_shape': list(annotated_frame.shape),
-                'timestamp': datetime.now().isoformat(),
-                'type': 'final_frame'
-            })
+        def store_right_image(frame_base64):
+            """퍼블리셔 인코딩 완료 시 우측 결과에 이미지 추가 (ETag 갱신)"""
+            with frame_lock:
+                right_result['image'] = frame_base64
+                mark_results_changed()
+
+        # SocketIO: 좌측 프레임 broadcast (디버그 뷰어용, 'image'는 퍼블리셔가 추가)
+        frame_publisher.publish('left', annotated_frame, {
+            'camera_id': 'left',
+            'defect_type': decision,
+            'confidence': 1.0 if decision == 'normal' else 0.0,
+            'boxes_count': len(boxes_data),
+            'boxes_data': boxes_data,
+            'roi_status': roi_status,
+            'frame_shape': list(annotated_frame.shape),
+            'timestamp': datetime.now().isoformat(),
+            'type': 'final_frame'
+        }, frame_id=left_frame_id)
 
-            # SocketIO: 우측 프레임 broadcast (디버그 뷰어용)
-            socketio.emit('frame_update', {
-                'camera_id': 'right',
-                'image': right_frame_base64,
-                'serial_number': serial_number,
-                'product_code': product_code,
-                'ocr_confidence': ocr_confidence,
-                'detected_text': ocr_result.get('detected_text', '') if serial_detector and ocr_result else '',
-                'error': ocr_error,
-                'frame_shape': list(rotated_right_display.shape),
-                'timestamp': datetime.now().isoformat(),
-                'type': 'final_frame'
-            })
+        # SocketIO: 우측 프레임 broadcast (디버그 뷰어용)
+        frame_publisher.publish('right', rotated_right_display, {
+            'camera_id': 'right',
+            'serial_number': serial_number,
+            'product_code': product_code,
+            'ocr_confidence': ocr_confidence,
+            'detected_text': detected_text,
+            'error': ocr_error,
+            'frame_shape': list(rotated_right_display.shape),
+            'timestamp': datetime.now().isoformat(),
+            'type': 'final_frame'
+        }, on_encoded=store_right_image, frame_id=right_frame_id)
 
-            logger.info(f"[DUAL] 양면 프레임 broadcast 완료 (좌: {len(boxes_data)}개 부품, 우: OCR={serial_number})")
+        logger.info(f"[DUAL] 양면 프레임 퍼블리시 요청 완료 (좌: {len(boxes_data)}개 부품, 우: OCR={serial_number})")
 
         # 10. 응답 생성
         inference_time_ms = (time.time() - start_time) * 1000
@@ -1369,13 +1250,23 @@ def predict_dual():
                 'pin': gpio_pin,
                 'duration_ms': 300
             },
-            'inference_time_ms': round(inference_time_ms, 2),
+            'timings': {
+                'ocr_ms': round(ocr_ms, 2),
+                'align_ms': round(align_ms, 2),
+                'yolo_ms': round(yolo_ms, 2),
+                'verify_ms': round(verify_ms, 2),
+                'total_ms': round(inference_time_ms, 2)
+            },
+            'inference_reused': ctx.gate_result == 'reused',  # 모션 게이트: 캐시된 검출/검증 결과 재사용 여부
+            'frame_geometry': ctx.geometry.to_dict() if ctx.geometry is not None else None,  # 640 좌표 ↔ 원본 카메라 좌표
             'timestamp': datetime.now().isoformat()
         }
 
+        logger.info(f"[DUAL] 처리 시간: OCR {ocr_ms:.1f}ms ∥ 정렬 {align_ms:.1f}ms + YOLO {yolo_ms:.1f}ms, 검증 {verify_ms:.1f}ms, 전체 {inference_time_ms:.1f}ms")
         logger.info(f"✅ 양면 검증 완료: 시리얼={serial_number}, 제품={product_code}, 판정={decision}, GPIO={gpio_pin}, 누락={missing_count}, 위치오류={position_error_count}")
 
         # DB 저장 (v3.0 스키마)
+        db_start = time.perf_counter()
         try:
             # 평균 신뢰도 계산
             avg_confidence = (
@@ -1407,8 +1298,8 @@ def predict_dual():
                 yolo_detections=boxes_data,
                 detection_count=len(boxes_data),
                 avg_confidence=avg_confidence,
-                inference_time_ms=inference_time_ms,
-                verification_time_ms=0.0,  # predict_dual에서는 별도 측정 안 함
+                inference_time_ms=yolo_ms,
+                verification_time_ms=verify_ms,
                 total_time_ms=inference_time_ms,
                 image_width=left_frame.shape[1] if left_frame is not None else 0,
                 image_height=left_frame.shape[0] if left_frame is not None else 0,
@@ -1422,6 +1313,8 @@ def predict_dual():
         except Exception as db_error:
             logger.error(f"❌ DB 저장 실패: {db_error}", exc_info=True)
             # DB 저장 실패해도 응답은 반환
+        finally:
+            predict_dual_pipeline.record('db', (time.perf_counter() - db_start) * 1000)
 
         return jsonify(response)
 
@@ -1444,6 +1337,9 @@ def predict_single():
             "image": "base64_encoded_jpeg_image"
         }
 
+    Request multipart/form-data: camera_id=<left|right>, image=<JPEG 파일>
+    Request application/octet-stream: 본문 = JPEG, ?camera_id=left (또는 X-Camera-Id 헤더)
+
     Response JSON:
         {
             "status": "ok",
@@ -1457,66 +1353,61 @@ def predict_single():
     start_time = time.time()
 
     try:
-        # 1. 요청 데이터 검증
-        data = request.get_json()
-        if not data:
+        # 1. 요청 데이터 검증 (JSON / multipart / octet-stream)
+        try:
+            upload = parse_frame_upload(request, ('image',))
+        except ValueError as parse_error:
+            logger.error(f"요청 파싱 실패: {parse_error}")
+            return jsonify({
+                'status': 'error',
+                'error': f'Failed to decode image: {str(parse_error)}'
+            }), 400
+
+        if upload is None:
             logger.error("요청 데이터가 비어있음")
             return jsonify({
                 'status': 'error',
                 'error': 'Request body is empty'
             }), 400
 
-        camera_id = data.get('camera_id')
-        image_base64 = data.get('image')
+        camera_id = upload.fields.get('camera_id')
+        image_buffer = upload.get('image')
 
-        if not camera_id or not image_base64:
-            logger.error(f"필수 필드 누락: camera_id={camera_id}, image={'있음' if image_base64 else '없음'}")
+        if not camera_id or not image_buffer:
+            logger.error(f"필수 필드 누락: camera_id={camera_id}, image={'있음' if image_buffer else '없음'}")
             return jsonify({
                 'status': 'error',
                 'error': 'Missing required fields: camera_id, image'
             }), 400
 
-        # 2. Base64 디코딩 및 프레임 검증
+        # 2. JPEG 디코딩 및 프레임 검증
         try:
-            image_bytes = base64.b64decode(image_base64)
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            frame = upload.decode('image')
 
-            if frame is None or frame.size == 0:
+            if frame is None:
                 logger.error("프레임 디코딩 실패: 유효하지 않은 이미지 데이터")
                 return jsonify({
                     'status': 'error',
                     'error': 'Invalid image data: failed to decode'
                 }), 400
 
-            logger.info(f"프레임 수신 성공: {camera_id} (shape: {frame.shape})")
+            logger.info(f"프레임 수신 성공: {camera_id} (shape: {frame.shape}, 업로드: {upload.mode})")
 
         except Exception as decode_error:
-            logger.error(f"Base64 디코딩 실패: {decode_error}")
+            logger.error(f"이미지 디코딩 실패: {decode_error}")
             return jsonify({
                 'status': 'error',
                 'error': f'Failed to decode image: {str(decode_error)}'
             }), 400
 
-        # 3. AI 추론 (YOLO 모델)
-        if yolo_model is not None:
-            try:
-                # YOLO 추론 실행
-                results = yolo_model.predict(frame, conf=0.3, iou=0.7, verbose=False)
-                defect_type, confidence, boxes = parse_yolo_results(results)
-                logger.info(f"YOLO 추론 완료: {len(boxes)}개 객체 검출")
-            except Exception as yolo_error:
-                logger.error(f"YOLO 추론 실패: {yolo_error}")
-                # 추론 실패 시 더미 값 사용
-                defect_type = "정상"
-                confidence = 0.0
-                boxes = []
-        else:
-            # 모델 미로드 시 더미 응답
-            logger.warning("YOLO 모델이 로드되지 않음 - 더미 결과 반환")
-            defect_type = "정상"
-            confidence = 0.95
-            boxes = []
+        # 3. AI 추론 (YOLO 모델, 검사 파이프라인의 yolo 단계만 실행)
+        # 추론 실패 시 정상/0.0, 모델 미로드 시 정상/0.95 더미 값 사용
+        ctx = predict_single_pipeline.run(new_inspection_context(camera_id, frame, '[PREDICT]'))
+        defect_type = ctx.defect_type
+        confidence = ctx.confidence
+        boxes = ctx.raw_detections.to_box_dicts() if ctx.raw_detections is not None else []
+        if ctx.raw_detections is not None:
+            logger.info(f"YOLO 추론 완료: {len(boxes)}개 객체 검출")
 
         # 4. GPIO 핀 결정
         gpio_pin = get_gpio_pin(defect_type)
@@ -1525,6 +1416,7 @@ def predict_single():
         inference_time_ms = (time.time() - start_time) * 1000
 
         # 6. 데이터베이스 저장
+        db_start = time.perf_counter()
         try:
             inspection_id = db.insert_inspection(
                 camera_id=camera_id,
@@ -1538,6 +1430,8 @@ def predict_single():
         except Exception as db_error:
             logger.warning(f"데이터베이스 저장 실패 (추론은 계속 진행): {db_error}")
             # DB 저장 실패해도 추론 결과는 반환
+        finally:
+            predict_single_pipeline.record('db', (time.perf_counter() - db_start) * 1000)
 
         # 7. 응답 생성
         response = {
@@ -1547,6 +1441,7 @@ def predict_single():
             'confidence': confidence,
             'gpio_pin': gpio_pin,
             'inference_time_ms': round(inference_time_ms, 2),
+            'result_cache_hit': ctx.result_cache_hit,
             'timestamp': datetime.now().isoformat()
         }
 
@@ -1681,7 +1576,8 @@ def predict_dual_new():
         # ==================== 4. STEP 2: DB에서 기준 부품 배치 로드 ====================
         db_time_start = time.time()
 
-        reference_components = db.get_reference_components(product_code)
+        layout = reference_store.get(product_code)
+        reference_components = layout.components if layout is not None else []
 
         if not reference_components:
             logger.error(f"제품 코드 '{product_code}'의 기준 데이터가 없습니다")
@@ -1704,9 +1600,9 @@ def predict_dual_new():
         # 템플릿 매칭은 현재 비활성화 (추후 구현 예정)
         # TemplateBasedAlignment 클래스는 find_reference_point() 메서드만 제공하며
         # align_pcb()나 align() 메서드는 존재하지 않음
-        if False and template_alignment is not None:
+        if False and default_template_alignment() is not None:
             try:
-                reference_point = template_alignment.find_reference_point(left_frame)
+                reference_point = default_template_alignment().find_reference_point(left_frame)
                 if reference_point is not None:
                     template_match_success = True
                     logger.info(f"✅ 템플릿 매칭 성공 (기준점: {reference_point})")
@@ -1723,7 +1619,7 @@ def predict_dual_new():
         detected_components = []
 
         if yolo_model is not None:
-            yolo_results = yolo_model.predict(aligned_frame, conf=0.25, iou=0.7, verbose=False)
+            yolo_results = run_yolo(aligned_frame, conf=0.25, iou=0.7)
 
             if len(yolo_results) > 0 and len(yolo_results[0].boxes) > 0:
                 boxes = yolo_results[0].boxes
@@ -1755,11 +1651,12 @@ def predict_dual_new():
         # ==================== 7. STEP 5: 부품 위치 검증 (동적 ComponentVerifier 생성) ====================
         verification_time_start = time.time()
 
-        # 동적으로 ComponentVerifier 생성 (제품별 기준 데이터 사용)
+        # ComponentVerifier 생성 (제품별 기준 배치 캐시 재사용)
         verifier = ComponentVerifier(
             reference_components=reference_components,
             position_threshold=20.0,  # 20픽셀 허용 오차
-            confidence_threshold=0.25
+            confidence_threshold=0.25,
+            layout=layout
         )
 
         verification_result = verifier.verify_components(detected_components, debug=False)
@@ -1936,6 +1833,7 @@ def predict_dual_new():
                 'ocr_preprocessed_image': ocr_image_base64,  # OCR 전처리 이미지 추가 ⭐
                 'timestamp': datetime.now().isoformat()
             }
+            mark_results_changed()
 
         # =====================================================================
         # SocketIO: 디버그 뷰어로 양면 프레임 전송 ⭐
@@ -1975,7 +1873,7 @@ def predict_dual_new():
         # YOLO ROI bbox 생성 (draw_bounding_boxes에 전달하기 위해)
         # 템플릿 매칭 ROI를 시각화 (old 버전과 동일)
         yolo_roi_bbox = None
-        if template_alignment and template_alignment.template is not None:
+        if default_template_alignment() is not None:
             # YOLO ROI는 lines 1033-1039에서 정의됨
             img_h, img_w = left_frame.shape[:2]
             yolo_width = 600
@@ -2320,25 +2218,28 @@ def video_feed(camera_id):
         cv2.putText(dummy_frame, f"Waiting for {camera_id} camera...",
                    (100, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
 
+        # JPEG 인코딩 - Baseline 형식 강제 (C# Image.FromStream() 호환성)
+        _, dummy_buffer = cv2.imencode('.jpg', dummy_frame, JPEG_ENCODE_PARAMS)
+        dummy_bytes = dummy_buffer.tobytes()
+
+        last_sent_id = object()  # 첫 프레임은 항상 전송
+        last_sent_at = 0.0
+
         while True:
-            with frame_lock:
-                frame = latest_frames.get(camera_id)
+            # 퍼블리셔가 인코딩해 둔 최신 JPEG 사용 (뷰어마다 재인코딩하지 않음) ⭐
+            frame_id, frame_bytes, _ = frame_publisher.get_latest(camera_id)
 
             # 프레임이 없으면 더미 프레임 사용
-            if frame is None:
-                frame = dummy_frame
+            if frame_bytes is None:
+                frame_bytes = dummy_bytes
 
-            # JPEG 인코딩 - Baseline 형식 강제 (C# Image.FromStream() 호환성)
-            encode_params = [
-                cv2.IMWRITE_JPEG_QUALITY, 85,        # 화질 85%
-                cv2.IMWRITE_JPEG_PROGRESSIVE, 0,     # Progressive JPEG 비활성화 (Baseline 강제)
-                cv2.IMWRITE_JPEG_OPTIMIZE, 1         # 허프만 테이블 최적화
-            ]
-            ret, buffer = cv2.imencode('.jpg', frame, encode_params)
-            if ret:
-                frame_bytes = buffer.tobytes()
+            # 같은 프레임은 다시 보내지 않음 (연결 유지를 위해 MJPEG_KEEPALIVE_S마다 재전송)
+            now = time.monotonic()
+            if frame_id != last_sent_id or now - last_sent_at >= MJPEG_KEEPALIVE_S:
                 yield (b'--frame\r\n'
                        b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+                last_sent_id = frame_id
+                last_sent_at = now
 
             time.sleep(0.1)  # 10 FPS (깜빡거림 방지)
 
@@ -2349,131 +2250,296 @@ def video_feed(camera_id):
 
 @app.route('/api/latest_results', methods=['GET'])
 def get_latest_results():
-    """최신 추론 결과 반환 (JSON)"""
+    """
+    최신 추론 결과 반환 (JSON)
+
+    ETag / If-None-Match 지원: 결과가 바뀌지 않았으면 본문 없이 304 반환.
+    응답에는 카메라별 최신 프레임 ID(frame_ids)가 포함됩니다.
+    """
+    global latest_results_body
+
     with frame_lock:
-        results = {
-            'left': latest_results.get('left', {}),
-            'right': latest_results.get('right', {}),
-            'serial_ocr': latest_results.get('serial_ocr', {})
-        }
-    return jsonify(results)
+        version = latest_results_version
+        etag = f'"{LATEST_RESULTS_ETAG_PREFIX}-{version}"'
+        if etag_matches(request.headers.get('If-None-Match', ''), etag):
+            return Response(status=304, headers={'ETag': etag})
 
+        # 같은 버전이면 직렬화한 본문 재사용 (폴링 클라이언트가 여럿이어도 1회만 직렬화)
+        cached_version, body = latest_results_body
+        if cached_version != version:
+            body = json.dumps({
+                'left': latest_results.get('left', {}),
+                'right': latest_results.get('right', {}),
+                'serial_ocr': latest_results.get('serial_ocr', {}),
+                'frame_ids': dict(latest_frame_ids)
+            }, ensure_ascii=False, default=str).encode('utf-8')
+            latest_results_body = (version, body)
 
-# 유틸리티 함수
-def crop_to_square(frame, target_size=640):
-    """
-    프레임을 정사각형으로 중앙 크롭 후 리사이즈
+    return Response(body, mimetype='application/json', headers={'ETag': etag})
 
-    대부분의 웹캠은 640x480 (4:3) 해상도를 사용하므로,
-    중앙 480x480을 크롭한 후 640x640으로 리사이즈합니다.
 
-    Args:
-        frame: 입력 프레임 (예: 640x480)
-        target_size: 목표 크기 (기본값: 640)
+@app.route('/api/pipeline_stats', methods=['GET'])
+def get_pipeline_stats_api():
+    """검사 파이프라인 단계별 처리 시간 히스토그램 반환 (avg / p50 / p95 / p99 / max, 누적 버킷)"""
+    return jsonify(get_pipeline_stats())
 
-    Returns:
-        정사각형 프레임 (target_size x target_size)
 
-    Example:
-        640x480 입력 → 중앙 480x480 크롭 → 640x640 리사이즈
-        (좌우 80픽셀씩 제거)
-    """
-    height, width = frame.shape[:2]
+@app.route('/api/inference_stats', methods=['GET'])
+def get_inference_stats():
+    """YOLO 배칭 스케줄러 통계 반환 (배치 크기 분포, 큐 대기 시간)"""
+    if inference_batcher is None:
+        return jsonify({'enabled': False})
+    stats = inference_batcher.get_stats()
+    stats['enabled'] = True
+    return jsonify(stats)
+
 
-    # 이미 정사각형이면 그대로 리사이즈
-    if height == width:
-        if height != target_size:
-            return cv2.resize(frame, (target_size, target_size), interpolation=cv2.INTER_LINEAR)
-        return frame
+@app.route('/api/motion_gate_stats', methods=['GET'])
+def get_motion_gate_stats():
+    """모션 게이트 통계 반환 (추론 / 재사용 프레임 수, 추론 생략 비율, 재추론 사유)"""
+    stats = motion_gate.get_stats()
+    stats['enabled'] = MOTION_GATE_ENABLED
+    return jsonify(stats)
 
-    # 중앙 크롭 (짧은 쪽 기준)
-    crop_size = min(height, width)
 
-    # 중앙 시작 위치 계산
-    start_x = (width - crop_size) // 2
-    start_y = (height - crop_size) // 2
+@app.route('/api/result_cache_stats', methods=['GET'])
+def get_result_cache_stats():
+    """프레임 결과 캐시 통계 반환 (적중 / 미스 / 제거 / 만료 수, 엔드포인트별 적중률)"""
+    stats = result_cache.get_stats()
+    stats['enabled_endpoints'] = sorted(RESULT_CACHE_ENDPOINTS)
+    return jsonify(stats)
 
-    # 크롭
-    cropped = frame[start_y:start_y + crop_size, start_x:start_x + crop_size]
 
-    # 리사이즈
-    if crop_size != target_size:
-        cropped = cv2.resize(cropped, (target_size, target_size), interpolation=cv2.INTER_LINEAR)
+@app.route('/api/reference_cache_stats', methods=['GET'])
+def get_reference_cache_stats():
+    """제품별 기준 배치 캐시 통계 (캐시된 제품 / 적중률 / DB 조회 수)"""
+    return jsonify(reference_store.get_stats())
 
-    return cropped
 
+@app.route('/api/reference_cache/invalidate', methods=['POST'])
+def invalidate_reference_cache():
+    """기준 배치 캐시 무효화 (DB를 직접 수정한 경우, ?product_code=BC 없으면 전체)"""
+    product_code = request.args.get('product_code') or None
+    reference_store.invalidate(product_code)
+    return jsonify({'status': 'ok', 'invalidated': product_code or 'all'})
 
-def detect_pcb_roi(frame):
+
+@app.route('/api/reverify', methods=['POST'])
+def reverify_inspections():
     """
-    초록색 PCB 자동 감지 및 내부 ROI 추출
+    저장된 검사 이력 일괄 재검증 (임계값 조정 / 기준 배치 수정 후 판정 변화 확인)
 
-    Args:
-        frame: 원본 프레임 (BGR)
+    요청 JSON (모두 선택):
+        product_code, since, until, limit (기본/최대: batch_verification.max_inspections),
+        position_threshold (기본 20.0), confidence_threshold (기본 0.25), only_changed (기본 false)
 
-    Returns:
-        roi_mask: ROI 마스크 (255=PCB 내부, 0=외부/테두리)
-        pcb_bbox: PCB 바운딩 박스 (x, y, w, h) 또는 None
-        roi_bbox: ROI 바운딩 박스 (x, y, w, h) 또는 None (테두리 제외)
+    응답: application/x-ndjson - 검사별 결과 한 줄씩 ({"type": "inspection", ...}),
+          마지막 줄에 판정 변화 통계 ({"type": "summary", ...})
     """
-    h, w = frame.shape[:2]
-
-    # 1. HSV 변환
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-
-    # 2. 초록색 PCB 마스크 생성
-    pcb_mask = cv2.inRange(hsv, PCB_COLOR_LOWER_HSV, PCB_COLOR_UPPER_HSV)
-
-    # 3. 노이즈 제거 (모폴로지 연산)
-    kernel = np.ones((5, 5), np.uint8)
-    pcb_mask = cv2.morphologyEx(pcb_mask, cv2.MORPH_CLOSE, kernel)
-    pcb_mask = cv2.morphologyEx(pcb_mask, cv2.MORPH_OPEN, kernel)
-
-    # 4. 가장 큰 컨투어 찾기 (PCB)
-    contours, _ = cv2.findContours(pcb_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-    if not contours:
-        # PCB 감지 실패 → 전체 프레임 사용
-        roi_mask = np.ones((h, w), dtype=np.uint8) * 255
-        return roi_mask, None, None
-
-    # 가장 큰 컨투어 = PCB
-    largest_contour = max(contours, key=cv2.contourArea)
-    pcb_x, pcb_y, pcb_w, pcb_h = cv2.boundingRect(largest_contour)
-
-    # 4-1. PCB가 프레임 경계에 붙어있는지 확인 ⭐⭐⭐
-    # PCB 전체가 프레임에 나와야만 ROI 적용
-    is_pcb_on_edge = (
-        pcb_x < PCB_EDGE_THRESHOLD or  # 왼쪽 경계
-        pcb_y < PCB_EDGE_THRESHOLD or  # 위쪽 경계
-        pcb_x + pcb_w > w - PCB_EDGE_THRESHOLD or  # 오른쪽 경계
-        pcb_y + pcb_h > h - PCB_EDGE_THRESHOLD  # 아래쪽 경계
+    if db is None or not db.health_check():
+        return jsonify({'status': 'error', 'error': 'Database not available'}), 503
+
+    params = request.get_json(silent=True) or {}
+    try:
+        position_threshold = float(params.get('position_threshold', 20.0))
+        confidence_threshold = float(params.get('confidence_threshold', 0.25))
+        limit = min(int(params.get('limit') or REVERIFY_MAX_INSPECTIONS), REVERIFY_MAX_INSPECTIONS)
+    except (TypeError, ValueError) as e:
+        return jsonify({'status': 'error', 'error': f'잘못된 파라미터: {e}'}), 400
+    only_changed = bool(params.get('only_changed', False))
+
+    def load_reference(product_code):
+        # 현재 서버가 사용하는 기준 배치 (캐시)
+        layout = reference_store.get(product_code)
+        return layout.components if layout is not None else None
+
+    reverifier = BatchReverifier(
+        load_reference,
+        position_threshold=position_threshold,
+        confidence_threshold=confidence_threshold,
+        workers=REVERIFY_WORKERS,
+        chunk_size=REVERIFY_CHUNK_SIZE,
+        executor=reverify_executor
     )
+    inspections = db.iter_inspections_v3(
+        product_code=params.get('product_code'),
+        since=params.get('since'),
+        until=params.get('until'),
+        limit=limit
+    )
+    logger.info(f"🔁 일괄 재검증 시작: {params}")
+
+    def generate():
+        for record in reverifier.run(inspections):
+            if only_changed and not record.get('changed'):
+                continue
+            yield json.dumps(dict(record, type='inspection'), ensure_ascii=False) + '\n'
+        summary = reverifier.stats.to_dict()
+        summary.update(type='summary', position_threshold=position_threshold,
+                       confidence_threshold=confidence_threshold)
+        yield json.dumps(summary, ensure_ascii=False) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@app.route('/api/pcb_alignment_stats', methods=['GET'])
+def get_pcb_alignment_stats():
+    """PCB 정렬 경로별(holes / edges / reused / failed) 처리 시간 통계 (좌/우)"""
+    aligners = {'left': pcb_aligner_left, 'right': pcb_aligner_right}
+    return jsonify({
+        'status': 'ok',
+        'options': PCB_ALIGNER_OPTIONS,
+        'cameras': {side: aligner.get_timing_stats() if aligner is not None else None
+                    for side, aligner in aligners.items()}
+    })
+
+
+@app.route('/api/ocr_label_stats', methods=['GET'])
+def get_ocr_label_stats():
+    """시리얼 라벨 영역 OCR 통계 (라벨 영역 성공 / 전체 프레임 재시도 수, 기억한 라벨 위치)"""
+    if serial_detector is None:
+        return jsonify({'status': 'error', 'error': 'Serial number detector not initialized'}), 503
+    try:
+        stats = serial_detector.get_label_stats()  # 원격 OCR은 추론 프로세스에서 조회
+    except Exception as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 503
+    return jsonify({
+        'status': 'ok',
+        'options': SERIAL_DETECTOR_OPTIONS,
+        'stats': stats
+    })
 
-    if is_pcb_on_edge:
-        # PCB가 프레임 경계에 붙어있음 → 부분적으로만 보임 → 전체 프레임 사용
-        roi_mask = np.ones((h, w), dtype=np.uint8) * 255
-        return roi_mask, None, None
 
-    # 5. PCB 내부 영역만 ROI로 설정 (테두리 제외)
-    margin_w = int(pcb_w * PCB_INNER_MARGIN_PERCENT)
-    margin_h = int(pcb_h * PCB_INNER_MARGIN_PERCENT)
+@app.route('/api/templates', methods=['GET'])
+def get_templates():
+    """등록된 기준점 템플릿 목록 (제품 코드 / 면 / 배율) + 검색 모드 통계"""
+    if template_registry is None:
+        return jsonify({'status': 'error', 'error': 'Template alignment system not initialized'}), 503
 
-    roi_x = pcb_x + margin_w
-    roi_y = pcb_y + margin_h
-    roi_w = pcb_w - 2 * margin_w
-    roi_h = pcb_h - 2 * margin_h
+    return jsonify({
+        'status': 'ok',
+        'template_dir': str(template_registry.template_dir),
+        'templates': template_registry.list_templates(),
+        'search_stats': template_registry.default.get_search_stats() if template_registry.default is not None else None
+    })
 
-    # 경계 체크
-    roi_x = max(0, roi_x)
-    roi_y = max(0, roi_y)
-    roi_w = min(roi_w, w - roi_x)
-    roi_h = min(roi_h, h - roi_y)
 
-    # 6. ROI 마스크 생성
-    roi_mask = np.zeros((h, w), dtype=np.uint8)
-    roi_mask[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w] = 255
+@app.route('/api/templates/reload', methods=['POST'])
+def reload_templates():
+    """기준점 템플릿 디렉토리 다시 읽기 (새 제품 템플릿 추가 / 교체 후 즉시 반영)"""
+    if template_registry is None:
+        return jsonify({'status': 'error', 'error': 'Template alignment system not initialized'}), 503
+
+    result = template_registry.reload(force=request.args.get('force', 'false').lower() == 'true')
+    logger.info(f"🔄 기준점 템플릿 리로드: {result}")
+    return jsonify({'status': 'ok', **result, 'templates': template_registry.list_templates()})
+
+
+@app.route('/api/edge_cache_stats', methods=['GET'])
+def get_edge_cache_stats():
+    """WebSocket request_frame 테두리 검출 결과 캐시 통계 (적중 / 미스 / 적중률)"""
+    return jsonify(edge_result_cache.get_stats())
+
+
+def collect_runtime_metrics():
+    """배칭 큐 / 프레임 퍼블리셔 상태 → Prometheus 텍스트 라인 (/metrics scrape 시 호출)"""
+    lines = []
+    if inference_batcher is not None:
+        stats = inference_batcher.get_stats()
+        lines += gauge_lines('inference_queue_depth', 'Frames waiting in the YOLO batching queue',
+                             stats['queue_depth'])
+        lines += counter_lines('inference_batches_total', 'YOLO batches executed', stats['total_batches'])
+        lines += counter_lines('inference_frames_total', 'Frames processed by the YOLO batcher',
+                               stats['total_frames'])
+        lines += counter_lines('inference_errors_total', 'Failed YOLO batches', stats['total_errors'])
+        lines += counter_lines('inference_cancelled_total', 'Timed-out requests dropped before batching',
+                               stats['total_cancelled'])
+        lines += gauge_lines('inference_avg_batch_size', 'Rolling average YOLO batch size',
+                             stats['avg_batch_size'])
+        for key in ('p50', 'p95', 'max'):
+            lines += gauge_lines(f'inference_queue_wait_{key}_seconds',
+                                 f'Rolling {key} time frames wait in the YOLO batching queue',
+                                 stats['queue_wait_ms'][key] / 1000.0)
+            lines += gauge_lines(f'inference_predict_{key}_seconds',
+                                 f'Rolling {key} YOLO batch predict time',
+                                 stats['predict_ms'][key] / 1000.0)
+
+    if MOTION_GATE_ENABLED:
+        gate_stats = motion_gate.get_stats()
+        lines += counter_lines('motion_gate_inferred_total', 'Frames inferred by the pipelines behind the motion gate',
+                               gate_stats['inferred'])
+        lines += counter_lines('motion_gate_reused_total', 'Static frames answered from the motion gate cache',
+                               gate_stats['reused'])
+        lines += gauge_lines('motion_gate_skip_ratio', 'Fraction of frames that skipped alignment and YOLO',
+                             gate_stats['skip_ratio'])
+
+    if RESULT_CACHE_ENDPOINTS:
+        cache_stats = result_cache.get_stats()
+        lines += counter_lines('result_cache_hits_total', 'Frames answered from the perceptual-hash result cache',
+                               cache_stats['hits'])
+        lines += counter_lines('result_cache_misses_total', 'Result cache lookups that ran YOLO',
+                               cache_stats['misses'])
+        lines += counter_lines('result_cache_evictions_total', 'Result cache entries evicted by the size bound',
+                               cache_stats['evictions'])
+        lines += counter_lines('result_cache_expirations_total', 'Result cache entries expired by the TTL',
+                               cache_stats['expirations'])
+        lines += gauge_lines('result_cache_entries', 'Entries currently held in the result cache',
+                             cache_stats['size'])
+
+    edge_stats = edge_result_cache.get_stats()
+    lines += counter_lines('edge_cache_hits_total', 'request_frame polls answered from the edge-detection cache',
+                           edge_stats['hits'])
+    lines += counter_lines('edge_cache_misses_total', 'request_frame polls that ran edge detection',
+                           edge_stats['misses'])
+
+    publisher_stats = frame_publisher.get_stats()
+    lines += counter_lines('frame_publisher_published_total', 'Frames handed to the publisher',
+                           publisher_stats['published'])
+    lines += counter_lines('frame_publisher_encoded_total', 'Frames JPEG-encoded by the publisher',
+                           publisher_stats['encoded'])
+    lines += counter_lines('frame_publisher_dropped_total', 'Frames replaced before encoding (latest-frame-wins)',
+                           publisher_stats['dropped'])
+    lines += gauge_lines('frame_publisher_pending', 'Cameras with a frame waiting to be encoded',
+                         publisher_stats['pending'])
+    return lines
+
+
+if METRICS_ENABLED:
+    metrics.add_collector(collect_runtime_metrics)
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Prometheus 텍스트 형식 성능 지표
 
-    return roi_mask, (pcb_x, pcb_y, pcb_w, pcb_h), (roi_x, roi_y, roi_w, roi_h)
+    요청 수 / 지연 시간, 파이프라인 단계별 시간, 락 대기 시간,
+    SocketIO 클라이언트 / 이벤트 수, 배칭 큐, 프로세스 RSS
+    (configs/server_config.yaml의 monitoring.enable_metrics가 false면 404)
+    """
+    if not METRICS_ENABLED:
+        return jsonify({'error': 'Metrics disabled (monitoring.enable_metrics)'}), 404
+    return Response(metrics.render(), mimetype=None, content_type=METRICS_CONTENT_TYPE)
+
+
+# 유틸리티 함수
+def detect_pcb_roi(frame, as_mask=True):
+    """
+    초록색 PCB 자동 감지 및 내부 ROI 추출 (축소 프레임에서 분할, pcb_roi.locate_pcb_roi)
+
+    Args:
+        frame: 원본 프레임 (BGR)
+        as_mask: True면 기존처럼 전체 크기 마스크, False면 슬라이스 좌표 반환 (마스크 할당 없음)
+
+    Returns:
+        roi_mask: ROI 마스크 (255=PCB 내부, 0=외부/테두리) 또는 (행 슬라이스, 열 슬라이스)
+        pcb_bbox: PCB 바운딩 박스 (x, y, w, h) 또는 None
+        roi_bbox: ROI 바운딩 박스 (x, y, w, h) 또는 None (테두리 제외)
+    """
+    roi_slices, pcb_bbox, roi_bbox = locate_pcb_roi(frame, downscale=PCB_ROI_DOWNSCALE)
+    if as_mask:
+        return roi_mask_from_slices(frame.shape, roi_slices), pcb_bbox, roi_bbox
+    return roi_slices, pcb_bbox, roi_bbox
 
 
 def detect_motion(current_frame, previous_frame, camera_id):
@@ -2508,41 +2574,6 @@ def detect_motion(current_frame, previous_frame, camera_id):
     return motion_detected, mean_diff
 
 
-def calculate_iou(box1, box2):
-    """
-    두 바운딩 박스의 IOU (Intersection over Union) 계산
-
-    Args:
-        box1, box2: {'x1': float, 'y1': float, 'x2': float, 'y2': float}
-
-    Returns:
-        iou (float): 0.0 ~ 1.0
-    """
-    # 교집합 영역 계산
-    x1_inter = max(box1['x1'], box2['x1'])
-    y1_inter = max(box1['y1'], box2['y1'])
-    x2_inter = min(box1['x2'], box2['x2'])
-    y2_inter = min(box1['y2'], box2['y2'])
-
-    # 교집합 면적
-    if x2_inter < x1_inter or y2_inter < y1_inter:
-        return 0.0
-
-    inter_area = (x2_inter - x1_inter) * (y2_inter - y1_inter)
-
-    # 각 박스의 면적
-    box1_area = (box1['x2'] - box1['x1']) * (box1['y2'] - box1['y1'])
-    box2_area = (box2['x2'] - box2['x1']) * (box2['y2'] - box2['y1'])
-
-    # 합집합 면적
-    union_area = box1_area + box2_area - inter_area
-
-    if union_area == 0:
-        return 0.0
-
-    return inter_area / union_area
-
-
 def smooth_detections(camera_id, current_detections):
     """
     검출 결과 평활화 (Temporal Smoothing)
@@ -2550,116 +2581,23 @@ def smooth_detections(camera_id, current_detections):
     이전 프레임의 검출 결과를 참고하여 안정적인 검출 유지:
     - 최소 MIN_DETECTION_FRAMES 프레임 동안 검출된 객체만 표시
     - 사라진 객체는 MAX_MISSING_FRAMES 프레임 동안 유지
+    - 매칭은 클래스별 IOU 행렬 + 헝가리안 알고리즘 (object_tracker.ObjectTracker)
 
     Args:
         camera_id (str): 'left' or 'right'
-        current_detections (list): 현재 프레임의 검출 결과 [{...}, {...}]
+        current_detections (Detections): 현재 프레임의 검출 결과
 
     Returns:
-        smoothed_detections (list): 평활화된 검출 결과
+        smoothed_detections (Detections): 평활화된 검출 결과
     """
-    global next_object_id
-
     with tracking_lock:
-        tracked = tracked_objects[camera_id]
-
-        # 현재 검출 결과와 추적 중인 객체 매칭
-        matched_ids = set()
-        new_detections = []
-
-        for detection in current_detections:
-            best_match_id = None
-            best_iou = 0.0
-
-            # 추적 중인 객체와 매칭
-            for obj_id, tracked_obj in tracked.items():
-                iou = calculate_iou(detection, tracked_obj['box'])
-
-                # 같은 클래스이면서 IOU가 높으면 매칭
-                if (detection['class_id'] == tracked_obj['class_id'] and
-                    iou > IOU_THRESHOLD and
-                    iou > best_iou):
-                    best_iou = iou
-                    best_match_id = obj_id
-
-            if best_match_id is not None:
-                # 기존 객체 업데이트
-                tracked[best_match_id]['count'] += 1
-                tracked[best_match_id]['missing'] = 0
+        tracker = object_trackers[camera_id]
+        smoothed = tracker.update(current_detections)
 
-                # 30프레임 검출 후 값 고정 (컨베이어 벨트용)
-                if not tracked[best_match_id]['frozen']:
-                    tracked[best_match_id]['box'] = detection
-                    tracked[best_match_id]['confidence'] = detection['confidence']
-
-                    # 30프레임 도달 시 고정
-                    if tracked[best_match_id]['count'] >= FREEZE_AFTER_FRAMES:
-                        tracked[best_match_id]['frozen'] = True
-                        logger.info(f"[FREEZE] 객체 {best_match_id} 고정 완료 (class: {tracked[best_match_id]['class_name']}, conf: {tracked[best_match_id]['confidence']:.2f})")
-
-                # 이미 고정된 객체는 box와 confidence 업데이트 안 함
-
-                matched_ids.add(best_match_id)
-            else:
-                # 새로운 객체 추가
-                new_id = next_object_id
-                next_object_id += 1
-
-                tracked[new_id] = {
-                    'box': detection,
-                    'class_id': detection['class_id'],
-                    'class_name': detection['class_name'],
-                    'confidence': detection['confidence'],
-                    'count': 1,        # 검출 횟수
-                    'missing': 0,      # 미검출 횟수
-                    'frozen': False    # 30프레임 후 고정 여부 ⭐
-                }
-                matched_ids.add(new_id)
-
-        # 매칭되지 않은 객체는 missing 카운트 증가
-        to_remove = []
-        for obj_id in list(tracked.keys()):
-            if obj_id not in matched_ids:
-                # frozen 객체는 절대 삭제하지 않음 (영구 보존)
-                if tracked[obj_id]['frozen']:
-                    continue  # missing 카운트도 증가 안 함
-
-                tracked[obj_id]['missing'] += 1
-
-                # MAX_MISSING_FRAMES 초과 시 제거 (frozen 아닌 객체만)
-                if tracked[obj_id]['missing'] > MAX_MISSING_FRAMES:
-                    to_remove.append(obj_id)
-
-        for obj_id in to_remove:
-            del tracked[obj_id]
-
-        # 평활화된 검출 결과 생성
-        # - Frozen 객체: 무조건 표시 (고정된 박스는 절대 사라지면 안 됨) ⭐⭐⭐
-        # - 일반 객체: MIN_DETECTION_FRAMES 이상 검출된 객체만 표시
-        smoothed = []
-
-        # obj_id로 정렬하여 항상 같은 순서로 그리기 (깜빡거림 방지)
-        for obj_id in sorted(tracked.keys()):
-            tracked_obj = tracked[obj_id]
-            # Frozen 객체는 count와 관계없이 무조건 표시 ⭐
-            if tracked_obj['frozen'] or tracked_obj['count'] >= MIN_DETECTION_FRAMES:
-                smoothed.append({
-                    'x1': tracked_obj['box']['x1'],
-                    'y1': tracked_obj['box']['y1'],
-                    'x2': tracked_obj['box']['x2'],
-                    'y2': tracked_obj['box']['y2'],
-                    'confidence': tracked_obj['confidence'],
-                    'class_id': tracked_obj['class_id'],
-                    'class_name': tracked_obj['class_name']
-                })
-
-        # 모든 객체가 frozen 상태인지 확인 (완전 정지 모드) ⭐⭐⭐
-        if len(tracked) > 0:
-            all_frozen = all(obj['frozen'] for obj in tracked.values())
-            # 모든 객체 frozen + 충분한 안정 프레임 → 완전 정지 모드
-            if all_frozen and stable_frame_count[camera_id] >= STABLE_FRAMES_FOR_FREEZE and not camera_frozen_state[camera_id]:
-                camera_frozen_state[camera_id] = True
-                logger.info(f"🔒 [{camera_id}] 완전 정지 모드 활성화 (객체: {len(tracked)}개, 안정 프레임: {stable_frame_count[camera_id]})")
+        # 모든 객체가 frozen 상태 + 충분한 안정 프레임 → 완전 정지 모드 ⭐⭐⭐
+        if tracker.all_frozen() and stable_frame_count[camera_id] >= STABLE_FRAMES_FOR_FREEZE and not camera_frozen_state[camera_id]:
+            camera_frozen_state[camera_id] = True
+            logger.info(f"🔒 [{camera_id}] 완전 정지 모드 활성화 (객체: {len(tracker)}개, 안정 프레임: {stable_frame_count[camera_id]})")
 
         return smoothed
 
@@ -2670,7 +2608,7 @@ def draw_bounding_boxes(frame, boxes_data, pcb_bbox=None, roi_bbox=None):
 
     Args:
         frame: OpenCV 이미지 (numpy array)
-        boxes_data: 바운딩 박스 정보 리스트
+        boxes_data: Detections 또는 바운딩 박스 정보 리스트
         pcb_bbox: PCB 바운딩 박스 (x, y, w, h) - 파란색 점선
         roi_bbox: ROI 바운딩 박스 (x, y, w, h) - 노란색 실선
 
@@ -2708,15 +2646,12 @@ def draw_bounding_boxes(frame, boxes_data, pcb_bbox=None, roi_bbox=None):
         (0, 128, 128),    # zener diode - 청록
     ]
 
-    for box in boxes_data:
-        x1 = int(box['x1'])
-        y1 = int(box['y1'])
-        x2 = int(box['x2'])
-        y2 = int(box['y2'])
-        conf = box['confidence']
-        class_id = box['class_id']
-        class_name = box['class_name']
+    if not isinstance(boxes_data, Detections):
+        boxes_data = Detections.from_dicts(boxes_data)
 
+    for (x1, y1, x2, y2), conf, class_id, class_name in zip(
+            boxes_data.boxes.astype(int).tolist(), boxes_data.confidence.tolist(),
+            boxes_data.class_id.tolist(), boxes_data.class_names):
         # 색상 선택
         color = colors[class_id % len(colors)]
 
@@ -2751,51 +2686,33 @@ def parse_yolo_results(results):
     Returns:
         defect_type (str): 불량 유형 ("정상" | "부품불량" | "납땜불량" | "폐기")
         confidence (float): 평균 신뢰도 (0.0 ~ 1.0)
-        boxes (list): 바운딩 박스 정보 리스트
+        detections (Detections): 검출 결과 배열 컨테이너 (boxes / confidence / class_id)
     """
     if results is None or len(results) == 0:
-        return "정상", 1.0, []
+        return "정상", 1.0, Detections.empty()
 
     result = results[0]  # 첫 번째 결과 (단일 이미지)
-    boxes_data = []
+
+    # 바운딩 박스 정보 추출 (프레임당 1회 device→host 전송)
+    detections = Detections.from_yolo(result)
 
     # 검출된 객체가 없으면 정상
-    if result.boxes is None or len(result.boxes) == 0:
-        return "정상", 1.0, []
-
-    # 바운딩 박스 정보 추출
-    for box in result.boxes:
-        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-        conf = float(box.conf[0].cpu().numpy())
-        cls = int(box.cls[0].cpu().numpy())
-        class_name = result.names[cls]
-
-        boxes_data.append({
-            'x1': float(x1),
-            'y1': float(y1),
-            'x2': float(x2),
-            'y2': float(y2),
-            'confidence': conf,
-            'class_id': cls,
-            'class_name': class_name
-        })
+    if len(detections) == 0:
+        return "정상", 1.0, detections
 
     # 평균 신뢰도 계산
-    if boxes_data:
-        avg_confidence = sum(b['confidence'] for b in boxes_data) / len(boxes_data)
-    else:
-        avg_confidence = 1.0
+    avg_confidence = detections.mean_confidence()
 
     # 불량 판정 로직 (현재는 단순 버전)
     # TODO: 더 정교한 판정 로직 필요 (누락된 부품, 잘못된 위치 등)
-    if len(boxes_data) > 0:
+    if len(detections) > 0:
         # 일단 검출된 객체가 있으면 정상으로 판정
         # 향후 기준 PCB와 비교하여 누락/추가 부품 검출 필요
         defect_type = "정상"
     else:
         defect_type = "정상"
 
-    return defect_type, avg_confidence, boxes_data
+    return defect_type, avg_confidence, detections
 
 
 def get_gpio_pin(defect_type):
@@ -2820,6 +2737,576 @@ def defect_type_to_category(defect_type):
     return category_map.get(defect_type, 'NORMAL')
 
 
+# ===================================
+# 검사 파이프라인 단계 (predict_test / predict_dual / predict 공용) ⭐⭐⭐
+# ===================================
+
+def has_template_checker():
+    """템플릿 기반 정렬 시스템 사용 가능 여부 (기본 또는 제품별 템플릿이 하나라도 있음)"""
+    return template_registry is not None and template_registry.has_templates()
+
+
+def get_yolo_roi(frame_shape):
+    """
+    YOLO 검출용 ROI / 템플릿 매칭용 ROI 계산
+
+    YOLO ROI는 프레임 중앙에서 위로 YOLO_ROI_OFFSET_Y만큼 이동한 영역이고,
+    템플릿 ROI는 YOLO ROI 왼쪽 상단 모서리에 정렬된 정사각형입니다.
+
+    Args:
+        frame_shape: 프레임 shape (h, w, ...)
+
+    Returns:
+        yolo_roi (tuple): (x1, y1, x2, y2)
+        template_roi (tuple): (x1, y1, x2, y2)
+    """
+    img_h, img_w = frame_shape[:2]
+    yolo_roi_x1 = (img_w - YOLO_ROI_WIDTH) // 2                          # 20
+    yolo_roi_y1 = (img_h - YOLO_ROI_HEIGHT) // 2 - YOLO_ROI_OFFSET_Y     # 42 (112-70)
+    yolo_roi = (yolo_roi_x1, yolo_roi_y1, yolo_roi_x1 + YOLO_ROI_WIDTH, yolo_roi_y1 + YOLO_ROI_HEIGHT)
+    template_roi = (yolo_roi_x1, yolo_roi_y1, yolo_roi_x1 + TEMPLATE_ROI_SIZE, yolo_roi_y1 + TEMPLATE_ROI_SIZE)
+    return yolo_roi, template_roi
+
+
+def draw_roi_overlay(annotated_frame, reference_point, roi_status, alignment=None):
+    """
+    ROI + 템플릿 매칭 결과 시각화 오버레이 (annotated_frame에 직접 그림)
+
+    Args:
+        annotated_frame: 바운딩 박스가 그려진 프레임
+        reference_point: 템플릿 기준점 (x, y) 또는 None
+        roi_status: ROI 상태 문자열
+        alignment: 매칭에 사용한 정렬 시스템 (None이면 기본 템플릿 크기로 표시)
+    """
+    alignment = alignment or default_template_alignment()
+    img_h = annotated_frame.shape[0]
+    (yolo_roi_x1, yolo_roi_y1, yolo_roi_x2, yolo_roi_y2), (roi_x1, roi_y1, roi_x2, roi_y2) = get_yolo_roi(annotated_frame.shape)
+
+    # YOLO ROI 박스 그리기 (초록색, 먼저 그려서 뒤에 표시)
+    cv2.rectangle(annotated_frame, (yolo_roi_x1, yolo_roi_y1), (yolo_roi_x2, yolo_roi_y2), (0, 255, 0), 2)
+    cv2.putText(annotated_frame, "YOLO ROI", (yolo_roi_x1 + 10, yolo_roi_y1 + 30),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+    # 템플릿 ROI 박스 그리기 (노란색, 나중에 그려서 앞에 표시)
+    cv2.rectangle(annotated_frame, (roi_x1, roi_y1), (roi_x2, roi_y2), (0, 255, 255), 3)
+    cv2.putText(annotated_frame, "Template ROI", (roi_x1 + 10, roi_y1 + 50),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+
+    # 템플릿 매칭 결과 그리기
+    if reference_point and alignment is not None:
+        ref_x, ref_y = reference_point
+
+        # 템플릿 영역 그리기 (보라색)
+        template_h, template_w = alignment.template.shape[:2]
+        top_left_x = ref_x - template_w // 2
+        top_left_y = ref_y - template_h // 2
+        cv2.rectangle(annotated_frame,
+                    (top_left_x, top_left_y),
+                    (top_left_x + template_w, top_left_y + template_h),
+                    (255, 0, 255), 3)
+
+        # 기준점 원 그리기 (빨간색)
+        cv2.circle(annotated_frame, (ref_x, ref_y), 10, (0, 0, 255), -1)
+
+        # 좌표축 그리기
+        cv2.arrowedLine(annotated_frame, (ref_x, ref_y), (ref_x + 50, ref_y), (255, 0, 0), 2)
+        cv2.arrowedLine(annotated_frame, (ref_x, ref_y), (ref_x, ref_y + 50), (0, 255, 0), 2)
+
+        # ROI 상태 텍스트
+        status_text = "✅ IN ROI" if roi_status == "in_roi" else "⚠️ OUT OF ROI"
+        status_color = (0, 255, 0) if roi_status == "in_roi" else (0, 0, 255)
+        cv2.putText(annotated_frame, status_text, (10, img_h - 10),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, status_color, 2)
+
+
+def add_source_bboxes(boxes_data, detections, geometry):
+    """컴포넌트 dict에 원본 카메라 좌표 바운딩 박스(source_bbox) 추가 (crop 단계와 같은 기하 정보 사용)"""
+    if geometry is None or detections is None or not boxes_data:
+        return
+    for item, box in zip(boxes_data, geometry.to_source(detections.boxes).round(1).tolist()):
+        item['source_bbox'] = box
+
+
+def new_inspection_context(camera_id, frame, tag, **fields):
+    """
+    검사 파이프라인 컨텍스트 생성 (단계 출력 기본값 포함)
+
+    Args:
+        camera_id: 'left' 또는 'right' (평활화 / 모션 감지 키)
+        frame: 디코딩된 BGR 프레임
+        tag: 로그 접두어 (예: '[TEST]', '[DUAL-LEFT]')
+        **fields: 추가 입력 (emit_roi_status, ocr_future 등)
+    """
+    ctx = PipelineContext(
+        camera_id=camera_id,
+        frame=frame,
+        tag=tag,
+        emit_roi_status=False,     # align 단계에서 roi_status 이벤트 broadcast 여부
+        geometry=None,             # crop 단계: 크롭 / 리사이즈 기하 정보 (검사 좌표 → 원본 카메라 좌표)
+        frozen_result=None,        # motion 단계: 정지 모드 기존 결과
+        gate_key=camera_id,        # gate 단계: 모션 게이트 캐시 키
+        gate_result=None,          # gate 단계: 'reused' 또는 재추론 사유
+        gate_cached=None,          # gate 단계: 재사용한 캐시 필드 (재추론 시 None)
+        alignment=None,            # align 단계: 사용한 정렬 시스템 (제품 / 면별 템플릿)
+        reference_point=None,      # align 단계: 템플릿 기준점
+        should_run_yolo=True,
+        roi_status="unknown",
+        yolo_roi=None,
+        raw_detections=None,       # yolo 단계: YOLO 원본 검출 (미실행 시 None)
+        result_cache_hit=False,    # yolo 단계: 프레임 결과 캐시 적중 여부
+        filtered_detections=None,  # roi_filter 단계
+        detections=None,           # smooth 단계: 평활화된 검출 (Detections)
+        defect_type="정상",
+        confidence=0.0,
+        annotated_frame=None,
+        ocr_future=None,           # predict_dual: 뒷면 OCR 브랜치 Future
+        ocr_branch=None,
+        product_code=None,
+        verified_product_code=None,  # verify 단계: 검증에 사용한 제품 코드 (실패 시 None)
+        verification_reused=False,
+        verification_result=None,
+        missing_count=0,
+        position_error_count=0,
+        extra_count=0,
+        correct_count=0,
+        decision=None,
+        gpio_pin=None
+    )
+    ctx.__dict__.update(fields)
+    return ctx
+
+
+def stage_crop(ctx):
+    """정사각형 중앙 크롭 (640x480 → 640x640, 호출마다 새 배열에 리사이즈 1회 - 이후 YOLO 입력도 이 프레임 그대로)"""
+    logger.info(f"{ctx.tag} 원본 프레임 shape: {ctx.frame.shape}")
+    ctx.frame, ctx.geometry = frame_preprocessor.prepare(ctx.frame)
+    logger.info(f"{ctx.tag} 크롭 후 shape: {ctx.frame.shape}")
+
+
+def stage_motion(ctx):
+    """모션 감지 (새 PCB 진입 확인) + 완전 정지 모드 확인"""
+    camera_id = ctx.camera_id
+    motion_detected, motion_value = detect_motion(ctx.frame, previous_frames.get(camera_id), camera_id)
+
+    if motion_detected:
+        # 큰 움직임 감지 → 새 PCB 진입!
+        logger.info(f"🚨 [{camera_id}] 모션 감지! (차이: {motion_value:.1f}) → 추론 재개")
+
+        # 템플릿 tracking 모드: 새 PCB는 전체 검색부터
+        if has_template_checker():
+            template_registry.reset_tracking(camera_id)
+
+        # frozen 상태 리셋
+        with tracking_lock:
+            camera_frozen_state[camera_id] = False
+            stable_frame_count[camera_id] = 0
+            object_trackers[camera_id].clear()  # 모든 추적 객체 초기화
+            logger.info(f"🔓 [{camera_id}] frozen 상태 리셋 완료")
+    else:
+        # 움직임 없음 → 안정 프레임 증가
+        stable_frame_count[camera_id] += 1
+
+    # 이전 프레임 업데이트
+    previous_frames[camera_id] = ctx.frame.copy()
+
+    # 완전 정지 모드 확인 (모든 객체가 frozen 상태면 추론 건너뛰기) ⭐⭐⭐
+    if camera_frozen_state.get(camera_id, False):
+        # 이미 frozen 상태 - 추론하지 않고 기존 결과 반환
+        with frame_lock:
+            existing_result = latest_results.get(camera_id, {})
+
+        if existing_result:
+            logger.info(f"🔒 [{camera_id}] 정지 모드 - 기존 결과 반환 (추론 생략)")
+            ctx.frozen_result = existing_result
+            ctx.stop = True
+        else:
+            # 결과가 없으면 한 번만 추론 실행 (초기화)
+            logger.info(f"⚠️  [{camera_id}] 정지 모드지만 기존 결과 없음 - 초기 추론 실행")
+
+
+def stage_gate(ctx):
+    """모션 게이트: 마지막 추론 프레임 대비 정지 상태면 캐시된 검출 결과 재사용 (정렬/YOLO 생략)"""
+    cached, ctx.gate_result, motion_value = motion_gate.check(ctx.gate_key, ctx.frame)
+    if cached is None:
+        if ctx.gate_result == REASON_MOTION:
+            logger.info(f"{ctx.tag} 🚨 모션 게이트: 움직임 감지 (차이: {motion_value:.1f}) → 재추론")
+            if has_template_checker():
+                template_registry.reset_tracking(ctx.camera_id)  # tracking 모드: 전체 검색부터
+        return
+
+    ctx.gate_cached = cached
+    for name in GATE_DETECTION_FIELDS:
+        setattr(ctx, name, cached[name])
+    logger.info(f"{ctx.tag} ♻️ 모션 게이트: 정지 프레임 (차이: {motion_value:.1f}) → 캐시된 검출 결과 재사용")
+
+
+def stage_align(ctx):
+    """템플릿 매칭 + ROI 체크 (템플릿이 ROI 안에 있을 때만 YOLO 실행)"""
+    if has_template_checker():
+        # 제품별 템플릿 선택 (요청의 제품 코드 → 같은 게이트 키의 직전 OCR 제품 코드 → 기본)
+        product_code = ctx.product_code or last_product_codes.get(ctx.gate_key)
+        ctx.alignment = template_registry.get(product_code, ctx.camera_id)
+
+    if ctx.alignment is None:
+        # 템플릿이 없으면 (기본 템플릿 없이 다른 제품 템플릿만 있는 경우 포함) 항상 YOLO 실행 (기존 동작 유지)
+        ctx.should_run_yolo = True
+        ctx.roi_status = "no_template"
+        logger.info(f"{ctx.tag} 템플릿 없음 → 항상 YOLO 실행: {ctx.camera_id}")
+        return
+
+    ctx.yolo_roi, template_roi = get_yolo_roi(ctx.frame.shape)
+    roi_x1, roi_y1, roi_x2, roi_y2 = template_roi
+
+    # 템플릿 매칭
+    ctx.reference_point = ctx.alignment.find_reference_point(
+        ctx.frame,
+        method=cv2.TM_CCORR_NORMED,
+        roi=None,
+        track_key=ctx.camera_id  # tracking 모드: 카메라별 이전 기준점 주변만 검색
+    )
+
+    if not ctx.reference_point:
+        logger.warning(f"{ctx.tag} ⚠️ 템플릿 매칭 실패: {ctx.camera_id} → YOLO 건너뛰기")
+        ctx.should_run_yolo = False
+        ctx.roi_status = "template_not_found"
+        return
+
+    ref_x, ref_y = ctx.reference_point
+    if roi_x1 <= ref_x <= roi_x2 and roi_y1 <= ref_y <= roi_y2:
+        ctx.should_run_yolo = True
+        ctx.roi_status = "in_roi"
+        logger.info(f"{ctx.tag} ✅ 템플릿이 ROI 안: {ctx.camera_id} ({ref_x}, {ref_y}) → YOLO 실행")
+    else:
+        ctx.should_run_yolo = False
+        ctx.roi_status = "out_of_roi"
+        logger.warning(f"{ctx.tag} ⚠️ 템플릿이 ROI 밖: {ctx.camera_id} ({ref_x}, {ref_y}) → YOLO 건너뛰기")
+
+    if ctx.emit_roi_status:
+        # ROI 상태 broadcast
+        socketio.emit('roi_status', {
+            'camera_id': ctx.camera_id,
+            'status': ctx.roi_status,
+            'reference_point': [int(ref_x), int(ref_y)],
+            'roi': [roi_x1, roi_y1, roi_x2, roi_y2]
+        })
+
+
+def stage_yolo(ctx):
+    """YOLO 부품 검출 (ROI 조건부 실행, 거의 같은 프레임은 결과 캐시 사용)"""
+    if yolo_model is not None and ctx.should_run_yolo:
+        cache_key = None
+        if ctx.pipeline in RESULT_CACHE_ENDPOINTS:
+            cache_key = (ctx.camera_id, ctx.frame.shape, frame_hash(ctx.frame, RESULT_CACHE_HASH_SIZE))
+            cached = result_cache.get(ctx.pipeline, cache_key)
+            if cached is not None:
+                ctx.defect_type, ctx.confidence, ctx.raw_detections = cached
+                ctx.result_cache_hit = True
+                return
+
+        try:
+            # 참고: ROI 마스크를 직접 적용하지 않고, 추론 후 필터링으로 처리
+            results = run_yolo(ctx.frame, conf=0.3, iou=0.7)
+            ctx.defect_type, ctx.confidence, ctx.raw_detections = parse_yolo_results(results)
+            if cache_key is not None:
+                result_cache.put(ctx.pipeline, cache_key, (ctx.defect_type, ctx.confidence, ctx.raw_detections))
+        except Exception as yolo_error:
+            logger.error(f"{ctx.tag} YOLO 추론 실패: {yolo_error}")
+            ctx.defect_type = "정상"
+            ctx.confidence = 0.0
+    elif not ctx.should_run_yolo:
+        # ROI 밖 또는 템플릿 매칭 실패 - YOLO 실행하지 않음
+        logger.info(f"{ctx.tag} YOLO 건너뛰기: {ctx.camera_id} (ROI 상태: {ctx.roi_status})")
+        ctx.defect_type = "정상"
+        ctx.confidence = 0.0
+    else:
+        logger.warning(f"{ctx.tag} YOLO 모델이 로드되지 않음 - 더미 결과 반환")
+        ctx.defect_type = "정상"
+        ctx.confidence = 0.95
+
+
+def stage_roi_filter(ctx):
+    """신뢰도 필터링 + YOLO ROI 필터링 (템플릿이 ROI 안에 있을 때만)"""
+    detections = ctx.raw_detections.filter_confidence(CONFIDENCE_THRESHOLD)
+
+    if ctx.reference_point and ctx.yolo_roi is not None:
+        # 바운딩 박스 중심점이 YOLO ROI 안에 있는지 확인
+        roi_filtered = detections.filter_centers_in(*ctx.yolo_roi)
+        logger.info(f"{ctx.tag} YOLO ROI 필터링: {ctx.camera_id} → {len(detections)}개 → {len(roi_filtered)}개")
+        detections = roi_filtered
+
+    ctx.filtered_detections = detections
+
+
+def stage_smooth(ctx):
+    """검출 결과 평활화 (Temporal Smoothing)"""
+    ctx.detections = smooth_detections(ctx.camera_id, ctx.filtered_detections)
+    logger.info(
+        f"{ctx.tag} YOLO 추론 완료: {ctx.camera_id} → 원본 {len(ctx.raw_detections)}개 → "
+        f"필터링 {len(ctx.filtered_detections)}개 → 평활화 {len(ctx.detections)}개 객체"
+    )
+
+
+def stage_annotate(ctx):
+    """평활화된 바운딩 박스 + ROI/템플릿 오버레이 그리기"""
+    if ctx.detections is not None:
+        # draw_bounding_boxes는 내부에서 프레임을 복사함
+        ctx.annotated_frame = draw_bounding_boxes(ctx.frame, ctx.detections, None, None)
+    else:
+        ctx.annotated_frame = ctx.frame.copy()
+
+    if has_template_checker():
+        draw_roi_overlay(ctx.annotated_frame, ctx.reference_point, ctx.roi_status, ctx.alignment)
+
+
+def run_serial_ocr_branch(right_frame):
+    """
+    뒷면 처리 브랜치: 시리얼 넘버 OCR (predict_dual에서 워커 풀로 실행)
+
+    앞면 검출 브랜치와 공유하는 데이터가 없으므로 별도 스레드에서 동시에 실행합니다.
+
+    Args:
+        right_frame: 우측(뒷면) 프레임
+
+    Returns:
+        dict: serial_number, product_code, ocr_confidence, ocr_error,
+              ocr_result, ocr_processed_image, exception, ocr_ms
+    """
+    branch_start = time.perf_counter()
+    branch = {
+        'serial_number': None,
+        'product_code': None,
+        'ocr_confidence': 0.0,
+        'ocr_error': None,
+        'ocr_result': None,
+        'ocr_processed_image': None,  # OCR이 처리한 이미지 (전처리된 이미지 - 디버그 뷰어용)
+        'exception': None,
+        'ocr_ms': 0.0
+    }
+
+    # 디버그: serial_detector 상태 확인
+    logger.info(f"[DEBUG] serial_detector is None: {serial_detector is None}")
+
+    if serial_detector is not None:
+        try:
+            # OCR 처리 (회전은 serial_detector 내부에서 처리)
+            ocr_result = serial_detector.detect_serial_number(right_frame)
+            branch['ocr_result'] = ocr_result
+
+            # OCR이 실제로 처리한 전처리된 이미지 가져오기
+            ocr_processed_image = ocr_result.get('preprocessed_image')
+            branch['ocr_processed_image'] = ocr_processed_image
+
+            # 디버그: OCR 전처리된 이미지를 파일로 저장 (사용자 확인용)
+            if ocr_processed_image is not None:
+                try:
+                    cv2.imwrite('/tmp/ocr_debug.jpg', ocr_processed_image)
+                    logger.info(f"[OCR-DEBUG] 전처리 이미지 저장: /tmp/ocr_debug.jpg (shape: {ocr_processed_image.shape})")
+                except Exception as save_err:
+                    logger.warning(f"[OCR-DEBUG] 이미지 저장 실패: {save_err}")
+
+            if ocr_result['status'] == 'ok':
+                branch['serial_number'] = ocr_result.get('serial_number')
+                branch['product_code'] = ocr_result.get('product_code')
+                branch['ocr_confidence'] = ocr_result.get('confidence', 0.0)
+                logger.info(f"✅ 시리얼 넘버 검출 성공: {branch['serial_number']} (제품: {branch['product_code']}, 신뢰도: {branch['ocr_confidence']:.2%})")
+            else:
+                branch['ocr_error'] = ocr_result.get('error', 'OCR 실패')
+                logger.warning(f"⚠️ 시리얼 넘버 검출 실패: {branch['ocr_error']}")
+        except Exception as e:
+            branch['ocr_error'] = f"OCR 처리 중 예외 발생: {str(e)}"
+            branch['exception'] = e
+            logger.error(branch['ocr_error'], exc_info=True)
+    else:
+        branch['ocr_error'] = "시리얼 넘버 검출기가 초기화되지 않았습니다"
+        logger.error(branch['ocr_error'])
+
+    branch['ocr_ms'] = (time.perf_counter() - branch_start) * 1000
+    return branch
+
+
+def stage_ocr_join(ctx):
+    """뒷면 OCR 브랜치 합류 (병렬 실행 결과 대기)"""
+    ctx.ocr_branch = ctx.ocr_future.result()
+    ctx.product_code = ctx.ocr_branch['product_code']
+    if ctx.product_code:
+        last_product_codes[ctx.gate_key] = ctx.product_code  # 다음 프레임 템플릿 선택용
+    if ctx.ocr_branch['exception'] is not None:
+        ctx.stop = True
+
+
+def template_mismatch(ctx):
+    """OCR 제품 코드의 템플릿이 정렬에 사용한 템플릿과 다른지 (OCR 제품 코드가 없으면 판단 불가 → False)"""
+    if not has_template_checker() or not ctx.product_code:
+        return False
+    return template_registry.get(ctx.product_code, ctx.camera_id) is not ctx.alignment
+
+
+def stage_realign(ctx):
+    """
+    OCR 제품의 템플릿으로 정렬 + YOLO 다시 실행 (제품 교체 직후 첫 보드)
+
+    predict_dual의 정렬은 OCR과 병렬이라 직전 보드의 제품 템플릿을 사용하므로,
+    제품이 바뀌면 다른 기준점을 찾아 template_not_found / out_of_roi로 YOLO를 건너뛰고 전부 누락 판정이 됩니다.
+    """
+    if not template_mismatch(ctx):
+        return
+
+    logger.info(f"{ctx.tag} 🔄 OCR 제품({ctx.product_code}) 템플릿이 정렬에 사용한 템플릿과 다름 → 재정렬 + YOLO")
+    template_registry.reset_tracking(ctx.camera_id)  # 다른 제품 보드의 tracking 기준점은 사용하지 않음
+    ctx.gate_cached = None  # 다른 템플릿으로 만든 캐시 검출은 재사용하지 않음
+    ctx.reference_point = None
+    ctx.yolo_roi = None
+    ctx.should_run_yolo = True
+    ctx.roi_status = "unknown"
+    ctx.raw_detections = None
+    ctx.result_cache_hit = False
+    stage_align(ctx)
+    stage_yolo(ctx)
+
+
+def stage_verify(ctx):
+    """제품별 기준 부품 배치와 검출 결과 비교 (ComponentVerifier)"""
+    detections = ctx.detections if ctx.detections is not None else Detections.empty()
+    product_code = ctx.product_code
+
+    # 모션 게이트가 검출을 재사용했고 제품 코드가 같으면 검증 결과도 재사용
+    cached = ctx.gate_cached
+    if cached is not None and cached.get('verified_product_code') == product_code:
+        for name in GATE_VERIFICATION_FIELDS:
+            setattr(ctx, name, cached[name])
+        ctx.verification_reused = True
+        return
+
+    ctx.verified_product_code = product_code
+
+    # 제품 코드가 있으면 DB에서 기준 부품 배치 로드
+    if not product_code:
+        logger.warning("⚠️ 제품 코드가 없어 부품 검증을 건너뜁니다")
+        ctx.correct_count = len(detections)
+        return
+
+    try:
+        # 제품별 기준 배치 (캐시 적중 시 DB 조회 없음)
+        layout = reference_store.get(product_code)
+
+        if layout is None:
+            logger.warning(f"⚠️ 제품 코드 '{product_code}'의 기준 데이터가 DB에 없습니다")
+            ctx.correct_count = len(detections)
+            return
+
+        # ComponentVerifier 생성 (캐시된 배치 재사용, 템플릿 기준 상대좌표 사용)
+        verifier = ComponentVerifier(
+            reference_components=layout.components,
+            position_threshold=20.0,  # 20픽셀 허용 오차
+            confidence_threshold=0.25,
+            reference_point=ctx.reference_point,  # ⭐ 템플릿 기준점 전달 (검출 좌표 → 상대좌표 변환)
+            layout=layout
+        )
+
+        # 부품 검증 실행 (DB와 검출 모두 상대좌표 사용, 배열 컨테이너 그대로 전달)
+        verification_result = verifier.verify_components(detections, debug=False)
+        summary = verification_result['summary']
+
+        ctx.verification_result = verification_result
+        ctx.missing_count = summary['missing_count']
+        ctx.position_error_count = summary['misplaced_count']
+        ctx.extra_count = summary['extra_count']
+        ctx.correct_count = summary['correct_count']
+
+        logger.info(
+            f"✅ 부품 검증 완료: 정상 {ctx.correct_count}개, "
+            f"위치오류 {ctx.position_error_count}개, "
+            f"누락 {ctx.missing_count}개, "
+            f"추가 {ctx.extra_count}개"
+        )
+    except Exception as e:
+        logger.error(f"부품 검증 중 오류: {e}", exc_info=True)
+        ctx.correct_count = len(detections)
+        ctx.verified_product_code = None  # 일시적 오류 결과는 재사용하지 않음
+
+
+def stage_decide(ctx):
+    """최종 판정 (누락 / 위치 오류 개수 기준) + GPIO 핀 결정"""
+    missing_count = ctx.missing_count
+    position_error_count = ctx.position_error_count
+
+    if missing_count >= 3 or position_error_count >= 5 or (missing_count + position_error_count) >= 7:
+        ctx.decision, ctx.gpio_pin = "discard", 22
+        logger.warning(f"🔴 치명적 불량 (폐기): 누락 {missing_count}개, 위치오류 {position_error_count}개")
+    elif missing_count > 0:
+        ctx.decision, ctx.gpio_pin = "missing", 17
+        logger.warning(f"🟡 부품 누락: {missing_count}개")
+    elif position_error_count > 0:
+        ctx.decision, ctx.gpio_pin = "position_error", 27
+        logger.warning(f"🟡 위치 오류: {position_error_count}개")
+    else:
+        ctx.decision, ctx.gpio_pin = "normal", 23
+        logger.info("🟢 정상 제품")
+
+
+def stage_gate_store(ctx):
+    """새로 추론한 검출 / 검증 결과를 모션 게이트에 저장"""
+    verified = 'verify' in ctx.timings and not ctx.verification_reused
+    fields = {name: getattr(ctx, name) for name in GATE_VERIFICATION_FIELDS} if verified else {}
+
+    if template_mismatch(ctx):
+        # 정렬 이후 템플릿이 교체된 경우 등 - OCR 제품과 다른 템플릿으로 만든 결과는 캐시하지 않음
+        logger.info(f"{ctx.tag} 모션 게이트 저장 생략 (OCR 제품 템플릿과 다른 템플릿으로 정렬)")
+        return
+
+    if ctx.gate_cached is None:
+        fields.update((name, getattr(ctx, name)) for name in GATE_DETECTION_FIELDS)
+        motion_gate.store(ctx.gate_key, ctx.frame, fields)
+    elif fields:
+        # 검출은 재사용했지만 제품 코드가 바뀌어 검증만 다시 한 경우
+        motion_gate.update(ctx.gate_key, fields)
+
+
+def _gate_reused(ctx):
+    """모션 게이트가 캐시된 검출 결과를 재사용한 경우 (정렬/YOLO 생략)"""
+    return ctx.gate_cached is not None
+
+
+def _yolo_not_run(ctx):
+    """YOLO를 실행하지 않았거나 실패한 경우, 또는 캐시된 검출을 재사용한 경우 (필터링/평활화 생략)"""
+    return ctx.raw_detections is None or ctx.gate_cached is not None
+
+
+INSPECTION_STAGES = [
+    Stage('crop', stage_crop),
+    Stage('motion', stage_motion),
+    Stage('gate', stage_gate),
+    Stage('align', stage_align, skip_if=_gate_reused),
+    Stage('yolo', stage_yolo, skip_if=_gate_reused),
+    Stage('ocr_join', stage_ocr_join),  # 평활화 전에 합류 (재정렬 시 추적기를 한 프레임에 한 번만 갱신)
+    Stage('realign', stage_realign),
+    Stage('roi_filter', stage_roi_filter, skip_if=_yolo_not_run),
+    Stage('smooth', stage_smooth, skip_if=_yolo_not_run),
+    Stage('annotate', stage_annotate),
+    Stage('verify', stage_verify),
+    Stage('decide', stage_decide),
+    Stage('gate_store', stage_gate_store),
+]
+
+# 모션 게이트 비활성화 시 게이트 단계 제외
+GATE_STAGES = () if MOTION_GATE_ENABLED else ('gate', 'gate_store')
+
+# 엔드포인트별 파이프라인 (필요 없는 단계는 건너뜀)
+predict_test_pipeline = InspectionPipeline(
+    'predict_test', INSPECTION_STAGES,
+    skip=('ocr_join', 'realign', 'verify', 'decide') + GATE_STAGES
+)
+predict_dual_pipeline = InspectionPipeline(
+    'predict_dual', INSPECTION_STAGES,
+    skip=('motion',) + GATE_STAGES
+)
+predict_single_pipeline = InspectionPipeline(
+    'predict', INSPECTION_STAGES,
+    skip=('crop', 'motion', 'gate', 'align', 'roi_filter', 'smooth', 'annotate', 'ocr_join', 'realign', 'verify',
+          'decide', 'gate_store')
+)
+
+
 # ===================================
 # SocketIO 이벤트 핸들러 (WebSocket)
 # ===================================
@@ -2828,6 +3315,7 @@ def defect_type_to_category(defect_type):
 def handle_connect():
     """클라이언트 연결 이벤트"""
     logger.info(f"[WebSocket] 클라이언트 연결: {request.sid}")
+    metrics.client_connected()
     emit('connection_response', {'status': 'connected', 'message': 'Flask SocketIO 서버에 연결되었습니다'})
 
 
@@ -2839,10 +3327,13 @@ def handle_disconnect():
     """
     session_id = request.sid
     logger.info(f"[WebSocket] 클라이언트 연결 종료: {session_id}")
+    metrics.client_disconnected()
 
     try:
         # 1. 세션 관련 리소스 정리
         # (필요시 세션별 추적 데이터 삭제)
+        for camera_id in ('left', 'right'):
+            viewer_frame_params.pop((session_id, camera_id), None)
 
         # 2. threading 모드에서는 소켓 정리 자동 처리
         # eventlet.sleep(0)  # (eventlet 모드 전용, threading에서는 불필요)
@@ -2852,24 +3343,34 @@ def handle_disconnect():
         logger.error(f"[WebSocket] disconnect 처리 중 오류: {e}", exc_info=True)
 
 
+# 세션 / 카메라별 마지막으로 전체 프레임을 보낸 요청 파라미터 (since_frame_id 조건부 응답 키)
+viewer_frame_params = {}
+
+
 @socketio.on('request_frame')
 def handle_frame_request(data):
     """
     프레임 요청 이벤트
     클라이언트가 100ms 간격으로 요청
+    (프레임이 바뀌지 않았으면 같은 파라미터의 테두리 검출 결과를 edge_result_cache에서 재사용)
 
     Args:
         data (dict): {
             'camera_id': 'left' or 'right',
             'edge_detection': bool (optional),
-            'thresholds': {'top': int, 'bottom': int, 'left': int, 'right': int} (optional)
+            'thresholds': {'top': int, 'bottom': int, 'left': int, 'right': int} (optional),
+            'since_frame_id': int (optional) - 클라이언트가 마지막으로 받은 frame_id
         }
+
+    since_frame_id와 현재 frame_id가 같고 테두리 검출 파라미터(edge_detection / thresholds / rois)도
+    이 세션의 직전 요청과 같으면 frameData 없이 {'unchanged': True, 'frame_id'}만 보냅니다.
     """
     try:
         camera_id = data.get('camera_id')
         edge_detection = data.get('edge_detection', False)
         thresholds = data.get('thresholds', None)
         rois = data.get('rois', None)
+        since_frame_id = data.get('since_frame_id')
 
         # DEBUG: ROI 파라미터 확인용 로그
         logger.info(f"[WebSocket] request_frame 수신: camera={camera_id}, edge={edge_detection}, rois={rois}")
@@ -2879,11 +3380,33 @@ def handle_frame_request(data):
             emit('error', {'message': 'Invalid camera_id. Use "left" or "right"'})
             return
 
-        # 캐시된 JPEG 가져오기 (WebSocket 성능 최적화) ⭐
+        # 캐시된 JPEG 가져오기 (퍼블리셔 캐시, WebSocket 성능 최적화) ⭐
+        frame_id, _, frame_base64 = frame_publisher.get_latest(camera_id)
+        # Edge Detection을 위해 원본 프레임 + 프레임 ID도 가져오기
         with frame_lock:
-            frame_base64 = latest_frames_jpeg.get(camera_id)
-            # Edge Detection을 위해 원본 프레임도 가져오기
             original_frame = latest_frames.get(camera_id)
+            latest_frame_id = latest_frame_ids[camera_id]
+
+        # 테두리 검출은 원본 프레임 기준, 그 외에는 퍼블리셔가 인코딩한 프레임 기준
+        if frame_base64 is None:
+            frame_id = None  # 더미 프레임
+        elif edge_detection and original_frame is not None:
+            frame_id = latest_frame_id
+
+        # 클라이언트가 이미 가진 프레임이면 본문 없이 응답 (대역폭 / 인코딩 생략) ⭐
+        # 같은 프레임이라도 테두리 검출을 켜고 끄거나 임계값 / ROI를 바꾸면 새 오버레이 / 코너를 보냄
+        edge_params = (json.dumps(thresholds, sort_keys=True), json.dumps(rois, sort_keys=True))
+        view_key = (True,) + edge_params if edge_detection else (False,)
+        view_session = (request.sid, camera_id)
+        if (since_frame_id is not None and frame_id is not None and since_frame_id == frame_id
+                and viewer_frame_params.get(view_session) == view_key):
+            emit('frame_data', {
+                'camera_id': camera_id,
+                'frame_id': frame_id,
+                'unchanged': True,
+                'timestamp': time.time()
+            })
+            return
 
         # 캐시가 없으면 더미 프레임 생성 및 인코딩
         if frame_base64 is None:
@@ -2912,33 +3435,45 @@ def handle_frame_request(data):
             # Edge Detection이 활성화되고 원본 프레임이 있으면 테두리 검출 수행
             corners = None
             if edge_detection and original_frame is not None:
-                try:
-                    # PCB 테두리 검출 수행
-                    detected_corners, debug_img = detect_pcb_edges(
-                        original_frame,
-                        thresholds=thresholds,
-                        rois=rois,
-                        draw_debug=True
-                    )
-
-                    if detected_corners:
-                        corners = detected_corners
-                        logger.info(f"[WebSocket] {camera_id} 테두리 검출 성공: {len(corners)}개 코너")
-
-                    # 디버그 이미지가 있으면 그것을 전송
-                    if debug_img is not None:
-                        encode_params = [
-                            cv2.IMWRITE_JPEG_QUALITY, 85,
-                            cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
-                            cv2.IMWRITE_JPEG_OPTIMIZE, 1
-                        ]
-                        ret, buffer = cv2.imencode('.jpg', debug_img, encode_params)
-                        if ret:
-                            frame_base64 = base64.b64encode(buffer.tobytes()).decode('utf-8')
-                            logger.info(f"[WebSocket] {camera_id} 테두리 검출 이미지 전송")
-
-                except Exception as e:
-                    logger.error(f"[WebSocket] 테두리 검출 실패: {e}", exc_info=True)
+                # 같은 프레임 + 같은 파라미터면 이전 검출 결과(코너 + 인코딩된 디버그 이미지) 재사용
+                cache_key = (camera_id, latest_frame_id) + edge_params
+                cached = edge_result_cache.get('request_frame', cache_key)
+                if cached is not None:
+                    corners, debug_base64 = cached
+                    if debug_base64 is not None:
+                        frame_base64 = debug_base64
+                else:
+                    try:
+                        # PCB 테두리 검출 수행
+                        detected_corners, debug_img = detect_pcb_edges(
+                            original_frame,
+                            thresholds=thresholds,
+                            rois=rois,
+                            draw_debug=True
+                        )
+
+                        if detected_corners:
+                            corners = detected_corners
+                            logger.info(f"[WebSocket] {camera_id} 테두리 검출 성공: {len(corners)}개 코너")
+
+                        # 디버그 이미지가 있으면 그것을 전송
+                        debug_base64 = None
+                        if debug_img is not None:
+                            encode_params = [
+                                cv2.IMWRITE_JPEG_QUALITY, 85,
+                                cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+                                cv2.IMWRITE_JPEG_OPTIMIZE, 1
+                            ]
+                            ret, buffer = cv2.imencode('.jpg', debug_img, encode_params)
+                            if ret:
+                                debug_base64 = base64.b64encode(buffer.tobytes()).decode('utf-8')
+                                frame_base64 = debug_base64
+                                logger.info(f"[WebSocket] {camera_id} 테두리 검출 이미지 전송")
+
+                        edge_result_cache.put('request_frame', cache_key, (corners, debug_base64))
+
+                    except Exception as e:
+                        logger.error(f"[WebSocket] 테두리 검출 실패: {e}", exc_info=True)
 
             logger.debug(f"[WebSocket] {camera_id} 캐시된 JPEG 전송 (인코딩 생략)")
 
@@ -2946,6 +3481,7 @@ def handle_frame_request(data):
         response_data = {
             'camera_id': camera_id,
             'frameData': frame_base64,  # 필드명 변경: frame → frameData
+            'frame_id': frame_id,  # 다음 요청의 since_frame_id로 사용 (더미 프레임이면 None)
             'timestamp': time.time(),
             'size': len(frame_base64)  # Base64 문자열 길이
         }
@@ -2956,6 +3492,7 @@ def handle_frame_request(data):
 
         # NOTE: 'frame' 필드명을 'frameData'로 변경하여 Flask-SocketIO의 binary 자동 변환 방지
         emit('frame_data', response_data)
+        viewer_frame_params[view_session] = view_key
 
         logger.debug(f"[WebSocket] 프레임 전송 완료: {camera_id} ({len(frame_base64)} bytes)")
 
@@ -2978,7 +3515,8 @@ def handle_template_match_request(data):
         camera_id = data.get('camera_id', 'left')
         logger.info(f"[WebSocket] 템플릿 매칭 요청: camera={camera_id}")
 
-        # 템플릿 정렬 시스템이 없으면 에러
+        # 템플릿 정렬 시스템이 없으면 에러 (요청 중 리로드돼도 같은 인스턴스 사용)
+        template_alignment = default_template_alignment()
         if template_alignment is None:
             logger.error("[WebSocket] 템플릿 정렬 시스템이 초기화되지 않음")
             emit('template_match_result', {
@@ -3041,11 +3579,11 @@ def handle_template_match_request(data):
             roi = (roi_x1, roi_y1, roi_x2, roi_y2)
             logger.info(f"[WebSocket] ROI 영역: x={roi_x1}~{roi_x2}, y={roi_y1}~{roi_y2}")
 
-            # 기준점 찾기 (ROI 검증 없이 먼저 템플릿 매칭)
-            reference_point = template_alignment.find_reference_point(
+            # 기준점 찾기 (ROI 검증 없이 먼저 템플릿 매칭, 신뢰도도 함께 반환)
+            reference_point, match_confidence = template_alignment.match(
                 img_resized,
                 method=cv2.TM_CCORR_NORMED,
-                roi=None  # ROI 검증 비활성화 (시각화용)
+                track_key='websocket'
             )
 
             if reference_point:
@@ -3084,18 +3622,15 @@ def handle_template_match_request(data):
                     logger.info("[WebSocket] 🎯 ROI 안에 있음 - YOLO 검출 시작")
 
                     # YOLO 추론
-                    yolo_results = yolo_model.predict(img_resized, conf=0.3, iou=0.7, verbose=False)
+                    yolo_results = run_yolo(img_resized, conf=0.3, iou=0.7)
 
-                    if len(yolo_results) > 0 and len(yolo_results[0].boxes) > 0:
-                        boxes = yolo_results[0].boxes
-                        yolo_detected_count = len(boxes)
+                    detections = Detections.from_yolo(yolo_results[0]) if len(yolo_results) > 0 else Detections.empty()
+                    if len(detections) > 0:
+                        yolo_detected_count = len(detections)
                         logger.info(f"[WebSocket] ✅ YOLO 검출 완료: {yolo_detected_count}개 부품")
 
                         # YOLO 바운딩 박스 그리기
-                        for box in boxes:
-                            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                            conf = box.conf[0].cpu().numpy()
-                            cls = int(box.cls[0].cpu().numpy())
+                        for (x1, y1, x2, y2), conf, cls in zip(detections.boxes, detections.confidence, detections.class_id):
 
                             # 바운딩 박스 그리기 (초록색)
                             cv2.rectangle(
@@ -3141,12 +3676,8 @@ def handle_template_match_request(data):
                     2
                 )
 
-                # 매칭 신뢰도 계산
-                gray = cv2.cvtColor(img_resized, cv2.COLOR_BGR2GRAY)
-                template_gray = cv2.cvtColor(template_alignment.template, cv2.COLOR_BGR2GRAY)
-                result = cv2.matchTemplate(gray, template_gray, cv2.TM_CCORR_NORMED)
-                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-                confidence = max_val
+                # 매칭 신뢰도 (match()에서 함께 계산됨)
+                confidence = match_confidence
 
                 logger.info(f"[WebSocket] 템플릿 매칭 성공: ref={reference_point}, conf={confidence:.4f}")
 
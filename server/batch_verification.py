@@ -0,0 +1,387 @@
+"""
+저장된 검사 이력 일괄 재검증
+
+position_threshold를 조정하거나 제품 기준 배치를 수정한 뒤, 저장된 yolo_detections로
+과거 보드를 다시 판정해서 판정이 어떻게 바뀌는지 확인합니다 (HTTP 요청을 한 건씩 재생하지 않음).
+
+    reverifier = BatchReverifier(db.get_reference_components, position_threshold=15.0, workers=4)
+    for record in reverifier.run(db.iter_inspections_v3(product_code='BC')):
+        ...                               # 검사별 새 판정 (제출 순서대로 바로 전달)
+    reverifier.stats.to_dict()            # 판정 변화 통계
+
+검사 이력은 제품별로 chunk_size건씩 묶어 ChunkExecutor(별도 워커 프로세스 reverify_worker.py 안의
+spawn 프로세스 풀)에 넘기고, 풀 워커는 묶음마다 기준 배치를 한 번 정리한 ComponentVerifier로
+JSON 파싱 + 클래스별 배열 매칭을 연속 수행합니다. 실행당 처리 중인 묶음은 workers x 2개로 제한하므로
+이력 수와 관계없이 메모리 사용량이 일정합니다. 서버는 ChunkExecutor 하나를 모든 요청이 공유합니다.
+"""
+
+import json
+import logging
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, InvalidStateError
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from component_verification import ComponentVerifier, ReferenceLayout
+
+logger = logging.getLogger(__name__)
+
+# 저장된 개수 컬럼 → verify_components 요약 키
+COUNT_FIELDS = {
+    'missing_count': 'missing_count',
+    'position_error_count': 'misplaced_count',
+    'extra_count': 'extra_count',
+    'correct_count': 'correct_count'
+}
+
+
+def _stored_detections(row: Dict) -> Optional[List[Dict]]:
+    """
+    yolo_detections 컬럼 → 검증 입력 dict 리스트
+
+    저장 시 템플릿 기준점이 있었으면 'relative_center'가 함께 저장되므로 그 좌표를 사용합니다
+    (라이브 검증과 같은 좌표계). 빈 검출은 NULL로 저장되므로 detection_count가 0이면 빈 리스트입니다.
+
+    Returns:
+        dict 리스트, 검출 정보가 없으면 None
+    """
+    raw = row.get('yolo_detections')
+    if raw is None:
+        return [] if not row.get('detection_count') else None
+    if isinstance(raw, (str, bytes)):
+        raw = json.loads(raw)
+
+    detections = []
+    for comp in raw:
+        center = comp.get('relative_center') or comp.get('center')
+        if center is None or 'class_name' not in comp:
+            continue
+        detections.append({
+            'class_name': comp['class_name'],
+            'center': center,
+            'bbox': comp.get('bbox'),
+            'confidence': comp.get('confidence', 1.0)
+        })
+    return detections
+
+
+def _skipped(row: Dict, reason: str) -> Dict:
+    return {
+        'inspection_id': row.get('id'),
+        'serial_number': row.get('serial_number'),
+        'product_code': row.get('product_code'),
+        'status': 'skipped',
+        'reason': reason,
+        'old_decision': row.get('decision')
+    }
+
+
+def verify_chunk(reference_components: List[Dict], rows: List[Dict],
+                 position_threshold: float, confidence_threshold: float) -> List[Dict]:
+    """
+    같은 제품 검사 이력 묶음 재검증 (프로세스 풀 워커에서 실행)
+
+    Args:
+        reference_components: 제품 기준 부품 배치
+        rows: iter_inspections_v3 형식의 검사 이력
+        position_threshold: 위치 오류 판정 임계값 (픽셀)
+        confidence_threshold: 검출 신뢰도 임계값
+
+    Returns:
+        검사별 결과 리스트 (rows 순서)
+    """
+    layout = ReferenceLayout(reference_components)
+    verifier = ComponentVerifier(reference_components, position_threshold, confidence_threshold, layout=layout)
+
+    records: List[Optional[Dict]] = []
+    valid_rows, detection_lists = [], []
+    for row in rows:
+        try:
+            detections = _stored_detections(row)
+        except (ValueError, TypeError, AttributeError):
+            records.append(_skipped(row, 'invalid_detections'))
+            continue
+        if detections is None:
+            records.append(_skipped(row, 'no_detections'))
+            continue
+        records.append(None)  # 검증 결과 자리
+        valid_rows.append(row)
+        detection_lists.append(detections)
+
+    results = iter(zip(valid_rows, verifier.verify_batch(detection_lists)))
+    for position, record in enumerate(records):
+        if record is not None:
+            continue
+        row, verification_result = next(results)
+        summary = verification_result['summary']
+        counts = {column: summary[key] for column, key in COUNT_FIELDS.items()}
+        records[position] = {
+            'inspection_id': row.get('id'),
+            'serial_number': row.get('serial_number'),
+            'product_code': row.get('product_code'),
+            'status': 'ok',
+            'old_decision': row.get('decision'),
+            'new_decision': verification_result['decision'],
+            'changed': verification_result['decision'] != row.get('decision'),
+            'counts': counts,
+            'delta': {column: counts[column] - int(row.get(column) or 0) for column in COUNT_FIELDS}
+        }
+    return records
+
+
+WORKER_SCRIPT = Path(__file__).with_name('reverify_worker.py')
+
+
+class ChunkExecutor:
+    """
+    verify_chunk 실행기 (reverify_worker.py 프로세스 1개 + 그 안의 spawn 프로세스 풀, 여러 요청이 공유)
+
+    워커 프로세스는 첫 submit 때 시작하고, 비정상 종료하면 다음 submit 때 다시 시작합니다
+    (처리 중이던 묶음의 Future는 RuntimeError로 끝남).
+    """
+
+    def __init__(self, workers: int = 2):
+        """
+        Args:
+            workers: 검증 프로세스 수
+        """
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()  # 워커 시작 / 전송 / Future 등록
+        self._process: Optional[subprocess.Popen] = None
+        self._conn: Optional[Connection] = None
+        self._futures: Dict[int, Future] = {}
+        self._next_id = 0
+
+    def _start(self):
+        """워커 프로세스 시작 (self._lock 안에서 호출)"""
+        parent_sock, child_sock = socket.socketpair()
+        process = subprocess.Popen(
+            [sys.executable, str(WORKER_SCRIPT), '--fd', str(child_sock.fileno()), '--workers', str(self.workers)],
+            pass_fds=(child_sock.fileno(),), cwd=str(WORKER_SCRIPT.parent)
+        )
+        child_sock.close()
+        conn = Connection(parent_sock.detach())
+
+        futures: Dict[int, Future] = {}
+        self._process, self._conn, self._futures = process, conn, futures
+        threading.Thread(target=self._read_results, args=(conn, futures), name='reverify-results', daemon=True).start()
+        logger.info(f"✅ 일괄 재검증 워커 프로세스 시작 (PID {process.pid}, 검증 프로세스 {self.workers}개)")
+
+    def _read_results(self, conn: Connection, futures: Dict[int, Future]):
+        """워커 응답 → Future (연결이 끊기면 남은 Future 실패 처리)"""
+        while True:
+            try:
+                job_id, ok, payload = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                future = futures.pop(job_id, None)
+            if future is None:
+                continue
+            try:
+                if ok:
+                    future.set_result(payload)
+                else:
+                    future.set_exception(RuntimeError(f"재검증 워커 오류: {payload}"))
+            except InvalidStateError:
+                pass  # 요청이 먼저 끝나 취소됨 (클라이언트 연결 종료 등)
+
+        with self._lock:
+            pending = list(futures.values())
+            futures.clear()
+        for future in pending:
+            try:
+                future.set_exception(RuntimeError("재검증 워커 프로세스 종료"))
+            except InvalidStateError:
+                pass
+
+    def submit(self, reference_components: List[Dict], rows: List[Dict],
+               position_threshold: float, confidence_threshold: float) -> Future:
+        """verify_chunk 실행 요청 → Future (결과: 검사별 결과 리스트)"""
+        future = Future()
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                if self._process is not None:
+                    logger.warning(f"⚠️  재검증 워커 프로세스 종료됨 (코드 {self._process.returncode}) → 다시 시작")
+                    self._conn.close()
+                self._start()
+            job_id = self._next_id
+            self._next_id += 1
+            self._futures[job_id] = future
+            try:
+                self._conn.send((job_id, (reference_components, rows, position_threshold, confidence_threshold)))
+            except OSError as e:
+                self._futures.pop(job_id, None)
+                future.set_exception(RuntimeError(f"재검증 워커 전송 실패: {e}"))
+        return future
+
+    def close(self):
+        """워커 프로세스 종료"""
+        with self._lock:
+            process, conn = self._process, self._conn
+            self._process = self._conn = None
+        if process is None:
+            return
+        try:
+            conn.send(None)
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.terminate()
+        conn.close()
+
+
+class ReverificationStats:
+    """재검증 판정 변화 통계"""
+
+    def __init__(self):
+        self.total = 0
+        self.verified = 0
+        self.changed = 0
+        self.skipped = Counter()       # 사유별 건수
+        self.transitions = Counter()   # 'old → new' 판정 변화 건수
+        self.old_decisions = Counter()
+        self.new_decisions = Counter()
+        self.delta_sums = Counter()    # 개수 컬럼별 (새 값 - 저장 값) 합
+        self.started_at = time.monotonic()
+
+    def add(self, record: Dict):
+        self.total += 1
+        if record['status'] != 'ok':
+            self.skipped[record['reason']] += 1
+            return
+        self.verified += 1
+        self.old_decisions[record['old_decision']] += 1
+        self.new_decisions[record['new_decision']] += 1
+        if record['changed']:
+            self.changed += 1
+            self.transitions[f"{record['old_decision']} → {record['new_decision']}"] += 1
+        self.delta_sums.update(record['delta'])
+
+    def to_dict(self) -> Dict:
+        """API 응답 / CLI 출력용"""
+        elapsed = time.monotonic() - self.started_at
+        return {
+            'total': self.total,
+            'verified': self.verified,
+            'changed': self.changed,
+            'changed_ratio': round(self.changed / self.verified, 4) if self.verified else 0.0,
+            'skipped': dict(self.skipped),
+            'transitions': dict(self.transitions.most_common()),
+            'old_decisions': dict(self.old_decisions),
+            'new_decisions': dict(self.new_decisions),
+            'delta_sums': {column: self.delta_sums[column] for column in COUNT_FIELDS},
+            'elapsed_s': round(elapsed, 3),
+            'boards_per_s': round(self.total / elapsed, 1) if elapsed > 0 else 0.0
+        }
+
+
+class BatchReverifier:
+    """저장된 검사 이력 일괄 재검증 (제품별 묶음 → 프로세스 풀, 결과 스트리밍)"""
+
+    def __init__(
+        self,
+        reference_loader: Callable[[str], Optional[List[Dict]]],
+        position_threshold: float = 20.0,
+        confidence_threshold: float = 0.25,
+        workers: int = 2,
+        chunk_size: int = 256,
+        executor: Optional[ChunkExecutor] = None
+    ):
+        """
+        Args:
+            reference_loader: 제품 코드 → 기준 부품 배치 (예: db.get_reference_components, 없으면 빈 리스트 / None)
+            position_threshold: 위치 오류 판정 임계값 (픽셀)
+            confidence_threshold: 검출 신뢰도 임계값
+            workers: 워커 프로세스 수 (0이면 현재 프로세스에서 처리)
+            chunk_size: 워커에 한 번에 넘기는 검사 수 (같은 제품끼리)
+            executor: 공유 ChunkExecutor (None이면 run()마다 만들고 끝나면 종료)
+        """
+        self.reference_loader = reference_loader
+        self.position_threshold = position_threshold
+        self.confidence_threshold = confidence_threshold
+        self.workers = workers
+        self.executor = executor
+        self.chunk_size = max(1, chunk_size)
+        self.stats = ReverificationStats()
+
+    def _chunks(self, inspections: Iterable[Dict], references: Dict[str, Optional[List[Dict]]]) -> Iterator:
+        """검사 이력 → (기준 배치, 같은 제품 검사 묶음) 또는 (None, 건너뛴 결과 리스트)"""
+        pending: Dict[str, List[Dict]] = {}
+        for row in inspections:
+            product_code = row.get('product_code')
+            if product_code not in references:
+                references[product_code] = self.reference_loader(product_code) if product_code else None
+            if not references[product_code]:
+                yield None, [_skipped(row, 'no_reference')]
+                continue
+
+            rows = pending.setdefault(product_code, [])
+            rows.append(row)
+            if len(rows) >= self.chunk_size:
+                yield references[product_code], pending.pop(product_code)
+
+        for product_code, rows in pending.items():
+            yield references[product_code], rows
+
+    def run(self, inspections: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        검사 이력 재검증 (결과는 묶음 제출 순서대로 바로 전달)
+
+        Args:
+            inspections: iter_inspections_v3 형식의 검사 이력 (제너레이터 가능)
+
+        Yields:
+            dict: 검사별 결과 - status 'ok'면 old_decision / new_decision / changed / counts / delta,
+                  'skipped'면 reason (no_reference / no_detections / invalid_detections)
+        """
+        self.stats = ReverificationStats()
+        references: Dict[str, Optional[List[Dict]]] = {}
+        args = (self.position_threshold, self.confidence_threshold)
+
+        if self.workers <= 0 and self.executor is None:
+            for reference_components, rows in self._chunks(inspections, references):
+                records = rows if reference_components is None else verify_chunk(reference_components, rows, *args)
+                for record in records:
+                    self.stats.add(record)
+                    yield record
+            logger.info(f"🔁 일괄 재검증 완료: {self.stats.to_dict()}")
+            return
+
+        executor = self.executor or ChunkExecutor(self.workers)
+        max_in_flight = max(1, executor.workers) * 2
+        in_flight = deque()
+        try:
+            for reference_components, rows in self._chunks(inspections, references):
+                if reference_components is None:
+                    in_flight.append(rows)
+                else:
+                    in_flight.append(executor.submit(reference_components, rows, *args))
+
+                while len(in_flight) > max_in_flight or (in_flight and isinstance(in_flight[0], list)):
+                    yield from self._drain(in_flight.popleft())
+
+            while in_flight:
+                yield from self._drain(in_flight.popleft())
+        finally:
+            for item in in_flight:
+                if isinstance(item, Future):
+                    item.cancel()  # 중단된 실행 (결과가 와도 버림)
+            if executor is not self.executor:
+                executor.close()
+            logger.info(f"🔁 일괄 재검증 완료: {self.stats.to_dict()}")
+
+    def _drain(self, item) -> Iterator[Dict]:
+        """완료된 묶음(또는 건너뛴 결과) 전달 + 통계 반영"""
+        records = item if isinstance(item, list) else item.result()
+        for record in records:
+            self.stats.add(record)
+            yield record
@@ -9,16 +9,176 @@
 2. 위치 오류 검출 (Misplaced Components)
 3. 누락 컴포넌트 검출 (Missing Components)
 4. 추가 컴포넌트 검출 (Extra Components)
+
+매칭: 클래스별 기준 × 검출 거리 행렬에서 위치 임계값(gate) 안 쌍의 수를 최대로, 그다음 거리 합을 최소로 하는
+1:1 배정을 헝가리안 알고리즘(scipy linear_sum_assignment)으로 구합니다 (기준 순서와 무관).
+같은 클래스 부품이 많으면(거리 행렬이 DENSE_MATCH_LIMIT 초과) KD-tree로 gate 안 후보만 찾아
+서로 연결된 묶음별로 나눠 풀고, 남은 기준 / 검출끼리 다시 배정합니다.
 """
 
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import Iterable, Iterator, List, Dict, Tuple, Optional, Union
 import logging
-from scipy.spatial.distance import cdist
+
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from detections import Detections
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+# 클래스별 밀집 거리 행렬 최대 원소 수 (초과 시 KD-tree gate 분할)
+DENSE_MATCH_LIMIT = 250_000
+
+
+def _pairwise_distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(R, 2) × (D, 2) → (R, D) 유클리드 거리"""
+    return np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2))
+
+
+def _gated_assignment(distances: np.ndarray, gate: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    gate 안 쌍 수 최대 → 거리 합 최소 배정 (min(R, D)쌍)
+
+    gate 밖 쌍에 (가능한 거리 합보다 큰) 벌점을 더해 한 번의 헝가리안으로 두 기준을 함께 최적화합니다.
+    """
+    penalty = float(distances.max()) * min(distances.shape) + 1.0
+    cost = np.where(distances > gate, distances + penalty, distances)
+    return linear_sum_assignment(cost)
+
+
+def _assign_sparse(ref: np.ndarray, det: np.ndarray, gate: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    부품 수가 많은 클래스: KD-tree gate 후보 → 연결 묶음별 배정 → 남은 쌍 배정
+
+    gate 안 후보로 이어지지 않은 기준 / 검출은 서로 영향을 주지 않으므로 묶음마다 따로 풀어도
+    gate 안 쌍 수 / 거리 합은 전체를 한 번에 푼 것과 같습니다.
+
+    Returns:
+        (기준 위치 배열, 검출 위치 배열)
+    """
+    n_ref, n_det = len(ref), len(det)
+    near = cKDTree(ref).sparse_distance_matrix(cKDTree(det), gate, output_type='coo_matrix')
+    graph = coo_matrix((np.ones(near.nnz), (near.row, near.col + n_ref)), shape=(n_ref + n_det,) * 2)
+    _, labels = connected_components(graph, directed=False)
+
+    ref_groups: Dict[int, List[int]] = {}
+    det_groups: Dict[int, List[int]] = {}
+    for idx, label in enumerate(labels[:n_ref]):
+        ref_groups.setdefault(label, []).append(idx)
+    for idx, label in enumerate(labels[n_ref:]):
+        det_groups.setdefault(label, []).append(idx)
+
+    rows, cols = [np.zeros(0, np.int64)], [np.zeros(0, np.int64)]
+    for label, ref_idx in ref_groups.items():
+        det_idx = det_groups.get(label)
+        if not det_idx:
+            continue
+        ref_idx, det_idx = np.asarray(ref_idx), np.asarray(det_idx)
+        distances = _pairwise_distances(ref[ref_idx], det[det_idx])
+        r, c = _gated_assignment(distances, gate)
+        keep = distances[r, c] <= gate  # gate 밖 쌍은 남은 쌍 배정에서 다시 고려
+        rows.append(ref_idx[r[keep]])
+        cols.append(det_idx[c[keep]])
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+
+    # gate 안에 짝이 없는 기준 / 검출끼리 배정 (위치 오류 후보)
+    rest_ref = np.setdiff1d(np.arange(n_ref), rows)
+    rest_det = np.setdiff1d(np.arange(n_det), cols)
+    if len(rest_ref) and len(rest_det):
+        r, c = linear_sum_assignment(_pairwise_distances(ref[rest_ref], det[rest_det]))
+        rows = np.concatenate([rows, rest_ref[r]])
+        cols = np.concatenate([cols, rest_det[c]])
+    return rows, cols
+
+
+def match_components(
+    ref_centers: np.ndarray,
+    ref_by_class: Dict[str, np.ndarray],
+    det_centers: np.ndarray,
+    det_class_names: List[str],
+    gate: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    같은 클래스끼리 기준 ↔ 검출 1:1 배정
+
+    Args:
+        ref_centers: (R, 2) 기준 중심점
+        ref_by_class: {class_name: 기준 인덱스 배열} (ReferenceLayout.by_class)
+        det_centers: (D, 2) 검출 중심점 (기준과 같은 좌표계)
+        det_class_names: 검출별 클래스 이름
+        gate: 위치 임계값 (픽셀) - 이 거리 안 쌍을 우선 배정
+
+    Returns:
+        (기준 인덱스, 검출 인덱스, 거리) 배열 - 클래스마다 min(기준 수, 검출 수)쌍
+    """
+    det_by_class: Dict[str, List[int]] = {}
+    for idx, class_name in enumerate(det_class_names):
+        det_by_class.setdefault(class_name, []).append(idx)
+
+    ref_idx, det_idx = [], []
+    for class_name, refs in ref_by_class.items():
+        dets = det_by_class.get(class_name)
+        if not dets:
+            continue
+        dets = np.asarray(dets, dtype=np.int64)
+        if len(refs) * len(dets) <= DENSE_MATCH_LIMIT:
+            rows, cols = _gated_assignment(_pairwise_distances(ref_centers[refs], det_centers[dets]), gate)
+        else:
+            rows, cols = _assign_sparse(ref_centers[refs], det_centers[dets], gate)
+        ref_idx.append(refs[rows])
+        det_idx.append(dets[cols])
+
+    if not ref_idx:
+        empty = np.zeros(0, np.int64)
+        return empty, empty, np.zeros(0, np.float64)
+    ref_idx, det_idx = np.concatenate(ref_idx), np.concatenate(det_idx)
+    distances = np.linalg.norm(ref_centers[ref_idx] - det_centers[det_idx], axis=1)
+    return ref_idx, det_idx, distances
+
+
+class ReferenceLayout:
+    """
+    제품 기준 부품 배치 (검증용으로 미리 정리한 배열)
+
+    기준 컴포넌트 리스트를 한 번만 정리해서
+    - centers: (N, 2) float64 중심점 ('center', 없으면 'relative_center')
+    - by_class: {class_name: 기준 인덱스 배열}
+    로 보관합니다. 제품별로 만들어 두고(reference_store.ReferenceStore) 보드마다 재사용합니다.
+    """
+
+    __slots__ = ('components', 'centers', 'class_names', 'by_class')
+
+    def __init__(self, reference_components: List[Dict]):
+        """
+        Args:
+            reference_components (list): 기준 컴포넌트 정보 (ComponentVerifier와 같은 형식)
+        """
+        components = []
+        for comp in reference_components:
+            if 'center' not in comp and 'relative_center' not in comp:
+                logger.warning(f"기준 컴포넌트에 'center' 또는 'relative_center' 키 없음: {comp}")
+                continue
+            components.append(comp)
+
+        self.components = components
+        self.centers = np.array(
+            [comp['center'] if 'center' in comp else comp['relative_center'] for comp in components],
+            dtype=np.float64
+        ).reshape(-1, 2)
+        self.class_names = [comp['class_name'] for comp in components]
+
+        by_class: Dict[str, List[int]] = {}
+        for idx, class_name in enumerate(self.class_names):
+            by_class.setdefault(class_name, []).append(idx)
+        self.by_class = {name: np.array(indices, dtype=np.int64) for name, indices in by_class.items()}
+
+    def __len__(self) -> int:
+        return len(self.components)
+
 
 class ComponentVerifier:
     """컴포넌트 위치 검증 클래스"""
@@ -28,7 +188,8 @@ class ComponentVerifier:
         reference_components: List[Dict],
         position_threshold: float = 20.0,
         confidence_threshold: float = 0.25,
-        reference_point: Optional[Tuple[int, int]] = None
+        reference_point: Optional[Tuple[int, int]] = None,
+        layout: Optional[ReferenceLayout] = None
     ):
         """
         Args:
@@ -46,14 +207,18 @@ class ComponentVerifier:
             confidence_threshold (float): YOLO 신뢰도 임계값 (기본 0.25)
             reference_point (tuple, optional): 템플릿 기준점 (x, y).
                 None이면 절대좌표 사용, 값이 있으면 상대좌표로 변환
+            layout (ReferenceLayout, optional): 미리 정리한 기준 배치 (제품별 캐시).
+                주면 reference_components를 다시 정리하지 않음
         """
         self.reference_components = reference_components
         self.position_threshold = position_threshold
         self.confidence_threshold = confidence_threshold
         self.reference_point = reference_point
+        self.layout = layout if layout is not None else ReferenceLayout(reference_components)
 
-        # 기준 컴포넌트를 클래스별로 그룹화
-        self.reference_by_class = self._group_by_class(reference_components)
+        if layout is not None:
+            # 캐시된 배치로 보드마다 생성하는 경우 (로그 생략)
+            return
 
         coord_system = "상대좌표" if reference_point else "절대좌표"
         logger.info(
@@ -63,41 +228,23 @@ class ComponentVerifier:
             f"좌표계: {coord_system})"
         )
 
-    def _group_by_class(
-        self,
-        components: List[Dict]
-    ) -> Dict[str, List[Dict]]:
-        """
-        컴포넌트를 클래스별로 그룹화
-
-        Args:
-            components (list): 컴포넌트 리스트
-
-        Returns:
-            dict: {class_name: [component1, component2, ...]}
-        """
-        grouped = {}
-
-        for comp in components:
-            class_name = comp['class_name']
-
-            if class_name not in grouped:
-                grouped[class_name] = []
-
-            grouped[class_name].append(comp)
-
-        return grouped
+    @property
+    def reference_by_class(self) -> Dict[str, List[Dict]]:
+        """{class_name: [기준 컴포넌트, ...]} (layout.by_class의 dict 보기)"""
+        components = self.layout.components
+        return {name: [components[i] for i in indices] for name, indices in self.layout.by_class.items()}
 
     def verify_components(
         self,
-        detected_components: List[Dict],
+        detected_components: Union[Detections, List[Dict]],
         debug: bool = False
     ) -> Dict:
         """
         컴포넌트 위치 검증
 
         Args:
-            detected_components (list): YOLO 검출 결과
+            detected_components (Detections | list): YOLO 검출 결과
+                Detections 배열 컨테이너를 그대로 받거나, 기존 dict 리스트 형식
                 [
                     {
                         'class_name': str,
@@ -146,115 +293,64 @@ class ComponentVerifier:
                     }
                 }
         """
-        # 신뢰도 필터링
-        detected_components = [
-            comp for comp in detected_components
-            if comp['confidence'] >= self.confidence_threshold
-        ]
+        # 검출 결과를 배열로 정리 (중심점 / 클래스 이름 / 결과 dict 생성 함수)
+        det_centers, det_class_names, det_item = self._prepare_detections(detected_components)
 
-        # 상대좌표 변환 (템플릿 기준점이 있는 경우)
+        # 기준 컴포넌트 좌표계: DB 'center'는 이미 템플릿 기준 상대좌표이므로 변환 불필요
+        # (layout.centers는 'center', 없으면 'relative_center' - 생성 시 1회 정리)
+        layout = self.layout
         if self.reference_point:
-            ref_x, ref_y = self.reference_point
-
-            # 검출 컴포넌트를 상대좌표로 변환
-            detected_components_relative = []
-            for det_comp in detected_components:
-                det_copy = det_comp.copy()
-                # 'relative_center' 키가 있으면 우선 사용, 없으면 'center'를 상대좌표로 변환
-                if 'relative_center' in det_comp:
-                    det_copy['center'] = det_comp['relative_center']
-                elif 'center' in det_comp:
-                    cx, cy = det_comp['center']
-                    det_copy['center'] = [cx - ref_x, cy - ref_y]
-                else:
-                    logger.warning(f"검출 컴포넌트에 'center' 또는 'relative_center' 키 없음: {det_comp}")
-                    continue
-                detected_components_relative.append(det_copy)
-
-            detected_components = detected_components_relative
-
-            # 기준 컴포넌트는 DB에서 이미 상대좌표로 저장되어 있으므로 변환 불필요
-            # DB 'center' 키는 이미 템플릿 기준 상대좌표임
-            reference_components_relative = []
-            for ref_comp in self.reference_components:
-                ref_copy = ref_comp.copy()
-                # DB는 이미 상대좌표를 'center' 키에 저장하므로 그대로 사용
-                if 'center' in ref_comp:
-                    ref_copy['center'] = ref_comp['center']  # 이미 상대좌표
-                elif 'relative_center' in ref_comp:
-                    ref_copy['center'] = ref_comp['relative_center']
-                else:
-                    logger.warning(f"기준 컴포넌트에 'center' 또는 'relative_center' 키 없음: {ref_comp}")
-                    continue
-                reference_components_relative.append(ref_copy)
-
-            reference_components_for_verification = reference_components_relative
-            logger.debug(f"🔄 상대좌표 변환 완료 (템플릿 기준점: {self.reference_point})")
+            logger.debug(f"🔄 상대좌표 비교 (템플릿 기준점: {self.reference_point})")
         else:
-            # 절대좌표 사용
-            reference_components_for_verification = self.reference_components
-            logger.debug(f"📍 절대좌표 사용 (템플릿 기준점 없음)")
+            logger.debug("📍 절대좌표 사용 (템플릿 기준점 없음)")
 
-        # 검출된 컴포넌트를 클래스별로 그룹화
-        detected_by_class = self._group_by_class(detected_components)
+        # 클래스별 최적 1:1 배정 (gate = 위치 임계값)
+        ref_idx, det_idx, distances = match_components(
+            layout.centers, layout.by_class, det_centers, det_class_names, self.position_threshold
+        )
+        det_for_ref = np.full(len(layout), -1, dtype=np.int64)
+        det_for_ref[ref_idx] = det_idx
+        distance_for_ref = np.zeros(len(layout), dtype=np.float64)
+        distance_for_ref[ref_idx] = distances
 
         misplaced = []
         missing = []
         extra = []
         correct = []
 
-        # 기준 컴포넌트 순회 (상대좌표 변환된 리스트 사용)
-        for ref_comp in reference_components_for_verification:
-            class_name = ref_comp['class_name']
-            ref_center = np.array(ref_comp['center'])
-
-            # 동일 클래스 검출 결과
-            detected_same_class = detected_by_class.get(class_name, [])
-
-            if not detected_same_class:
-                # 누락 (해당 클래스가 검출되지 않음)
-                missing.append(ref_comp)
-                continue
-
-            # 가장 가까운 검출 결과 찾기
-            closest_det, min_distance = self._find_closest_detection(
-                ref_center,
-                detected_same_class
-            )
-
-            if closest_det is None:
-                # 누락
+        # 기준 컴포넌트 순서대로 결과 정리
+        for ref_pos, ref_comp in enumerate(layout.components):
+            det_pos = int(det_for_ref[ref_pos])
+            if det_pos < 0:
+                # 누락 (배정된 같은 클래스 검출 없음)
                 missing.append(ref_comp)
                 continue
 
-            # 거리 임계값 비교
-            if min_distance > self.position_threshold:
-                # 위치 오류
-                misplaced.append({
-                    'reference': ref_comp,
-                    'detected': closest_det,
-                    'offset': float(min_distance)
-                })
+            match = {
+                'reference': ref_comp,
+                'detected': det_item(det_pos),
+                'offset': float(distance_for_ref[ref_pos])
+            }
+            if match['offset'] > self.position_threshold:
+                misplaced.append(match)  # 위치 오류
             else:
-                # 정상
-                correct.append({
-                    'reference': ref_comp,
-                    'detected': closest_det,
-                    'offset': float(min_distance)
-                })
-
-            # 매칭된 검출 결과 제거 (중복 매칭 방지)
-            detected_same_class.remove(closest_det)
-
-        # 남은 검출 결과 = 추가 컴포넌트 (기준에 없음)
-        for class_name, det_list in detected_by_class.items():
-            for det_comp in det_list:
-                extra.append(det_comp)
+                correct.append(match)  # 정상
+
+        # 배정되지 않은 검출 결과 = 추가 컴포넌트 (기준에 없음, 클래스 첫 등장 순서)
+        matched = np.zeros(len(det_class_names), dtype=bool)
+        matched[det_idx] = True
+        unmatched_by_class: Dict[str, List[int]] = {}
+        for idx, class_name in enumerate(det_class_names):
+            unmatched_by_class.setdefault(class_name, [])
+            if not matched[idx]:
+                unmatched_by_class[class_name].append(idx)
+        for det_indices in unmatched_by_class.values():
+            extra.extend(det_item(idx) for idx in det_indices)
 
         # 요약 통계
         summary = {
             'total_reference': len(self.reference_components),
-            'total_detected': len(detected_components),
+            'total_detected': len(det_class_names),
             'misplaced_count': len(misplaced),
             'missing_count': len(missing),
             'extra_count': len(extra),
@@ -272,37 +368,64 @@ class ComponentVerifier:
             'summary': summary
         }
 
-    def _find_closest_detection(
-        self,
-        ref_center: np.ndarray,
-        detected_list: List[Dict]
-    ) -> Tuple[Optional[Dict], float]:
+    def _prepare_detections(self, detected_components):
         """
-        기준 위치에 가장 가까운 검출 결과 찾기
+        검출 결과를 신뢰도 필터링 후 배열로 정리
+
+        Detections 입력은 배열을 그대로 사용하고, 결과 dict는 매칭 결과에
+        들어가는 검출에 대해서만 만든다 (JSON 직전 변환).
 
         Args:
-            ref_center (np.ndarray): 기준 중심점 [cx, cy]
-            detected_list (list): 동일 클래스 검출 결과 리스트
+            detected_components (Detections | list): YOLO 검출 결과
 
         Returns:
-            tuple: (가장 가까운 검출 결과, 거리)
+            tuple: (중심점 배열 (N, 2), 클래스 이름 리스트, 인덱스 → 결과 dict 함수)
+                기준점이 있으면 중심점과 결과 dict의 'center'는 상대좌표
         """
-        if not detected_list:
-            return None, float('inf')
+        if isinstance(detected_components, Detections):
+            detections = detected_components.filter_confidence(self.confidence_threshold)
+            centers = detections.centers.astype(np.float64)
+            if self.reference_point:
+                centers = centers - np.asarray(self.reference_point, dtype=np.float64)
+
+            def det_item(idx):
+                item = detections.component_dict(idx, self.reference_point)
+                if self.reference_point:
+                    item['center'] = item['relative_center']
+                return item
 
-        # 모든 검출 결과의 중심점
-        det_centers = np.array([det['center'] for det in detected_list])
+            return centers, detections.class_names, det_item
+
+        # 기존 dict 리스트 입력: 신뢰도 필터링
+        detected_components = [
+            comp for comp in detected_components
+            if comp['confidence'] >= self.confidence_threshold
+        ]
 
-        # 유클리드 거리 계산
-        distances = np.linalg.norm(det_centers - ref_center, axis=1)
+        # 상대좌표 변환 (템플릿 기준점이 있는 경우)
+        if self.reference_point:
+            ref_x, ref_y = self.reference_point
 
-        # 최소 거리 찾기
-        min_idx = np.argmin(distances)
-        min_distance = distances[min_idx]
+            # 검출 컴포넌트를 상대좌표로 변환
+            detected_components_relative = []
+            for det_comp in detected_components:
+                det_copy = det_comp.copy()
+                # 'relative_center' 키가 있으면 우선 사용, 없으면 'center'를 상대좌표로 변환
+                if 'relative_center' in det_comp:
+                    det_copy['center'] = det_comp['relative_center']
+                elif 'center' in det_comp:
+                    cx, cy = det_comp['center']
+                    det_copy['center'] = [cx - ref_x, cy - ref_y]
+                else:
+                    logger.warning(f"검출 컴포넌트에 'center' 또는 'relative_center' 키 없음: {det_comp}")
+                    continue
+                detected_components_relative.append(det_copy)
 
-        closest_det = detected_list[min_idx]
+            detected_components = detected_components_relative
 
-        return closest_det, float(min_distance)
+        centers = np.array([comp['center'] for comp in detected_components], dtype=np.float64).reshape(-1, 2)
+        class_names = [comp['class_name'] for comp in detected_components]
+        return centers, class_names, detected_components.__getitem__
 
     def is_critical_defect(self, verification_result: Dict) -> Tuple[bool, str]:
         """
@@ -335,6 +458,43 @@ class ComponentVerifier:
 
         return False, "정상 범위"
 
+    def decide(self, verification_result: Dict) -> str:
+        """
+        최종 판정 (predict_dual / predict_serial과 같은 기준)
+
+        Args:
+            verification_result (dict): verify_components() 결과
+
+        Returns:
+            str: 'discard' / 'missing' / 'position_error' / 'normal'
+        """
+        summary = verification_result['summary']
+        if self.is_critical_defect(verification_result)[0]:
+            return 'discard'
+        if summary['missing_count'] > 0:
+            return 'missing'
+        if summary['misplaced_count'] > 0:
+            return 'position_error'
+        return 'normal'
+
+    def verify_batch(
+        self,
+        detection_lists: Iterable[Union[Detections, List[Dict]]]
+    ) -> Iterator[Dict]:
+        """
+        여러 보드의 검출 결과를 같은 기준 배치로 연속 검증 (저장된 검사 이력 재검증용)
+
+        Args:
+            detection_lists: 보드별 검출 결과 (verify_components 입력 형식)
+
+        Yields:
+            dict: verify_components() 결과 + 'decision' (decide() 결과)
+        """
+        for detected_components in detection_lists:
+            verification_result = self.verify_components(detected_components)
+            verification_result['decision'] = self.decide(verification_result)
+            yield verification_result
+
     def generate_report(self, verification_result: Dict) -> str:
         """
         검증 결과 리포트 생성
@@ -9,10 +9,10 @@ Flask 서버에서 MySQL 데이터베이스와 연동하기 위한 클래스입
 """
 
 import pymysql
-from pymysql.cursors import DictCursor
+from pymysql.cursors import DictCursor, SSDictCursor
 import json
 from datetime import datetime
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, Iterator, List, Any
 import logging
 
 logger = logging.getLogger(__name__)
@@ -526,6 +526,107 @@ class DatabaseManager:
             logger.error(f"기준 부품 조회 실패 (제품 코드: {product_code}): {e}")
             return []
 
+    def get_reference_version(self, product_code: str) -> Optional[tuple]:
+        """
+        제품 기준 부품 배치 버전 (product_components 행 수 / 최대 ID / 최근 생성 시각)
+
+        /save_reference_components는 기존 행을 지우고 새로 넣으므로 저장할 때마다 최대 ID가 바뀝니다.
+        여러 서버 프로세스의 기준 배치 캐시가 전체 배치를 다시 읽지 않고 변경 여부만 확인하는 데 사용합니다.
+
+        Args:
+            product_code: 제품 코드
+
+        Returns:
+            (행 수, 최대 ID, 최근 생성 시각) 또는 None (조회 실패)
+        """
+        try:
+            conn = self.get_connection()
+            with conn.cursor() as cursor:
+                sql = """
+                    SELECT COUNT(*) AS row_count, MAX(id) AS max_id, MAX(created_at) AS updated_at
+                    FROM product_components
+                    WHERE product_code = %s
+                """
+                cursor.execute(sql, (product_code,))
+                row = cursor.fetchone()
+                return (row['row_count'], row['max_id'], str(row['updated_at']))
+
+        except pymysql.Error as e:
+            logger.error(f"기준 부품 버전 조회 실패 (제품 코드: {product_code}): {e}")
+            return None
+
+    def iter_inspections_v3(
+        self,
+        product_code: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+        fetch_size: int = 500
+    ) -> Iterator[Dict]:
+        """
+        저장된 검사 이력을 재검증용으로 순회 (v3.0 inspections, 서버 측 커서로 fetch_size씩 읽음)
+
+        수천 건을 한 번에 메모리에 올리지 않도록 별도 연결 + SSDictCursor를 사용합니다
+        (공유 연결은 다른 요청이 계속 사용).
+
+        Args:
+            product_code: 제품 코드 필터 (None이면 전체)
+            since: 검사 시간 하한 (포함, 'YYYY-MM-DD[ HH:MM:SS]')
+            until: 검사 시간 상한 (미포함)
+            limit: 최대 건수
+            fetch_size: 한 번에 가져올 행 수
+
+        Yields:
+            Dict: id, serial_number, product_code, decision, 개수 4종, detection_count,
+                  yolo_detections (JSON 문자열), inspection_time
+        """
+        conditions, params = [], []
+        if product_code:
+            conditions.append("product_code = %s")
+            params.append(product_code)
+        if since:
+            conditions.append("inspection_time >= %s")
+            params.append(since)
+        if until:
+            conditions.append("inspection_time < %s")
+            params.append(until)
+
+        sql = """
+            SELECT
+                id, serial_number, product_code, decision,
+                missing_count, position_error_count, extra_count, correct_count,
+                detection_count, yolo_detections, inspection_time
+            FROM inspections
+        """
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY id"
+        if limit:
+            sql += " LIMIT %s"
+            params.append(int(limit))
+
+        try:
+            conn = pymysql.connect(**dict(self.config, cursorclass=SSDictCursor))
+        except pymysql.Error as e:
+            logger.error(f"검사 이력 순회 연결 실패: {e}")
+            return
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        if row['inspection_time']:
+                            row['inspection_time'] = row['inspection_time'].isoformat()
+                        yield row
+        except pymysql.Error as e:
+            logger.error(f"검사 이력 순회 실패: {e}")
+        finally:
+            conn.close()
+
     def insert_inspection_v3(
         self,
         serial_number: str,
@@ -638,6 +739,8 @@ class DatabaseManager:
         """
         try:
             conn = self.get_connection()
+            if conn is None:
+                return False  # 연결 실패 (get_connection이 None 반환)
             with conn.cursor() as cursor:
                 cursor.execute("SELECT 1")
                 return True
@@ -0,0 +1,211 @@
+"""
+YOLO 검출 결과 컨테이너 (Struct-of-Arrays)
+
+검출 1개당 dict 1개를 만드는 대신, 프레임 단위로
+- boxes: (N, 4) float32 [x1, y1, x2, y2]
+- confidence: (N,) float32
+- class_id: (N,) int32
+배열을 보관합니다. YOLO 결과는 result.boxes.data 한 번의 device→host 전송으로 채우고,
+신뢰도/ROI 필터링, 평활화(추적), 부품 검증 단계는 배열 그대로 사용합니다.
+dict 변환은 JSON 응답/DB 저장 직전(to_box_dicts / to_component_dicts)에만 수행합니다.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class Detections:
+    """프레임 단위 검출 결과 (배열 기반)"""
+
+    __slots__ = ('boxes', 'confidence', 'class_id', 'names')
+
+    def __init__(self, boxes: np.ndarray, confidence: np.ndarray,
+                 class_id: np.ndarray, names: Optional[Dict[int, str]] = None):
+        """
+        Args:
+            boxes: (N, 4) 바운딩 박스 [x1, y1, x2, y2]
+            confidence: (N,) 신뢰도
+            class_id: (N,) 클래스 ID
+            names: {class_id: class_name} (YOLO result.names)
+        """
+        self.boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        self.confidence = np.asarray(confidence, dtype=np.float32).reshape(-1)
+        self.class_id = np.asarray(class_id, dtype=np.int32).reshape(-1)
+        self.names = names if names is not None else {}
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+    @classmethod
+    def empty(cls, names: Optional[Dict[int, str]] = None) -> 'Detections':
+        """빈 검출 결과"""
+        return cls(np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.int32), names)
+
+    @classmethod
+    def from_yolo(cls, result) -> 'Detections':
+        """
+        ultralytics Results 1개 → Detections
+
+        result.boxes.data ((N, 6) [x1, y1, x2, y2, conf, cls])를
+        한 번에 CPU로 옮겨서 분할합니다 (박스별 .cpu() 호출 없음).
+        ONNX 백엔드(detector_backends.BackendResult)는 data가 이미 numpy 배열입니다.
+        """
+        names = getattr(result, 'names', None) or {}
+        if result.boxes is None or len(result.boxes) == 0:
+            return cls.empty(names)
+
+        data = result.boxes.data
+        if not isinstance(data, np.ndarray):
+            data = data.cpu().numpy()
+        return cls(data[:, :4], data[:, 4], data[:, 5].astype(np.int32), names)
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[Dict]) -> 'Detections':
+        """
+        dict 리스트 → Detections (기존 형식 호환용)
+
+        {'x1', 'y1', 'x2', 'y2', ...} 또는 {'bbox': [x1, y1, x2, y2], ...} 형식 모두 지원
+        """
+        items = list(items)
+        # 명시된 class_id를 먼저 모두 등록 (임시 ID가 항목 순서와 관계없이 명시된 ID와 겹치지 않게)
+        names = {}
+        for item in items:
+            cid = int(item.get('class_id', -1))
+            if cid >= 0:
+                name = item.get('class_name')
+                names.setdefault(cid, name if name is not None else str(cid))
+
+        boxes, confidence, class_id = [], [], []
+        for item in items:
+            if 'bbox' in item:
+                boxes.append(item['bbox'])
+            else:
+                boxes.append([item['x1'], item['y1'], item['x2'], item['y2']])
+            confidence.append(item.get('confidence', 0.0))
+            cid = int(item.get('class_id', -1))
+            name = item.get('class_name')
+            if cid < 0:
+                # class_id가 없으면 같은 class_name의 ID 재사용, 처음 보는 이름이면 최댓값 다음 임시 ID
+                cid = next((k for k, v in names.items() if name is not None and v == name),
+                           max(names, default=-1) + 1)
+                names.setdefault(cid, name if name is not None else str(cid))
+            class_id.append(cid)
+        if not boxes:
+            return cls.empty(names)
+        return cls(np.array(boxes), np.array(confidence), np.array(class_id), names)
+
+    # ------------------------------------------------------------------
+    # 조회 / 부분 선택
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.confidence)
+
+    def select(self, index) -> 'Detections':
+        """불리언 마스크 또는 인덱스 배열로 부분 선택"""
+        return Detections(self.boxes[index], self.confidence[index], self.class_id[index], self.names)
+
+    @property
+    def centers(self) -> np.ndarray:
+        """(N, 2) 바운딩 박스 중심점"""
+        return (self.boxes[:, :2] + self.boxes[:, 2:]) * 0.5
+
+    @property
+    def class_names(self) -> List[str]:
+        """검출별 클래스 이름"""
+        return [self.names.get(int(c), str(int(c))) for c in self.class_id]
+
+    def mean_confidence(self, default: float = 1.0) -> float:
+        """평균 신뢰도 (검출이 없으면 default)"""
+        return float(self.confidence.mean()) if len(self) else default
+
+    # ------------------------------------------------------------------
+    # 필터링
+    # ------------------------------------------------------------------
+    def filter_confidence(self, threshold: float) -> 'Detections':
+        """신뢰도 threshold 이상만 남김"""
+        return self.select(self.confidence >= threshold)
+
+    def filter_centers_in(self, x1: float, y1: float, x2: float, y2: float) -> 'Detections':
+        """중심점이 사각형 (x1, y1)-(x2, y2) 안에 있는 검출만 남김 (경계 포함)"""
+        centers = self.centers
+        mask = ((centers[:, 0] >= x1) & (centers[:, 0] <= x2) &
+                (centers[:, 1] >= y1) & (centers[:, 1] <= y2))
+        return self.select(mask)
+
+    # ------------------------------------------------------------------
+    # JSON 변환 (응답 / DB 저장 직전에만 사용)
+    # ------------------------------------------------------------------
+    def to_box_dicts(self) -> List[Dict]:
+        """
+        기존 parse_yolo_results 형식의 dict 리스트
+
+        Returns:
+            [{'x1', 'y1', 'x2', 'y2', 'confidence', 'class_id', 'class_name'}, ...]
+        """
+        boxes = self.boxes.tolist()
+        return [
+            {
+                'x1': b[0], 'y1': b[1], 'x2': b[2], 'y2': b[3],
+                'confidence': conf,
+                'class_id': cid,
+                'class_name': name
+            }
+            for b, conf, cid, name in zip(boxes, self.confidence.tolist(), self.class_id.tolist(), self.class_names)
+        ]
+
+    def to_component_dicts(self, reference_point: Optional[Tuple[int, int]] = None) -> List[Dict]:
+        """
+        디버그 뷰어 / ComponentVerifier 형식의 dict 리스트
+
+        Args:
+            reference_point: 템플릿 기준점 (x, y). 있으면 relative_center 추가
+
+        Returns:
+            [{'class_name', 'bbox', 'center', 'confidence', ('relative_center')}, ...]
+        """
+        return [self.component_dict(i, reference_point) for i in range(len(self))]
+
+    def component_dict(self, i: int, reference_point: Optional[Tuple[int, int]] = None) -> Dict:
+        """i번째 검출을 to_component_dicts 형식으로 변환"""
+        x1, y1, x2, y2 = self.boxes[i].tolist()
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        item = {
+            'class_name': self.names.get(int(self.class_id[i]), str(int(self.class_id[i]))),
+            'bbox': [x1, y1, x2, y2],
+            'center': [cx, cy],
+            'confidence': float(self.confidence[i])
+        }
+        if reference_point:
+            ref_x, ref_y = reference_point
+            item['relative_center'] = [cx - ref_x, cy - ref_y]
+        return item
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    두 박스 집합 간 IOU 행렬
+
+    Args:
+        boxes_a: (N, 4) [x1, y1, x2, y2]
+        boxes_b: (M, 4) [x1, y1, x2, y2]
+
+    Returns:
+        (N, M) IOU 행렬 (0.0 ~ 1.0)
+    """
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+
+    inter_x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    inter_y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    inter_x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    inter_y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    inter = np.clip(inter_x2 - inter_x1, 0, None) * np.clip(inter_y2 - inter_y1, 0, None)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        iou = np.where(union > 0, inter / union, 0.0)
+    return iou.astype(np.float32)
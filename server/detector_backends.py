@@ -0,0 +1,409 @@
+"""
+부품 검출기 백엔드 (PyTorch / ONNX Runtime / OpenVINO)
+
+GPU가 없는 라인 PC에서는 ultralytics PyTorch eager 모드 대신
+ONNX로 내보낸 모델(FP32 / FP16 / INT8)을 ONNX Runtime 또는 OpenVINO CPU 런타임으로 실행합니다.
+
+configs/server_config.yaml의 model 섹션으로 선택:
+    model:
+      backend: pytorch       # pytorch / onnxruntime / openvino
+      onnx_model_path: ...   # onnxruntime 백엔드용 .onnx
+      openvino_model_path: ...  # openvino 백엔드용 .xml 또는 *_openvino_model 폴더
+      imgsz: 640
+      cpu_threads: 0         # 0이면 런타임 기본값
+
+모든 백엔드는 ultralytics YOLO와 같은 인터페이스를 제공합니다.
+    results = detector.predict(frames, conf=0.3, iou=0.7, verbose=False)
+    results[i].boxes.data  → (N, 6) [x1, y1, x2, y2, conf, cls]
+    detector.names         → {class_id: class_name}
+
+ONNX 백엔드는 레터박스 전처리, 클래스별 NMS, 원본 좌표 복원을 직접 수행합니다.
+입력이 이미 imgsz 정사각형(서버 crop 단계 출력)이면 리사이즈 / 패딩 없이
+재사용하는 배치 입력 버퍼에 바로 정규화해서 기록합니다 (frame_preprocess.to_tensor).
+모델 내보내기는 yolo/export_yolo.py를 사용하세요.
+"""
+
+import ast
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from frame_preprocess import to_tensor
+from server_config import get_config_value, resolve_project_path
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('pytorch', 'onnxruntime', 'openvino')
+
+# 백엔드별 모델 경로 (pytorch는 기존 v5 가중치, 나머지는 설정 파일 키)
+PYTORCH_MODEL_PATH = '../models/component_detector_v5_best.pt'  # v5 모델 ⭐ (server/ 기준)
+BACKEND_MODEL_PATH_KEYS = {
+    'onnxruntime': 'model.onnx_model_path',
+    'openvino': 'model.openvino_model_path'
+}
+
+# 클래스별 NMS를 한 번에 처리하기 위한 클래스 오프셋 (ultralytics와 동일)
+MAX_WH = 7680
+MAX_NMS_CANDIDATES = 30000
+LETTERBOX_COLOR = (114, 114, 114)
+
+
+class BackendBoxes:
+    """ultralytics Boxes 호환 (numpy 기반)"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: np.ndarray):
+        self.data = data  # (N, 6) [x1, y1, x2, y2, conf, cls]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def xyxy(self) -> np.ndarray:
+        return self.data[:, :4]
+
+    @property
+    def conf(self) -> np.ndarray:
+        return self.data[:, 4]
+
+    @property
+    def cls(self) -> np.ndarray:
+        return self.data[:, 5]
+
+
+class BackendResult:
+    """ultralytics Results 호환 (검출 결과 1장)"""
+
+    __slots__ = ('boxes', 'names', 'orig_shape', 'speed')
+
+    def __init__(self, data: np.ndarray, names: Dict[int, str], orig_shape: Tuple[int, int], speed: Dict):
+        self.boxes = BackendBoxes(data)
+        self.names = names
+        self.orig_shape = orig_shape
+        self.speed = speed  # {'preprocess', 'inference', 'postprocess'} (ms, 배치 내 1장 기준)
+
+
+class OnnxDetector:
+    """내보낸 YOLO 모델 CPU 추론 (ONNX Runtime / OpenVINO)"""
+
+    def __init__(self, model_path: str, runtime: str = 'onnxruntime', imgsz: int = 640,
+                 cpu_threads: int = 0, names: Optional[Dict[int, str]] = None):
+        """
+        Args:
+            model_path: .onnx 파일 (onnxruntime) 또는 .xml / *_openvino_model 폴더 (openvino)
+            runtime: 'onnxruntime' 또는 'openvino'
+            imgsz: 모델 입력 크기 (정사각형)
+            cpu_threads: 추론 스레드 수 (0이면 런타임 기본값)
+            names: 클래스 이름 (None이면 모델 메타데이터에서 읽음)
+        """
+        if runtime not in ('onnxruntime', 'openvino'):
+            raise ValueError(f"지원하지 않는 런타임: {runtime}")
+
+        self.model_path = Path(model_path)
+        self.runtime = runtime
+        self.imgsz = int(imgsz)
+        self.max_det = 300
+
+        # 배치 입력 버퍼 (가장 큰 배치 크기로 1회 할당 후 재사용)
+        self._input_buffer: Optional[np.ndarray] = None
+        self._input_lock = threading.Lock()
+
+        if runtime == 'onnxruntime':
+            self._load_onnxruntime(cpu_threads)
+        else:
+            self._load_openvino(cpu_threads)
+
+        if names:
+            self.names = {int(k): v for k, v in names.items()}
+
+        logger.info(f"✅ {runtime} 검출기 로드 완료: {self.model_path}")
+        logger.info(f"   - 입력: {self.input_dtype.__name__} {self.imgsz}x{self.imgsz}, "
+                    f"배치 {'동적' if self.max_batch is None else self.max_batch}")
+        logger.info(f"   - 클래스 수: {len(self.names)}개")
+
+    # ------------------------------------------------------------------
+    # 모델 로드
+    # ------------------------------------------------------------------
+    def _load_onnxruntime(self, cpu_threads: int):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if cpu_threads > 0:
+            options.intra_op_num_threads = cpu_threads
+        self._session = ort.InferenceSession(str(self.model_path), options, providers=['CPUExecutionProvider'])
+
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        self.input_dtype = np.float16 if model_input.type == 'tensor(float16)' else np.float32
+        self.max_batch = model_input.shape[0] if isinstance(model_input.shape[0], int) else None
+
+        metadata = self._session.get_modelmeta().custom_metadata_map
+        self.names = _parse_names(metadata.get('names'))
+
+    def _load_openvino(self, cpu_threads: int):
+        import openvino as ov
+
+        xml_path = self.model_path
+        if xml_path.is_dir():
+            xml_path = next(xml_path.glob('*.xml'))
+
+        core = ov.Core()
+        model = core.read_model(str(xml_path))
+        config = {'PERFORMANCE_HINT': 'LATENCY'}
+        if cpu_threads > 0:
+            config['INFERENCE_NUM_THREADS'] = cpu_threads
+        self._compiled = core.compile_model(model, 'CPU', config)
+        self._output = self._compiled.output(0)
+
+        model_input = model.input(0)
+        self.input_dtype = np.float16 if model_input.get_element_type() == ov.Type.f16 else np.float32
+        batch = model_input.get_partial_shape()[0]
+        self.max_batch = batch.get_length() if batch.is_static else None
+
+        # ultralytics OpenVINO 내보내기는 같은 폴더에 metadata.yaml을 저장
+        self.names = {}
+        metadata_path = xml_path.parent / 'metadata.yaml'
+        if metadata_path.exists():
+            try:
+                import yaml
+                with open(metadata_path, 'r', encoding='utf-8') as f:
+                    self.names = _parse_names((yaml.safe_load(f) or {}).get('names'))
+            except ImportError:
+                logger.warning("⚠️  PyYAML이 없어 OpenVINO 메타데이터(클래스 이름)를 읽지 못했습니다")
+
+    # ------------------------------------------------------------------
+    # 추론
+    # ------------------------------------------------------------------
+    def predict(self, source: Union[np.ndarray, Sequence[np.ndarray]], conf: float = 0.25,
+                iou: float = 0.7, verbose: bool = False) -> List[BackendResult]:
+        """
+        ultralytics YOLO.predict 호환 추론
+
+        Args:
+            source: BGR 이미지 1장 또는 리스트
+            conf: confidence threshold
+            iou: NMS IoU threshold
+            verbose: 사용하지 않음 (인터페이스 호환용)
+
+        Returns:
+            이미지별 BackendResult 리스트
+        """
+        frames = [source] if isinstance(source, np.ndarray) else list(source)
+        if not frames:
+            return []
+
+        # 정적 배치 모델이면 max_batch 단위로 나눠 실행
+        chunk = self.max_batch or len(frames)
+        results = []
+        for start in range(0, len(frames), chunk):
+            results.extend(self._predict_batch(frames[start:start + chunk], conf, iou))
+        return results
+
+    def _batch_input(self, n: int) -> np.ndarray:
+        """배치 입력 버퍼 (n장 이상 크기로 할당해 두고 앞쪽 n장만 사용)"""
+        if self._input_buffer is None or len(self._input_buffer) < n:
+            self._input_buffer = np.empty((n, 3, self.imgsz, self.imgsz), dtype=self.input_dtype)
+        return self._input_buffer[:n]
+
+    def _predict_batch(self, frames: List[np.ndarray], conf: float, iou: float) -> List[BackendResult]:
+        with self._input_lock:
+            t0 = time.perf_counter()
+            batch = self._batch_input(len(frames))
+            letterboxes = [letterbox(frame, self.imgsz, out=slot)[1] for frame, slot in zip(frames, batch)]
+
+            t1 = time.perf_counter()
+            if self.runtime == 'onnxruntime':
+                output = self._session.run(None, {self._input_name: batch})[0]
+            else:
+                output = self._compiled([batch])[self._output]
+
+        t2 = time.perf_counter()
+        output = np.asarray(output, dtype=np.float32)
+        detections = [
+            scale_boxes(non_max_suppression(pred, conf, iou, self.max_det), gain_pad, frame.shape[:2])
+            for pred, gain_pad, frame in zip(output, letterboxes, frames)
+        ]
+        t3 = time.perf_counter()
+
+        n = len(frames)
+        speed = {
+            'preprocess': (t1 - t0) * 1000 / n,
+            'inference': (t2 - t1) * 1000 / n,
+            'postprocess': (t3 - t2) * 1000 / n
+        }
+        return [BackendResult(det, self.names, frame.shape[:2], speed) for det, frame in zip(detections, frames)]
+
+
+# ----------------------------------------------------------------------
+# 전처리 / 후처리
+# ----------------------------------------------------------------------
+def letterbox(frame: np.ndarray, imgsz: int,
+              out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Tuple[float, float, float]]:
+    """
+    비율 유지 리사이즈 + 패딩 (ultralytics LetterBox, auto=False)
+
+    Args:
+        frame: BGR 이미지
+        imgsz: 모델 입력 크기
+        out: (3, imgsz, imgsz) 출력 버퍼 (None이면 새로 할당)
+
+    Returns:
+        (CHW RGB 0~1 텐서, (gain, pad_x, pad_y))
+    """
+    h, w = frame.shape[:2]
+    if (h, w) == (imgsz, imgsz):
+        # 이미 모델 입력 크기 (서버 crop 단계 출력) → 리사이즈 / 패딩 없이 정규화만
+        return to_tensor(frame, out=out), (1.0, 0.0, 0.0)
+
+    gain = min(imgsz / h, imgsz / w)
+    new_w, new_h = int(round(w * gain)), int(round(h * gain))
+    pad_x, pad_y = (imgsz - new_w) / 2, (imgsz - new_h) / 2
+
+    if (new_w, new_h) != (w, h):
+        frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    frame = cv2.copyMakeBorder(frame, top, bottom, left, right, cv2.BORDER_CONSTANT, value=LETTERBOX_COLOR)
+
+    # BGR HWC uint8 → RGB CHW float32 (0~1)
+    return to_tensor(frame, out=out), (gain, pad_x, pad_y)
+
+
+def non_max_suppression(pred: np.ndarray, conf: float, iou: float, max_det: int = 300) -> np.ndarray:
+    """
+    YOLO 원시 출력 1장 → NMS 후 검출 결과
+
+    Args:
+        pred: (4 + nc, A) 또는 (A, 4 + nc) [cx, cy, w, h, class scores...]
+        conf: confidence threshold
+        iou: NMS IoU threshold (클래스별)
+        max_det: 최대 검출 수
+
+    Returns:
+        (N, 6) [x1, y1, x2, y2, conf, cls] (입력 좌표계)
+    """
+    if pred.shape[0] < pred.shape[1]:
+        pred = pred.T  # (A, 4 + nc)
+
+    scores = pred[:, 4:]
+    class_id = scores.argmax(axis=1)
+    confidence = scores[np.arange(len(scores)), class_id]
+    keep = confidence > conf
+    if not keep.any():
+        return np.zeros((0, 6), np.float32)
+
+    xywh, confidence, class_id = pred[keep, :4], confidence[keep], class_id[keep]
+    if len(confidence) > MAX_NMS_CANDIDATES:
+        top = np.argpartition(-confidence, MAX_NMS_CANDIDATES)[:MAX_NMS_CANDIDATES]
+        xywh, confidence, class_id = xywh[top], confidence[top], class_id[top]
+
+    boxes = np.empty_like(xywh)
+    boxes[:, :2] = xywh[:, :2] - xywh[:, 2:] / 2
+    boxes[:, 2:] = xywh[:, :2] + xywh[:, 2:] / 2
+
+    # 클래스별 NMS: 클래스마다 좌표를 MAX_WH만큼 떨어뜨려 한 번에 처리
+    offset_boxes = boxes + (class_id[:, None] * MAX_WH).astype(np.float32)
+    keep_idx = _nms(offset_boxes, confidence, iou)[:max_det]
+
+    return np.concatenate([
+        boxes[keep_idx],
+        confidence[keep_idx, None],
+        class_id[keep_idx, None].astype(np.float32)
+    ], axis=1).astype(np.float32)
+
+
+def _nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Greedy NMS (점수 내림차순 인덱스 반환)"""
+    order = scores.argsort()[::-1]
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        xx1 = np.maximum(boxes[i, 0], boxes[rest, 0])
+        yy1 = np.maximum(boxes[i, 1], boxes[rest, 1])
+        xx2 = np.minimum(boxes[i, 2], boxes[rest, 2])
+        yy2 = np.minimum(boxes[i, 3], boxes[rest, 3])
+        inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+        overlap = inter / (areas[i] + areas[rest] - inter + 1e-7)
+        order = rest[overlap <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
+
+
+def scale_boxes(det: np.ndarray, gain_pad: Tuple[float, float, float], orig_shape: Tuple[int, int]) -> np.ndarray:
+    """레터박스 좌표 → 원본 이미지 좌표 (경계 클리핑)"""
+    if len(det) == 0:
+        return det
+    gain, pad_x, pad_y = gain_pad
+    det[:, [0, 2]] = ((det[:, [0, 2]] - pad_x) / gain).clip(0, orig_shape[1])
+    det[:, [1, 3]] = ((det[:, [1, 3]] - pad_y) / gain).clip(0, orig_shape[0])
+    return det
+
+
+def _parse_names(raw) -> Dict[int, str]:
+    """메타데이터 names ("{0: 'a', ...}" 문자열 또는 dict / list) → dict"""
+    if not raw:
+        return {}
+    if isinstance(raw, str):
+        raw = ast.literal_eval(raw)
+    if isinstance(raw, (list, tuple)):
+        raw = dict(enumerate(raw))
+    return {int(k): str(v) for k, v in raw.items()}
+
+
+# ----------------------------------------------------------------------
+# 생성
+# ----------------------------------------------------------------------
+def create_detector(backend: str, model_path: str, imgsz: int = 640, cpu_threads: int = 0,
+                    names: Optional[Dict[int, str]] = None):
+    """
+    설정에 맞는 검출기 생성
+
+    Args:
+        backend: 'pytorch' / 'onnxruntime' / 'openvino'
+        model_path: 백엔드별 모델 경로
+        imgsz: 입력 크기 (ONNX 백엔드)
+        cpu_threads: CPU 추론 스레드 수 (ONNX 백엔드, 0이면 기본값)
+        names: 클래스 이름 (ONNX 메타데이터가 없을 때)
+
+    Returns:
+        predict(frames, conf, iou, verbose) / names를 제공하는 검출기
+    """
+    backend = backend.lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 검출기 백엔드: {backend} (가능: {', '.join(BACKENDS)})")
+
+    if backend == 'pytorch':
+        from ultralytics import YOLO
+        return YOLO(model_path)
+    return OnnxDetector(model_path, runtime=backend, imgsz=imgsz, cpu_threads=cpu_threads, names=names)
+
+
+def load_configured_detector() -> Tuple[object, str, str]:
+    """
+    configs/server_config.yaml의 model 섹션에 맞는 검출기 로드
+
+    Returns:
+        (검출기, 모델 경로, 백엔드 이름)
+    """
+    backend = get_config_value('model.backend', 'pytorch')
+    if backend == 'pytorch':
+        model_path = PYTORCH_MODEL_PATH
+    else:
+        model_path = resolve_project_path(get_config_value(BACKEND_MODEL_PATH_KEYS.get(backend, ''), ''))
+
+    detector = create_detector(
+        backend,
+        model_path,
+        imgsz=get_config_value('model.imgsz', 640),
+        cpu_threads=get_config_value('model.cpu_threads', 0)
+    )
+    return detector, model_path, backend
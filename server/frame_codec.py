@@ -0,0 +1,190 @@
+"""
+프레임 업로드 디코딩 모듈
+
+/predict, /predict_test, /predict_dual 요청 본문에서 JPEG 프레임을 꺼내
+OpenCV 이미지로 디코딩합니다. 세 가지 업로드 방식을 지원합니다.
+
+1. JSON (기존 방식, 하위 호환)
+   {"camera_id": "left", "image": "<base64 JPEG>"}
+   {"left_image": "<base64 JPEG>", "right_image": "<base64 JPEG>"}
+
+2. multipart/form-data (권장 ⭐)
+   파일 파트 이름 = 기존 JSON 필드 이름 (image / left_image / right_image)
+   나머지 텍스트 파트(camera_id, timestamp 등)는 일반 필드로 취급
+
+3. application/octet-stream
+   - 단일 프레임: 본문 = JPEG 원본, camera_id는 쿼리 파라미터 또는 X-Camera-Id 헤더
+   - 양면 프레임: 본문 = 좌측 JPEG + 우측 JPEG 연결,
+     X-Left-Length 헤더에 좌측 JPEG 바이트 수 지정
+
+multipart / octet-stream 모드는 Base64 변환이 없어 전송 크기가 약 25% 작고,
+요청 버퍼를 np.frombuffer로 그대로 감싸서 복사 없이 cv2.imdecode에 전달합니다.
+"""
+
+import base64
+import binascii
+import logging
+from typing import Dict, Optional, Sequence, Union
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 업로드 모드 이름 (응답/로그/메트릭 표기용)
+UPLOAD_MODE_JSON = 'json'
+UPLOAD_MODE_MULTIPART = 'multipart'
+UPLOAD_MODE_BINARY = 'binary'
+
+# 양면 octet-stream 업로드 시 좌측 JPEG 길이를 전달하는 헤더
+LEFT_LENGTH_HEADER = 'X-Left-Length'
+CAMERA_ID_HEADER = 'X-Camera-Id'
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class FrameUpload:
+    """요청에서 추출한 JPEG 버퍼와 부가 필드"""
+
+    def __init__(self, mode: str, buffers: Dict[str, Optional[Buffer]],
+                 fields: Dict, wire_bytes: int):
+        """
+        Args:
+            mode: 업로드 모드 ('json' | 'multipart' | 'binary')
+            buffers: {필드 이름: JPEG 바이트 버퍼 또는 None}
+            fields: 프레임 외 나머지 필드 (camera_id, timestamp 등)
+            wire_bytes: 요청 본문 크기 (바이트)
+        """
+        self.mode = mode
+        self.buffers = buffers
+        self.fields = fields
+        self.wire_bytes = wire_bytes
+
+    def get(self, name: str) -> Optional[Buffer]:
+        """프레임 버퍼 조회 (없으면 None)"""
+        return self.buffers.get(name)
+
+    def decode(self, name: str) -> Optional[np.ndarray]:
+        """
+        프레임 디코딩 후 버퍼 해제
+
+        multipart 파트 버퍼는 업로드 스트림을 직접 참조하므로, 디코딩이 끝나면
+        즉시 release()해서 요청 종료 시 Werkzeug가 스트림을 닫을 수 있게 한다.
+        """
+        buffer = self.buffers.get(name)
+        frame = decode_jpeg(buffer)
+        if isinstance(buffer, memoryview):
+            buffer.release()
+        self.buffers[name] = None
+        return frame
+
+
+def decode_jpeg(buffer: Optional[Buffer]) -> Optional[np.ndarray]:
+    """
+    JPEG 바이트 버퍼를 BGR 이미지로 디코딩 (복사 없음)
+
+    Args:
+        buffer: JPEG 바이트 (bytes / bytearray / memoryview)
+
+    Returns:
+        BGR 이미지 또는 None (디코딩 실패)
+    """
+    if buffer is None or len(buffer) == 0:
+        return None
+
+    # np.frombuffer는 원본 버퍼를 공유하는 뷰를 만든다 (복사 없음)
+    np_arr = np.frombuffer(buffer, dtype=np.uint8)
+    frame = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+
+    if frame is None or frame.size == 0:
+        return None
+    return frame
+
+
+def _file_buffer(file_storage) -> Buffer:
+    """
+    업로드 파일 파트의 바이트 버퍼 반환
+
+    Werkzeug는 작은 파트를 메모리(BytesIO)에 보관하므로 getbuffer()로
+    복사 없이 접근하고, 디스크로 넘어간 큰 파트만 read()로 읽는다.
+    """
+    stream = file_storage.stream
+    inner = getattr(stream, '_file', stream)  # SpooledTemporaryFile 내부 버퍼
+    getbuffer = getattr(inner, 'getbuffer', None)
+    if getbuffer is not None:
+        try:
+            return getbuffer()
+        except (BufferError, ValueError):
+            pass
+    stream.seek(0)
+    return stream.read()
+
+
+def parse_frame_upload(req, frame_fields: Sequence[str]) -> Optional[FrameUpload]:
+    """
+    Flask 요청에서 프레임 버퍼 추출 (JSON / multipart / octet-stream 자동 판별)
+
+    Args:
+        req: flask.request
+        frame_fields: 프레임 필드 이름 목록 (예: ('image',), ('left_image', 'right_image'))
+
+    Returns:
+        FrameUpload 또는 None (본문이 비어 있음)
+
+    Raises:
+        ValueError: Base64 디코딩 실패 또는 octet-stream 분할 정보 오류
+    """
+    content_type = (req.mimetype or '').lower()
+    wire_bytes = req.content_length or 0
+
+    # 1. multipart/form-data
+    if content_type == 'multipart/form-data':
+        buffers = {}
+        for name in frame_fields:
+            file_storage = req.files.get(name)
+            buffers[name] = _file_buffer(file_storage) if file_storage else None
+        fields = req.form.to_dict()
+        if not fields and not any(b is not None for b in buffers.values()):
+            return None
+        return FrameUpload(UPLOAD_MODE_MULTIPART, buffers, fields, wire_bytes)
+
+    # 2. application/octet-stream (본문 = JPEG 원본)
+    if content_type == 'application/octet-stream':
+        body = req.get_data(cache=False)
+        if not body:
+            return None
+        view = memoryview(body)
+        fields = req.args.to_dict()
+        if CAMERA_ID_HEADER in req.headers:
+            fields.setdefault('camera_id', req.headers[CAMERA_ID_HEADER])
+
+        if len(frame_fields) == 1:
+            buffers = {frame_fields[0]: view}
+        else:
+            left_length = req.headers.get(LEFT_LENGTH_HEADER, type=int)
+            if left_length is None or not 0 <= left_length <= len(view):
+                raise ValueError(f'{LEFT_LENGTH_HEADER} header is missing or out of range')
+            left_name, right_name = frame_fields[0], frame_fields[1]
+            buffers = {
+                left_name: view[:left_length] or None,
+                right_name: view[left_length:] or None
+            }
+        return FrameUpload(UPLOAD_MODE_BINARY, buffers, fields, wire_bytes)
+
+    # 3. JSON (기존 Base64 방식)
+    data = req.get_json(silent=True)
+    if not data:
+        return None
+
+    buffers = {}
+    for name in frame_fields:
+        value = data.get(name)
+        if value:
+            try:
+                buffers[name] = base64.b64decode(value)
+            except (binascii.Error, TypeError) as e:
+                raise ValueError(f'Invalid base64 in {name}: {e}')
+        else:
+            buffers[name] = None
+    fields = {k: v for k, v in data.items() if k not in frame_fields}
+    return FrameUpload(UPLOAD_MODE_JSON, buffers, fields, wire_bytes)
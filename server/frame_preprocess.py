@@ -0,0 +1,151 @@
+"""
+카메라 프레임 → 검사 입력 / 모델 입력 전처리 (1회 리사이즈)
+
+카메라 프레임(640x480)을 정사각형 중앙 크롭 + 640x640 리사이즈를 한 번에 수행하고,
+같은 기하 정보(SquareGeometry)로 검출 좌표를 원본 카메라 좌표로 되돌립니다.
+
+    preprocessor = FramePreprocessor(640)
+    square, geometry = preprocessor.prepare(frame)   # 크롭 + 리사이즈 1회
+    to_tensor(square, out=batch[i])                  # BGR HWC uint8 → RGB CHW 0~1 (배치 슬롯에 바로 기록)
+    geometry.to_source(detections.boxes)             # 640 좌표 → 원본 카메라 좌표
+
+출력 프레임은 호출마다 새로 할당합니다. 검사 프레임은 요청 처리가 끝난 뒤에도 응답 / DB 저장 /
+뷰어에서 참조될 수 있어 반납 시점을 정할 수 없으므로 버퍼를 재사용하지 않습니다
+(640x640 할당 비용은 크롭 + 리사이즈 1회에 비해 작음).
+"""
+
+import threading
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+INV_255 = np.float32(1 / 255.0)
+
+
+class SquareGeometry:
+    """정사각형 중앙 크롭 + 리사이즈 기하 정보 (검사 좌표 ↔ 원본 카메라 좌표)"""
+
+    __slots__ = ('source_shape', 'crop_x', 'crop_y', 'crop_size', 'target_size', 'scale')
+
+    def __init__(self, source_shape: Tuple[int, ...], target_size: int):
+        """
+        Args:
+            source_shape: 원본 프레임 shape (h, w[, c])
+            target_size: 출력 정사각형 크기
+        """
+        h, w = source_shape[:2]
+        self.source_shape = (h, w)
+        self.crop_size = min(h, w)
+        self.crop_x = (w - self.crop_size) // 2
+        self.crop_y = (h - self.crop_size) // 2
+        self.target_size = target_size
+        self.scale = target_size / self.crop_size  # 원본 → 검사 좌표 배율
+
+    @property
+    def crop_slices(self) -> Tuple[slice, slice]:
+        """원본 프레임의 크롭 영역 (행 슬라이스, 열 슬라이스)"""
+        return (slice(self.crop_y, self.crop_y + self.crop_size),
+                slice(self.crop_x, self.crop_x + self.crop_size))
+
+    @property
+    def is_identity(self) -> bool:
+        """원본이 이미 target_size 정사각형인지 (크롭 / 리사이즈 없음)"""
+        return self.source_shape == (self.target_size, self.target_size)
+
+    def to_source(self, boxes: np.ndarray) -> np.ndarray:
+        """
+        검사 좌표 (x1, y1, x2, y2) → 원본 카메라 좌표
+
+        Args:
+            boxes: (N, 4) 또는 (N, 2) 점 배열
+
+        Returns:
+            같은 shape의 float32 배열 (새 배열)
+        """
+        boxes = np.asarray(boxes, dtype=np.float32)
+        mapped = boxes / self.scale
+        mapped[..., 0::2] += self.crop_x
+        mapped[..., 1::2] += self.crop_y
+        return mapped
+
+    def to_target(self, boxes: np.ndarray) -> np.ndarray:
+        """원본 카메라 좌표 → 검사 좌표 (to_source의 역변환)"""
+        mapped = np.array(boxes, dtype=np.float32)
+        mapped[..., 0::2] -= self.crop_x
+        mapped[..., 1::2] -= self.crop_y
+        return mapped * self.scale
+
+    def to_dict(self) -> dict:
+        """API 응답용"""
+        return {
+            'source_size': [self.source_shape[1], self.source_shape[0]],
+            'crop': [self.crop_x, self.crop_y, self.crop_size, self.crop_size],
+            'target_size': self.target_size,
+            'scale': round(self.scale, 6)
+        }
+
+
+class FramePreprocessor:
+    """정사각형 크롭 + 리사이즈 1회 수행"""
+
+    def __init__(self, target_size: int = 640):
+        """
+        Args:
+            target_size: 출력 정사각형 크기 (YOLO 입력 크기)
+        """
+        self.target_size = target_size
+        self._lock = threading.Lock()
+        self._resized = 0
+        self._passthrough = 0
+
+    def prepare(self, frame: np.ndarray) -> Tuple[np.ndarray, SquareGeometry]:
+        """
+        카메라 프레임 → target_size 정사각형 (중앙 크롭 + 리사이즈 1회)
+
+        Args:
+            frame: 원본 프레임 (BGR)
+
+        Returns:
+            (정사각형 프레임, 기하 정보) - 원본이 이미 target_size 정사각형이면 원본을 그대로 반환
+        """
+        geometry = SquareGeometry(frame.shape, self.target_size)
+        if geometry.is_identity or geometry.crop_size == self.target_size:
+            with self._lock:
+                self._passthrough += 1
+            # 원본 그대로 또는 크롭만 필요 (뷰, 복사 없음)
+            return (frame if geometry.is_identity else frame[geometry.crop_slices]), geometry
+
+        size = (self.target_size, self.target_size)
+        square = cv2.resize(frame[geometry.crop_slices], size, interpolation=cv2.INTER_LINEAR)
+        with self._lock:
+            self._resized += 1
+        return square, geometry
+
+    def get_stats(self) -> dict:
+        """전처리 통계 (리사이즈 / 원본·크롭 뷰 반환 횟수)"""
+        with self._lock:
+            return {
+                'resized': self._resized,
+                'passthrough': self._passthrough
+            }
+
+
+def to_tensor(frame: np.ndarray, out: Optional[np.ndarray] = None, dtype=np.float32) -> np.ndarray:
+    """
+    BGR HWC uint8 → RGB CHW 0~1 텐서 (채널 분리 후 채널별 정규화를 out에 바로 기록)
+
+    Args:
+        frame: (H, W, 3) BGR 이미지
+        out: (3, H, W) 출력 버퍼 (None이면 새로 할당, 배치 텐서의 한 슬롯을 넘기면 그 자리에 기록)
+        dtype: out이 없을 때 출력 dtype (float32 / float16)
+
+    Returns:
+        out
+    """
+    if out is None:
+        out = np.empty((3,) + frame.shape[:2], dtype=dtype)
+    for i, channel in enumerate(reversed(cv2.split(frame))):
+        np.multiply(channel, INV_255, out=out[i], dtype=np.float32, casting='unsafe')
+    return out
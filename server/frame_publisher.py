@@ -0,0 +1,170 @@
+"""
+프레임 퍼블리셔 (JPEG 인코딩 + SocketIO broadcast 전용 스레드)
+
+추론 요청 경로는 publish()로 최신 프레임 참조만 넘기고 바로 반환합니다.
+JPEG 인코딩, Base64 변환, socketio.emit('frame_update')는 전용 스레드에서 처리하며,
+카메라별로 아직 처리되지 않은 프레임이 있으면 새 프레임으로 덮어씁니다 (latest-frame-wins).
+
+인코딩된 JPEG는 카메라별로 프레임 ID와 함께 캐시되어 /video_feed, request_frame 핸들러가
+다시 인코딩하지 않고 그대로 사용하며, 프레임 ID가 같으면 다시 보내지 않습니다.
+"""
+
+import base64
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Baseline JPEG (C# Image.FromStream() 호환성)
+JPEG_ENCODE_PARAMS = [
+    cv2.IMWRITE_JPEG_QUALITY, 85,
+    cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+    cv2.IMWRITE_JPEG_OPTIMIZE, 1
+]
+
+
+class _PublishJob:
+    """카메라별 대기 중인 퍼블리시 작업"""
+
+    __slots__ = ('frame', 'event', 'on_encoded', 'frame_id')
+
+    def __init__(self, frame: np.ndarray, event: Optional[Dict], on_encoded: Optional[Callable[[str], None]],
+                 frame_id: Optional[int]):
+        self.frame = frame
+        self.event = event
+        self.on_encoded = on_encoded
+        self.frame_id = frame_id
+
+
+class FramePublisher:
+    """최신 프레임 JPEG 인코딩 및 broadcast 스레드"""
+
+    def __init__(self, socketio, event_name: str = 'frame_update'):
+        """
+        Args:
+            socketio: Flask-SocketIO 인스턴스
+            event_name: broadcast 이벤트 이름
+        """
+        self.socketio = socketio
+        self.event_name = event_name
+
+        self._cond = threading.Condition()
+        self._pending: Dict[str, _PublishJob] = {}
+
+        # 카메라별 인코딩 결과 캐시
+        self._cache_lock = threading.Lock()
+        self._jpeg: Dict[str, bytes] = {}
+        self._jpeg_base64: Dict[str, str] = {}
+        self._frame_ids: Dict[str, Optional[int]] = {}
+
+        # 통계
+        self.published_count = 0
+        self.dropped_count = 0   # 인코딩 전에 새 프레임으로 대체된 수
+        self.encoded_count = 0
+
+        self._worker = threading.Thread(target=self._run, name='frame-publisher', daemon=True)
+        self._worker.start()
+        logger.info("✅ 프레임 퍼블리셔 스레드 시작 (latest-frame-wins)")
+
+    def publish(self, camera_id: str, frame: np.ndarray, event: Optional[Dict] = None,
+                on_encoded: Optional[Callable[[str], None]] = None, frame_id: Optional[int] = None):
+        """
+        프레임 퍼블리시 요청 (즉시 반환)
+
+        Args:
+            camera_id: 'left' 또는 'right'
+            frame: 표시할 BGR 이미지 (호출 후 수정하지 말 것)
+            event: broadcast할 이벤트 데이터 ('image' 키는 인코딩 후 자동 추가, None이면 broadcast 안 함)
+            on_encoded: 인코딩 완료 후 Base64 문자열로 호출할 콜백 (퍼블리셔 스레드에서 실행)
+            frame_id: 카메라별 프레임 ID (캐시와 broadcast 이벤트의 'frame_id'에 기록)
+        """
+        with self._cond:
+            if camera_id in self._pending:
+                self.dropped_count += 1
+            self._pending[camera_id] = _PublishJob(frame, event, on_encoded, frame_id)
+            self.published_count += 1
+            self._cond.notify()
+
+    def get_jpeg(self, camera_id: str) -> Optional[bytes]:
+        """최신 JPEG 바이트 (없으면 None)"""
+        with self._cache_lock:
+            return self._jpeg.get(camera_id)
+
+    def get_jpeg_base64(self, camera_id: str) -> Optional[str]:
+        """최신 JPEG Base64 문자열 (없으면 None)"""
+        with self._cache_lock:
+            return self._jpeg_base64.get(camera_id)
+
+    def get_latest(self, camera_id: str) -> Tuple[Optional[int], Optional[bytes], Optional[str]]:
+        """
+        최신 인코딩 결과를 한 번에 조회 (프레임 ID와 JPEG가 서로 다른 프레임이 되지 않도록)
+
+        Returns:
+            (frame_id, JPEG 바이트, Base64 문자열) - 없으면 (None, None, None)
+        """
+        with self._cache_lock:
+            return (self._frame_ids.get(camera_id), self._jpeg.get(camera_id),
+                    self._jpeg_base64.get(camera_id))
+
+    def clear(self, camera_id: str):
+        """카메라 캐시 초기화"""
+        with self._cache_lock:
+            self._jpeg.pop(camera_id, None)
+            self._jpeg_base64.pop(camera_id, None)
+            self._frame_ids.pop(camera_id, None)
+
+    def get_stats(self) -> Dict:
+        """퍼블리시 / 인코딩 / 대체(drop) 횟수"""
+        with self._cond:
+            return {
+                'published': self.published_count,
+                'encoded': self.encoded_count,
+                'dropped': self.dropped_count,
+                'pending': len(self._pending)
+            }
+
+    def _run(self):
+        """퍼블리셔 루프: 대기 중인 최신 프레임을 인코딩 후 broadcast"""
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                jobs = self._pending
+                self._pending = {}
+
+            for camera_id, job in jobs.items():
+                try:
+                    self._publish_job(camera_id, job)
+                except Exception as e:
+                    logger.error(f"❌ 프레임 퍼블리시 실패 ({camera_id}): {e}", exc_info=True)
+
+    def _publish_job(self, camera_id: str, job: _PublishJob):
+        """단일 작업 처리 (인코딩 → 캐시 → 콜백 → broadcast)"""
+        ret, buffer = cv2.imencode('.jpg', job.frame, JPEG_ENCODE_PARAMS)
+        if not ret:
+            logger.warning(f"⚠️  JPEG 인코딩 실패: {camera_id}")
+            return
+
+        jpeg_bytes = buffer.tobytes()
+        frame_base64 = base64.b64encode(jpeg_bytes).decode('utf-8')
+
+        with self._cache_lock:
+            self._jpeg[camera_id] = jpeg_bytes
+            self._jpeg_base64[camera_id] = frame_base64
+            self._frame_ids[camera_id] = job.frame_id
+        with self._cond:
+            self.encoded_count += 1
+
+        if job.on_encoded is not None:
+            job.on_encoded(frame_base64)
+
+        if job.event is not None:
+            payload = dict(job.event)
+            payload['image'] = frame_base64
+            if job.frame_id is not None:
+                payload['frame_id'] = job.frame_id
+            self.socketio.emit(self.event_name, payload)
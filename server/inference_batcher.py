@@ -0,0 +1,248 @@
+"""
+YOLO 동적 마이크로 배칭 스케줄러
+
+/predict, /predict_test, /predict_dual, request_template_match 핸들러는
+Flask-SocketIO threading 워커에서 동시에 실행되며 하나의 YOLO 모델을 공유합니다.
+이 모듈은 각 호출자의 프레임을 큐에 모은 뒤, 짧은 시간 창(batch_window_ms) 안에
+도착한 요청을 한 번의 배치 predict로 처리하고 결과를 호출자별로 돌려줍니다.
+
+- 최대 배치 크기: inference.max_batch_size (configs/server_config.yaml)
+- 배치 대기 시간: inference.batch_window_ms
+- 호출자 대기 한도: inference.timeout (초)
+
+conf / iou 값이 다른 요청은 같은 배치에 섞지 않습니다.
+호출자가 timeout으로 포기한 요청은 취소 표시되고 배치에 넣지 않습니다 (과부하 시 아무도 읽지 않을 추론 생략).
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _InferenceRequest:
+    """배치 큐에 들어가는 단일 프레임 요청"""
+
+    __slots__ = ('frame', 'key', 'enqueued_at', 'done', 'result', 'error', 'queue_wait_ms', 'cancelled')
+
+    def __init__(self, frame: np.ndarray, key: tuple):
+        self.frame = frame
+        self.key = key  # (conf, iou) - 같은 키끼리만 배치
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.queue_wait_ms = 0.0
+        self.cancelled = False  # 호출자가 대기를 포기함 (배치에서 제외)
+
+
+class InferenceBatcher:
+    """YOLO 동적 마이크로 배칭 큐"""
+
+    def __init__(self, model, max_batch_size: int = 2, batch_window_ms: float = 5.0,
+                 timeout: float = 5.0, stats_window: int = 500):
+        """
+        Args:
+            model: ultralytics YOLO 모델 (predict(list_of_frames) 지원)
+            max_batch_size: 한 번에 추론할 최대 프레임 수
+            batch_window_ms: 첫 요청 도착 후 추가 요청을 기다리는 시간 (밀리초)
+            timeout: 호출자가 결과를 기다리는 최대 시간 (초)
+            stats_window: 통계 계산에 사용할 최근 배치/요청 수
+        """
+        self.model = model
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.batch_window = max(0.0, float(batch_window_ms)) / 1000.0
+        self.timeout = float(timeout)
+
+        self._queue: "queue.Queue[_InferenceRequest]" = queue.Queue()
+        self._pending: deque = deque()  # 키가 달라 이전 배치에 못 들어간 요청
+
+        # 통계
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = deque(maxlen=stats_window)
+        self._queue_waits_ms = deque(maxlen=stats_window)
+        self._predict_ms = deque(maxlen=stats_window)
+        self._total_batches = 0
+        self._total_frames = 0
+        self._total_errors = 0
+        self._total_cancelled = 0
+
+        self._worker = threading.Thread(target=self._run, name='yolo-batcher', daemon=True)
+        self._worker.start()
+
+        logger.info("✅ YOLO 배칭 스케줄러 시작")
+        logger.info(f"   - 최대 배치 크기: {self.max_batch_size}")
+        logger.info(f"   - 배치 대기 시간: {self.batch_window * 1000:.1f}ms")
+
+    def predict(self, frame: np.ndarray, conf: float = 0.3, iou: float = 0.7):
+        """
+        프레임 1장 추론 (배치 큐 경유, 호출 스레드는 결과가 나올 때까지 대기)
+
+        Args:
+            frame: BGR 이미지
+            conf: confidence threshold
+            iou: NMS IoU threshold
+
+        Returns:
+            yolo_model.predict(frame)와 같은 형식의 결과 리스트 (길이 1)
+
+        Raises:
+            TimeoutError: timeout 안에 결과가 나오지 않은 경우
+        """
+        req = _InferenceRequest(frame, (float(conf), float(iou)))
+        self._queue.put(req)
+
+        if not req.done.wait(self.timeout):
+            req.cancelled = True
+            req.frame = None
+            raise TimeoutError(f"YOLO 추론 대기 시간 초과 ({self.timeout:.1f}s)")
+        if req.error is not None:
+            raise req.error
+        return [req.result]
+
+    def _is_live(self, req: _InferenceRequest) -> bool:
+        """
+        결과를 기다리는 호출자가 있는 요청인지 (취소 / 대기 한도 초과 요청은 버림)
+
+        대기 한도가 지난 요청은 호출자가 아직 취소 표시를 하기 전이어도 곧 TimeoutError로 포기하므로 함께 버립니다.
+        """
+        if req.cancelled or time.perf_counter() - req.enqueued_at >= self.timeout:
+            req.cancelled = True
+            req.frame = None
+            req.error = TimeoutError(f"YOLO 추론 대기 시간 초과 ({self.timeout:.1f}s)")
+            req.done.set()  # 아직 대기 중인 호출자는 TimeoutError
+            with self._stats_lock:
+                self._total_cancelled += 1
+            return False
+        return True
+
+    def _next_request(self, block_timeout: Optional[float]) -> Optional[_InferenceRequest]:
+        """보류 요청 우선, 없으면 큐에서 꺼냄 (취소된 요청은 건너뜀)"""
+        while self._pending:
+            req = self._pending.popleft()
+            if self._is_live(req):
+                return req
+        while True:
+            try:
+                req = self._queue.get(timeout=block_timeout)
+            except queue.Empty:
+                return None
+            if self._is_live(req):
+                return req
+
+    def _collect_batch(self) -> List[_InferenceRequest]:
+        """첫 요청 도착 후 batch_window 동안 같은 키의 요청을 모음"""
+        first = self._next_request(block_timeout=None)
+        batch = [first]
+        deadline = time.perf_counter() + self.batch_window
+
+        # 보류 요청 중 같은 키를 먼저 합침
+        skipped = deque()
+        while self._pending and len(batch) < self.max_batch_size:
+            req = self._pending.popleft()
+            if self._is_live(req):
+                (batch if req.key == first.key else skipped).append(req)
+        skipped.extend(self._pending)
+        self._pending = skipped
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                req = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if not self._is_live(req):
+                continue
+            if req.key == first.key:
+                batch.append(req)
+            else:
+                self._pending.append(req)
+        return batch
+
+    def _run(self):
+        """배치 워커 루프"""
+        while True:
+            # 배치를 모으는 동안 대기 한도가 지난 요청 제외
+            batch = [req for req in self._collect_batch() if self._is_live(req)]
+            if not batch:
+                continue
+            conf, iou = batch[0].key
+            start = time.perf_counter()
+            for req in batch:
+                req.queue_wait_ms = (start - req.enqueued_at) * 1000
+
+            try:
+                results = self.model.predict([req.frame for req in batch], conf=conf, iou=iou, verbose=False)
+                for req, result in zip(batch, results):
+                    req.result = result
+            except Exception as e:
+                logger.error(f"❌ 배치 추론 실패 (배치 크기 {len(batch)}): {e}")
+                for req in batch:
+                    req.error = e
+
+            predict_ms = (time.perf_counter() - start) * 1000
+            self._record(batch, predict_ms)
+
+            for req in batch:
+                req.frame = None
+                req.done.set()
+
+    def _record(self, batch: List[_InferenceRequest], predict_ms: float):
+        """배치 통계 기록"""
+        with self._stats_lock:
+            self._total_batches += 1
+            self._total_frames += len(batch)
+            if batch[0].error is not None:
+                self._total_errors += 1
+            self._batch_sizes.append(len(batch))
+            self._predict_ms.append(predict_ms)
+            self._queue_waits_ms.extend(req.queue_wait_ms for req in batch)
+
+    def get_stats(self) -> Dict:
+        """
+        배치 크기 / 큐 대기 시간 통계
+
+        Returns:
+            누적 카운터와 최근 stats_window 기준 통계 딕셔너리
+        """
+        with self._stats_lock:
+            sizes = np.array(self._batch_sizes, dtype=np.float64)
+            waits = np.array(self._queue_waits_ms, dtype=np.float64)
+            predicts = np.array(self._predict_ms, dtype=np.float64)
+            stats = {
+                'max_batch_size': self.max_batch_size,
+                'batch_window_ms': round(self.batch_window * 1000, 2),
+                'queue_depth': self._queue.qsize() + len(self._pending),
+                'total_batches': self._total_batches,
+                'total_frames': self._total_frames,
+                'total_errors': self._total_errors,
+                'total_cancelled': self._total_cancelled,
+                'batch_size_histogram': {
+                    str(size): int((sizes == size).sum()) for size in range(1, self.max_batch_size + 1)
+                },
+            }
+
+        stats['avg_batch_size'] = round(float(sizes.mean()), 3) if sizes.size else 0.0
+        stats['queue_wait_ms'] = _summarize(waits)
+        stats['predict_ms'] = _summarize(predicts)
+        return stats
+
+
+def _summarize(samples: np.ndarray) -> Dict:
+    """평균 / p50 / p95 / 최대 (ms)"""
+    if samples.size == 0:
+        return {'avg': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    return {
+        'avg': round(float(samples.mean()), 2),
+        'p50': round(float(np.percentile(samples, 50)), 2),
+        'p95': round(float(np.percentile(samples, 95)), 2),
+        'max': round(float(samples.max()), 2)
+    }
@@ -0,0 +1,346 @@
+"""
+전용 추론 프로세스 + 프론트엔드 워커용 원격 모델 프록시 (멀티 프로세스 서빙 모드)
+
+serve.py가 만드는 프로세스 구성:
+    프론트엔드 워커 N개 (Flask + SocketIO, 요청 파싱 / JPEG 디코딩 / 스트리밍 / DB)
+        │  프레임: 워커별 공유 메모리 링 (shm_ring.SharedFrameRing)
+        │  요청:   (op, worker_id, req_id, 프레임 참조, 파라미터) → 공용 요청 큐
+        ▼
+    추론 프로세스 1개 (YOLO + 배칭 스케줄러, 시리얼 OCR)
+        │  응답:   (req_id, 에러, 결과) → 워커별 응답 큐
+        ▼
+    RemoteDetector / RemoteSerialDetector (app.py의 yolo_model / serial_detector 자리)
+
+프레임은 pickle하지 않고 공유 메모리 슬롯에 한 번 복사되며,
+추론 프로세스는 슬롯을 numpy 뷰로 바로 읽습니다. 큐에는 작은 메타데이터와 검출 배열만 오갑니다.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import numpy as np
+
+from detector_backends import BackendResult
+from shm_ring import SharedFrameRing, DEFAULT_SLOT_BYTES
+
+logger = logging.getLogger(__name__)
+
+# 요청 종류
+OP_INFO = 'info'      # 모델 준비 상태 / 클래스 이름
+OP_DETECT = 'detect'  # YOLO 부품 검출
+OP_OCR = 'ocr'        # 시리얼 넘버 OCR
+OP_OCR_LABEL = 'ocr_label'  # 시리얼 라벨 위치 삭제 / 통계
+
+
+class _PendingCall:
+    """응답 대기 중인 요청"""
+
+    __slots__ = ('slot', 'done', 'error', 'payload')
+
+    def __init__(self, slot: Optional[int]):
+        self.slot = slot
+        self.done = threading.Event()
+        self.error = None
+        self.payload = None
+
+
+class InferenceClient:
+    """프론트엔드 워커 → 추론 프로세스 요청 클라이언트 (워커 프로세스당 1개)"""
+
+    def __init__(self, worker_id: int, request_queue, response_queue, slots: int = 8,
+                 slot_bytes: int = DEFAULT_SLOT_BYTES, timeout: float = 5.0):
+        """
+        Args:
+            worker_id: 워커 번호 (응답 큐 인덱스)
+            request_queue: 공용 요청 큐 (multiprocessing.Queue)
+            response_queue: 이 워커의 응답 큐 (multiprocessing.Queue)
+            slots: 공유 메모리 링 슬롯 수
+            slot_bytes: 슬롯당 최대 프레임 바이트
+            timeout: 기본 응답 대기 시간 (초)
+        """
+        self.worker_id = worker_id
+        self.request_queue = request_queue
+        self.response_queue = response_queue
+        self.timeout = float(timeout)
+        self.ring = SharedFrameRing(slots=slots, slot_bytes=slot_bytes)
+
+        self._ids = itertools.count()
+        self._pending: Dict[int, _PendingCall] = {}
+        self._pending_lock = threading.Lock()
+
+        self._listener = threading.Thread(target=self._listen, name='inference-client', daemon=True)
+        self._listener.start()
+
+    def call(self, op: str, frame: Optional[np.ndarray] = None, timeout: Optional[float] = None, **params):
+        """
+        추론 프로세스에 요청하고 결과 대기
+
+        Args:
+            op: 요청 종류 (OP_INFO / OP_DETECT / OP_OCR / OP_OCR_LABEL)
+            frame: 입력 프레임 (공유 메모리 링으로 전달, 슬롯보다 크면 큐로 직접 전달)
+            timeout: 응답 대기 시간 (None이면 기본값)
+            **params: 요청 파라미터 (conf, iou 등)
+
+        Returns:
+            요청별 결과
+
+        Raises:
+            TimeoutError: 응답 시간 초과
+            RuntimeError: 추론 프로세스에서 실패
+        """
+        timeout = self.timeout if timeout is None else timeout
+        slot, frame_ref = None, None
+        if frame is not None:
+            if self.ring.fits(frame):
+                slot, shape, dtype = self.ring.write(frame, timeout=timeout)
+                frame_ref = ('shm', self.ring.name, slot, shape, dtype)
+            else:
+                frame_ref = ('inline', frame)
+
+        req_id = next(self._ids)
+        pending = _PendingCall(slot)
+        with self._pending_lock:
+            self._pending[req_id] = pending
+        self.request_queue.put((op, self.worker_id, req_id, frame_ref, params))
+
+        # 시간 초과 시에도 pending은 남겨 둠 (늦은 응답이 도착하면 리스너가 슬롯 반납)
+        if not pending.done.wait(timeout):
+            raise TimeoutError(f"추론 프로세스 응답 시간 초과 ({op}, {timeout:.1f}s)")
+        if pending.error is not None:
+            raise RuntimeError(pending.error)
+        return pending.payload
+
+    def _listen(self):
+        """응답 수신 루프 (슬롯 반납 + 대기 중인 호출자 깨우기)"""
+        while True:
+            req_id, error, payload = self.response_queue.get()
+            with self._pending_lock:
+                pending = self._pending.pop(req_id, None)
+            if pending is None:
+                continue
+            if pending.slot is not None:
+                self.ring.release(pending.slot)
+            pending.error = error
+            pending.payload = payload
+            pending.done.set()
+
+    def close(self):
+        self.ring.close()
+
+
+class RemoteDetector:
+    """추론 프로세스의 YOLO 검출기 프록시 (ultralytics YOLO.predict 호환)"""
+
+    def __init__(self, client: InferenceClient, startup_timeout: float = 300.0):
+        """
+        Args:
+            client: 워커의 InferenceClient
+            startup_timeout: 추론 프로세스의 모델 로드 / 워밍업 대기 시간 (초)
+
+        Raises:
+            RuntimeError: 추론 프로세스에서 YOLO 로드에 실패한 경우
+        """
+        self.client = client
+        info = client.call(OP_INFO, timeout=startup_timeout)
+        if info['status'].get('yolo') != 'ready':
+            raise RuntimeError(f"추론 프로세스 YOLO 로드 실패: {info['errors'].get('yolo')}")
+        self.names = info['names']
+
+    def predict(self, source, conf: float = 0.3, iou: float = 0.7, verbose: bool = False):
+        """
+        YOLO 추론 (프레임별 요청, 추론 프로세스에서 워커 간 배칭)
+
+        Returns:
+            이미지별 BackendResult 리스트
+        """
+        frames = [source] if isinstance(source, np.ndarray) else list(source)
+        results = []
+        for frame in frames:
+            start = time.perf_counter()
+            data = self.client.call(OP_DETECT, frame, conf=float(conf), iou=float(iou))
+            speed = {'inference': (time.perf_counter() - start) * 1000}
+            results.append(BackendResult(data, self.names, frame.shape[:2], speed))
+        return results
+
+
+class RemoteSerialDetector:
+    """추론 프로세스의 시리얼 넘버 OCR 프록시 (SerialNumberDetector 호환)"""
+
+    def __init__(self, client: InferenceClient, startup_timeout: float = 300.0, ocr_timeout: float = 30.0):
+        """
+        Args:
+            client: 워커의 InferenceClient
+            startup_timeout: 추론 프로세스의 모델 로드 / 워밍업 대기 시간 (초)
+            ocr_timeout: OCR 1회 응답 대기 시간 (초)
+
+        Raises:
+            RuntimeError: 추론 프로세스에서 OCR 초기화에 실패한 경우
+        """
+        self.client = client
+        self.ocr_timeout = ocr_timeout
+        info = client.call(OP_INFO, timeout=startup_timeout)
+        if info['status'].get('ocr') != 'ready':
+            raise RuntimeError(f"추론 프로세스 OCR 초기화 실패: {info['errors'].get('ocr')}")
+
+    def detect_serial_number(self, image: np.ndarray, learn_label: bool = True) -> Dict:
+        return self.client.call(OP_OCR, image, timeout=self.ocr_timeout, learn_label=learn_label)
+
+    def forget_label(self):
+        """추론 프로세스가 기억한 라벨 위치 삭제"""
+        self.client.call(OP_OCR_LABEL, action='forget')
+
+    def get_label_stats(self) -> Dict:
+        """추론 프로세스의 라벨 영역 OCR 통계"""
+        return self.client.call(OP_OCR_LABEL, action='stats')
+
+
+# ----------------------------------------------------------------------
+# 워커 프로세스 전역 클라이언트 (serve.py가 app 임포트 전에 설정)
+# ----------------------------------------------------------------------
+_client: Optional[InferenceClient] = None
+
+
+def configure_inference_client(worker_id: int, request_queue, response_queue, **kwargs) -> InferenceClient:
+    """현재 워커 프로세스의 추론 클라이언트 생성 (멀티 프로세스 모드)"""
+    global _client
+    _client = InferenceClient(worker_id, request_queue, response_queue, **kwargs)
+    return _client
+
+
+def get_inference_client() -> Optional[InferenceClient]:
+    """멀티 프로세스 모드면 추론 클라이언트, 단일 프로세스 모드면 None"""
+    return _client
+
+
+# ----------------------------------------------------------------------
+# 추론 프로세스
+# ----------------------------------------------------------------------
+def run_inference_process(request_queue, response_queues, handler_threads: int = 8):
+    """
+    추론 프로세스 메인 루프
+
+    YOLO(배칭 스케줄러 포함)와 시리얼 OCR을 로드 / 워밍업한 뒤,
+    요청을 스레드 풀에서 처리합니다 (동시 요청은 배칭 스케줄러가 한 배치로 묶음).
+
+    Args:
+        request_queue: 공용 요청 큐
+        response_queues: 워커별 응답 큐 리스트
+        handler_threads: 요청 처리 스레드 수
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] [%(levelname)s] [Inference-Process] [%(module)s] - %(message)s',
+        force=True  # fork로 상속된 실행기 로깅 설정 대체
+    )
+
+    from detector_backends import load_configured_detector
+    from inference_batcher import InferenceBatcher
+    from serial_number_detector import SerialNumberDetector
+    from server_config import get_config_value
+
+    status = {'yolo': 'loading', 'ocr': 'loading'}
+    errors: Dict[str, Optional[str]] = {'yolo': None, 'ocr': None}
+    names: Dict[int, str] = {}
+    batcher = None
+    serial_detector = None
+
+    # 1. YOLO 로드 + 워밍업
+    try:
+        model, model_path, backend = load_configured_detector()
+        batcher = InferenceBatcher(
+            model,
+            max_batch_size=get_config_value('inference.max_batch_size', 2),
+            batch_window_ms=get_config_value('inference.batch_window_ms', 5.0),
+            timeout=get_config_value('inference.timeout', 5.0)
+        )
+        names = {int(k): str(v) for k, v in model.names.items()}
+        frame = np.zeros((640, 640, 3), dtype=np.uint8)
+        for batch_size in range(1, batcher.max_batch_size + 1):
+            model.predict([frame] * batch_size, conf=0.3, iou=0.7, verbose=False)
+        status['yolo'] = 'ready'
+        logger.info(f"✅ YOLO 로드 + 워밍업 완료: {model_path} (백엔드: {backend})")
+    except Exception as e:
+        status['yolo'] = 'failed'
+        errors['yolo'] = str(e)
+        logger.error(f"❌ YOLO 로드 실패: {e}")
+
+    # 2. 시리얼 OCR 로드
+    try:
+        serial_detector = SerialNumberDetector(
+            label_mode=get_config_value('ocr.label_mode', 'auto'),
+            label_roi=get_config_value('ocr.label_roi', None),
+            label_padding=get_config_value('ocr.label_padding', 0.5)
+        )
+        status['ocr'] = 'ready'
+        logger.info("✅ 시리얼 넘버 OCR 검출기 초기화 완료")
+    except Exception as e:
+        status['ocr'] = 'failed'
+        errors['ocr'] = str(e)
+        logger.error(f"❌ 시리얼 넘버 OCR 초기화 실패: {e}")
+
+    rings: Dict[str, SharedFrameRing] = {}
+    rings_lock = threading.Lock()
+
+    def resolve_frame(frame_ref) -> Optional[np.ndarray]:
+        if frame_ref is None:
+            return None
+        if frame_ref[0] == 'inline':
+            return frame_ref[1]
+        _, ring_name, slot, shape, dtype = frame_ref
+        with rings_lock:
+            ring = rings.get(ring_name)
+            if ring is None:
+                ring = SharedFrameRing(name=ring_name, create=False,
+                                       slots=get_config_value('serving.ring_slots', 8),
+                                       slot_bytes=get_config_value('serving.ring_slot_bytes', DEFAULT_SLOT_BYTES))
+                rings[ring_name] = ring
+        return ring.view(slot, shape, dtype)
+
+    def handle(message):
+        op, worker_id, req_id, frame_ref, params = message
+        error, payload = None, None
+        try:
+            frame = resolve_frame(frame_ref)
+            if op == OP_INFO:
+                payload = {'status': status, 'errors': errors, 'names': names}
+            elif op == OP_DETECT:
+                if batcher is None:
+                    raise RuntimeError(f"YOLO 사용 불가: {errors['yolo']}")
+                result = batcher.predict(frame, conf=params.get('conf', 0.3), iou=params.get('iou', 0.7))[0]
+                data = result.boxes.data
+                payload = data if isinstance(data, np.ndarray) else data.cpu().numpy()
+            elif op == OP_OCR:
+                if serial_detector is None:
+                    raise RuntimeError(f"OCR 사용 불가: {errors['ocr']}")
+                payload = serial_detector.detect_serial_number(frame, learn_label=params.get('learn_label', True))
+            elif op == OP_OCR_LABEL:
+                if serial_detector is None:
+                    raise RuntimeError(f"OCR 사용 불가: {errors['ocr']}")
+                if params.get('action') == 'forget':
+                    serial_detector.forget_label()
+                else:
+                    payload = serial_detector.get_label_stats()
+            else:
+                raise ValueError(f"알 수 없는 요청: {op}")
+        except Exception as e:
+            error = str(e)
+        # 응답 이후 워커가 슬롯을 재사용하므로 프레임 뷰는 여기서 더 이상 사용하지 않음
+        response_queues[worker_id].put((req_id, error, payload))
+
+    pool = ThreadPoolExecutor(max_workers=handler_threads, thread_name_prefix='inference-handler')
+    logger.info(f"✅ 추론 프로세스 요청 처리 시작 (워커 {len(response_queues)}개)")
+
+    while True:
+        message = request_queue.get()
+        if message is None:
+            break
+        pool.submit(handle, message)
+
+    pool.shutdown(wait=True)
+    for ring in rings.values():
+        ring.close()
+    logger.info("추론 프로세스 종료")
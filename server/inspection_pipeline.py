@@ -0,0 +1,208 @@
+"""
+검사 파이프라인 엔진 (이름 있는 단계 + 단계별 지연 시간 히스토그램)
+
+predict_test / predict_dual / predict 엔드포인트가 공유하는
+크롭 → 모션 → 템플릿 매칭 → YOLO → ROI 필터 → 평활화 → 시각화 → 검증 → 판정
+흐름을 단계(Stage) 목록으로 정의하고, 엔드포인트별로 필요 없는 단계를 건너뜁니다.
+
+각 단계의 실행 시간(ms)은 파이프라인/단계별 롤링 히스토그램에 기록되어
+get_stats()로 평균 / p50 / p95 / p99 / 최대값과 누적 버킷 분포를 확인할 수 있습니다.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 버킷 상한 (ms) - 10 FPS 프레임 예산(100ms) 기준
+DEFAULT_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class StageHistogram:
+    """단계별 지연 시간 히스토그램 (최근 window개 롤링 + 누적 버킷)"""
+
+    def __init__(self, window: int = 1000, buckets_ms: Iterable[float] = DEFAULT_BUCKETS_MS):
+        """
+        Args:
+            window: 백분위수 계산에 사용할 최근 샘플 수
+            buckets_ms: 누적 버킷 상한 (ms, 오름차순)
+        """
+        self.buckets_ms = tuple(buckets_ms)
+        self._samples = deque(maxlen=window)
+        self._bucket_counts = [0] * (len(self.buckets_ms) + 1)  # 마지막 = +Inf
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float):
+        """샘플 1개 기록"""
+        with self._lock:
+            self._samples.append(value_ms)
+            self._count += 1
+            self._sum += value_ms
+            for i, bound in enumerate(self.buckets_ms):
+                if value_ms <= bound:
+                    self._bucket_counts[i] += 1
+                    break
+            else:
+                self._bucket_counts[-1] += 1
+
+    def summary(self) -> Dict:
+        """롤링 백분위수 + 누적 카운터"""
+        with self._lock:
+            samples = np.array(self._samples, dtype=np.float64)
+            count = self._count
+            total = self._sum
+            bucket_counts = list(self._bucket_counts)
+
+        # 누적 버킷 (le: 상한 이하 개수)
+        cumulative = np.cumsum(bucket_counts).tolist()
+        buckets = {str(bound): int(c) for bound, c in zip(self.buckets_ms, cumulative)}
+        buckets['+Inf'] = int(cumulative[-1])
+
+        if samples.size == 0:
+            return {'count': count, 'sum_ms': round(total, 2), 'avg': 0.0, 'p50': 0.0,
+                    'p95': 0.0, 'p99': 0.0, 'max': 0.0, 'buckets': buckets}
+
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        return {
+            'count': count,
+            'sum_ms': round(total, 2),
+            'avg': round(float(samples.mean()), 2),
+            'p50': round(float(p50), 2),
+            'p95': round(float(p95), 2),
+            'p99': round(float(p99), 2),
+            'max': round(float(samples.max()), 2),
+            'buckets': buckets
+        }
+
+
+class PipelineContext:
+    """단계 간에 공유되는 검사 상태 (속성 컨테이너)"""
+
+    def __init__(self, **fields):
+        self.timings: Dict[str, float] = {}   # 단계별 실행 시간 (ms)
+        self.skipped: List[str] = []          # 건너뛴 단계
+        self.stopped_at: Optional[str] = None  # 조기 종료한 단계
+        self.stop = False                      # 단계에서 True로 설정하면 이후 단계 중단
+        self.pipeline: Optional[str] = None    # 실행 중인 파이프라인 이름 (run()에서 설정)
+        self.__dict__.update(fields)
+
+    def stage_ms(self, *names: str) -> float:
+        """지정 단계들의 실행 시간 합계 (ms)"""
+        return sum(self.timings.get(name, 0.0) for name in names)
+
+
+class Stage:
+    """파이프라인 단계"""
+
+    def __init__(self, name: str, func: Callable[[PipelineContext], None],
+                 skip_if: Optional[Callable[[PipelineContext], bool]] = None):
+        """
+        Args:
+            name: 단계 이름 (히스토그램 키)
+            func: 단계 함수 func(ctx)
+            skip_if: ctx를 받아 True면 이번 실행에서 건너뜀 (예: YOLO 미실행 시 평활화 생략)
+        """
+        self.name = name
+        self.func = func
+        self.skip_if = skip_if
+
+
+class InspectionPipeline:
+    """이름 있는 단계를 순서대로 실행하고 단계별 시간을 기록하는 엔진"""
+
+    def __init__(self, name: str, stages: List[Stage], skip: Iterable[str] = (),
+                 window: int = 1000):
+        """
+        Args:
+            name: 파이프라인 이름 (예: 'predict_dual')
+            stages: 단계 목록 (실행 순서)
+            skip: 이 파이프라인에서 항상 건너뛸 단계 이름
+            window: 히스토그램 롤링 샘플 수
+        """
+        self.name = name
+        self.stages = [stage for stage in stages if stage.name not in set(skip)]
+        self._window = window
+        self._histograms: Dict[str, StageHistogram] = {}
+        self._hist_lock = threading.Lock()
+
+        with _registry_lock:
+            _registry[name] = self
+
+        logger.info(f"✅ 검사 파이프라인 등록: {name} ({' → '.join(stage.name for stage in self.stages)})")
+
+    def _histogram(self, stage_name: str) -> StageHistogram:
+        with self._hist_lock:
+            hist = self._histograms.get(stage_name)
+            if hist is None:
+                hist = StageHistogram(self._window)
+                self._histograms[stage_name] = hist
+            return hist
+
+    def record(self, stage_name: str, value_ms: float):
+        """파이프라인 밖에서 측정한 단계 시간 기록 (예: 병렬 OCR 브랜치)"""
+        self._histogram(stage_name).observe(value_ms)
+
+    def run(self, ctx: PipelineContext, skip: Iterable[str] = ()) -> PipelineContext:
+        """
+        단계 순차 실행
+
+        Args:
+            ctx: 검사 컨텍스트
+            skip: 이번 실행에서만 건너뛸 단계 이름
+
+        Returns:
+            ctx (timings / skipped / stopped_at 채워짐)
+        """
+        skip = set(skip)
+        ctx.pipeline = self.name
+        run_start = time.perf_counter()
+
+        for stage in self.stages:
+            if stage.name in skip or (stage.skip_if is not None and stage.skip_if(ctx)):
+                ctx.skipped.append(stage.name)
+                continue
+
+            stage_start = time.perf_counter()
+            try:
+                stage.func(ctx)
+            finally:
+                elapsed_ms = (time.perf_counter() - stage_start) * 1000
+                ctx.timings[stage.name] = elapsed_ms
+                self.record(stage.name, elapsed_ms)
+
+            if ctx.stop:
+                ctx.stopped_at = stage.name
+                break
+
+        self.record('total', (time.perf_counter() - run_start) * 1000)
+        return ctx
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """단계별 히스토그램 요약 {stage_name: summary}"""
+        with self._hist_lock:
+            histograms = dict(self._histograms)
+        return {name: hist.summary() for name, hist in histograms.items()}
+
+
+# 파이프라인 레지스트리 (통계 조회용)
+_registry: Dict[str, InspectionPipeline] = {}
+_registry_lock = threading.Lock()
+
+
+def get_pipeline_stats() -> Dict[str, Dict]:
+    """
+    등록된 모든 파이프라인의 단계별 통계
+
+    Returns:
+        {pipeline_name: {stage_name: summary}}
+    """
+    with _registry_lock:
+        pipelines = dict(_registry)
+    return {name: pipeline.get_stats() for name, pipeline in pipelines.items()}
@@ -0,0 +1,305 @@
+"""
+서버 성능 지표 수집 모듈 (Prometheus 텍스트 형식)
+
+수집 항목:
+- 엔드포인트별 요청 수 / 지연 시간 히스토그램 (Flask before/after_request 훅)
+- 검사 파이프라인 단계별 처리 시간 (inspection_pipeline 레지스트리)
+- frame_lock / tracking_lock 대기 시간 (InstrumentedLock)
+- SocketIO 연결 클라이언트 수 / 이벤트 전송 횟수
+- YOLO 배칭 큐 / 프레임 퍼블리셔 상태
+- 프로세스 RSS 메모리
+
+/metrics 엔드포인트에서 metrics.render()의 결과를 text/plain; version=0.0.4로 반환하면
+로컬 Prometheus 호환 수집기가 그대로 읽을 수 있습니다.
+외부 의존성(prometheus_client) 없이 텍스트 형식을 직접 생성합니다.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from inspection_pipeline import StageHistogram, get_pipeline_stats
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = 'pcb'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 락 대기 시간 버킷 (ms) - 대부분 1ms 미만, 인코딩 중 경합 시 수십 ms
+LOCK_WAIT_BUCKETS_MS = (0.01, 0.1, 0.5, 1, 5, 10, 25, 50, 100, 250)
+
+
+class InstrumentedLock:
+    """
+    대기 시간을 기록하는 threading.Lock 래퍼
+
+    with 문 / acquire() / release() 모두 threading.Lock과 동일하게 동작합니다.
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: 지표 라벨로 사용할 락 이름 (예: 'frame_lock')
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self.wait_histogram = StageHistogram(window=1000, buckets_ms=LOCK_WAIT_BUCKETS_MS)
+        _lock_registry[name] = self
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        if acquired:
+            self.wait_histogram.observe((time.perf_counter() - start) * 1000)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class MetricsRegistry:
+    """요청 / SocketIO 지표 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._request_counts: Dict[Tuple[str, str, int], int] = defaultdict(int)  # (endpoint, method, status)
+        self._request_latency: Dict[str, StageHistogram] = {}
+        self._emit_counts: Dict[str, int] = defaultdict(int)
+        self.socketio_clients = 0
+        self.started_at = time.time()
+
+        # 외부 모듈 상태 수집 함수 (배칭 큐, 퍼블리셔 등)
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def observe_request(self, endpoint: str, method: str, status: int, latency_ms: float):
+        """HTTP 요청 1건 기록"""
+        with self._lock:
+            self._request_counts[(endpoint, method, status)] += 1
+            hist = self._request_latency.get(endpoint)
+            if hist is None:
+                hist = StageHistogram(window=1000)
+                self._request_latency[endpoint] = hist
+        hist.observe(latency_ms)
+
+    def count_emit(self, event: str, n: int = 1):
+        """SocketIO 이벤트 전송 횟수 증가"""
+        with self._lock:
+            self._emit_counts[event] += n
+
+    def client_connected(self):
+        with self._lock:
+            self.socketio_clients += 1
+
+    def client_disconnected(self):
+        with self._lock:
+            self.socketio_clients = max(0, self.socketio_clients - 1)
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]):
+        """
+        추가 지표 수집 함수 등록
+
+        Args:
+            collector: Prometheus 텍스트 라인을 반환하는 함수 (scrape 시 호출)
+        """
+        self._collectors.append(collector)
+
+    # ------------------------------------------------------------------
+    # Flask 연동
+    # ------------------------------------------------------------------
+    def init_app(self, app):
+        """Flask 요청 훅 등록 (엔드포인트별 요청 수 / 지연 시간)"""
+        from flask import g, request
+
+        @app.before_request
+        def _metrics_start_timer():
+            g._metrics_start = time.perf_counter()
+
+        @app.after_request
+        def _metrics_record_request(response):
+            start = g.pop('_metrics_start', None)
+            if start is not None:
+                endpoint = request.endpoint or 'unknown'
+                # MJPEG 스트림은 응답 시작 시점까지만 측정됨
+                self.observe_request(endpoint, request.method, response.status_code,
+                                     (time.perf_counter() - start) * 1000)
+            return response
+
+    def init_socketio(self, socketio):
+        """
+        SocketIO 이벤트 전송 횟수 집계
+
+        flask_socketio.emit()(핸들러 내부 응답)도 내부적으로 socketio.emit()을 호출하므로
+        인스턴스의 emit 하나만 감싸면 broadcast / 개별 응답이 모두 집계됩니다.
+        """
+        original_emit = socketio.emit
+
+        def counted_emit(event, *args, **kwargs):
+            self.count_emit(event)
+            return original_emit(event, *args, **kwargs)
+
+        socketio.emit = counted_emit
+
+    # ------------------------------------------------------------------
+    # 출력
+    # ------------------------------------------------------------------
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 지표 생성"""
+        lines: List[str] = []
+
+        with self._lock:
+            request_counts = dict(self._request_counts)
+            request_latency = dict(self._request_latency)
+            emit_counts = dict(self._emit_counts)
+            clients = self.socketio_clients
+
+        # 1. HTTP 요청
+        _header(lines, 'http_requests_total', 'counter', 'HTTP requests by endpoint, method and status')
+        for (endpoint, method, status), count in sorted(request_counts.items()):
+            lines.append(_sample('http_requests_total', count,
+                                 endpoint=endpoint, method=method, status=str(status)))
+
+        _header(lines, 'http_request_duration_seconds', 'histogram', 'HTTP request latency by endpoint')
+        for endpoint, hist in sorted(request_latency.items()):
+            _histogram_lines(lines, 'http_request_duration_seconds', hist.summary(), endpoint=endpoint)
+
+        _header(lines, 'http_request_duration_quantile_seconds', 'gauge',
+                'Rolling HTTP request latency percentiles by endpoint')
+        for endpoint, hist in sorted(request_latency.items()):
+            _quantile_lines(lines, 'http_request_duration_quantile_seconds', hist.summary(), endpoint=endpoint)
+
+        # 2. 검사 파이프라인 단계
+        pipeline_stats = get_pipeline_stats()
+        _header(lines, 'pipeline_stage_duration_seconds', 'histogram',
+                'Inspection pipeline stage wall time (ocr, align, yolo, verify, db, ...)')
+        for pipeline, stages in sorted(pipeline_stats.items()):
+            for stage, summary in sorted(stages.items()):
+                _histogram_lines(lines, 'pipeline_stage_duration_seconds', summary, pipeline=pipeline, stage=stage)
+
+        _header(lines, 'pipeline_stage_duration_quantile_seconds', 'gauge',
+                'Rolling inspection pipeline stage percentiles')
+        for pipeline, stages in sorted(pipeline_stats.items()):
+            for stage, summary in sorted(stages.items()):
+                _quantile_lines(lines, 'pipeline_stage_duration_quantile_seconds', summary,
+                                pipeline=pipeline, stage=stage)
+
+        # 3. 락 대기 시간
+        _header(lines, 'lock_wait_seconds', 'histogram', 'Time spent waiting to acquire shared locks')
+        for name, lock in sorted(_lock_registry.items()):
+            _histogram_lines(lines, 'lock_wait_seconds', lock.wait_histogram.summary(), lock=name)
+
+        # 4. SocketIO
+        _header(lines, 'socketio_connected_clients', 'gauge', 'Currently connected SocketIO clients')
+        lines.append(_sample('socketio_connected_clients', clients))
+
+        _header(lines, 'socketio_emits_total', 'counter', 'SocketIO events emitted by event name')
+        for event, count in sorted(emit_counts.items()):
+            lines.append(_sample('socketio_emits_total', count, event=event))
+
+        # 5. 프로세스
+        _header(lines, 'process_resident_memory_bytes', 'gauge', 'Resident set size of the server process')
+        rss = process_rss_bytes()
+        if rss is not None:
+            lines.append(_sample('process_resident_memory_bytes', rss))
+
+        _header(lines, 'process_uptime_seconds', 'gauge', 'Seconds since the metrics registry was created')
+        lines.append(_sample('process_uptime_seconds', round(time.time() - self.started_at, 3)))
+
+        # 6. 외부 수집 함수
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                logger.warning(f"⚠️  지표 수집 함수 실패: {e}")
+
+        return '\n'.join(lines) + '\n'
+
+
+def process_rss_bytes() -> Optional[int]:
+    """프로세스 RSS (바이트). psutil이 없으면 /proc/self/statm 사용"""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# ----------------------------------------------------------------------
+# Prometheus 텍스트 형식 헬퍼
+# ----------------------------------------------------------------------
+def metric_name(name: str) -> str:
+    return f"{METRIC_PREFIX}_{name}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _sample(name: str, value, suffix: str = '', **labels) -> str:
+    label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+    label_part = f'{{{label_text}}}' if label_text else ''
+    return f"{metric_name(name)}{suffix}{label_part} {value}"
+
+
+def _header(lines: List[str], name: str, metric_type: str, help_text: str):
+    lines.append(f"# HELP {metric_name(name)} {help_text}")
+    lines.append(f"# TYPE {metric_name(name)} {metric_type}")
+
+
+def _histogram_lines(lines: List[str], name: str, summary: Dict, **labels):
+    """StageHistogram.summary() (ms) → Prometheus histogram (초)"""
+    for bound, count in summary['buckets'].items():
+        le = '+Inf' if bound == '+Inf' else repr(float(bound) / 1000.0)
+        lines.append(_sample(name, count, '_bucket', **labels, le=le))
+    lines.append(_sample(name, round(summary['sum_ms'] / 1000.0, 6), '_sum', **labels))
+    lines.append(_sample(name, summary['count'], '_count', **labels))
+
+
+def _quantile_lines(lines: List[str], name: str, summary: Dict, **labels):
+    """롤링 백분위수 (ms) → 초 단위 gauge"""
+    for quantile, key in (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99')):
+        lines.append(_sample(name, round(summary[key] / 1000.0, 6), **labels, quantile=quantile))
+
+
+def gauge_lines(name: str, help_text: str, value, **labels) -> List[str]:
+    """외부 수집 함수용 단일 gauge 라인 생성"""
+    lines: List[str] = []
+    _header(lines, name, 'gauge', help_text)
+    lines.append(_sample(name, value, **labels))
+    return lines
+
+
+def counter_lines(name: str, help_text: str, value, **labels) -> List[str]:
+    """외부 수집 함수용 단일 counter 라인 생성"""
+    lines: List[str] = []
+    _header(lines, name, 'counter', help_text)
+    lines.append(_sample(name, value, **labels))
+    return lines
+
+
+# 락 레지스트리 (InstrumentedLock 생성 시 자동 등록)
+_lock_registry: Dict[str, InstrumentedLock] = {}
+
+# 전역 지표 저장소
+metrics = MetricsRegistry()
@@ -0,0 +1,208 @@
+"""
+서버 시작 시 모델 백그라운드 로드 / 워밍업 및 준비 상태(readiness) 관리
+
+YOLO 가중치 로드, EasyOCR Reader 생성은 수 초가 걸리고,
+첫 추론에서도 그래프 초기화 / 메모리 할당 때문에 지연이 큽니다.
+이 모듈은 컴포넌트(yolo, ocr, template, references)별로
+로드 → 워밍업(실제 입력 크기의 더미 프레임 추론) 과정을 백그라운드 스레드에서 실행하고,
+/health 및 추론 엔드포인트 게이팅에 쓸 준비 상태를 제공합니다.
+
+컴포넌트 상태:
+    pending → loading → warming → ready
+                      ↘ failed (예외) / disabled (로드 결과 없음, 예: 템플릿 파일 없음)
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_PENDING = 'pending'
+STATE_LOADING = 'loading'
+STATE_WARMING = 'warming'
+STATE_READY = 'ready'
+STATE_FAILED = 'failed'
+STATE_DISABLED = 'disabled'
+
+# 아직 준비 중인 상태 (추론 요청 게이팅 대상)
+IN_PROGRESS_STATES = (STATE_PENDING, STATE_LOADING, STATE_WARMING)
+
+
+class _Component:
+    """컴포넌트별 준비 상태"""
+
+    __slots__ = ('name', 'state', 'error', 'load_ms', 'warmup_ms', 'first_warmup_ms', 'updated_at')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = STATE_PENDING
+        self.error: Optional[str] = None
+        self.load_ms: Optional[float] = None
+        self.warmup_ms: Optional[float] = None        # 마지막 워밍업 추론 시간
+        self.first_warmup_ms: Optional[float] = None  # 첫 워밍업 추론 시간 (콜드 스타트 비용)
+        self.updated_at = time.time()
+
+    def to_dict(self) -> Dict:
+        return {
+            'state': self.state,
+            'ready': self.state == STATE_READY,
+            'error': self.error,
+            'load_ms': _round(self.load_ms),
+            'first_warmup_ms': _round(self.first_warmup_ms),
+            'warmup_ms': _round(self.warmup_ms)
+        }
+
+
+class ReadinessTracker:
+    """컴포넌트 로드 / 워밍업 실행 및 준비 상태 조회"""
+
+    def __init__(self, warmup_iterations: int = 2):
+        """
+        Args:
+            warmup_iterations: 컴포넌트별 워밍업 추론 반복 횟수
+        """
+        self.warmup_iterations = max(0, int(warmup_iterations))
+        self._lock = threading.Lock()
+        self._components: Dict[str, _Component] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._done = threading.Event()
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def register(self, *names: str):
+        """준비 상태를 추적할 컴포넌트 등록 (상태: pending)"""
+        with self._lock:
+            for name in names:
+                self._components.setdefault(name, _Component(name))
+
+    def _set(self, name: str, state: str, **fields):
+        with self._lock:
+            component = self._components.setdefault(name, _Component(name))
+            component.state = state
+            component.updated_at = time.time()
+            for key, value in fields.items():
+                setattr(component, key, value)
+
+    def mark_ready(self, name: str, load_ms: Optional[float] = None):
+        """워밍업 없이 준비 완료 처리 (동기 로드한 컴포넌트용)"""
+        self._set(name, STATE_READY, load_ms=load_ms)
+
+    def mark_disabled(self, name: str, reason: Optional[str] = None):
+        """사용하지 않는 컴포넌트 (파일 없음 등)"""
+        self._set(name, STATE_DISABLED, error=reason)
+
+    def mark_failed(self, name: str, error: str):
+        self._set(name, STATE_FAILED, error=error)
+
+    def run_component(self, name: str, load: Callable[[], object],
+                      warmup: Optional[Callable[[object], None]] = None) -> Optional[object]:
+        """
+        컴포넌트 로드 후 워밍업 실행
+
+        Args:
+            name: 컴포넌트 이름
+            load: 로드 함수. None을 반환하면 disabled 처리
+            warmup: 로드 결과를 받아 더미 추론 1회를 수행하는 함수
+
+        Returns:
+            load() 결과 (실패 / disabled 시 None)
+        """
+        self._set(name, STATE_LOADING)
+        start = time.perf_counter()
+        try:
+            obj = load()
+        except Exception as e:
+            logger.error(f"❌ [{name}] 로드 실패: {e}")
+            self.mark_failed(name, str(e))
+            return None
+        load_ms = (time.perf_counter() - start) * 1000
+
+        if obj is None:
+            self._set(name, STATE_DISABLED, load_ms=load_ms)
+            logger.warning(f"⚠️  [{name}] 비활성화 (로드 결과 없음)")
+            return None
+
+        if warmup is not None and self.warmup_iterations > 0:
+            self._set(name, STATE_WARMING, load_ms=load_ms)
+            try:
+                for i in range(self.warmup_iterations):
+                    warm_start = time.perf_counter()
+                    warmup(obj)
+                    warmup_ms = (time.perf_counter() - warm_start) * 1000
+                    if i == 0:
+                        self._set(name, STATE_WARMING, first_warmup_ms=warmup_ms)
+                    self._set(name, STATE_WARMING, warmup_ms=warmup_ms)
+            except Exception as e:
+                # 워밍업 실패는 치명적이지 않음 (첫 실제 요청에서 초기화 비용을 치름)
+                logger.warning(f"⚠️  [{name}] 워밍업 실패 (로드는 완료): {e}")
+
+        self._set(name, STATE_READY, load_ms=load_ms)
+        with self._lock:
+            component = self._components[name]
+            logger.info(f"✅ [{name}] 준비 완료 (로드 {load_ms:.0f}ms, "
+                        f"워밍업 첫 {_round(component.first_warmup_ms)}ms → 마지막 {_round(component.warmup_ms)}ms)")
+        return obj
+
+    def start(self, tasks: List[Callable[[], None]], background: bool = True):
+        """
+        로드 / 워밍업 작업 실행
+
+        GPU를 공유하는 모델끼리 경합하지 않도록 작업은 순서대로 실행합니다.
+
+        Args:
+            tasks: 인자 없는 작업 함수 목록 (각 작업이 run_component 호출)
+            background: True면 데몬 스레드에서 실행하고 즉시 반환
+        """
+        def run_all():
+            for task in tasks:
+                try:
+                    task()
+                except Exception as e:
+                    logger.error(f"❌ 워밍업 작업 실패: {e}", exc_info=True)
+            self.finished_at = time.time()
+            self._done.set()
+            logger.info(f"✅ 모델 워밍업 완료 ({self.finished_at - self.started_at:.1f}s)")
+
+        if background:
+            self._thread = threading.Thread(target=run_all, name='model-warmup', daemon=True)
+            self._thread.start()
+            logger.info("🔥 모델 로드 / 워밍업 백그라운드 시작")
+        else:
+            run_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """워밍업 완료까지 대기 (완료 시 True)"""
+        return self._done.wait(timeout)
+
+    def is_settled(self) -> bool:
+        """모든 컴포넌트가 준비 / 실패 / 비활성 상태 중 하나로 확정되었는지"""
+        with self._lock:
+            return all(c.state not in IN_PROGRESS_STATES for c in self._components.values())
+
+    def is_ready(self, name: str) -> bool:
+        with self._lock:
+            component = self._components.get(name)
+            return component is not None and component.state == STATE_READY
+
+    def snapshot(self) -> Dict:
+        """
+        /health 응답용 준비 상태
+
+        Returns:
+            {'ready': bool, 'elapsed_s': float, 'components': {name: {...}}}
+        """
+        with self._lock:
+            components = {name: c.to_dict() for name, c in self._components.items()}
+            settled = all(c.state not in IN_PROGRESS_STATES for c in self._components.values())
+        end = self.finished_at or time.time()
+        return {
+            'ready': settled,
+            'elapsed_s': round(end - self.started_at, 2),
+            'components': components
+        }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
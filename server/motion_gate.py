@@ -0,0 +1,177 @@
+"""
+모션 게이트 (정지 프레임 추론 생략)
+
+컨베이어가 멈춰 PCB가 카메라 아래에 그대로 있으면 매 프레임 템플릿 매칭 + YOLO를
+다시 돌려도 결과가 같습니다. 게이트는 마지막으로 추론한 프레임과 현재 프레임의
+차이(축소 그레이스케일 평균 절대 차이)를 비교해서
+- 임계값 미만이면 캐시된 검출 / 검증 결과를 재사용하고
+- 모션이 감지되거나 재사용 한도(프레임 수 / 경과 시간)를 넘으면 다시 추론합니다.
+
+평활화(MIN_DETECTION_FRAMES)가 안정되기 전에 결과를 고정하지 않도록,
+정지 상태에서 min_stable_inferences번 연속 추론한 뒤부터 재사용합니다.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 재추론 사유
+REASON_NO_CACHE = 'no_cache'
+REASON_MOTION = 'motion'
+REASON_SETTLING = 'settling'
+REASON_STALE_FRAMES = 'stale_frames'
+REASON_STALE_AGE = 'stale_age'
+
+
+class _GateEntry:
+    """게이트 키 1개의 마지막 추론 상태"""
+
+    __slots__ = ('thumbnail', 'fields', 'inferred_at', 'reused', 'stable_inferences')
+
+    def __init__(self, thumbnail: np.ndarray, fields: Dict[str, Any]):
+        self.thumbnail = thumbnail
+        self.fields = fields
+        self.inferred_at = time.monotonic()
+        self.reused = 0                # 마지막 추론 이후 재사용한 프레임 수
+        self.stable_inferences = 0     # 정지 상태에서 연속 추론한 횟수
+
+
+class MotionGate:
+    """카메라(게이트 키)별 마지막 추론 프레임 대비 모션으로 추론 여부 결정"""
+
+    def __init__(self, threshold: float = 8.0, max_reuse_frames: int = 30,
+                 max_age_s: float = 3.0, min_stable_inferences: int = 5,
+                 thumbnail_width: int = 160):
+        """
+        Args:
+            threshold: 재사용 허용 최대 평균 픽셀 차이 (0~255, 축소 그레이스케일 기준)
+            max_reuse_frames: 한 번 추론한 결과를 재사용할 최대 프레임 수
+            max_age_s: 캐시 결과 최대 유효 시간 (초)
+            min_stable_inferences: 재사용 전 정지 상태 연속 추론 횟수 (평활화 안정화)
+            thumbnail_width: 프레임 비교용 축소 폭 (픽셀)
+        """
+        self.threshold = threshold
+        self.max_reuse_frames = max_reuse_frames
+        self.max_age_s = max_age_s
+        self.min_stable_inferences = min_stable_inferences
+        self.thumbnail_width = thumbnail_width
+
+        self._entries: Dict[str, _GateEntry] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        """비교용 축소 그레이스케일 (노이즈 억제를 위해 INTER_AREA)"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        h, w = gray.shape[:2]
+        if w > self.thumbnail_width:
+            gray = cv2.resize(gray, (self.thumbnail_width, max(1, round(h * self.thumbnail_width / w))),
+                              interpolation=cv2.INTER_AREA)
+        return gray
+
+    def _count(self, key: str, result: str):
+        stats = self._stats.setdefault(key, {'frames': 0, 'inferred': 0, 'reused': 0, 'reasons': {}})
+        stats['frames'] += 1
+        if result == 'reused':
+            stats['reused'] += 1
+        else:
+            stats['inferred'] += 1
+            stats['reasons'][result] = stats['reasons'].get(result, 0) + 1
+
+    def check(self, key: str, frame: np.ndarray) -> Tuple[Optional[Dict[str, Any]], str, float]:
+        """
+        현재 프레임을 추론해야 하는지 판단
+
+        Args:
+            key: 게이트 키 (카메라 / 엔드포인트별)
+            frame: 현재 프레임 (BGR)
+
+        Returns:
+            (캐시 필드 또는 None, 판정 'reused' 또는 재추론 사유, 평균 픽셀 차이)
+            캐시 필드가 None이면 추론 후 store()를 호출해야 합니다.
+        """
+        thumbnail = self._thumbnail(frame)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.thumbnail.shape != thumbnail.shape:
+                self._count(key, REASON_NO_CACHE)
+                return None, REASON_NO_CACHE, 0.0
+
+            diff = float(cv2.absdiff(thumbnail, entry.thumbnail).mean())
+            if diff > self.threshold:
+                reason = REASON_MOTION
+            elif entry.stable_inferences < self.min_stable_inferences:
+                reason = REASON_SETTLING
+            elif entry.reused >= self.max_reuse_frames:
+                reason = REASON_STALE_FRAMES
+            elif time.monotonic() - entry.inferred_at > self.max_age_s:
+                reason = REASON_STALE_AGE
+            else:
+                entry.reused += 1
+                self._count(key, 'reused')
+                return entry.fields, 'reused', diff
+
+            self._count(key, reason)
+            return None, reason, diff
+
+    def store(self, key: str, frame: np.ndarray, fields: Dict[str, Any]):
+        """
+        새로 추론한 결과 저장
+
+        Args:
+            key: 게이트 키
+            frame: 추론한 프레임 (다음 비교 기준)
+            fields: 재사용할 결과 필드 (검출 / 검증)
+        """
+        thumbnail = self._thumbnail(frame)
+        with self._lock:
+            previous = self._entries.get(key)
+            entry = _GateEntry(thumbnail, fields)
+            if previous is not None and previous.thumbnail.shape == thumbnail.shape:
+                diff = float(cv2.absdiff(thumbnail, previous.thumbnail).mean())
+                if diff <= self.threshold:
+                    entry.stable_inferences = previous.stable_inferences + 1
+            self._entries[key] = entry
+
+    def update(self, key: str, fields: Dict[str, Any]):
+        """재사용 중인 결과의 일부 필드만 갱신 (예: 제품 코드가 바뀌어 검증만 다시 한 경우)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.fields = {**entry.fields, **fields}
+
+    def invalidate(self, key: Optional[str] = None):
+        """캐시 삭제 (key가 None이면 전체)"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        게이트 키별 / 전체 추론 생략 통계
+
+        Returns:
+            {'frames', 'inferred', 'reused', 'skip_ratio', 'keys': {key: {..., 'reasons'}}}
+        """
+        with self._lock:
+            keys = {key: {**stats, 'reasons': dict(stats['reasons'])} for key, stats in self._stats.items()}
+
+        for stats in keys.values():
+            stats['skip_ratio'] = round(stats['reused'] / stats['frames'], 4) if stats['frames'] else 0.0
+        frames = sum(stats['frames'] for stats in keys.values())
+        reused = sum(stats['reused'] for stats in keys.values())
+        return {
+            'frames': frames,
+            'inferred': frames - reused,
+            'reused': reused,
+            'skip_ratio': round(reused / frames, 4) if frames else 0.0,
+            'keys': keys
+        }
@@ -0,0 +1,193 @@
+"""
+카메라별 다중 객체 추적기 (Temporal Smoothing)
+
+추적 상태를 객체별 dict 대신 배열로 보관합니다.
+- ids: (T,) 객체 ID (생성 순서 = 정렬 순서)
+- boxes: (T, 4) float32 [x1, y1, x2, y2]
+- class_id / confidence / count / missing / frozen: (T,)
+
+프레임마다 클래스별로 (검출 x 추적 객체) IOU 행렬을 NumPy로 한 번에 계산하고,
+헝가리안 알고리즘(scipy linear_sum_assignment)으로 IOU 합이 최대가 되도록 1:1 매칭합니다.
+"""
+
+import logging
+from typing import Dict
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from detections import Detections, iou_matrix
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectTracker:
+    """
+    카메라 1대의 검출 결과 평활화 추적기
+
+    - 최소 min_hits 프레임 동안 검출된 객체만 표시
+    - 사라진 객체는 max_missing 프레임 동안 유지
+    - freeze_after 프레임 이상 검출된 객체는 박스/신뢰도를 고정하고 삭제하지 않음
+
+    스레드 안전하지 않으므로 호출 측에서 잠금을 잡아야 합니다 (app.py tracking_lock).
+    """
+
+    def __init__(self, iou_threshold: float = 0.05, min_hits: int = 5,
+                 max_missing: int = 3, freeze_after: int = 9999, name: str = ''):
+        """
+        Args:
+            iou_threshold: 매칭 최소 IOU (초과해야 매칭)
+            min_hits: 표시에 필요한 최소 검출 횟수
+            max_missing: 미검출 허용 프레임 수 (초과 시 제거)
+            freeze_after: 값 고정까지 필요한 검출 횟수
+            name: 로그용 이름 (카메라 ID)
+        """
+        self.iou_threshold = iou_threshold
+        self.min_hits = min_hits
+        self.max_missing = max_missing
+        self.freeze_after = freeze_after
+        self.name = name
+
+        self.names: Dict[int, str] = {}
+        self._next_id = 0
+        self.clear()
+
+    def clear(self):
+        """모든 추적 객체 초기화 (새 PCB 진입 시)"""
+        self.ids = np.zeros(0, np.int64)
+        self.boxes = np.zeros((0, 4), np.float32)
+        self.class_id = np.zeros(0, np.int32)
+        self.confidence = np.zeros(0, np.float32)
+        self.count = np.zeros(0, np.int32)
+        self.missing = np.zeros(0, np.int32)
+        self.frozen = np.zeros(0, bool)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def all_frozen(self) -> bool:
+        """추적 객체가 있고 모두 고정 상태인지 (완전 정지 모드 판단용)"""
+        return len(self.ids) > 0 and bool(self.frozen.all())
+
+    def _assign(self, detections: Detections):
+        """
+        클래스별 헝가리안 매칭
+
+        Returns:
+            (det_idx, track_idx) 매칭 쌍 배열, 검출별 매칭 여부 (N,) bool
+        """
+        det_idx, track_idx = [], []
+        for class_id in np.intersect1d(detections.class_id, self.class_id):
+            dets = np.flatnonzero(detections.class_id == class_id)
+            tracks = np.flatnonzero(self.class_id == class_id)
+
+            ious = iou_matrix(detections.boxes[dets], self.boxes[tracks])
+            ious[ious <= self.iou_threshold] = 0.0
+            rows, cols = linear_sum_assignment(ious, maximize=True)
+            keep = ious[rows, cols] > 0
+            det_idx.append(dets[rows[keep]])
+            track_idx.append(tracks[cols[keep]])
+
+        det_idx = np.concatenate(det_idx) if det_idx else np.zeros(0, np.int64)
+        track_idx = np.concatenate(track_idx) if track_idx else np.zeros(0, np.int64)
+        det_matched = np.zeros(len(detections), bool)
+        det_matched[det_idx] = True
+        return det_idx, track_idx, det_matched
+
+    def update(self, detections: Detections) -> Detections:
+        """
+        현재 프레임 검출 결과로 추적 상태 갱신
+
+        Args:
+            detections: 현재 프레임의 검출 결과
+
+        Returns:
+            평활화된 검출 결과 (표시 대상 객체, 객체 ID 순)
+        """
+        self.names.update(detections.names)
+        det_idx, track_idx, det_matched = self._assign(detections)
+
+        # 1. 매칭된 객체 업데이트 (고정된 객체는 박스/신뢰도 유지)
+        self.count[track_idx] += 1
+        self.missing[track_idx] = 0
+        update = track_idx[~self.frozen[track_idx]]
+        update_det = det_idx[~self.frozen[track_idx]]
+        self.boxes[update] = detections.boxes[update_det]
+        self.confidence[update] = detections.confidence[update_det]
+
+        newly_frozen = update[self.count[update] >= self.freeze_after]
+        for t in newly_frozen:
+            logger.info(f"[FREEZE] 객체 {self.ids[t]} 고정 완료 "
+                        f"(class: {self.names.get(int(self.class_id[t]), self.class_id[t])}, conf: {self.confidence[t]:.2f})")
+        self.frozen[newly_frozen] = True
+
+        # 2. 매칭되지 않은 검출 → 새 객체
+        #    같은 프레임에서 이미 매칭/추가된 같은 클래스 객체와 겹치면 중복 검출로 보고 버림
+        new_boxes, new_classes, new_conf = self._collect_new_objects(detections, track_idx, det_matched)
+
+        # 3. 매칭되지 않은 객체는 missing 증가 후 MAX 초과 시 제거 (frozen 객체는 영구 보존)
+        unmatched = np.ones(len(self.ids), bool)
+        unmatched[track_idx] = False
+        unmatched &= ~self.frozen
+        self.missing[unmatched] += 1
+        self._keep(self.missing <= self.max_missing)
+
+        if len(new_boxes):
+            self._append(new_boxes, new_classes, new_conf)
+
+        # 4. 표시 대상: frozen 객체는 무조건, 일반 객체는 min_hits 이상 검출된 객체
+        visible = self.frozen | (self.count >= self.min_hits)
+        names = dict(detections.names)
+        for class_id in np.unique(self.class_id[visible]):
+            names.setdefault(int(class_id), self.names.get(int(class_id), str(class_id)))
+        return Detections(self.boxes[visible].copy(), self.confidence[visible].copy(),
+                          self.class_id[visible].copy(), names)
+
+    def _collect_new_objects(self, detections: Detections, track_idx: np.ndarray, det_matched: np.ndarray):
+        """매칭되지 않은 검출 중 새 객체로 추가할 검출 (검출 순서대로 중복 제거)"""
+        unmatched_dets = np.flatnonzero(~det_matched)
+        if len(unmatched_dets) == 0:
+            return np.zeros((0, 4), np.float32), np.zeros(0, np.int32), np.zeros(0, np.float32)
+
+        occupied_boxes = list(self.boxes[track_idx])
+        occupied_classes = list(self.class_id[track_idx])
+        new = []
+        for d in unmatched_dets:
+            box = detections.boxes[d]
+            class_id = detections.class_id[d]
+            if occupied_boxes:
+                same_class = np.asarray(occupied_classes) == class_id
+                if same_class.any():
+                    ious = iou_matrix(box, np.asarray(occupied_boxes)[same_class])[0]
+                    if ious.max() > self.iou_threshold:
+                        continue
+            new.append(d)
+            occupied_boxes.append(box)
+            occupied_classes.append(class_id)
+
+        new = np.asarray(new, dtype=np.int64)
+        return detections.boxes[new], detections.class_id[new], detections.confidence[new]
+
+    def _keep(self, mask: np.ndarray):
+        """mask가 True인 객체만 남김"""
+        if mask.all():
+            return
+        self.ids = self.ids[mask]
+        self.boxes = self.boxes[mask]
+        self.class_id = self.class_id[mask]
+        self.confidence = self.confidence[mask]
+        self.count = self.count[mask]
+        self.missing = self.missing[mask]
+        self.frozen = self.frozen[mask]
+
+    def _append(self, boxes: np.ndarray, class_id: np.ndarray, confidence: np.ndarray):
+        """새 객체 추가 (ID는 단조 증가하므로 배열 순서 = ID 순서)"""
+        n = len(boxes)
+        self.ids = np.concatenate([self.ids, np.arange(self._next_id, self._next_id + n, dtype=np.int64)])
+        self._next_id += n
+        self.boxes = np.concatenate([self.boxes, boxes.astype(np.float32)])
+        self.class_id = np.concatenate([self.class_id, class_id.astype(np.int32)])
+        self.confidence = np.concatenate([self.confidence, confidence.astype(np.float32)])
+        self.count = np.concatenate([self.count, np.ones(n, np.int32)])
+        self.missing = np.concatenate([self.missing, np.zeros(n, np.int32)])
+        self.frozen = np.concatenate([self.frozen, np.zeros(n, bool)])
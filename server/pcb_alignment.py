@@ -9,21 +9,46 @@ PCB 정렬 모듈
 2. PCB 전체 가시성 검증
 3. Perspective Transform을 통한 정렬
 4. Fallback: PCB Edge 검출
+
+나사 구멍 검출 모드:
+- full: 전체 프레임 GaussianBlur + HoughCircles 후 코너 구멍 선택
+- window: 기준 데이터의 구멍 위치(또는 직전 프레임 검출 위치) 주변 작은 창에서만 검출,
+  창을 축소(downscale)해서 찾은 뒤 원본 해상도에서 원 테두리 피팅으로 서브픽셀 보정
+
+보드가 움직이지 않았으면(축소 프레임 차이 < reuse_threshold) 직전 변환 행렬을 재사용합니다.
+process_frame() 결과의 'timings_ms'와 get_timing_stats()로 경로별(holes / edges / reused) 시간을 확인할 수 있습니다.
 """
 
 import cv2
 import numpy as np
+import time
 from typing import Optional, Tuple, List, Dict
 import logging
 
+from inspection_pipeline import StageHistogram
+from motion_gate import MotionGate
+
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+HOLE_SEARCH_MODES = ('full', 'window')
+
+# HoughCircles 파라미터 (원본 해상도 기준)
+HOUGH_PARAMS = {'dp': 1, 'minDist': 50, 'param1': 50, 'param2': 30, 'minRadius': 5, 'maxRadius': 20}
+
+# window 모드: 창 안에서는 예상 위치에 가장 가까운 원을 고르므로 후보를 넓게 받음
+# (minDist=50이면 창 안의 더 강한 가짜 원이 실제 구멍을 억제함, 누적 임계값은 축소 비율에 따라 낮춤)
+WINDOW_MIN_DIST = 5
+WINDOW_PARAM2 = 18
+WINDOW_VOTE_TOLERANCE = 3.0  # 창 간 이동량 일치 허용 오차 (픽셀)
+
 
 class PCBAligner:
     """PCB 정렬 클래스"""
 
-    def __init__(self, reference_data: Dict):
+    def __init__(self, reference_data: Dict, hole_search: str = 'full', window_radius: int = 40,
+                 downscale: float = 1.0, subpixel: bool = True, reuse_threshold: float = 0.0,
+                 reuse_max_frames: int = 30):
         """
         Args:
             reference_data (dict): 기준 PCB 데이터
@@ -34,7 +59,16 @@ class PCBAligner:
                     'components': [...],
                     'side': 'left' or 'right'
                 }
+            hole_search: 나사 구멍 검출 모드 ('full' 또는 'window', HOLE_SEARCH_MODES 참고)
+            window_radius: window 모드 검색 창 반경 (픽셀, 예상 위치에서 보드가 움직일 수 있는 최대 거리)
+            downscale: window 모드 창 축소 비율 (1.0이면 원본, 0.5면 1/2 해상도에서 검출)
+            subpixel: window 모드에서 원본 해상도 원 테두리 피팅으로 중심 보정
+            reuse_threshold: 직전 프레임 대비 평균 픽셀 차이가 이 값 이하면 변환 행렬 재사용 (0이면 사용 안 함)
+            reuse_max_frames: 변환 행렬을 재사용할 최대 연속 프레임 수
         """
+        if hole_search not in HOLE_SEARCH_MODES:
+            raise ValueError(f"지원하지 않는 구멍 검출 모드: {hole_search} (가능: {HOLE_SEARCH_MODES})")
+
         self.reference_data = reference_data
         self.reference_holes = reference_data['mounting_holes']
         self.reference_distances = reference_data['hole_distances']
@@ -43,12 +77,25 @@ class PCBAligner:
             reference_data['image_size']['height']
         )
 
-        logger.info(f"PCBAligner 초기화 완료 (side: {reference_data.get('side', 'unknown')})")
+        self.hole_search = hole_search
+        self.window_radius = window_radius
+        self.downscale = downscale
+        self.subpixel = subpixel
+        self.reuse_threshold = reuse_threshold
+
+        # 직전 프레임 결과 (window 모드 검색 중심 / 변환 행렬 재사용)
+        self._last_holes: Optional[List[Tuple[float, float]]] = None
+        self._reuse_gate = MotionGate(threshold=reuse_threshold, max_reuse_frames=reuse_max_frames,
+                                      max_age_s=float('inf'), min_stable_inferences=0)
+        self._path_histograms: Dict[str, StageHistogram] = {}
+
+        logger.info(f"PCBAligner 초기화 완료 (side: {reference_data.get('side', 'unknown')}, 구멍 검출: {hole_search})")
 
     def detect_mounting_holes(
         self,
         image: np.ndarray,
-        debug: bool = False
+        debug: bool = False,
+        mode: Optional[str] = None
     ) -> Optional[List[Tuple[int, int]]]:
         """
         Hough Circle Transform으로 나사 구멍 검출
@@ -56,28 +103,28 @@ class PCBAligner:
         Args:
             image (np.ndarray): 입력 이미지 (BGR)
             debug (bool): 디버그 정보 출력
+            mode (str): 'full' 또는 'window' (None이면 생성 시 설정한 hole_search)
 
         Returns:
             list: 4개 코너 구멍 좌표 [(x1,y1), (x2,y2), (x3,y3), (x4,y4)]
-                  또는 None (검출 실패)
+                  (window + subpixel 모드는 float 좌표) 또는 None (검출 실패)
         """
         # 그레이스케일 변환
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
+        if (mode or self.hole_search) == 'window':
+            holes = self._detect_holes_windowed(gray, debug=debug)
+            if holes is not None:
+                self._last_holes = holes
+                return holes
+            if debug:
+                logger.debug("창 검색 실패 → 전체 프레임 검출")
+
         # 가우시안 블러
         blurred = cv2.GaussianBlur(gray, (9, 9), 2)
 
         # Hough Circle Transform
-        circles = cv2.HoughCircles(
-            blurred,
-            cv2.HOUGH_GRADIENT,
-            dp=1,
-            minDist=50,
-            param1=50,
-            param2=30,
-            minRadius=5,
-            maxRadius=20
-        )
+        circles = cv2.HoughCircles(blurred, cv2.HOUGH_GRADIENT, **HOUGH_PARAMS)
 
         if circles is None:
             if debug:
@@ -101,8 +148,136 @@ class PCBAligner:
         if len(corner_holes) != 4:
             return None
 
+        self._last_holes = corner_holes
         return corner_holes
 
+    def _expected_holes(self, image_shape: Tuple[int, ...]) -> List[Tuple[float, float]]:
+        """window 모드 검색 중심: 직전 프레임 검출 위치, 없으면 기준 구멍 위치 (프레임 크기에 맞게 비례 변환)"""
+        if self._last_holes is not None:
+            return self._last_holes
+        h, w = image_shape[:2]
+        sx, sy = w / self.image_size[0], h / self.image_size[1]
+        return [(x * sx, y * sy) for x, y in self.reference_holes]
+
+    def _detect_holes_windowed(
+        self,
+        gray: np.ndarray,
+        debug: bool = False
+    ) -> Optional[List[Tuple[float, float]]]:
+        """
+        예상 구멍 위치 주변 창에서만 HoughCircles 실행
+
+        창마다 후보 원을 넓게 받은 뒤, 네 창에 공통으로 나타나는 이동량(보드 평행이동)에
+        투표해서 창별 구멍을 고릅니다. 창 하나의 가짜 원(부품 테두리 등)에 끌려가지 않습니다.
+
+        Args:
+            gray (np.ndarray): 그레이스케일 프레임
+            debug (bool): 디버그 정보 출력
+
+        Returns:
+            list: 기준 구멍 순서의 4개 좌표 또는 None (하나라도 실패)
+        """
+        h, w = gray.shape[:2]
+        scale = self.downscale
+        radius = self.window_radius + HOUGH_PARAMS['maxRadius']
+        min_radius = max(2, int(round(HOUGH_PARAMS['minRadius'] * scale)))
+        max_radius = max(min_radius + 1, int(round(HOUGH_PARAMS['maxRadius'] * scale)))
+        param2 = max(8, round(WINDOW_PARAM2 * min(1.0, scale) ** 0.75))
+
+        # 1) 창별 후보 원 (예상 위치 기준 오프셋)
+        expected = self._expected_holes(gray.shape)
+        candidates = []
+        for ex, ey in expected:
+            x1, y1 = max(0, int(ex) - radius), max(0, int(ey) - radius)
+            x2, y2 = min(w, int(ex) + radius + 1), min(h, int(ey) + radius + 1)
+            window = gray[y1:y2, x1:x2]
+            if window.shape[0] < 2 * max_radius or window.shape[1] < 2 * max_radius:
+                return None
+
+            if scale != 1.0:
+                window = cv2.resize(window, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            blurred = cv2.GaussianBlur(window, (9, 9), 2 * scale)
+            circles = cv2.HoughCircles(
+                blurred,
+                cv2.HOUGH_GRADIENT,
+                dp=HOUGH_PARAMS['dp'],
+                minDist=WINDOW_MIN_DIST,
+                param1=HOUGH_PARAMS['param1'],
+                param2=param2,
+                minRadius=min_radius,
+                maxRadius=max_radius
+            )
+            if circles is None:
+                if debug:
+                    logger.debug(f"창 ({ex:.0f}, {ey:.0f}) 구멍 검출 실패")
+                return None
+
+            circles = circles[0] / scale + (x1 - ex, y1 - ey, 0)  # (dx, dy, r)
+            candidates.append(circles[np.hypot(circles[:, 0], circles[:, 1]) <= self.window_radius])
+
+        # 2) 보드 이동량 투표: 네 창에 공통으로 나타나는 오프셋 = 실제 구멍 (가짜 원은 창마다 제각각)
+        offsets = np.concatenate([c[:, :2] for c in candidates])
+        if len(offsets) == 0:
+            return None
+        support = np.zeros(len(offsets))
+        for c in candidates:
+            if len(c):
+                dist = np.hypot(offsets[:, None, 0] - c[None, :, 0], offsets[:, None, 1] - c[None, :, 1])
+                support += dist.min(axis=1) <= WINDOW_VOTE_TOLERANCE
+        support -= np.hypot(offsets[:, 0], offsets[:, 1]) / (self.window_radius * 10)  # 동률이면 작은 이동
+        shift = offsets[np.argmax(support)]
+        if support.max() < len(expected) - 0.5:
+            if debug:
+                logger.debug(f"창 검색: 네 구멍에 공통인 이동량 없음 (최대 지지 {support.max():.0f}개)")
+            return None
+
+        # 3) 창별로 공통 이동량에 가장 가까운 원 선택 (+ 원본 해상도 서브픽셀 보정)
+        holes = []
+        for (ex, ey), c in zip(expected, candidates):
+            dx, dy, r = (float(v) for v in c[np.argmin(np.hypot(c[:, 0] - shift[0], c[:, 1] - shift[1]))])
+            cx, cy = ex + dx, ey + dy
+            if self.subpixel:
+                cx, cy = self._refine_hole_center(gray, cx, cy, r)
+            holes.append((cx, cy))
+
+        return holes
+
+    @staticmethod
+    def _refine_hole_center(gray: np.ndarray, cx: float, cy: float, r: float) -> Tuple[float, float]:
+        """
+        원본 해상도에서 구멍 테두리 엣지에 원을 최소자승 피팅해서 중심 보정 (서브픽셀)
+
+        구멍이 배경보다 밝든 어둡든 테두리 엣지만 사용하므로 극성과 무관합니다.
+        엣지 점이 부족하거나 보정량이 반경보다 크면 원래 중심을 그대로 반환합니다.
+        """
+        h, w = gray.shape[:2]
+        half = int(np.ceil(r * 1.6)) + 2
+        x1, y1 = max(0, int(cx) - half), max(0, int(cy) - half)
+        x2, y2 = min(w, int(cx) + half + 1), min(h, int(cy) + half + 1)
+        patch = cv2.GaussianBlur(gray[y1:y2, x1:x2], (3, 3), 0)
+
+        ys, xs = np.nonzero(cv2.Canny(patch, 50, 100))
+        xs = xs + x1 - cx
+        ys = ys + y1 - cy
+        dist = np.hypot(xs, ys)
+        ring = (dist > r * 0.5) & (dist < r * 1.5)
+        if ring.sum() < 8:
+            return cx, cy
+
+        # Kasa 원 피팅: x² + y² + a·x + b·y + c = 0
+        xs, ys = xs[ring], ys[ring]
+        A = np.column_stack([xs, ys, np.ones_like(xs)])
+        (a, b, _), *_ = np.linalg.lstsq(A, -(xs ** 2 + ys ** 2), rcond=None)
+        dx, dy = -a / 2, -b / 2
+        if np.hypot(dx, dy) > r:
+            return cx, cy
+        return round(cx + float(dx), 2), round(cy + float(dy), 2)
+
+    def reset(self):
+        """직전 프레임 상태 초기화 (새 보드 진입 등)"""
+        self._last_holes = None
+        self._reuse_gate.invalidate()
+
     def _select_corner_holes(
         self,
         holes: List[Tuple[int, int]]
@@ -375,6 +550,7 @@ class PCBAligner:
         """
         프레임 처리 (통합 함수)
 
+        0. 보드가 움직이지 않았으면 직전 변환 행렬 재사용 (reuse_threshold > 0)
         1. 나사 구멍 검출 시도
         2. 전체 PCB 가시성 검증
         3. PCB 정렬
@@ -390,22 +566,58 @@ class PCBAligner:
                     'success': bool,
                     'aligned_frame': np.ndarray or None,
                     'transform_matrix': np.ndarray or None,
-                    'method': 'holes' or 'edges' or None,
+                    'method': 'holes' or 'edges' or 'reused' or None,
                     'error': str or None,
+                    'timings_ms': {'reuse_check', 'holes', 'edges', 'warp', 'total'} (실행한 단계만),
                     'debug_info': dict
                 }
         """
+        start = time.perf_counter()
+        result = self._process_frame(frame, debug)
+
+        timings = result['timings_ms']
+        timings['total'] = (time.perf_counter() - start) * 1000
+        self._record_path(result['method'] or 'failed', timings['total'])
+
+        # 정렬에 성공한 변환 행렬은 다음 프레임 재사용 후보로 저장
+        if self.reuse_threshold > 0 and result['success'] and result['method'] != 'reused':
+            self._reuse_gate.store('frame', frame, {'transform_matrix': result['transform_matrix']})
+        return result
+
+    def _process_frame(self, frame: np.ndarray, debug: bool) -> Dict:
+        """process_frame() 본체 (경로별 시간은 result['timings_ms']에 기록)"""
         result = {
             'success': False,
             'aligned_frame': None,
             'transform_matrix': None,
             'method': None,
             'error': None,
+            'timings_ms': {},
             'debug_info': {}
         }
+        timings = result['timings_ms']
+
+        # 0단계: 보드가 움직이지 않았으면 직전 변환 행렬 재사용
+        if self.reuse_threshold > 0:
+            stage_start = time.perf_counter()
+            cached, reason, diff = self._reuse_gate.check('frame', frame)
+            timings['reuse_check'] = (time.perf_counter() - stage_start) * 1000
+            result['debug_info']['reuse'] = {'result': reason, 'diff': round(diff, 2)}
+
+            if cached is not None:
+                stage_start = time.perf_counter()
+                M = cached['transform_matrix']
+                result['success'] = True
+                result['aligned_frame'] = cv2.warpPerspective(frame, M, self.image_size)
+                result['transform_matrix'] = M
+                result['method'] = 'reused'
+                timings['warp'] = (time.perf_counter() - stage_start) * 1000
+                return result
 
         # 1차 시도: 나사 구멍 검출
+        stage_start = time.perf_counter()
         detected_holes = self.detect_mounting_holes(frame, debug=debug)
+        timings['holes'] = (time.perf_counter() - stage_start) * 1000
 
         if detected_holes is not None:
             # 전체 PCB 가시성 검증
@@ -418,7 +630,9 @@ class PCBAligner:
 
             if is_visible:
                 # PCB 정렬
+                stage_start = time.perf_counter()
                 aligned_frame, M = self.align_pcb(frame, detected_holes)
+                timings['warp'] = (time.perf_counter() - stage_start) * 1000
 
                 result['success'] = True
                 result['aligned_frame'] = aligned_frame
@@ -441,11 +655,15 @@ class PCBAligner:
         if debug:
             logger.debug("나사 구멍 검출 실패, Edge 검출 시도...")
 
+        stage_start = time.perf_counter()
         edge_corners = self.detect_pcb_edges(frame, debug=debug)
+        timings['edges'] = (time.perf_counter() - stage_start) * 1000
 
         if edge_corners is not None:
             # Edge 기반 정렬
+            stage_start = time.perf_counter()
             aligned_frame, M = self.align_pcb(frame, edge_corners)
+            timings['warp'] = (time.perf_counter() - stage_start) * 1000
 
             result['success'] = True
             result['aligned_frame'] = aligned_frame
@@ -464,3 +682,18 @@ class PCBAligner:
             logger.debug("PCB 정렬 실패")
 
         return result
+
+    def _record_path(self, path: str, value_ms: float):
+        hist = self._path_histograms.get(path)
+        if hist is None:
+            hist = self._path_histograms.setdefault(path, StageHistogram())
+        hist.observe(value_ms)
+
+    def get_timing_stats(self) -> Dict[str, Dict]:
+        """
+        경로별 process_frame() 시간 통계
+
+        Returns:
+            {'holes' / 'edges' / 'reused' / 'failed': StageHistogram 요약 (count, avg, p50, p95, ...)}
+        """
+        return {path: hist.summary() for path, hist in sorted(self._path_histograms.items())}
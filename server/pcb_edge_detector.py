@@ -136,6 +136,66 @@ class PCBEdgeDetector:
         except Exception as e:
             logger.warning(f"직선 그리기 실패: {e}")
 
+    @staticmethod
+    def gradients(gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        인접 픽셀 밝기 차이 절대값
+
+        Args:
+            gray: 그레이스케일 이미지 (uint8)
+
+        Returns:
+            (grad_y, grad_x)
+            grad_y[r, c] = |gray[r+1, c] - gray[r, c]|  shape (h-1, w)
+            grad_x[r, c] = |gray[r, c+1] - gray[r, c]|  shape (h, w-1)
+        """
+        return cv2.absdiff(gray[1:, :], gray[:-1, :]), cv2.absdiff(gray[:, 1:], gray[:, :-1])
+
+    @staticmethod
+    def scan_edge_points(grad_y: np.ndarray, grad_x: np.ndarray, direction: str,
+                         roi: Tuple[int, int, int, int], threshold: int) -> np.ndarray:
+        """
+        ROI 안에서 스캔라인별로 바깥쪽부터 처음 임계값을 넘는 엣지 위치 (NumPy 벡터화)
+
+        top/bottom은 열마다, left/right는 행마다 첫 교차 지점을 argmax로 한 번에 구합니다.
+        교차 지점이 없는 스캔라인은 제외합니다.
+
+        Args:
+            grad_y, grad_x: gradients() 결과
+            direction: 'top', 'bottom', 'left', 'right'
+            roi: (x, y, width, height) - 이미지 범위로 잘린 ROI
+            threshold: 밝기 차이 임계값 (초과 시 엣지)
+
+        Returns:
+            엣지 점 배열 [[x, y], ...] (N x 2, int)
+        """
+        x, y, roi_w, roi_h = roi
+
+        if direction in ('top', 'bottom'):
+            # 열마다 세로 방향 차이: diff[r] = |roi[r+1] - roi[r]|
+            mask = grad_y[y:y + roi_h - 1, x:x + roi_w] > threshold
+            if mask.size == 0:
+                return np.empty((0, 2), dtype=np.int64)
+            if direction == 'top':
+                rows = mask.argmax(axis=0) + 1                         # 위에서 아래로: 아래쪽 픽셀
+            else:
+                rows = (mask.shape[0] - 1) - mask[::-1].argmax(axis=0)  # 아래에서 위로: 위쪽 픽셀
+            cols = np.arange(mask.shape[1])
+            found = mask.any(axis=0)
+        else:
+            # 행마다 가로 방향 차이: diff[:, c] = |roi[:, c+1] - roi[:, c]|
+            mask = grad_x[y:y + roi_h, x:x + roi_w - 1] > threshold
+            if mask.size == 0:
+                return np.empty((0, 2), dtype=np.int64)
+            if direction == 'left':
+                cols = mask.argmax(axis=1) + 1                            # 왼쪽에서 오른쪽으로: 오른쪽 픽셀
+            else:
+                cols = (mask.shape[1] - 1) - mask[:, ::-1].argmax(axis=1)  # 오른쪽에서 왼쪽으로: 왼쪽 픽셀
+            rows = np.arange(mask.shape[0])
+            found = mask.any(axis=1)
+
+        return np.stack([x + cols[found], y + rows[found]], axis=1).astype(np.int64)
+
     def detect_edges(self, image: np.ndarray,
                     thresholds: Optional[Dict[str, int]] = None,
                     rois: Optional[Dict[str, Tuple[int, int, int, int]]] = None,
@@ -167,6 +227,9 @@ class PCBEdgeDetector:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         gray = cv2.GaussianBlur(gray, (5, 5), 0)
 
+        # 인접 픽셀 밝기 차이 (네 방향 공용, 프레임당 1회 계산)
+        grad_y, grad_x = self.gradients(gray)
+
         # 디버그 이미지 준비
         if draw_debug:
             result_img = image.copy()
@@ -198,47 +261,13 @@ class PCBEdgeDetector:
             if draw_debug:
                 cv2.rectangle(result_img, (x, y), (x + roi_w, y + roi_h), (0, 255, 0), 1)
 
-            # ROI 추출
-            roi_img = gray[y:y + roi_h, x:x + roi_w]
-            points = []
-
-            # 방향별 엣지 스캔 (바깥 -> 안쪽)
-            if direction == 'top':
-                # 위에서 아래로 스캔
-                for c in range(roi_w):
-                    for r in range(1, roi_h):
-                        if abs(int(roi_img[r, c]) - int(roi_img[r-1, c])) > th:
-                            points.append([x + c, y + r])
-                            break
-
-            elif direction == 'bottom':
-                # 아래에서 위로 스캔
-                for c in range(roi_w):
-                    for r in range(roi_h - 2, -1, -1):
-                        if abs(int(roi_img[r, c]) - int(roi_img[r+1, c])) > th:
-                            points.append([x + c, y + r])
-                            break
-
-            elif direction == 'left':
-                # 왼쪽에서 오른쪽으로 스캔
-                for r in range(roi_h):
-                    for c in range(1, roi_w):
-                        if abs(int(roi_img[r, c]) - int(roi_img[r, c-1])) > th:
-                            points.append([x + c, y + r])
-                            break
-
-            elif direction == 'right':
-                # 오른쪽에서 왼쪽으로 스캔
-                for r in range(roi_h):
-                    for c in range(roi_w - 2, -1, -1):
-                        if abs(int(roi_img[r, c]) - int(roi_img[r, c+1])) > th:
-                            points.append([x + c, y + r])
-                            break
+            # 방향별 엣지 스캔 (바깥 -> 안쪽, 첫 임계값 초과 지점)
+            points = self.scan_edge_points(grad_y, grad_x, direction, (x, y, roi_w, roi_h), th)
 
             # 디버그: 검출된 점 그리기
             if draw_debug:
-                for p in points:
-                    cv2.circle(result_img, tuple(p), 1, colors[direction], -1)
+                for px, py in points.tolist():
+                    cv2.circle(result_img, (px, py), 1, colors[direction], -1)
 
             # 직선 피팅
             is_vertical = (direction in ['left', 'right'])
@@ -0,0 +1,104 @@
+"""
+초록색 PCB 영역(ROI) 감지
+
+축소한 프레임에서 HSV 색상 분할 + 모폴로지 + 컨투어로 PCB를 찾고,
+바운딩 박스만 원본 해상도로 되돌립니다. 전체 크기 마스크 대신 슬라이스 좌표를 반환하므로
+frame[roi_slices]로 바로 잘라 쓸 수 있고 프레임당 큰 배열을 할당하지 않습니다.
+
+축소(INTER_AREA) 시 만능기판 구멍이 주변 초록색과 섞여 보드가 하나의 덩어리로 분할되므로,
+원본 해상도에서 구멍 때문에 마스크가 끊겨 보드 일부만 잡히던 문제도 줄어듭니다.
+"""
+
+from functools import lru_cache
+import math
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# PCB 색상 / 경계 설정 (원본 해상도 기준)
+PCB_COLOR_LOWER_HSV = np.array([35, 40, 40])    # 초록색 하한 (HSV)
+PCB_COLOR_UPPER_HSV = np.array([85, 255, 255])  # 초록색 상한 (HSV)
+PCB_INNER_MARGIN_PERCENT = 0.03  # PCB 테두리 3% 제외 (파란색 선에 가깝게) ⭐
+PCB_EDGE_THRESHOLD = 10  # PCB가 프레임 경계에서 최소 10픽셀 떨어져야 전체로 간주
+MORPH_KERNEL_SIZE = 5  # 노이즈 제거 커널 크기 (분할 해상도 기준 - 1/4 축소 시 원본 약 20픽셀로 만능기판 구멍 사이를 메움)
+
+BBox = Tuple[int, int, int, int]
+RoiSlices = Tuple[slice, slice]
+
+# PCB 미검출 / 경계에 걸친 경우: 전체 프레임
+FULL_FRAME: RoiSlices = (slice(None), slice(None))
+
+
+@lru_cache(maxsize=4)
+def _morph_kernel(size: int) -> np.ndarray:
+    """모폴로지 커널 (크기별 1회 생성 후 재사용)"""
+    return np.ones((size, size), np.uint8)
+
+
+def locate_pcb_roi(frame: np.ndarray, downscale: float = 0.25) -> Tuple[RoiSlices, Optional[BBox], Optional[BBox]]:
+    """
+    초록색 PCB 자동 감지 및 내부 ROI 좌표 계산 (축소 프레임에서 분할)
+
+    Args:
+        frame: 원본 프레임 (BGR)
+        downscale: 분할 해상도 비율 (1.0이면 원본, 0.25면 1/4 크기에서 분할)
+
+    Returns:
+        roi_slices: (행 슬라이스, 열 슬라이스) - frame[roi_slices]로 ROI 추출 (미검출 시 FULL_FRAME)
+        pcb_bbox: PCB 바운딩 박스 (x, y, w, h) 또는 None
+        roi_bbox: ROI 바운딩 박스 (x, y, w, h) 또는 None (테두리 제외)
+    """
+    h, w = frame.shape[:2]
+
+    # 1. 축소 + HSV 변환
+    if downscale < 1.0:
+        small = cv2.resize(frame, (max(1, int(w * downscale)), max(1, int(h * downscale))),
+                           interpolation=cv2.INTER_AREA)
+    else:
+        small = frame
+    sx, sy = w / small.shape[1], h / small.shape[0]
+    hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+
+    # 2. 초록색 PCB 마스크 + 노이즈 제거 (결과를 같은 버퍼에 덮어씀)
+    pcb_mask = cv2.inRange(hsv, PCB_COLOR_LOWER_HSV, PCB_COLOR_UPPER_HSV)
+    kernel = _morph_kernel(MORPH_KERNEL_SIZE)
+    cv2.morphologyEx(pcb_mask, cv2.MORPH_CLOSE, kernel, dst=pcb_mask)
+    cv2.morphologyEx(pcb_mask, cv2.MORPH_OPEN, kernel, dst=pcb_mask)
+
+    # 3. 가장 큰 컨투어 = PCB
+    contours, _ = cv2.findContours(pcb_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return FULL_FRAME, None, None
+
+    bx, by, bw, bh = cv2.boundingRect(max(contours, key=cv2.contourArea))
+
+    # 원본 해상도로 되돌림 (축소 픽셀 한 칸을 모두 포함하도록 바깥쪽으로 반올림)
+    pcb_x, pcb_y = int(math.floor(bx * sx)), int(math.floor(by * sy))
+    pcb_w = min(w, int(math.ceil((bx + bw) * sx))) - pcb_x
+    pcb_h = min(h, int(math.ceil((by + bh) * sy))) - pcb_y
+
+    # 4. PCB가 프레임 경계에 붙어있으면 부분적으로만 보임 → 전체 프레임 사용
+    if (pcb_x < PCB_EDGE_THRESHOLD or pcb_y < PCB_EDGE_THRESHOLD or
+            pcb_x + pcb_w > w - PCB_EDGE_THRESHOLD or pcb_y + pcb_h > h - PCB_EDGE_THRESHOLD):
+        return FULL_FRAME, None, None
+
+    # 5. PCB 내부 영역만 ROI로 설정 (테두리 제외)
+    margin_w = int(pcb_w * PCB_INNER_MARGIN_PERCENT)
+    margin_h = int(pcb_h * PCB_INNER_MARGIN_PERCENT)
+    roi_x = max(0, pcb_x + margin_w)
+    roi_y = max(0, pcb_y + margin_h)
+    roi_w = min(pcb_w - 2 * margin_w, w - roi_x)
+    roi_h = min(pcb_h - 2 * margin_h, h - roi_y)
+
+    roi_slices = (slice(roi_y, roi_y + roi_h), slice(roi_x, roi_x + roi_w))
+    return roi_slices, (pcb_x, pcb_y, pcb_w, pcb_h), (roi_x, roi_y, roi_w, roi_h)
+
+
+def roi_mask_from_slices(shape: Tuple[int, ...], roi_slices: RoiSlices) -> np.ndarray:
+    """슬라이스 좌표 → 전체 크기 ROI 마스크 (255=PCB 내부, 0=외부) - 마스크가 꼭 필요한 호출자용"""
+    if roi_slices == FULL_FRAME:
+        return np.full(shape[:2], 255, dtype=np.uint8)
+    mask = np.zeros(shape[:2], dtype=np.uint8)
+    mask[roi_slices] = 255
+    return mask
@@ -0,0 +1,177 @@
+"""
+제품별 기준 부품 배치 캐시 (프로세스 내)
+
+predict_dual은 보드마다 제품 코드로 DB(product_components)를 조회하고 ComponentVerifier를 새로 만들었습니다.
+기준 배치는 /save_reference_components를 호출할 때만 바뀌므로, 제품별로 한 번 읽어서
+ReferenceLayout(클래스별 NumPy 배열)으로 정리해 두고 보드마다 재사용합니다 (캐시 적중 시 DB 조회 0회).
+
+- 공유 버전 확인: version_loader(예: db.get_reference_version)가 있으면 revalidate_s마다 DB의 버전
+  (행 수 / 최대 ID / 생성 시각)만 조회해서 바뀌었으면 다시 읽음 - 다른 서버 프로세스나 도구가 저장한 배치도
+  revalidate_s 안에 반영 (버전 조회 실패 시에는 캐시 유지)
+- 시간 제한: ttl_s가 지나면 다음 조회 때 DB에서 다시 읽음
+- 기준 데이터 없음(빈 결과)은 negative_ttl_s 동안만 기억 (DB 조회 실패도 빈 결과로 오므로 짧게)
+- 명시적 무효화: invalidate(product_code) - /save_reference_components 저장 직후 호출 (같은 프로세스는 즉시 반영)
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional
+
+from component_verification import ReferenceLayout
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceStore:
+    """제품 코드 → ReferenceLayout 캐시 (스레드 안전, LRU + TTL)"""
+
+    def __init__(self, loader: Callable[[str], List[Dict]], ttl_s: float = 300.0,
+                 negative_ttl_s: float = 10.0, max_products: int = 64,
+                 version_loader: Optional[Callable[[str], Optional[Hashable]]] = None,
+                 revalidate_s: float = 2.0):
+        """
+        Args:
+            loader: 제품 코드 → 기준 컴포넌트 리스트 (예: db.get_reference_components)
+            ttl_s: 캐시 유효 시간 (초, 0이면 명시적 무효화 / 버전 변경 전까지 유지)
+            negative_ttl_s: 기준 데이터가 없는 제품 결과 유효 시간 (초)
+            max_products: 최대 제품 수 (초과 시 가장 오래 사용하지 않은 제품부터 제거)
+            version_loader: 제품 코드 → 공유 버전 (예: db.get_reference_version, 조회 실패 시 None)
+            revalidate_s: 캐시 적중 시 버전을 다시 확인하는 간격 (초, 0이면 조회마다 확인)
+        """
+        self.loader = loader
+        self.ttl_s = ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.max_products = max_products
+        self.version_loader = version_loader
+        self.revalidate_s = revalidate_s
+
+        # product_code → [로드 시각, layout 또는 None, 로드 시 버전, 마지막 버전 확인 시각]
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # 같은 시점 미스에 DB 조회가 몰리지 않도록 로드는 한 번에 하나
+        self._generation = 0  # 무효화 세대 (로드 중 무효화되면 결과를 저장하지 않음)
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._invalidations = 0
+        self._version_checks = 0
+        self._version_changes = 0
+
+    def _lookup(self, product_code: str):
+        """캐시 조회 (만료 항목은 제거) → (적중 여부, 항목 또는 None)"""
+        entry = self._entries.get(product_code)
+        if entry is None:
+            return False, None
+        loaded_at, layout = entry[0], entry[1]
+        ttl = self.ttl_s if layout is not None else self.negative_ttl_s
+        if ttl and time.monotonic() - loaded_at > ttl:
+            del self._entries[product_code]
+            return False, None
+        self._entries.move_to_end(product_code)
+        return True, entry
+
+    def _revalidate(self, product_code: str, entry: list) -> bool:
+        """
+        공유 버전 확인 (revalidate_s마다, 잠금 밖에서 호출)
+
+        Returns:
+            캐시 항목을 계속 써도 되는지 (버전이 바뀌었으면 항목을 제거하고 False)
+        """
+        now = time.monotonic()
+        if self.version_loader is None or now - entry[3] < self.revalidate_s:
+            return True
+        entry[3] = now  # 동시에 적중한 다른 요청은 다시 조회하지 않음
+
+        version = self.version_loader(product_code)
+        with self._lock:
+            self._version_checks += 1
+            if version is None or version == entry[2]:
+                return True  # 조회 실패면 기존 캐시 유지
+            if self._entries.get(product_code) is entry:
+                del self._entries[product_code]
+            self._version_changes += 1
+        logger.info(f"🔄 제품 '{product_code}' 기준 배치 변경 감지 (버전 {entry[2]} → {version}) → 다시 로드")
+        return False
+
+    def get(self, product_code: str) -> Optional[ReferenceLayout]:
+        """
+        제품 기준 배치 조회 (미스 시 loader로 DB에서 읽어 캐시)
+
+        Args:
+            product_code: 제품 코드 (예: 'BC')
+
+        Returns:
+            ReferenceLayout 또는 None (기준 데이터 없음)
+        """
+        with self._lock:
+            hit, entry = self._lookup(product_code)
+        if hit and self._revalidate(product_code, entry):
+            with self._lock:
+                self._hits += 1
+            return entry[1]
+
+        with self._lock:
+            self._misses += 1
+
+        with self._load_lock:
+            # 대기하는 동안 다른 요청이 이미 로드했으면 그 결과 사용
+            with self._lock:
+                hit, entry = self._lookup(product_code)
+                if hit:
+                    return entry[1]
+                generation = self._generation
+
+            # 버전을 먼저 읽음 (로드 도중 저장되면 다음 확인에서 버전이 달라 다시 로드)
+            version = self.version_loader(product_code) if self.version_loader is not None else None
+            components = self.loader(product_code)
+            layout = ReferenceLayout(components) if components else None
+
+            with self._lock:
+                self._loads += 1
+                if generation == self._generation:
+                    now = time.monotonic()
+                    self._entries[product_code] = [now, layout, version, now]
+                    self._entries.move_to_end(product_code)
+                    while len(self._entries) > self.max_products:
+                        self._entries.popitem(last=False)
+
+        if layout is not None:
+            logger.info(f"✅ 제품 '{product_code}' 기준 배치 캐시: {len(layout)}개 부품, {len(layout.by_class)}개 클래스")
+        return layout
+
+    def invalidate(self, product_code: Optional[str] = None):
+        """
+        캐시 무효화 (기준 배치 저장 후 호출)
+
+        Args:
+            product_code: 제품 코드 (None이면 전체)
+        """
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            if product_code is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(product_code, None)
+        logger.info(f"🔄 기준 배치 캐시 무효화: {product_code or '전체'}")
+
+    def get_stats(self) -> Dict:
+        """캐시 통계 (API 응답용)"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'products': {code: (len(entry[1]) if entry[1] is not None else None)
+                             for code, entry in self._entries.items()},
+                'ttl_s': self.ttl_s,
+                'negative_ttl_s': self.negative_ttl_s,
+                'revalidate_s': self.revalidate_s if self.version_loader is not None else None,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': round(self._hits / lookups, 4) if lookups else 0.0,
+                'db_loads': self._loads,
+                'invalidations': self._invalidations,
+                'version_checks': self._version_checks,
+                'version_changes': self._version_changes
+            }
@@ -0,0 +1,133 @@
+"""
+프레임 내용 기반 추론 결과 캐시 (지각 해시 + LRU + TTL)
+
+테스트 클라이언트(raspberry_pi/camera_client.py, 30 FPS)는 같은 보드를 거의 같은 프레임으로
+계속 보냅니다. 프레임을 작은 그레이스케일로 축소한 dHash(인접 픽셀 밝기 차이 부호)를 키로 써서
+JPEG 노이즈 수준의 차이는 같은 키로 모으고, 같은 키의 YOLO 추론 + 결과 파싱을 건너뜁니다.
+
+- 크기 제한: max_entries 초과 시 가장 오래 사용하지 않은 항목부터 제거 (eviction)
+- 시간 제한: ttl_s가 지난 항목은 조회 시 만료 처리 (expiration)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import cv2
+import numpy as np
+
+
+def frame_hash(frame: np.ndarray, hash_size: int = 16) -> bytes:
+    """
+    프레임 지각 해시 (dHash)
+
+    Args:
+        frame: BGR 또는 그레이스케일 프레임
+        hash_size: 해시 격자 크기 (hash_size² 비트)
+
+    Returns:
+        hash_size² 비트를 패킹한 bytes
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return np.packbits(small[:, 1:] > small[:, :-1]).tobytes()
+
+
+class FrameResultCache:
+    """스레드 안전 LRU + TTL 캐시 (네임스페이스별 적중 / 미스 카운터)"""
+
+    def __init__(self, max_entries: int = 256, ttl_s: float = 2.0):
+        """
+        Args:
+            max_entries: 최대 항목 수
+            ttl_s: 항목 유효 시간 (초)
+        """
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, namespace: str, key: Hashable) -> Optional[Any]:
+        """
+        캐시 조회
+
+        Args:
+            namespace: 통계 구분용 이름 (엔드포인트)
+            key: 캐시 키 (namespace 안에서 유일)
+
+        Returns:
+            캐시된 값 (없거나 만료되면 None)
+        """
+        full_key = (namespace, key)
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_s:
+                del self._entries[full_key]
+                self._expirations += 1
+                entry = None
+
+            if entry is None:
+                self._misses[namespace] = self._misses.get(namespace, 0) + 1
+                return None
+
+            self._entries.move_to_end(full_key)
+            self._hits[namespace] = self._hits.get(namespace, 0) + 1
+            return entry[1]
+
+    def put(self, namespace: str, key: Hashable, value: Any):
+        """캐시 저장 (가득 차면 가장 오래 사용하지 않은 항목 제거)"""
+        full_key = (namespace, key)
+        with self._lock:
+            self._entries[full_key] = (time.monotonic(), value)
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """모든 항목 삭제 (모델 교체 등)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계
+
+        Returns:
+            {'size', 'max_entries', 'ttl_s', 'hits', 'misses', 'hit_ratio',
+             'evictions', 'expirations', 'endpoints': {namespace: {'hits', 'misses', 'hit_ratio'}}}
+        """
+        with self._lock:
+            size = len(self._entries)
+            hits = dict(self._hits)
+            misses = dict(self._misses)
+            evictions = self._evictions
+            expirations = self._expirations
+
+        def ratio(h, m):
+            return round(h / (h + m), 4) if h + m else 0.0
+
+        endpoints = {
+            name: {'hits': hits.get(name, 0), 'misses': misses.get(name, 0),
+                   'hit_ratio': ratio(hits.get(name, 0), misses.get(name, 0))}
+            for name in sorted(set(hits) | set(misses))
+        }
+        total_hits = sum(hits.values())
+        total_misses = sum(misses.values())
+        return {
+            'size': size,
+            'max_entries': self.max_entries,
+            'ttl_s': self.ttl_s,
+            'hits': total_hits,
+            'misses': total_misses,
+            'hit_ratio': ratio(total_hits, total_misses),
+            'evictions': evictions,
+            'expirations': expirations,
+            'endpoints': endpoints
+        }
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+일괄 재검증 워커 프로세스 (batch_verification.ChunkExecutor가 실행)
+
+서버(app.py)에서 spawn 프로세스 풀을 바로 만들면 풀 워커가 부모의 __main__(app.py)을 다시 실행해서
+모델 로드 / 카메라 스레드가 워커마다 시작됩니다. 이 모듈을 별도 프로세스의 __main__으로 실행하고
+그 안에서 풀을 만들면 풀 워커는 이 모듈(+ batch_verification)만 불러옵니다.
+
+    python reverify_worker.py --fd <소켓 fd> --workers 4
+
+부모와는 상속받은 소켓(multiprocessing.connection.Connection)으로 통신합니다.
+    요청: (job_id, verify_chunk 인자 튜플), 종료: None
+    응답: (job_id, True, 결과 리스트) 또는 (job_id, False, 오류 문자열)
+"""
+
+import argparse
+import logging
+import multiprocessing
+import threading
+from multiprocessing.connection import Connection
+
+from batch_verification import verify_chunk
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='일괄 재검증 워커 프로세스')
+    parser.add_argument('--fd', type=int, required=True, help='부모와 연결된 소켓 파일 디스크립터')
+    parser.add_argument('--workers', type=int, default=2, help='검증 프로세스 수')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] [%(levelname)s] [Reverify] - %(message)s')
+    conn = Connection(args.fd)
+    send_lock = threading.Lock()  # 풀 결과 콜백 스레드와 공유
+
+    def reply(message):
+        try:
+            with send_lock:
+                conn.send(message)
+        except OSError:
+            pass  # 부모 종료 (recv 루프도 곧 끝남)
+
+    with multiprocessing.get_context('spawn').Pool(max(1, args.workers)) as pool:
+        logger.info(f"✅ 일괄 재검증 워커 시작 (검증 프로세스 {args.workers}개)")
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            if message is None:
+                break
+            job_id, job_args = message
+            pool.apply_async(
+                verify_chunk, job_args,
+                callback=lambda records, job_id=job_id: reply((job_id, True, records)),
+                error_callback=lambda error, job_id=job_id: reply((job_id, False, repr(error)))
+            )
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
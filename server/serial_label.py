@@ -0,0 +1,166 @@
+"""
+시리얼 라벨 위치 찾기 + OCR 전처리
+
+뒷면 프레임 전체를 3배 업스케일 + CLAHE / 선명화 / 팽창한 뒤 CRAFT(canvas_size=2560)로 읽으면
+프레임 대부분(부품 / 기판 패턴)도 함께 처리합니다. 시리얼 라벨(S/N MBXX-00000000 한 줄)은
+프레임의 작은 영역이므로 라벨 후보를 먼저 잘라내고 그 영역만 업스케일 / OCR 합니다.
+
+    gray = rotate_to_text(frame)                  # 90도 회전 + 그레이스케일 (텍스트가 가로 방향)
+    region = locate_text_line(gray)              # 축소 프레임에서 가장 그럴듯한 텍스트 줄 (x, y, w, h)
+    x, y, w, h = pad_region(region, gray.shape)  # 글자 잘림 방지 여백
+    enhanced = enhance_for_ocr(gray[y:y + h, x:x + w])
+
+좌표는 모두 회전된 프레임 기준입니다. 라벨을 찾지 못하거나 잘라낸 영역에서 시리얼을 읽지 못하면
+호출자(SerialNumberDetector)가 전체 프레임으로 다시 시도합니다.
+"""
+
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+OCR_UPSCALE = 3.0  # OCR 입력 업스케일 배율 (텍스트를 더 크게)
+SHARPEN_KERNEL = np.array([[0, -1, 0],
+                           [-1, 5, -1],
+                           [0, -1, 0]])
+
+# 텍스트 줄 휴리스틱 설정 (분할 해상도 기준)
+TEXT_LINE_MIN_ASPECT = 3.0  # 가로 / 세로 최소 비율 (시리얼 한 줄은 가로로 긴 영역)
+TEXT_LINE_MIN_HEIGHT = 4  # 최소 글자 높이 (픽셀)
+TEXT_LINE_MAX_HEIGHT_RATIO = 0.15  # 프레임 높이 대비 최대 줄 높이
+TEXT_LINE_MIN_FILL = 0.45  # 바운딩 박스 대비 글자 영역 최소 비율
+TEXT_STROKE_THRESHOLD = 60  # 블랙햇 응답 하한 (라벨의 검은 글자는 100 이상, 기판 구멍 / 그림자는 그보다 약함)
+TEXT_LINE_MIN_CONTRAST = 100  # 줄 영역 밝기 대비 (상위 10% - 하위 10%, 밝은 라벨 위 검은 글자 / 기판 구멍 줄 제외)
+
+Region = Tuple[int, int, int, int]
+
+
+@lru_cache(maxsize=8)
+def _rect_kernel(width: int, height: int) -> np.ndarray:
+    """사각형 구조 요소 (크기별 1회 생성 후 재사용)"""
+    return cv2.getStructuringElement(cv2.MORPH_RECT, (width, height))
+
+
+def rotate_to_text(image: np.ndarray) -> np.ndarray:
+    """
+    뒷면 프레임 → 텍스트가 가로 방향인 그레이스케일 (시리얼 넘버가 옆으로 누워있음)
+
+    그레이스케일 변환을 먼저 해서 1채널만 회전합니다 (회전 후 변환과 결과 동일).
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    return cv2.rotate(gray, cv2.ROTATE_90_CLOCKWISE)
+
+
+def enhance_for_ocr(gray: np.ndarray, scale: float = OCR_UPSCALE) -> np.ndarray:
+    """
+    OCR 전처리 (업스케일링 + CLAHE + 선명화 + 텍스트 굵게)
+
+    Args:
+        gray: 회전된 그레이스케일 프레임 또는 라벨 영역
+        scale: 업스케일 배율
+
+    Returns:
+        전처리된 이미지 (scale배 크기)
+    """
+    upscaled = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+    enhanced = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(upscaled)
+    sharpened = cv2.filter2D(enhanced, -1, SHARPEN_KERNEL)
+    # S/N의 '/' 같은 얇은 문자를 굵게 (2x2 커널 1회 팽창)
+    return cv2.dilate(sharpened, _rect_kernel(2, 2), iterations=1)
+
+
+def locate_text_line(gray: np.ndarray, downscale: float = 0.5) -> Optional[Region]:
+    """
+    가장 그럴듯한 텍스트 줄 찾기 (축소 프레임의 블랙햇 + 가로 닫힘 + 컨투어)
+
+    밝은 라벨 위 어두운 글자를 블랙햇으로 강조하고 글자 사이를 가로로 이어 붙인 뒤, 글자가 빽빽하고
+    (TEXT_LINE_MIN_FILL) 밝기 대비가 큰(TEXT_LINE_MIN_CONTRAST) 덩어리 중 가장 긴 것에서 시작해
+    같은 줄의 이웃 단어를 합칩니다. 합친 줄이 가로로 길어야(TEXT_LINE_MIN_ASPECT) 라벨로 봅니다.
+
+    Args:
+        gray: 회전된 그레이스케일 프레임
+        downscale: 분할 해상도 비율
+
+    Returns:
+        (x, y, w, h) 원본(회전된 프레임) 좌표 또는 None
+    """
+    h, w = gray.shape[:2]
+    if downscale < 1.0:
+        small = cv2.resize(gray, (max(1, int(w * downscale)), max(1, int(h * downscale))),
+                           interpolation=cv2.INTER_AREA)
+    else:
+        small = gray
+    sx, sy = w / small.shape[1], h / small.shape[0]
+
+    blackhat = cv2.morphologyEx(small, cv2.MORPH_BLACKHAT, _rect_kernel(9, 5))
+    _, mask = cv2.threshold(blackhat, TEXT_STROKE_THRESHOLD, 255, cv2.THRESH_BINARY)
+    cv2.morphologyEx(mask, cv2.MORPH_CLOSE, _rect_kernel(7, 1), dst=mask)
+    cv2.morphologyEx(mask, cv2.MORPH_OPEN, _rect_kernel(2, 2), dst=mask)
+
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    max_height = small.shape[0] * TEXT_LINE_MAX_HEIGHT_RATIO
+    words = []  # 글자 덩어리 후보 (단어 단위일 수 있음)
+    for contour in contours:
+        x, y, bw, bh = cv2.boundingRect(contour)
+        if bh < TEXT_LINE_MIN_HEIGHT or bh > max_height:
+            continue
+        if cv2.contourArea(contour) < TEXT_LINE_MIN_FILL * bw * bh:
+            continue
+        low, high = np.percentile(small[y:y + bh, x:x + bw], (10, 90))
+        if high - low < TEXT_LINE_MIN_CONTRAST:
+            continue
+        words.append((x, y, bw, bh))
+    if not words:
+        return None
+
+    # 가장 긴 후보에서 시작해 같은 줄의 이웃 단어를 이어 붙임 ('S/N', 'MBXX-', 숫자 사이 띄어쓰기)
+    x0, y0, bw, bh = max(words, key=lambda word: word[2])
+    x1, y1 = x0 + bw, y0 + bh
+    merged = True
+    while merged:
+        merged = False
+        for x, y, ww, wh in words:
+            overlap = min(y1, y + wh) - max(y0, y)
+            gap = max(x - x1, x0 - (x + ww))
+            if overlap >= 0.5 * min(wh, y1 - y0) and gap <= 2 * (y1 - y0) and not (x0 <= x and x + ww <= x1):
+                x0, y0, x1, y1 = min(x0, x), min(y0, y), max(x1, x + ww), max(y1, y + wh)
+                merged = True
+    if x1 - x0 < TEXT_LINE_MIN_ASPECT * (y1 - y0):
+        return None
+    best = (x0, y0, x1 - x0, y1 - y0)
+
+    x, y, bw, bh = best
+    return (int(x * sx), int(y * sy), int(np.ceil(bw * sx)), int(np.ceil(bh * sy)))
+
+
+def pad_region(region: Region, shape: Tuple[int, ...], padding: float = 0.5) -> Region:
+    """
+    글자가 잘리지 않도록 영역 확장 (줄 높이 x padding만큼 사방으로, 프레임 안으로 자름)
+
+    Args:
+        region: (x, y, w, h)
+        shape: 프레임 shape (h, w[, c])
+        padding: 줄 높이 대비 여백 비율
+    """
+    x, y, w, h = region
+    margin = int(np.ceil(h * padding)) + 2
+    x0, y0 = max(0, x - margin), max(0, y - margin)
+    x1, y1 = min(shape[1], x + w + margin), min(shape[0], y + h + margin)
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def region_from_fractions(fractions: Sequence[float], shape: Tuple[int, ...]) -> Region:
+    """프레임 크기 비율 (x, y, w, h) → 픽셀 영역 (설정 ROI / 학습된 위치)"""
+    fx, fy, fw, fh = fractions
+    height, width = shape[:2]
+    x0, y0 = max(0, int(fx * width)), max(0, int(fy * height))
+    x1, y1 = min(width, int(np.ceil((fx + fw) * width))), min(height, int(np.ceil((fy + fh) * height)))
+    return x0, y0, max(0, x1 - x0), max(0, y1 - y0)
+
+
+def region_to_fractions(region: Region, shape: Tuple[int, ...]) -> Tuple[float, float, float, float]:
+    """픽셀 영역 → 프레임 크기 비율 (해상도가 바뀌어도 재사용)"""
+    x, y, w, h = region
+    height, width = shape[:2]
+    return x / width, y / height, w / width, h / height
@@ -7,6 +7,8 @@
     - 정규식 기반 시리얼 넘버 파싱 (S/N MBXX-00000001 형식)
     - 제품 코드 추출 (MBXX에서 XX 추출)
     - 신뢰도 기반 검증
+    - 라벨 영역만 잘라서 업스케일 / OCR (설정 ROI → 직전 성공 위치 → 텍스트 줄 휴리스틱,
+      실패 시 전체 프레임으로 재시도)
 
 예시:
     S/N MBBC-00000001 → 제품 코드: BC
@@ -15,11 +17,16 @@
 """
 
 import re
+import threading
+from collections import Counter
 import cv2
 import numpy as np
 import easyocr
 import logging
-from typing import Optional, Tuple, Dict
+from typing import Optional, Sequence, Tuple, Dict
+
+from serial_label import (OCR_UPSCALE, rotate_to_text, enhance_for_ocr, locate_text_line, pad_region,
+                          region_from_fractions, region_to_fractions)
 
 logger = logging.getLogger(__name__)
 
@@ -54,8 +61,13 @@ class SerialNumberDetector:
         re.IGNORECASE
     )
 
+    # 학습된 라벨 위치로 연속 실패하면 잊고 휴리스틱으로 다시 찾음
+    LABEL_MAX_FAILURES = 3
+
     def __init__(self, languages=['en'], gpu=True, min_confidence=0.01,
-                 detector='craft', recognizer='english_g2'):
+                 detector='craft', recognizer='english_g2',
+                 label_mode: str = 'auto', label_roi: Optional[Sequence[float]] = None,
+                 label_padding: float = 0.5):
         """
         Args:
             languages: OCR 언어 설정 (기본: 영어)
@@ -63,6 +75,9 @@ class SerialNumberDetector:
             min_confidence: 최소 신뢰도 임계값
             detector: 텍스트 검출 모델 ('craft' 또는 'dbnet18' - craft가 더 정확)
             recognizer: 텍스트 인식 모델 ('english_g2'가 기본보다 더 정확)
+            label_mode: 'auto' (라벨 영역 먼저 OCR, 실패 시 전체 프레임) 또는 'full' (항상 전체 프레임)
+            label_roi: 고정 라벨 영역 [x, y, w, h] (회전된 프레임 크기 대비 비율, None이면 자동)
+            label_padding: 찾은 라벨 영역 여백 (글자 높이 대비 비율)
         """
         self.languages = languages
         self.gpu = gpu
@@ -71,6 +86,16 @@ class SerialNumberDetector:
         self.recognizer = recognizer
         self.reader = None
 
+        if label_mode not in ('auto', 'full'):
+            raise ValueError(f"label_mode는 'auto' 또는 'full'이어야 합니다: {label_mode}")
+        self.label_mode = label_mode
+        self.label_roi = tuple(label_roi) if label_roi else None
+        self.label_padding = label_padding
+        self._learned_label = None  # 직전에 시리얼을 읽은 라벨 위치 (프레임 비율)
+        self._label_failures = 0
+        self._label_lock = threading.Lock()
+        self._region_counts = Counter()  # 라벨 영역 성공 / 전체 프레임 재시도 / 전체 프레임만 사용
+
         logger.info("🔤 시리얼 넘버 OCR 검출기 초기화 중 (EasyOCR 개선 버전)...")
         self._initialize_reader()
 
@@ -100,7 +125,7 @@ class SerialNumberDetector:
 
     def preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """
-        OCR 전처리 (90도 회전 + 업스케일링 + CLAHE + 선명화 + 텍스트 굵게)
+        OCR 전처리 (90도 회전 + 업스케일링 + CLAHE + 선명화 + 텍스트 굵게) - 전체 프레임
 
         Args:
             image: 입력 이미지
@@ -108,46 +133,11 @@ class SerialNumberDetector:
         Returns:
             전처리된 이미지
         """
-        # **1단계: 오른쪽으로 90도 회전** (시리얼 넘버가 옆으로 누워있음)
-        rotated = cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE)
-
-        # **2단계: 그레이스케일 변환**
-        if len(rotated.shape) == 3:
-            gray = cv2.cvtColor(rotated, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = rotated
-
-        # **3단계: 업스케일링 (3배)** - 텍스트를 더 크게
-        scale_factor = 3.0
-        upscaled = cv2.resize(
-            gray,
-            None,
-            fx=scale_factor,
-            fy=scale_factor,
-            interpolation=cv2.INTER_CUBIC
-        )
-
-        # **4단계: 대비 향상 (CLAHE)**
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        enhanced = clahe.apply(upscaled)
-
-        # **5단계: 선명화 (Sharpening)**
-        kernel = np.array([[0,-1,0],
-                          [-1, 5,-1],
-                          [0,-1,0]])
-        sharpened = cv2.filter2D(enhanced, -1, kernel)
-
-        # **6단계: 텍스트 굵게 만들기 (Morphological Dilation)**
-        # - S/N의 '/' 같은 얇은 문자를 더 굵게 만들어 OCR 정확도 향상
-        # - 2x2 커널로 1회 팽창 (과도한 팽창 방지)
-        morph_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-        bold = cv2.dilate(sharpened, morph_kernel, iterations=1)
-
-        return bold
+        return enhance_for_ocr(rotate_to_text(image))
 
     def detect_text(self, image: np.ndarray) -> tuple:
         """
-        이미지에서 텍스트 검출 (EasyOCR)
+        이미지에서 텍스트 검출 (EasyOCR, 전체 프레임)
 
         Args:
             image: 입력 이미지
@@ -156,12 +146,24 @@ class SerialNumberDetector:
             (검출된 텍스트 리스트, 전처리된 이미지)
             [(bbox, text, confidence), ...], preprocessed_image
         """
+        return self._read_text(rotate_to_text(image))
+
+    def _read_text(self, gray: np.ndarray) -> tuple:
+        """
+        회전된 그레이스케일 프레임(또는 라벨 영역) 전처리 + 텍스트 검출
+
+        Args:
+            gray: rotate_to_text() 결과 또는 그 일부
+
+        Returns:
+            (검출된 텍스트 리스트, 전처리된 이미지) - bbox는 전처리된 이미지 좌표 (OCR_UPSCALE배)
+        """
         if self.reader is None:
             raise RuntimeError("EasyOCR Reader가 초기화되지 않았습니다")
 
         try:
             # 전처리
-            preprocessed = self.preprocess_image(image)
+            preprocessed = enhance_for_ocr(gray)
 
             # OCR 수행 (관대한 임계값으로 최대한 많이 검출)
             results = self.reader.readtext(
@@ -339,12 +341,16 @@ class SerialNumberDetector:
         logger.warning(f"⚠️  모든 패턴 매칭 실패. 원본 텍스트: '{text}'")
         return None
 
-    def detect_serial_number(self, image: np.ndarray) -> Dict:
+    def detect_serial_number(self, image: np.ndarray, learn_label: bool = True) -> Dict:
         """
         이미지에서 시리얼 넘버 검출 및 제품 코드 추출
 
+        label_mode='auto'면 라벨 영역만 잘라서 먼저 읽고, 라벨을 찾지 못했거나 시리얼 형식을
+        읽지 못하면 전체 프레임으로 다시 읽습니다.
+
         Args:
             image: 입력 이미지 (BGR 또는 Gray)
+            learn_label: False면 라벨 위치 학습 / 통계 반영 안 함 (워밍업 더미 프레임용)
 
         Returns:
             검출 결과 딕셔너리
@@ -356,60 +362,37 @@ class SerialNumberDetector:
                 'confidence': OCR 신뢰도,
                 'detected_text': 원본 OCR 텍스트,
                 'preprocessed_image': 전처리된 이미지 (디버그 뷰어용),
+                'ocr_region': 'label' (라벨 영역) / 'full' (전체 프레임),
+                'label_bbox': 라벨 영역 [x, y, w, h] (회전된 프레임 좌표, 라벨 영역으로 읽은 경우),
                 'error': 에러 메시지 (실패 시)
             }
         """
         try:
-            # 텍스트 검출 (전처리된 이미지도 함께 반환)
-            ocr_results, preprocessed = self.detect_text(image)
-
-            if not ocr_results:
-                return {
-                    'status': 'error',
-                    'error': '텍스트를 검출할 수 없습니다',
-                    'serial_number': None,
-                    'product_code': None,
-                    'confidence': 0.0,
-                    'preprocessed_image': preprocessed
-                }
-
-            # 검출된 모든 텍스트를 합쳐서 파싱
-            all_text = ' '.join([text for _, text, _ in ocr_results])
-            logger.info(f"검출된 텍스트: {all_text}")
-
-            # 시리얼 넘버 파싱
-            parsed = self.parse_serial_number(all_text)
-
-            if parsed is None:
-                return {
-                    'status': 'error',
-                    'error': '시리얼 넘버 형식을 찾을 수 없습니다',
-                    'serial_number': None,
-                    'product_code': None,
-                    'confidence': 0.0,
-                    'detected_text': all_text,
-                    'preprocessed_image': preprocessed
-                }
-
-            full_serial, product_code, sequence_number = parsed
-
-            # 평균 신뢰도 계산
-            avg_confidence = np.mean([conf for _, _, conf in ocr_results])
-
-            logger.info(
-                f"✅ 시리얼 넘버 검출 성공: {full_serial} "
-                f"(제품 코드: {product_code}, 신뢰도: {avg_confidence:.2%})"
-            )
-
-            return {
-                'status': 'ok',
-                'serial_number': full_serial,
-                'product_code': product_code,
-                'sequence_number': sequence_number,
-                'confidence': float(avg_confidence),
-                'detected_text': all_text,
-                'preprocessed_image': preprocessed
-            }
+            gray = rotate_to_text(image)
+
+            # 1. 라벨 영역만 OCR
+            region, source = self._label_region(gray) if self.label_mode == 'auto' else (None, None)
+            if region is not None:
+                x, y, w, h = region
+                result, _ = self._recognize(gray[y:y + h, x:x + w])
+                if learn_label:
+                    self._record_label(region, gray.shape, source, success=result['status'] == 'ok')
+                if result['status'] == 'ok':
+                    result['ocr_region'] = 'label'
+                    result['label_bbox'] = [x, y, w, h]
+                    return result
+                logger.info(f"🔁 라벨 영역({source}) OCR 실패 → 전체 프레임으로 재시도")
+
+            # 2. 전체 프레임 OCR (라벨 미검출 / 실패 시)
+            result, ocr_results = self._recognize(gray)
+            result['ocr_region'] = 'full'
+            if not learn_label:
+                return result
+            with self._label_lock:
+                self._region_counts['fallback' if region is not None else 'full'] += 1
+            if result['status'] == 'ok' and self.label_mode == 'auto':
+                self._learn_label(ocr_results, gray.shape)
+            return result
 
         except Exception as e:
             logger.error(f"❌ 시리얼 넘버 검출 실패: {e}", exc_info=True)
@@ -422,6 +405,134 @@ class SerialNumberDetector:
                 'preprocessed_image': None
             }
 
+    def _recognize(self, gray: np.ndarray) -> Tuple[Dict, list]:
+        """
+        회전된 그레이스케일 영역 OCR + 시리얼 파싱
+
+        Returns:
+            (검출 결과 딕셔너리, OCR 결과 리스트)
+        """
+        # 텍스트 검출 (전처리된 이미지도 함께 반환)
+        ocr_results, preprocessed = self._read_text(gray)
+
+        if not ocr_results:
+            return {
+                'status': 'error',
+                'error': '텍스트를 검출할 수 없습니다',
+                'serial_number': None,
+                'product_code': None,
+                'confidence': 0.0,
+                'preprocessed_image': preprocessed
+            }, ocr_results
+
+        # 검출된 모든 텍스트를 합쳐서 파싱
+        all_text = ' '.join([text for _, text, _ in ocr_results])
+        logger.info(f"검출된 텍스트: {all_text}")
+
+        # 시리얼 넘버 파싱
+        parsed = self.parse_serial_number(all_text)
+
+        if parsed is None:
+            return {
+                'status': 'error',
+                'error': '시리얼 넘버 형식을 찾을 수 없습니다',
+                'serial_number': None,
+                'product_code': None,
+                'confidence': 0.0,
+                'detected_text': all_text,
+                'preprocessed_image': preprocessed
+            }, ocr_results
+
+        full_serial, product_code, sequence_number = parsed
+
+        # 평균 신뢰도 계산
+        avg_confidence = np.mean([conf for _, _, conf in ocr_results])
+
+        logger.info(
+            f"✅ 시리얼 넘버 검출 성공: {full_serial} "
+            f"(제품 코드: {product_code}, 신뢰도: {avg_confidence:.2%})"
+        )
+
+        return {
+            'status': 'ok',
+            'serial_number': full_serial,
+            'product_code': product_code,
+            'sequence_number': sequence_number,
+            'confidence': float(avg_confidence),
+            'detected_text': all_text,
+            'preprocessed_image': preprocessed
+        }, ocr_results
+
+    def _label_region(self, gray: np.ndarray):
+        """
+        라벨 영역 선택 (설정 ROI → 직전 성공 위치 → 텍스트 줄 휴리스틱)
+
+        Returns:
+            ((x, y, w, h), 출처) 또는 (None, None) - 출처: 'config' / 'learned' / 'search'
+        """
+        if self.label_roi is not None:
+            region, source = region_from_fractions(self.label_roi, gray.shape), 'config'
+        else:
+            with self._label_lock:
+                learned = self._learned_label
+            if learned is not None:
+                region, source = region_from_fractions(learned, gray.shape), 'learned'
+            else:
+                found = locate_text_line(gray)
+                if found is None:
+                    return None, None
+                region, source = pad_region(found, gray.shape, self.label_padding), 'search'
+
+        if region[2] < 8 or region[3] < 8:
+            return None, None
+        return region, source
+
+    def _record_label(self, region, shape, source: str, success: bool):
+        """라벨 영역 OCR 결과 반영 (성공 위치 기억 / 학습 위치 연속 실패 시 폐기)"""
+        with self._label_lock:
+            self._region_counts[f'label_{source}' if success else f'label_{source}_failed'] += 1
+            if success:
+                self._label_failures = 0
+                if source == 'search':
+                    self._learned_label = region_to_fractions(region, shape)
+            elif source == 'learned':
+                self._label_failures += 1
+                if self._label_failures >= self.LABEL_MAX_FAILURES:
+                    logger.info(f"🔄 학습된 라벨 위치 {self.LABEL_MAX_FAILURES}회 연속 실패 → 다시 찾음")
+                    self._learned_label = None
+                    self._label_failures = 0
+
+    def _learn_label(self, ocr_results: list, shape):
+        """전체 프레임에서 시리얼을 읽은 텍스트 위치를 라벨 위치로 기억 (다음 프레임부터 라벨 영역만 OCR)"""
+        boxes = [np.asarray(bbox, dtype=np.float32) / OCR_UPSCALE
+                 for bbox, text, _ in ocr_results
+                 if 'MB' in text.upper() or sum(c.isdigit() for c in text) >= 4]
+        if not boxes:
+            return
+        points = np.concatenate(boxes)
+        x0, y0 = np.floor(points.min(axis=0)).astype(int)
+        x1, y1 = np.ceil(points.max(axis=0)).astype(int)
+        region = pad_region((int(x0), int(y0), int(x1 - x0), int(y1 - y0)), shape, self.label_padding)
+        with self._label_lock:
+            self._learned_label = region_to_fractions(region, shape)  # 연속 실패 횟수는 유지 (같은 위치에서 계속 실패하면 폐기)
+        logger.info(f"📌 시리얼 라벨 위치 기억: {region} (회전된 프레임 좌표)")
+
+    def forget_label(self):
+        """기억한 라벨 위치 삭제 (제품 교체 후)"""
+        with self._label_lock:
+            self._learned_label = None
+            self._label_failures = 0
+
+    def get_label_stats(self) -> Dict:
+        """라벨 영역 OCR 통계 (출처별 성공 / 실패, 전체 프레임 재시도 수)"""
+        with self._label_lock:
+            return {
+                'label_mode': self.label_mode,
+                'label_roi': list(self.label_roi) if self.label_roi else None,
+                'learned_label': [round(v, 4) for v in self._learned_label] if self._learned_label else None,
+                'counts': dict(self._region_counts)
+            }
+
 
 # 테스트 코드
 if __name__ == '__main__':
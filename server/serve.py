@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+멀티 프로세스 서빙 모드 실행기
+
+단일 프로세스(python app.py)에서는 HTTP 핸들러, SocketIO 스트리밍, OCR, YOLO, DB 호출이
+모두 하나의 GIL을 공유합니다. 이 실행기는
+    - 프론트엔드 워커 프로세스 N개 (Flask + SocketIO, 같은 포트의 리스닝 소켓을 공유)
+    - 전용 추론 프로세스 1개 (YOLO + 배칭 스케줄러, 시리얼 OCR)
+로 나눠 실행하고, 디코딩된 프레임은 워커별 공유 메모리 링 버퍼로 추론 프로세스에 전달합니다.
+
+실행 방법:
+    python serve.py               # configs/server_config.yaml의 serving.workers 사용
+
+설정 (configs/server_config.yaml):
+    serving:
+      workers: 1                  # 프론트엔드 워커 프로세스 수 (현재 1만 지원)
+      ring_slots: 8               # 워커별 공유 메모리 슬롯 수
+      ring_slot_bytes: 6220800    # 슬롯 크기 (1920x1080 BGR)
+      startup_timeout: 300        # 워커가 추론 프로세스 준비를 기다리는 시간 (초)
+      socketio_message_queue: null  # 워커 간 SocketIO broadcast 공유 (예: redis://localhost:6379/0)
+
+주의:
+    - 리눅스 전용 (fork로 리스닝 소켓과 큐를 워커에 상속)
+    - 프론트엔드 워커는 1개만 지원합니다. 추적 객체(MIN_DETECTION_FRAMES 스무딩), 모션 게이트,
+      YOLO 결과 캐시, latest_results, 기준 배치 캐시 같은 시간 상태가 app.py 모듈 변수라서
+      워커가 여러 개면 커널이 한 카메라의 프레임을 워커들에 나눠 주고 워커마다 다른 판정을 내립니다.
+      이 상태를 추론 프로세스로 옮기기 전까지 workers > 1은 시작 시 거부합니다.
+      (YOLO / OCR은 이미 추론 프로세스에서 실행되므로 워커 1개로도 HTTP 처리와 추론의 GIL은 분리됩니다.)
+"""
+
+import argparse
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import socket
+import sys
+
+from server_config import get_config_value
+from shm_ring import DEFAULT_SLOT_BYTES
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] [%(levelname)s] [Serve] [%(module)s] - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+MAX_FRONTEND_WORKERS = 1  # 시간 상태가 워커별이므로 공유되기 전까지 1개만 허용
+
+
+def create_listen_socket(host: str, port: int) -> socket.socket:
+    """워커들이 공유할 리스닝 소켓 (커널이 accept를 워커에 분산)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(128)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_frontend_worker(worker_id: int, listen_fd: int, host: str, port: int, request_queue, response_queue):
+    """
+    프론트엔드 워커 프로세스 (Flask + SocketIO)
+
+    app 모듈을 임포트하기 전에 추론 클라이언트를 설정하므로
+    app.py는 로컬 모델 대신 RemoteDetector / RemoteSerialDetector를 사용합니다.
+    """
+    import atexit
+
+    import inference_service
+    client = inference_service.configure_inference_client(
+        worker_id, request_queue, response_queue,
+        slots=get_config_value('serving.ring_slots', 8),
+        slot_bytes=get_config_value('serving.ring_slot_bytes', DEFAULT_SLOT_BYTES),
+        timeout=get_config_value('inference.timeout', 5.0)
+    )
+    atexit.register(client.close)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    import app as server_app
+    from werkzeug.serving import make_server
+
+    server = make_server(host, port, server_app.app, threaded=True, fd=listen_fd)
+    logger.info(f"✅ 프론트엔드 워커 {worker_id} 시작 (PID {os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PCB 검사 서버 멀티 프로세스 실행기')
+    parser.add_argument('--workers', type=int, default=get_config_value('serving.workers', 1),
+                        help=f'프론트엔드 워커 프로세스 수 (최대 {MAX_FRONTEND_WORKERS})')
+    parser.add_argument('--host', default=get_config_value('server.host', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=get_config_value('server.port', 5000))
+    args = parser.parse_args()
+
+    if not 1 <= args.workers <= MAX_FRONTEND_WORKERS:
+        # 추적 / 모션 게이트 / 결과 캐시 / latest_results가 워커별이라 판정이 워커마다 갈라짐
+        parser.error(f"serving.workers={args.workers}: 프론트엔드 워커는 {MAX_FRONTEND_WORKERS}개만 지원합니다 "
+                     "(카메라별 시간 상태가 워커 간에 공유되지 않음)")
+
+    ctx = multiprocessing.get_context('fork')
+    listen_socket = create_listen_socket(args.host, args.port)
+
+    request_queue = ctx.Queue()
+    response_queues = [ctx.Queue() for _ in range(args.workers)]
+
+    # 1. 추론 프로세스 (모델 로드 / 워밍업은 프로세스 안에서 수행, 워커는 /health로 상태 보고)
+    from inference_service import run_inference_process
+    inference_process = ctx.Process(target=run_inference_process, args=(request_queue, response_queues),
+                                    name='pcb-inference')
+    inference_process.start()
+
+    # 2. 프론트엔드 워커
+    workers = []
+    for worker_id in range(args.workers):
+        worker = ctx.Process(
+            target=run_frontend_worker,
+            args=(worker_id, listen_socket.fileno(), args.host, args.port, request_queue, response_queues[worker_id]),
+            name=f'pcb-frontend-{worker_id}'
+        )
+        worker.start()
+        workers.append(worker)
+
+    logger.info("=" * 60)
+    logger.info("PCB 검사 서버 (멀티 프로세스 모드)")
+    logger.info(f"주소: http://{args.host}:{args.port}")
+    logger.info(f"프론트엔드 워커: {args.workers}개, 추론 프로세스 PID: {inference_process.pid}")
+    logger.info("=" * 60)
+
+    def shutdown(*_):
+        logger.info("서버 종료 중...")
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join(timeout=5)
+        request_queue.put(None)
+        inference_process.join(timeout=10)
+        if inference_process.is_alive():
+            inference_process.terminate()
+        listen_socket.close()
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    # 프로세스 하나라도 종료되면 전체 종료 (supervisor / systemd가 재시작)
+    multiprocessing.connection.wait([p.sentinel for p in workers + [inference_process]])
+    logger.error("❌ 프로세스가 예기치 않게 종료되었습니다")
+    shutdown()
+
+
+if __name__ == '__main__':
+    main()
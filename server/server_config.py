@@ -0,0 +1,92 @@
+"""
+서버 설정 로더
+
+configs/server_config.yaml을 읽어 딕셔너리로 제공합니다.
+파일이 없거나 PyYAML이 설치되지 않은 경우 빈 설정을 반환하며,
+각 모듈은 get_config_value()의 기본값으로 동작합니다.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 기본 설정 파일 경로 (프로젝트 루트/configs/server_config.yaml)
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent / 'configs' / 'server_config.yaml'
+
+# 프로젝트 루트 (설정 파일의 상대 경로 기준)
+PROJECT_ROOT = DEFAULT_CONFIG_PATH.parent.parent
+
+_config_cache: Optional[Dict] = None
+
+
+def load_server_config(config_path: Optional[str] = None, reload: bool = False) -> Dict:
+    """
+    서버 설정 파일 로드 (최초 1회만 읽고 캐시)
+
+    Args:
+        config_path: 설정 파일 경로 (None이면 기본 경로)
+        reload: True면 캐시를 무시하고 다시 읽음
+
+    Returns:
+        설정 딕셔너리 (로드 실패 시 빈 딕셔너리)
+    """
+    global _config_cache
+
+    if _config_cache is not None and not reload and config_path is None:
+        return _config_cache
+
+    path = Path(config_path) if config_path else DEFAULT_CONFIG_PATH
+    config = {}
+    try:
+        import yaml
+        with open(path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+        logger.info(f"✅ 서버 설정 로드 완료: {path}")
+    except ImportError:
+        logger.warning("⚠️  PyYAML이 설치되지 않았습니다. 기본 설정을 사용합니다.")
+    except FileNotFoundError:
+        logger.warning(f"⚠️  설정 파일 없음: {path} (기본 설정 사용)")
+    except Exception as e:
+        logger.error(f"⚠️  설정 파일 로드 실패: {e} (기본 설정 사용)")
+
+    if config_path is None:
+        _config_cache = config
+    return config
+
+
+def get_config_value(key: str, default: Any = None, config: Optional[Dict] = None) -> Any:
+    """
+    점(.)으로 구분된 키로 설정 값 조회
+
+    Args:
+        key: 설정 키 (예: 'inference.max_batch_size')
+        default: 값이 없을 때 반환할 기본값
+        config: 설정 딕셔너리 (None이면 기본 설정 파일)
+
+    Returns:
+        설정 값 또는 기본값
+    """
+    node = config if config is not None else load_server_config()
+    for part in key.split('.'):
+        if not isinstance(node, dict) or part not in node:
+            return default
+        node = node[part]
+    return node if node is not None else default
+
+
+def resolve_project_path(path: str) -> str:
+    """
+    설정 파일의 경로 값을 절대 경로로 변환
+
+    Args:
+        path: 절대 경로 또는 프로젝트 루트 기준 상대 경로 (예: 'models/detector.onnx')
+
+    Returns:
+        절대 경로 문자열
+    """
+    resolved = Path(path)
+    if not resolved.is_absolute():
+        resolved = PROJECT_ROOT / resolved
+    return str(resolved)
@@ -0,0 +1,105 @@
+"""
+공유 메모리 프레임 링 버퍼 (multiprocessing.shared_memory)
+
+프론트엔드 워커 프로세스가 디코딩한 프레임을 추론 프로세스로 넘길 때
+프레임을 pickle하지 않고 공유 메모리 슬롯에 한 번 복사한 뒤,
+(링 이름, 슬롯 번호, shape, dtype)만 큐로 전달합니다.
+추론 프로세스는 같은 링에 attach해서 복사 없이 numpy 뷰로 읽습니다.
+
+- 링 1개 = 생산자(워커 프로세스) 1개. 슬롯 할당 / 반납은 생산자 프로세스 안에서만 수행
+- 소비자(추론 프로세스)는 읽기만 하고, 응답을 받은 생산자가 슬롯을 반납
+"""
+
+import logging
+import queue
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 기본 슬롯 크기: 1920x1080 BGR (storage.max_image_size 기준)
+DEFAULT_SLOT_BYTES = 1920 * 1080 * 3
+
+
+class SharedFrameRing:
+    """고정 크기 슬롯으로 나뉜 공유 메모리 프레임 버퍼"""
+
+    def __init__(self, name: Optional[str] = None, slots: int = 8,
+                 slot_bytes: int = DEFAULT_SLOT_BYTES, create: bool = True):
+        """
+        Args:
+            name: 공유 메모리 이름 (create=False면 필수)
+            slots: 슬롯 수 (동시에 추론 대기할 수 있는 프레임 수)
+            slot_bytes: 슬롯당 최대 프레임 바이트
+            create: True면 생성(생산자), False면 기존 링에 attach(소비자)
+        """
+        self.slots = int(slots)
+        self.slot_bytes = int(slot_bytes)
+        self.owner = create
+
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=self.slots * self.slot_bytes)
+        self.name = self._shm.name
+
+        if create:
+            self._free: "queue.Queue[int]" = queue.Queue()
+            for slot in range(self.slots):
+                self._free.put(slot)
+            logger.info(f"✅ 공유 메모리 링 생성: {self.name} ({self.slots}슬롯 x {self.slot_bytes / 1e6:.1f}MB)")
+        else:
+            # 소비자 프로세스 종료 시 resource_tracker가 링을 unlink하지 않도록 등록 해제 (Python < 3.13)
+            try:
+                resource_tracker.unregister(self._shm._name, 'shared_memory')
+            except Exception:
+                pass
+
+    def fits(self, frame: np.ndarray) -> bool:
+        """프레임이 슬롯 하나에 들어가는지"""
+        return frame.nbytes <= self.slot_bytes
+
+    def write(self, frame: np.ndarray, timeout: Optional[float] = None) -> Tuple[int, Tuple[int, ...], str]:
+        """
+        빈 슬롯에 프레임 복사 (생산자 전용)
+
+        Args:
+            frame: numpy 배열
+            timeout: 빈 슬롯 대기 시간 (None이면 무한 대기)
+
+        Returns:
+            (슬롯 번호, shape, dtype 문자열)
+
+        Raises:
+            ValueError: 프레임이 슬롯보다 큰 경우
+            TimeoutError: timeout 안에 빈 슬롯이 없는 경우
+        """
+        if not self.fits(frame):
+            raise ValueError(f"프레임이 슬롯보다 큽니다 ({frame.nbytes} > {self.slot_bytes} bytes)")
+        try:
+            slot = self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"공유 메모리 링에 빈 슬롯이 없습니다 ({self.name})")
+
+        self.view(slot, frame.shape, frame.dtype.str)[...] = frame
+        return slot, tuple(frame.shape), frame.dtype.str
+
+    def view(self, slot: int, shape: Tuple[int, ...], dtype: str) -> np.ndarray:
+        """슬롯의 프레임을 복사 없이 numpy 뷰로 반환"""
+        offset = slot * self.slot_bytes
+        return np.ndarray(shape, dtype=np.dtype(dtype), buffer=self._shm.buf, offset=offset)
+
+    def release(self, slot: int):
+        """슬롯 반납 (생산자 전용, 소비자 응답 수신 후 호출)"""
+        self._free.put(slot)
+
+    def free_slots(self) -> int:
+        return self._free.qsize() if self.owner else 0
+
+    def close(self):
+        """매핑 해제 (생산자는 공유 메모리도 삭제)"""
+        try:
+            self._shm.close()
+            if self.owner:
+                self._shm.unlink()
+        except (BufferError, FileNotFoundError) as e:
+            logger.warning(f"⚠️  공유 메모리 링 정리 실패 ({self.name}): {e}")
@@ -10,30 +10,115 @@
 
 import cv2
 import numpy as np
-from typing import Optional, Tuple, List, Dict
+from typing import Optional, Tuple, List, Dict, Hashable, Sequence
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# 검색 모드
+#   full: 전체 이미지 원본 해상도 매칭 (기존 동작)
+#   pyramid: 축소 해상도에서 전체 매칭 → 원본 해상도 작은 창에서 보정
+#   tracking: 이전 기준점 주변 창만 매칭 (이전 기준점이 없으면 전체 매칭)
+# pyramid / tracking은 신뢰도가 임계값 미만이면 전체 매칭으로 재시도
+SEARCH_MODES = ('full', 'pyramid', 'tracking')
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    """BGR → 그레이스케일 (이미 그레이스케일이면 그대로)"""
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
 
 class TemplateBasedAlignment:
     """템플릿 매칭 기반 PCB 정렬 클래스"""
 
-    def __init__(self, template_path: Optional[str] = None, threshold: float = 0.8):
+    def __init__(self, template_path: Optional[str] = None, threshold: float = 0.8,
+                 search_mode: str = 'full', pyramid_levels: int = 1,
+                 refine_margin: int = 6, tracking_margin: int = 40,
+                 pyramid_candidates: int = 3, tracking_tolerance: float = 0.02,
+                 tracking_refresh: int = 30, scales: Sequence[float] = (1.0,)):
         """
         초기화
 
         Args:
             template_path: 기준점 템플릿 이미지 경로 (나사 구멍 등)
             threshold: 템플릿 매칭 최소 신뢰도 (0.0~1.0, 기본값: 0.8)
+            search_mode: 'full', 'pyramid', 'tracking' (SEARCH_MODES 참고)
+            pyramid_levels: pyramid 모드 축소 단계 (1 → 1/2, 2 → 1/4)
+            refine_margin: pyramid 모드 원본 해상도 보정 창 여유 (픽셀)
+            tracking_margin: tracking 모드 이전 기준점 주변 검색 여유 (픽셀)
+            pyramid_candidates: pyramid 모드에서 원본 해상도로 보정할 축소 매칭 후보 수
+            tracking_tolerance: tracking 모드 주변 매칭 신뢰도가 이전 신뢰도보다 이만큼 낮으면 전체 매칭
+            tracking_refresh: tracking 모드에서 이 횟수만큼 주변 매칭 후 한 번 전체 매칭 (0이면 안 함)
+            scales: 전체 매칭에 사용할 템플릿 배율 (카메라 높이 / 보드 두께 차이 보정, 예: (0.9, 1.0, 1.1))
         """
-        self.template = None
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"지원하지 않는 검색 모드: {search_mode} (가능: {SEARCH_MODES})")
+
+        self._template = None
+        self.template_gray = None        # 전처리된 템플릿 (그레이스케일, 템플릿 설정 시 1회 계산)
+        self.template_small = None       # pyramid 모드용 축소 템플릿
+        self.template_variants: List[Tuple[float, np.ndarray]] = []  # 전체 매칭용 (배율, 그레이스케일)
+        self.scales = tuple(scales) if scales else (1.0,)
         self.template_path = template_path
         self.threshold = threshold  # 신뢰도 임계값 추가
 
+        self.search_mode = search_mode
+        self.pyramid_levels = pyramid_levels
+        self.refine_margin = refine_margin
+        self.tracking_margin = tracking_margin
+        self.pyramid_candidates = pyramid_candidates
+        self.tracking_tolerance = tracking_tolerance
+        self.tracking_refresh = tracking_refresh
+
+        self._last_locs: Dict[Hashable, Tuple[Tuple[int, int], float, int]] = {}  # tracking 모드: 키별 (이전 위치, 신뢰도, 연속 주변 매칭 수)
+        self._stats = {'full': 0, 'pyramid': 0, 'tracking': 0, 'fallbacks': 0}
+        self._stats_lock = threading.Lock()
+
         if template_path:
             self.load_template(template_path)
 
+    @property
+    def template(self) -> Optional[np.ndarray]:
+        """기준점 템플릿 (BGR)"""
+        return self._template
+
+    @template.setter
+    def template(self, image: Optional[np.ndarray]):
+        """템플릿 교체 시 전처리(그레이스케일 / 축소)를 한 번만 수행"""
+        self._template = image
+        self._last_locs.clear()
+
+        if image is None:
+            self.template_gray = None
+            self.template_small = None
+            self.template_variants = []
+            return
+
+        self.template_gray = np.ascontiguousarray(_to_gray(image))
+        h, w = self.template_gray.shape[:2]
+
+        # 배율별 템플릿 (1.0이 먼저 오도록 정렬, 8픽셀 미만은 제외)
+        self.template_variants = []
+        for factor in sorted(self.scales, key=lambda f: abs(f - 1.0)):
+            if factor == 1.0:
+                self.template_variants.append((1.0, self.template_gray))
+                continue
+            size = (round(w * factor), round(h * factor))
+            if min(size) >= 8:
+                interpolation = cv2.INTER_AREA if factor < 1.0 else cv2.INTER_LINEAR
+                self.template_variants.append((factor, cv2.resize(self.template_gray, size, interpolation=interpolation)))
+        if not self.template_variants:
+            self.template_variants.append((1.0, self.template_gray))
+
+        scale = 2 ** self.pyramid_levels
+        if self.pyramid_levels > 0 and min(h, w) // scale >= 8:
+            self.template_small = cv2.resize(self.template_gray, (w // scale, h // scale),
+                                             interpolation=cv2.INTER_AREA)
+        else:
+            # 너무 작은 템플릿은 축소 매칭이 불안정하므로 pyramid 모드에서도 전체 매칭
+            self.template_small = None
+
     def load_template(self, template_path: str) -> bool:
         """
         템플릿 이미지 로드
@@ -77,11 +162,161 @@ class TemplateBasedAlignment:
             logger.error(f"템플릿 설정 중 오류: {e}", exc_info=True)
             return False
 
+    @staticmethod
+    def _best(result: np.ndarray, method: int) -> Tuple[Tuple[int, int], float]:
+        """matchTemplate 결과에서 최적 위치 / 신뢰도"""
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+
+        # TM_SQDIFF, TM_SQDIFF_NORMED는 최소값이 최적 매칭
+        if method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED]:
+            return min_loc, 1 - min_val
+        return max_loc, max_val
+
+    def _match_full(self, img_gray: np.ndarray, method: int) -> Tuple[Tuple[int, int], float, Tuple[int, int]]:
+        """
+        전체 이미지 원본 해상도 매칭 (배율별 템플릿 중 최고 신뢰도)
+
+        Returns:
+            (좌상단 위치, 신뢰도, 매칭된 템플릿 (h, w))
+        """
+        best = None
+        img_h, img_w = img_gray.shape[:2]
+        for _, variant in self.template_variants:
+            if variant.shape[0] > img_h or variant.shape[1] > img_w:
+                continue
+            loc, confidence = self._best(cv2.matchTemplate(img_gray, variant, method), method)
+            if best is None or confidence > best[1]:
+                best = (loc, confidence, variant.shape[:2])
+        return best if best is not None else ((0, 0), 0.0, self.template_gray.shape[:2])
+
+    def _match_window(self, image: np.ndarray, loc: Tuple[int, int], margin: int,
+                      method: int) -> Tuple[Optional[Tuple[int, int]], float]:
+        """
+        loc(템플릿 좌상단) 주변 ±margin 창에서만 매칭
+
+        Args:
+            image: BGR 또는 그레이스케일 이미지 (창 영역만 그레이스케일 변환)
+        """
+        template_h, template_w = self.template_gray.shape[:2]
+        img_h, img_w = image.shape[:2]
+        x1 = max(0, loc[0] - margin)
+        y1 = max(0, loc[1] - margin)
+        x2 = min(img_w, loc[0] + template_w + margin)
+        y2 = min(img_h, loc[1] + template_h + margin)
+        if x2 - x1 < template_w or y2 - y1 < template_h:
+            return None, 0.0
+
+        window = _to_gray(image[y1:y2, x1:x2])
+        (wx, wy), confidence = self._best(cv2.matchTemplate(window, self.template_gray, method), method)
+        return (x1 + wx, y1 + wy), confidence
+
+    def _match_pyramid(self, img_gray: np.ndarray, method: int) -> Tuple[Optional[Tuple[int, int]], float]:
+        """축소 해상도 전체 매칭 → 상위 후보들을 원본 해상도 창에서 보정 후 최고 신뢰도 선택"""
+        scale = 2 ** self.pyramid_levels
+        img_h, img_w = img_gray.shape[:2]
+        small = cv2.resize(img_gray, (img_w // scale, img_h // scale), interpolation=cv2.INTER_AREA)
+        result = cv2.matchTemplate(small, self.template_small, method)
+
+        # 이미 본 후보 주변은 최악 값으로 덮어서 다음 후보가 다른 위치가 되도록 함
+        worst = np.inf if method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED] else -np.inf
+        small_h, small_w = self.template_small.shape[:2]
+        best_loc, best_confidence = None, 0.0
+        for _ in range(self.pyramid_candidates):
+            (sx, sy), _ = self._best(result, method)
+            loc, confidence = self._match_window(img_gray, (sx * scale, sy * scale),
+                                                 scale + self.refine_margin, method)
+            if loc is not None and (best_loc is None or confidence > best_confidence):
+                best_loc, best_confidence = loc, confidence
+            result[max(0, sy - small_h // 2):sy + small_h // 2 + 1,
+                   max(0, sx - small_w // 2):sx + small_w // 2 + 1] = worst
+        return best_loc, best_confidence
+
+    def reset_tracking(self, track_key: Hashable = None):
+        """tracking 모드 이전 기준점 삭제 (새 PCB 진입 등 모션 감지 시 다음 검색은 전체 매칭)"""
+        self._last_locs.pop(track_key, None)
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def get_search_stats(self) -> Dict:
+        """검색 모드별 실행 횟수 / 전체 매칭 재시도 횟수"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['mode'] = self.search_mode
+        return stats
+
+    def match(
+        self,
+        image: np.ndarray,
+        method: int = cv2.TM_CCOEFF_NORMED,
+        track_key: Hashable = None
+    ) -> Tuple[Optional[Tuple[int, int]], float]:
+        """
+        템플릿 매칭 (검색 모드 적용, 신뢰도 함께 반환)
+
+        Args:
+            image: 검색할 이미지
+            method: 매칭 방법 (cv2.TM_CCOEFF_NORMED, cv2.TM_CCORR_NORMED 등)
+            track_key: tracking 모드에서 이전 기준점을 구분하는 키 (카메라 ID 등)
+
+        Returns:
+            (기준점 좌표 (x, y) 또는 None (신뢰도 미달), 신뢰도)
+        """
+        match_loc, confidence = None, 0.0
+        img_gray = None
+        attempted = None
+        template_h, template_w = self.template_gray.shape[:2]
+
+        tracked = self._last_locs.get(track_key)
+        tracked_frames = 0
+        if (self.search_mode == 'tracking' and tracked is not None
+                and not (self.tracking_refresh and tracked[2] >= self.tracking_refresh)):
+            attempted = 'tracking'
+            last_loc, last_confidence, tracked_frames = tracked
+            match_loc, confidence = self._match_window(image, last_loc, self.tracking_margin, method)
+            if confidence < last_confidence - self.tracking_tolerance:
+                # 주변 매칭이 이전보다 눈에 띄게 약함 → 보드가 움직였을 수 있으므로 전체 매칭
+                match_loc = None
+        elif self.search_mode == 'pyramid' and self.template_small is not None:
+            attempted = 'pyramid'
+            img_gray = _to_gray(image)
+            match_loc, confidence = self._match_pyramid(img_gray, method)
+
+        if attempted is not None:
+            self._count(attempted)
+
+        if match_loc is None or confidence < self.threshold:
+            # 전체 매칭 (full 모드, tracking 첫 프레임, 또는 축소/주변 매칭 신뢰도 미달 시 재시도)
+            if attempted is not None:
+                self._count('fallbacks')
+            tracked_frames = -1  # 전체 매칭 후에는 연속 주변 매칭 수를 0부터 다시 셈
+            self._count('full')
+            if img_gray is None:
+                img_gray = _to_gray(image)
+            match_loc, confidence, (template_h, template_w) = self._match_full(img_gray, method)
+
+        # 신뢰도 검증 ⭐ (잘못된 매칭 방지)
+        if confidence < self.threshold:
+            self._last_locs.pop(track_key, None)
+            logger.warning(
+                f"템플릿 매칭 신뢰도가 임계값보다 낮음: {confidence:.3f} < {self.threshold:.3f}"
+            )
+            return None, confidence
+
+        self._last_locs[track_key] = (match_loc, confidence, tracked_frames + 1)
+
+        # 템플릿 중심점 계산 (기준점, 매칭된 배율의 템플릿 크기 기준)
+        ref_x = match_loc[0] + template_w // 2
+        ref_y = match_loc[1] + template_h // 2
+        return (ref_x, ref_y), confidence
+
     def find_reference_point(
         self,
         image: np.ndarray,
         method: int = cv2.TM_CCOEFF_NORMED,
-        roi: Optional[Tuple[int, int, int, int]] = None
+        roi: Optional[Tuple[int, int, int, int]] = None,
+        track_key: Hashable = None
     ) -> Optional[Tuple[int, int]]:
         """
         템플릿 매칭으로 기준점 찾기 (ROI 검증 포함)
@@ -90,6 +325,7 @@ class TemplateBasedAlignment:
             image: 검색할 이미지
             method: 매칭 방법 (cv2.TM_CCOEFF_NORMED, cv2.TM_CCORR_NORMED 등)
             roi: ROI 영역 (x1, y1, x2, y2). None이면 전체 이미지에서 검색
+            track_key: tracking 모드에서 이전 기준점을 구분하는 키 (카메라 ID 등)
 
         Returns:
             기준점 좌표 (x, y) 또는 None (ROI 밖에 있으면 None)
@@ -99,33 +335,11 @@ class TemplateBasedAlignment:
             return None
 
         try:
-            # 그레이스케일 변환
-            img_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            template_gray = cv2.cvtColor(self.template, cv2.COLOR_BGR2GRAY)
-
-            # 템플릿 매칭
-            result = cv2.matchTemplate(img_gray, template_gray, method)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-
-            # TM_SQDIFF, TM_SQDIFF_NORMED는 최소값이 최적 매칭
-            if method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED]:
-                match_loc = min_loc
-                confidence = 1 - min_val
-            else:
-                match_loc = max_loc
-                confidence = max_val
-
-            # 신뢰도 검증 ⭐ (잘못된 매칭 방지)
-            if confidence < self.threshold:
-                logger.warning(
-                    f"템플릿 매칭 신뢰도가 임계값보다 낮음: {confidence:.3f} < {self.threshold:.3f}"
-                )
+            reference_point, confidence = self.match(image, method, track_key)
+            if reference_point is None:
                 return None
 
-            # 템플릿 중심점 계산 (기준점)
-            template_h, template_w = self.template.shape[:2]
-            ref_x = match_loc[0] + template_w // 2
-            ref_y = match_loc[1] + template_h // 2
+            ref_x, ref_y = reference_point
 
             # ROI 검증
             if roi is not None:
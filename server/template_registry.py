@@ -0,0 +1,233 @@
+"""
+제품별 기준점(fiducial) 템플릿 레지스트리
+
+OCR로 읽은 제품 코드(BC, FT, RS, ...)와 카메라 면(left/right)별로 기준점 템플릿을 미리 로드해 두고,
+요청마다 템플릿을 다시 읽거나 전처리하지 않고 알맞은 TemplateBasedAlignment를 돌려줍니다.
+각 템플릿의 그레이스케일 / pyramid 축소 / 배율별 변형은 로드 시 한 번만 계산됩니다.
+
+템플릿 디렉토리 파일 이름 규칙:
+    <제품코드>_<면>.jpg   예: BC_left.jpg   (해당 제품 + 면 전용)
+    <제품코드>.jpg        예: FT.jpg        (해당 제품 양면 공용)
+    default_<면>.jpg      예: default_left.jpg (제품별 템플릿이 없을 때 면별 기본)
+없으면 기본 템플릿(server/reference_hole.jpg)을 사용합니다.
+
+디스크의 템플릿이 바뀌면 백그라운드 스레드가 reload_interval_s마다 수정 시각을 확인해서 바뀐 파일만
+다시 로드합니다 (요청 스레드에서는 디스크를 읽지 않음). 바뀐 템플릿은 새 TemplateBasedAlignment로 만든 뒤
+레지스트리 항목을 통째로 교체하므로, 매칭 중인 요청은 끝날 때까지 이전 템플릿 / 변형을 일관되게 사용합니다.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import cv2
+
+from template_based_alignment import TemplateBasedAlignment
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+SIDES = ('left', 'right')
+
+# 레지스트리 키: (제품 코드 또는 None(기본), 면 또는 None(양면 공용))
+TemplateKey = Tuple[Optional[str], Optional[str]]
+
+
+def parse_template_name(stem: str) -> Optional[TemplateKey]:
+    """
+    템플릿 파일 이름 → 레지스트리 키
+
+    Returns:
+        (product_code, side) 또는 None (규칙에 맞지 않는 이름)
+    """
+    name, _, side = stem.rpartition('_')
+    if side in SIDES and name:
+        return (None if name == 'default' else name.upper(), side)
+    if stem == 'default' or not stem.replace('-', '').isalnum():
+        return None
+    return (stem.upper(), None)
+
+
+class TemplateRegistry:
+    """제품 코드 / 카메라 면별 TemplateBasedAlignment 모음 (핫 리로드 지원)"""
+
+    def __init__(self, template_dir: Optional[str] = None, default_template_path: Optional[str] = None,
+                 reload_interval_s: float = 5.0, **alignment_kwargs):
+        """
+        Args:
+            template_dir: 제품별 템플릿 디렉토리 (없으면 기본 템플릿만 사용)
+            default_template_path: 기본 템플릿 경로
+            reload_interval_s: 디스크 변경 확인 간격 (초, 0이면 자동 리로드 안 함)
+            **alignment_kwargs: TemplateBasedAlignment 생성 인자 (threshold, search_mode, scales 등)
+        """
+        self.template_dir = Path(template_dir) if template_dir else None
+        self.default_template_path = default_template_path
+        self.reload_interval_s = reload_interval_s
+        self.alignment_kwargs = alignment_kwargs
+
+        self.default: Optional[TemplateBasedAlignment] = None
+        self._default_mtime: Optional[float] = None
+        self._entries: Dict[TemplateKey, TemplateBasedAlignment] = {}
+        self._mtimes: Dict[TemplateKey, Tuple[str, float]] = {}
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self.reload(force=True)
+
+        self._poller = None
+        if self.reload_interval_s and self.reload_interval_s > 0:
+            self._poller = threading.Thread(target=self._poll, name='template-reload', daemon=True)
+            self._poller.start()
+
+    # ------------------------------------------------------------------
+    # 로드 / 리로드
+    # ------------------------------------------------------------------
+    def _scan(self) -> Dict[TemplateKey, Tuple[str, float]]:
+        """템플릿 디렉토리 → {키: (경로, 수정 시각)}"""
+        found: Dict[TemplateKey, Tuple[str, float]] = {}
+        if self.template_dir is None or not self.template_dir.is_dir():
+            return found
+
+        for entry in os.scandir(self.template_dir):
+            path = Path(entry.path)
+            if not entry.is_file() or path.suffix.lower() not in TEMPLATE_EXTENSIONS:
+                continue
+            key = parse_template_name(path.stem)
+            if key is None:
+                logger.debug(f"템플릿 파일 이름 규칙 불일치 (무시): {path.name}")
+                continue
+            found[key] = (str(path), entry.stat().st_mtime)
+        return found
+
+    def _load_alignment(self, path: str, existing: Optional[TemplateBasedAlignment]) -> Optional[TemplateBasedAlignment]:
+        """
+        템플릿 로드 (항상 새 인스턴스 - 사용 중인 인스턴스는 건드리지 않음)
+
+        읽기에 실패하면 기존 템플릿을 그대로 유지합니다 (파일 복사 중 등).
+        """
+        image = cv2.imread(path)
+        if image is None:
+            logger.warning(f"⚠️  템플릿 로드 실패 (기존 템플릿 유지): {path}")
+            return existing
+
+        alignment = TemplateBasedAlignment(**self.alignment_kwargs)
+        alignment.template = image  # 그레이스케일 / 축소 / 배율 변형은 공개 전에 1회 계산
+        alignment.template_path = path
+        return alignment
+
+    def reload(self, force: bool = False) -> Dict[str, int]:
+        """
+        디스크의 템플릿을 다시 읽음 (바뀐 파일만)
+
+        Args:
+            force: True면 수정 시각과 관계없이 모두 다시 로드
+
+        Returns:
+            {'loaded', 'removed', 'total'}
+        """
+        with self._reload_lock:
+            loaded = 0
+
+            # 기본 템플릿
+            if self.default_template_path and os.path.exists(self.default_template_path):
+                mtime = os.path.getmtime(self.default_template_path)
+                if force or self.default is None or mtime != self._default_mtime:
+                    self.default = self._load_alignment(self.default_template_path, self.default)
+                    self._default_mtime = mtime
+                    loaded += 1
+
+            # 제품별 템플릿
+            found = self._scan()
+            entries = dict(self._entries)
+            for key, (path, mtime) in found.items():
+                if force or self._mtimes.get(key) != (path, mtime):
+                    alignment = self._load_alignment(path, entries.get(key))
+                    if alignment is not None:
+                        entries[key] = alignment
+                        loaded += 1
+            removed = [key for key in entries if key not in found]
+            for key in removed:
+                del entries[key]
+
+            self._entries = entries  # 참조 교체 (요청 스레드는 잠금 없이 읽음)
+            self._mtimes = found
+
+        if loaded or removed:
+            logger.info(f"✅ 기준점 템플릿 레지스트리: {loaded}개 로드, {len(removed)}개 제거 "
+                        f"(제품별 {len(entries)}개, 기본: {'있음' if self.default else '없음'})")
+        return {'loaded': loaded, 'removed': len(removed), 'total': len(entries)}
+
+    def _poll(self):
+        """백그라운드 리로드 루프 (reload_interval_s마다 디스크 변경 확인)"""
+        while not self._stop.wait(self.reload_interval_s):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"❌ 기준점 템플릿 리로드 실패: {e}")
+
+    def close(self):
+        """백그라운드 리로드 중지"""
+        self._stop.set()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def get(self, product_code: Optional[str] = None, side: Optional[str] = None) -> Optional[TemplateBasedAlignment]:
+        """
+        제품 코드 / 면에 맞는 정렬 시스템
+
+        우선순위: (제품, 면) → (제품, 공용) → (기본, 면) → 기본 템플릿
+
+        Args:
+            product_code: OCR 제품 코드 (None이면 기본)
+            side: 'left' / 'right' (카메라 ID)
+
+        Returns:
+            TemplateBasedAlignment 또는 None (템플릿이 하나도 없음)
+        """
+        entries = self._entries
+        keys = [(None, side)]
+        if product_code:
+            keys[:0] = [(product_code.upper(), side), (product_code.upper(), None)]
+        for key in keys:
+            alignment = entries.get(key)
+            if alignment is not None:
+                return alignment
+        return self.default
+
+    def all(self) -> List[TemplateBasedAlignment]:
+        """등록된 모든 정렬 시스템 (기본 포함)"""
+        alignments = list(self._entries.values())
+        if self.default is not None:
+            alignments.insert(0, self.default)
+        return alignments
+
+    def reset_tracking(self, track_key: Hashable = None):
+        """모든 템플릿의 tracking 기준점 삭제 (모션 감지 시 제품이 바뀌었을 수 있음)"""
+        for alignment in self.all():
+            alignment.reset_tracking(track_key)
+
+    def has_templates(self) -> bool:
+        """사용 가능한 템플릿이 하나라도 있는지"""
+        return self.default is not None or bool(self._entries)
+
+    def list_templates(self) -> List[Dict]:
+        """등록된 템플릿 목록 (API 응답용)"""
+        items = []
+        if self.default is not None:
+            items.append({'product_code': None, 'side': None, 'path': self.default.template_path,
+                          'shape': list(self.default.template.shape),
+                          'scales': [scale for scale, _ in self.default.template_variants], 'default': True})
+        mtimes = self._mtimes
+        for (product, side), alignment in sorted(self._entries.items(), key=lambda kv: (str(kv[0][0]), str(kv[0][1]))):
+            items.append({
+                'product_code': product,
+                'side': side,
+                'path': mtimes.get((product, side), (alignment.template_path, 0))[0],
+                'shape': list(alignment.template.shape),
+                'scales': [scale for scale, _ in alignment.template_variants],
+                'default': False
+            })
+        return items
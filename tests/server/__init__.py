@@ -0,0 +1 @@
+# 서버 모듈 단위 테스트
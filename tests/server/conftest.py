@@ -0,0 +1,16 @@
+"""
+서버 모듈 단위 테스트 공통 설정
+
+server/ 모듈은 같은 폴더 기준으로 서로를 임포트하므로 (예: from detections import Detections)
+server/ 경로를 sys.path에 추가합니다.
+
+실행 방법:
+pytest tests/server -v
+"""
+
+import os
+import sys
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'server'))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
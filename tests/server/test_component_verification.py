@@ -0,0 +1,202 @@
+"""
+컴포넌트 위치 검증 테스트 (server/component_verification.py)
+
+- 애매하지 않은 보드(부품 간격이 위치 임계값의 몇 배)에서는 기존 탐욕 최근접 매칭과 같은 개수
+- 검출 순서와 무관한 결과
+- 밀집 거리 행렬 / KD-tree 경로의 gate 안 쌍 수 일치 (DENSE_MATCH_LIMIT 경계)
+
+실행 방법:
+pytest tests/server/test_component_verification.py -v
+"""
+
+import numpy as np
+import pytest
+
+import component_verification
+from component_verification import (
+    ComponentVerifier, DENSE_MATCH_LIMIT, _assign_sparse, _gated_assignment, _pairwise_distances,
+    match_components
+)
+from detections import Detections
+
+POSITION_THRESHOLD = 20.0
+CLASSES = ['resistor', 'capacitor', 'ic', 'led']
+
+
+def legacy_counts(reference_components, detected_components, threshold=POSITION_THRESHOLD):
+    """기존 verify_components 매칭 (기준 순서대로 같은 클래스 최근접 검출을 골라 제거) → 개수"""
+    detected_by_class = {}
+    for comp in detected_components:
+        detected_by_class.setdefault(comp['class_name'], []).append(comp)
+
+    counts = {'correct_count': 0, 'misplaced_count': 0, 'missing_count': 0, 'extra_count': 0}
+    for ref_comp in reference_components:
+        candidates = detected_by_class.get(ref_comp['class_name'], [])
+        if not candidates:
+            counts['missing_count'] += 1
+            continue
+        distances = [np.linalg.norm(np.subtract(det['center'], ref_comp['center'])) for det in candidates]
+        closest = int(np.argmin(distances))
+        counts['misplaced_count' if distances[closest] > threshold else 'correct_count'] += 1
+        del candidates[closest]
+    counts['extra_count'] = sum(len(v) for v in detected_by_class.values())
+    return counts
+
+
+def detected(class_name, cx, cy, confidence=0.9):
+    return {'class_name': class_name, 'center': [float(cx), float(cy)],
+            'bbox': [cx - 5, cy - 5, cx + 5, cy + 5], 'confidence': confidence}
+
+
+def unambiguous_board(seed):
+    """
+    부품 간격 100px 격자 보드 (기준, 검출 dict 리스트)
+
+    검출: 6px 이내 흔들림, 30~40px 이동(위치 오류 - 이웃 부품보다는 가까움),
+    누락은 검출이 하나도 없는 클래스('led'), 추가 부품은 기준에 없는 클래스('diode')로만 만들어
+    어느 기준의 최근접 검출도 다른 기준의 짝이 아니게 함 (배정 방법과 관계없이 정답이 하나)
+    """
+    rng = np.random.default_rng(seed)
+    grid = [(x, y) for x in range(50, 650, 100) for y in range(50, 450, 100)]
+    references, detections = [], []
+    for x, y in grid:
+        roll = rng.random()
+        if roll < 0.1:
+            references.append({'class_name': 'led', 'center': [float(x), float(y)]})  # 누락
+            continue
+        class_name = CLASSES[rng.integers(3)]
+        references.append({'class_name': class_name, 'center': [float(x), float(y)]})
+        if roll < 0.25:
+            angle = rng.uniform(0, 2 * np.pi)
+            shift = rng.uniform(30, 40)
+            detections.append(detected(class_name, x + shift * np.cos(angle), y + shift * np.sin(angle)))
+        else:
+            detections.append(detected(class_name, *(np.array([x, y]) + rng.uniform(-6, 6, 2) / np.sqrt(2))))
+    for _ in range(3):
+        detections.append(detected('diode', *rng.uniform(0, 600, 2)))  # 추가
+    rng.shuffle(detections)
+    return references, detections
+
+
+def summary_counts(result):
+    summary = result['summary']
+    return {key: summary[key] for key in ('correct_count', 'misplaced_count', 'missing_count', 'extra_count')}
+
+
+class TestLegacyEquivalence:
+    """애매하지 않은 보드에서는 기존 탐욕 매칭과 같은 판정"""
+
+    @pytest.mark.parametrize('seed', range(10))
+    def test_counts_match_greedy_on_unambiguous_board(self, seed):
+        references, detections = unambiguous_board(seed)
+        verifier = ComponentVerifier(references, position_threshold=POSITION_THRESHOLD)
+
+        result = verifier.verify_components(detections)
+
+        assert summary_counts(result) == legacy_counts(references, detections)
+        assert result['summary']['total_reference'] == len(references)
+        assert result['summary']['total_detected'] == len(detections)
+
+    def test_counts_match_greedy_for_detections_container(self):
+        """Detections 입력도 dict 리스트 입력과 같은 결과"""
+        references, detections = unambiguous_board(42)
+        verifier = ComponentVerifier(references, position_threshold=POSITION_THRESHOLD)
+
+        result = verifier.verify_components(Detections.from_dicts(detections))
+
+        assert summary_counts(result) == legacy_counts(references, detections)
+
+    def test_nearby_parts_are_not_reported_misplaced(self):
+        """
+        탐욕 매칭이 틀리는 배치: 기준 B(15,0), A(0,0) 순서 / 검출 a(10,0), b(25,0)
+        탐욕: B→a(5px), A→b(25px, 위치 오류) / 최적 배정: A→a(10px), B→b(10px) 둘 다 정상
+        """
+        references = [{'class_name': 'resistor', 'center': [15.0, 0.0]},
+                      {'class_name': 'resistor', 'center': [0.0, 0.0]}]
+        detections = [detected('resistor', 10, 0), detected('resistor', 25, 0)]
+
+        result = ComponentVerifier(references, position_threshold=POSITION_THRESHOLD).verify_components(detections)
+
+        assert legacy_counts(references, detections)['misplaced_count'] == 1
+        assert result['summary']['correct_count'] == 2
+        assert result['summary']['misplaced_count'] == 0
+
+
+class TestOrderIndependence:
+    """검출 순서와 무관한 배정"""
+
+    @staticmethod
+    def assignment(verifier, detections):
+        result = verifier.verify_components(detections)
+        pairs = {}
+        for kind in ('correct', 'misplaced'):
+            for match in result[kind]:
+                pairs[tuple(match['reference']['center'])] = (kind, tuple(match['detected']['center']))
+        extra = sorted(tuple(item['center']) for item in result['extra'])
+        missing = sorted(tuple(item['center']) for item in result['missing'])
+        return pairs, extra, missing
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_shuffled_detections_give_same_assignment(self, seed):
+        """부품이 촘촘한(임계값보다 가까운) 보드에서도 검출 순서를 섞어도 같은 배정"""
+        rng = np.random.default_rng(seed)
+        centers = rng.uniform(0, 200, size=(40, 2))
+        classes = [CLASSES[i] for i in rng.integers(0, 2, size=40)]
+        references = [{'class_name': c, 'center': p.tolist()} for c, p in zip(classes, centers)]
+        detections = [detected(c, *(p + rng.normal(0, 8, 2))) for c, p in zip(classes, centers)
+                      if rng.random() > 0.1]
+        detections += [detected(CLASSES[0], *rng.uniform(0, 200, 2)) for _ in range(3)]
+        verifier = ComponentVerifier(references, position_threshold=POSITION_THRESHOLD)
+
+        expected = self.assignment(verifier, detections)
+        for _ in range(5):
+            shuffled = [detections[i] for i in rng.permutation(len(detections))]
+            assert self.assignment(verifier, shuffled) == expected
+
+
+class TestDenseSparseAgreement:
+    """DENSE_MATCH_LIMIT 경계에서 밀집 / KD-tree 경로의 gate 안 쌍 수 일치"""
+
+    @staticmethod
+    def board(n_ref, n_det, seed):
+        """임계값보다 촘촘한 격자 (gate 안 후보가 여러 개인 애매한 배치)"""
+        rng = np.random.default_rng(seed)
+        side = int(np.ceil(np.sqrt(max(n_ref, n_det))))
+        grid = np.array([(x, y) for x in range(side) for y in range(side)], dtype=np.float64) * 15.0
+        ref = grid[rng.permutation(len(grid))[:n_ref]]
+        det = grid[rng.permutation(len(grid))[:n_det]] + rng.normal(0, 6, size=(n_det, 2))
+        return ref, det
+
+    @staticmethod
+    def in_gate(ref, det, rows, cols):
+        return int((np.linalg.norm(ref[rows] - det[cols], axis=1) <= POSITION_THRESHOLD).sum())
+
+    @pytest.mark.parametrize('n_ref, n_det', [(500, 500), (501, 500)], ids=['at_limit', 'above_limit'])
+    def test_dense_and_sparse_paths_agree(self, n_ref, n_det):
+        ref, det = self.board(n_ref, n_det, seed=n_ref)
+
+        dense_rows, dense_cols = _gated_assignment(_pairwise_distances(ref, det), POSITION_THRESHOLD)
+        sparse_rows, sparse_cols = _assign_sparse(ref, det, POSITION_THRESHOLD)
+
+        for rows, cols in ((dense_rows, dense_cols), (sparse_rows, sparse_cols)):
+            assert len(rows) == min(n_ref, n_det)
+            assert len(set(rows.tolist())) == len(rows)  # 1:1
+            assert len(set(cols.tolist())) == len(cols)
+        assert self.in_gate(ref, det, sparse_rows, sparse_cols) == self.in_gate(ref, det, dense_rows, dense_cols)
+
+    def test_match_components_switches_path_at_limit(self, monkeypatch):
+        """기준 x 검출 수가 DENSE_MATCH_LIMIT를 넘을 때만 KD-tree 경로 사용"""
+        calls = []
+        original = component_verification._assign_sparse
+        monkeypatch.setattr(component_verification, '_assign_sparse',
+                            lambda *args: calls.append(1) or original(*args))
+        side = int(np.sqrt(DENSE_MATCH_LIMIT))
+
+        for n_ref, expected_calls in ((side, 0), (side + 1, 1)):
+            calls.clear()
+            ref, det = self.board(n_ref, side, seed=1)
+            ref_idx, det_idx, distances = match_components(
+                ref, {'resistor': np.arange(n_ref)}, det, ['resistor'] * side, POSITION_THRESHOLD
+            )
+            assert len(calls) == expected_calls
+            assert len(ref_idx) == side
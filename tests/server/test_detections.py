@@ -0,0 +1,58 @@
+"""
+검출 결과 컨테이너 테스트 (server/detections.py)
+
+실행 방법:
+pytest tests/server/test_detections.py -v
+"""
+
+import pytest
+
+from detections import Detections
+
+
+def box(**fields):
+    item = {'bbox': [0, 0, 10, 10], 'confidence': 0.9}
+    item.update(fields)
+    return item
+
+
+class TestFromDicts:
+    """dict 리스트 → Detections 변환 (class_id 누락 항목 임시 ID)"""
+
+    @pytest.mark.parametrize('items', [
+        [box(class_name='A'), box(class_id=0, class_name='B')],
+        [box(class_id=0, class_name='B'), box(class_name='A')],
+    ], ids=['fallback_first', 'explicit_first'])
+    def test_fallback_id_does_not_collide_with_explicit_id(self, items):
+        """class_id 없는 항목의 임시 ID는 항목 순서와 관계없이 명시된 class_id와 겹치지 않음"""
+        detections = Detections.from_dicts(items)
+
+        by_name = dict(zip(detections.class_names, detections.class_id.tolist()))
+        assert by_name['B'] == 0
+        assert by_name['A'] != 0
+        assert detections.names[0] == 'B'
+        assert sorted(detections.class_names) == ['A', 'B']
+
+    def test_fallback_id_is_shared_by_same_class_name(self):
+        """class_id 없는 같은 이름 항목은 같은 임시 ID"""
+        detections = Detections.from_dicts([box(class_name='A'), box(class_id=3, class_name='B'), box(class_name='A')])
+
+        assert detections.class_id.tolist() == [4, 3, 4]
+        assert detections.class_names == ['A', 'B', 'A']
+
+    def test_fallback_reuses_explicit_id_of_same_name(self):
+        """class_id 없는 항목이 명시된 항목과 이름이 같으면 그 ID를 사용"""
+        detections = Detections.from_dicts([box(class_name='B'), box(class_id=2, class_name='B')])
+
+        assert detections.class_id.tolist() == [2, 2]
+
+    def test_missing_class_name(self):
+        """class_name이 없으면 ID 문자열을 이름으로 사용"""
+        detections = Detections.from_dicts([box(class_id=5), {'x1': 1, 'y1': 2, 'x2': 3, 'y2': 4}])
+
+        assert detections.class_id.tolist() == [5, 6]
+        assert detections.class_names == ['5', '6']
+        assert detections.boxes[1].tolist() == [1, 2, 3, 4]
+
+    def test_empty(self):
+        assert len(Detections.from_dicts([])) == 0
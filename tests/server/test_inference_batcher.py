@@ -0,0 +1,165 @@
+"""
+YOLO 동적 마이크로 배칭 스케줄러 테스트 (server/inference_batcher.py)
+
+실행 방법:
+pytest tests/server/test_inference_batcher.py -v
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from inference_batcher import InferenceBatcher
+
+
+class StubModel:
+    """프레임의 첫 픽셀 값을 결과로 돌려주는 가짜 YOLO 모델 (배치 크기 기록)"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batch_sizes = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def predict(self, frames, conf=0.3, iou=0.7, verbose=False):
+        self.gate.wait()
+        self.batch_sizes.append(len(frames))
+        time.sleep(self.delay)
+        return [int(frame[0, 0, 0]) for frame in frames]
+
+
+def make_frame(value: int) -> np.ndarray:
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+def predict_concurrently(batcher, values):
+    """값마다 스레드 하나로 predict 호출 → {값: 결과 또는 예외}"""
+    results = {}
+    start = threading.Barrier(len(values))
+
+    def call(value):
+        start.wait()
+        try:
+            results[value] = batcher.predict(make_frame(value))[0]
+        except Exception as e:
+            results[value] = e
+
+    threads = [threading.Thread(target=call, args=(value,)) for value in values]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+class TestBatching:
+    """동시 요청 배치 묶기"""
+
+    def test_concurrent_calls_are_batched_up_to_max_batch_size(self):
+        """동시에 들어온 요청은 max_batch_size까지 한 배치로 묶임"""
+        model = StubModel()
+        batcher = InferenceBatcher(model, max_batch_size=4, batch_window_ms=200, timeout=5.0)
+
+        results = predict_concurrently(batcher, list(range(8)))
+
+        assert len(results) == 8
+        assert max(model.batch_sizes) == 4
+        assert all(size <= 4 for size in model.batch_sizes)
+        assert sum(model.batch_sizes) == 8
+        assert len(model.batch_sizes) < 8  # 실제로 묶였는지
+        stats = batcher.get_stats()
+        assert stats['total_frames'] == 8
+        assert stats['total_cancelled'] == 0
+
+    def test_each_caller_gets_its_own_result(self):
+        """배치로 묶여도 호출자마다 자기 프레임의 결과를 받음"""
+        batcher = InferenceBatcher(StubModel(), max_batch_size=3, batch_window_ms=100, timeout=5.0)
+
+        values = [10, 20, 30, 40, 50, 60, 70]
+        results = predict_concurrently(batcher, values)
+
+        assert results == {value: value for value in values}
+
+    def test_different_thresholds_are_not_mixed(self):
+        """conf / iou가 다른 요청은 같은 배치에 들어가지 않음"""
+        model = StubModel()
+        batcher = InferenceBatcher(model, max_batch_size=4, batch_window_ms=200, timeout=5.0)
+        seen = []
+        original = model.predict
+
+        def predict(frames, conf=0.3, iou=0.7, verbose=False):
+            seen.append((conf, len(frames)))
+            return original(frames, conf=conf, iou=iou, verbose=verbose)
+
+        model.predict = predict
+        start = threading.Barrier(4)
+        results = {}
+
+        def call(value, conf):
+            start.wait()
+            results[value] = batcher.predict(make_frame(value), conf=conf)[0]
+
+        threads = [threading.Thread(target=call, args=(value, 0.3 if value % 2 else 0.5)) for value in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert results == {1: 1, 2: 2, 3: 3, 4: 4}
+        assert sum(size for _, size in seen) == 4
+        assert all(size <= 2 for _, size in seen)
+
+
+class TestTimeout:
+    """대기 한도 초과 / 취소"""
+
+    def test_timed_out_request_is_dropped_and_later_calls_succeed(self):
+        """대기 한도가 지난 요청은 다음 배치에서 빠지고 이후 호출에 영향 없음"""
+        model = StubModel()
+        batcher = InferenceBatcher(model, max_batch_size=4, batch_window_ms=0, timeout=0.2)
+
+        # 워커를 첫 배치 predict 안에 붙잡아 두고, 그동안 두 번째 요청이 대기 한도를 넘기게 함
+        model.gate.clear()
+        first = {}
+        blocker = threading.Thread(target=lambda: first.setdefault('result', _safe_predict(batcher, 1)))
+        blocker.start()
+        time.sleep(0.05)
+
+        with pytest.raises(TimeoutError):
+            batcher.predict(make_frame(2))
+
+        model.gate.set()
+        blocker.join(5)
+        assert isinstance(first['result'], TimeoutError)  # 첫 요청도 predict가 풀리기 전 한도 초과
+
+        # 취소된 요청(2)은 추론되지 않음 - 첫 배치(1)만 실행됨
+        time.sleep(0.1)
+        assert model.batch_sizes == [1]
+        assert batcher.get_stats()['total_cancelled'] >= 1
+
+        # 이후 호출은 정상
+        assert batcher.predict(make_frame(7))[0] == 7
+        assert batcher.predict(make_frame(8))[0] == 8
+        assert model.batch_sizes == [1, 1, 1]
+
+    def test_model_error_is_raised_to_callers_only_for_that_batch(self):
+        """배치 추론 실패는 해당 배치 호출자에게만 전달"""
+        model = StubModel()
+        batcher = InferenceBatcher(model, max_batch_size=2, batch_window_ms=0, timeout=5.0)
+        original = model.predict
+        model.predict = lambda frames, **kwargs: (_ for _ in ()).throw(RuntimeError('boom'))
+
+        with pytest.raises(RuntimeError):
+            batcher.predict(make_frame(1))
+
+        model.predict = original
+        assert batcher.predict(make_frame(3))[0] == 3
+
+
+def _safe_predict(batcher, value):
+    try:
+        return batcher.predict(make_frame(value))[0]
+    except Exception as e:
+        return e
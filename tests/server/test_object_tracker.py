@@ -0,0 +1,189 @@
+"""
+다중 객체 추적기 테스트 (server/object_tracker.py)
+
+app.py와 같은 설정(MIN_DETECTION_FRAMES=5, MAX_MISSING_FRAMES=3, IOU_THRESHOLD=0.05)으로 검증합니다.
+
+실행 방법:
+pytest tests/server/test_object_tracker.py -v
+"""
+
+import numpy as np
+
+from detections import Detections
+from object_tracker import ObjectTracker
+
+MIN_DETECTION_FRAMES = 5
+MAX_MISSING_FRAMES = 3
+IOU_THRESHOLD = 0.05
+
+
+def make_tracker(**kwargs):
+    options = dict(iou_threshold=IOU_THRESHOLD, min_hits=MIN_DETECTION_FRAMES,
+                   max_missing=MAX_MISSING_FRAMES, name='test')
+    options.update(kwargs)
+    return ObjectTracker(**options)
+
+
+def dets(*items):
+    """(x1, class_id[, confidence]) → 가로 10px 박스 검출 결과"""
+    boxes, conf, cls = [], [], []
+    for item in items:
+        x1, class_id = item[0], item[1]
+        boxes.append([x1, 0, x1 + 10, 10])
+        cls.append(class_id)
+        conf.append(item[2] if len(item) > 2 else 0.9)
+    if not items:
+        return Detections.empty({0: 'resistor', 1: 'capacitor'})
+    return Detections(np.array(boxes), np.array(conf), np.array(cls), {0: 'resistor', 1: 'capacitor'})
+
+
+def x1s(detections):
+    return detections.boxes[:, 0].tolist()
+
+
+class TestConfirmation:
+    """최소 검출 프레임 수 (min_hits)"""
+
+    def test_object_is_shown_after_min_detection_frames(self):
+        """MIN_DETECTION_FRAMES번째 프레임부터 표시"""
+        tracker = make_tracker()
+
+        for _ in range(MIN_DETECTION_FRAMES - 1):
+            assert len(tracker.update(dets((0, 0)))) == 0
+        shown = tracker.update(dets((0, 0)))
+
+        assert len(shown) == 1
+        assert shown.class_names == ['resistor']
+
+    def test_confirmed_box_follows_latest_detection(self):
+        """표시 중인 객체의 박스는 최신 검출 위치로 갱신"""
+        tracker = make_tracker(min_hits=1)
+        tracker.update(dets((0, 0)))
+
+        assert x1s(tracker.update(dets((2, 0)))) == [2.0]
+
+
+class TestExpiry:
+    """사라진 객체 유지 / 제거 (max_missing)"""
+
+    def test_track_kept_for_max_missing_frames_then_removed(self):
+        """MAX_MISSING_FRAMES 프레임까지 유지, 그 다음 프레임에 제거"""
+        tracker = make_tracker()
+        for _ in range(MIN_DETECTION_FRAMES):
+            tracker.update(dets((0, 0)))
+
+        for _ in range(MAX_MISSING_FRAMES):
+            assert len(tracker.update(dets())) == 1
+        assert len(tracker.update(dets())) == 0
+        assert len(tracker) == 0
+
+    def test_redetection_resets_missing_count(self):
+        """유지 기간 안에 다시 검출되면 제거되지 않음"""
+        tracker = make_tracker()
+        for _ in range(MIN_DETECTION_FRAMES):
+            tracker.update(dets((0, 0)))
+
+        for _ in range(MAX_MISSING_FRAMES):
+            tracker.update(dets())
+        tracker.update(dets((0, 0)))
+        for _ in range(MAX_MISSING_FRAMES):
+            assert len(tracker.update(dets())) == 1
+
+    def test_unconfirmed_track_expires_without_being_shown(self):
+        """min_hits 전에 사라진 객체는 표시되지 않고 제거"""
+        tracker = make_tracker()
+        tracker.update(dets((0, 0)))
+
+        for _ in range(MAX_MISSING_FRAMES + 1):
+            assert len(tracker.update(dets())) == 0
+        assert len(tracker) == 0
+
+    def test_frozen_track_is_never_removed(self):
+        """freeze_after 이상 검출된 객체는 박스 고정 + 미검출이어도 유지"""
+        tracker = make_tracker(min_hits=1, freeze_after=3)
+        for _ in range(3):
+            tracker.update(dets((0, 0)))
+
+        assert x1s(tracker.update(dets((2, 0)))) == [0.0]
+        for _ in range(MAX_MISSING_FRAMES + 5):
+            assert len(tracker.update(dets())) == 1
+        assert tracker.all_frozen()
+
+
+class TestDuplicateSuppression:
+    """같은 프레임의 같은 클래스 중복 검출 제거"""
+
+    def test_overlapping_same_class_detections_create_one_track(self):
+        """IOU_THRESHOLD보다 겹치는 같은 클래스 검출은 먼저 나온 것만 새 객체"""
+        tracker = make_tracker(min_hits=1)
+
+        shown = tracker.update(dets((0, 0), (5, 0)))
+
+        assert x1s(shown) == [0.0]
+        assert len(tracker) == 1
+
+    def test_duplicate_of_matched_track_is_dropped(self):
+        """기존 객체에 매칭된 검출과 겹치는 같은 클래스 검출은 새 객체가 되지 않음"""
+        tracker = make_tracker(min_hits=1)
+        tracker.update(dets((0, 0)))
+
+        shown = tracker.update(dets((0, 0), (4, 0)))
+
+        assert x1s(shown) == [0.0]
+        assert len(tracker) == 1
+
+    def test_overlapping_different_classes_are_kept(self):
+        """겹쳐도 클래스가 다르면 각각 새 객체"""
+        tracker = make_tracker(min_hits=1)
+
+        shown = tracker.update(dets((0, 0), (5, 1)))
+
+        assert sorted(shown.class_id.tolist()) == [0, 1]
+
+    def test_barely_touching_same_class_detections_are_kept(self):
+        """IOU_THRESHOLD 이하로 겹치는 같은 클래스 검출은 별도 객체"""
+        tracker = make_tracker(min_hits=1)
+
+        shown = tracker.update(dets((0, 0), (9.5, 0)))  # IOU 0.5 / 19.5 < 0.05
+
+        assert x1s(shown) == [0.0, 9.5]
+
+
+class TestAssignment:
+    """클래스별 헝가리안 매칭"""
+
+    def test_swapped_detection_order_keeps_identities(self):
+        """같은 클래스 박스 2개의 검출 순서가 바뀌어도 각 객체가 자기 위치를 따라감"""
+        tracker = make_tracker(min_hits=1)
+        tracker.update(dets((0, 0, 0.6), (30, 0, 0.8)))
+
+        shown = tracker.update(dets((31, 0, 0.7), (1, 0, 0.5)))
+
+        # 객체 ID 순 (먼저 생긴 왼쪽 객체가 먼저)
+        assert x1s(shown) == [1.0, 31.0]
+        assert np.allclose(shown.confidence, [0.5, 0.7])
+        assert len(tracker) == 2
+
+    def test_assignment_maximizes_total_iou(self):
+        """
+        검출 순서대로 가장 겹치는 객체를 고르면(greedy) 한 객체를 빼앗기는 배치에서도 두 객체 모두 매칭
+
+        객체 T0=[0,10], T1=[9.5,19.5] / 검출 D0=[4,14] (T0 0.43, T1 0.29), D1=[-4,6] (T0 0.43, T1 0)
+        greedy: D0→T0, D1은 중복으로 버려짐 / 헝가리안: D0→T1, D1→T0
+        """
+        tracker = make_tracker(min_hits=1)
+        tracker.update(dets((0, 0), (9.5, 0)))
+
+        shown = tracker.update(dets((4, 0), (-4, 0)))
+
+        assert x1s(shown) == [-4.0, 4.0]
+        assert len(tracker) == 2
+
+    def test_classes_are_matched_separately(self):
+        """다른 클래스 객체와는 매칭하지 않음"""
+        tracker = make_tracker(min_hits=1)
+        tracker.update(dets((0, 0)))
+
+        tracker.update(dets((0, 1)))
+
+        assert sorted(tracker.class_id.tolist()) == [0, 1]
@@ -0,0 +1,168 @@
+"""
+제품별 기준 부품 배치 캐시 테스트 (server/reference_store.py)
+
+실행 방법:
+pytest tests/server/test_reference_store.py -v
+"""
+
+import threading
+
+from reference_store import ReferenceStore
+
+COMPONENTS = [
+    {'class_name': 'resistor', 'center': [100, 100]},
+    {'class_name': 'capacitor', 'center': [200, 150]},
+]
+
+
+class StubLoader:
+    """호출 횟수를 세는 가짜 db.get_reference_components / get_reference_version"""
+
+    def __init__(self, result=None):
+        self.result = COMPONENTS if result is None else result
+        self.calls = []
+
+    def __call__(self, product_code):
+        self.calls.append(product_code)
+        return self.result
+
+
+class TestCaching:
+    """캐시 적중 / 미스"""
+
+    def test_hit_does_not_call_loader(self):
+        """두 번째 조회부터 loader 호출 없음"""
+        loader = StubLoader()
+        store = ReferenceStore(loader)
+
+        first = store.get('BC')
+        assert loader.calls == ['BC']
+
+        for _ in range(5):
+            assert store.get('BC') is first
+        assert loader.calls == ['BC']
+        assert store.get_stats()['hits'] == 5
+
+    def test_hit_within_revalidate_interval_does_not_check_version(self):
+        """revalidate_s 안의 적중은 버전 조회도 없음"""
+        loader, versions = StubLoader(), StubLoader(result=(2, 7, 't'))
+        store = ReferenceStore(loader, version_loader=versions, revalidate_s=60.0)
+
+        store.get('BC')
+        store.get('BC')
+        store.get('BC')
+
+        assert loader.calls == ['BC']
+        assert versions.calls == ['BC']  # 로드 시 1회
+        assert store.get_stats()['version_checks'] == 0
+
+    def test_products_are_cached_separately(self):
+        loader = StubLoader()
+        store = ReferenceStore(loader)
+
+        store.get('BC')
+        store.get('AA')
+        store.get('BC')
+
+        assert loader.calls == ['BC', 'AA']
+
+    def test_missing_reference_is_cached_as_none(self):
+        """기준 데이터 없음(빈 결과)도 negative_ttl_s 동안 캐시"""
+        loader = StubLoader(result=[])
+        store = ReferenceStore(loader, negative_ttl_s=60.0)
+
+        assert store.get('ZZ') is None
+        assert store.get('ZZ') is None
+        assert loader.calls == ['ZZ']
+
+
+class TestRevalidation:
+    """공유 버전 확인 (version_loader)"""
+
+    def test_version_change_triggers_reload(self):
+        """버전이 바뀌면 다시 로드"""
+        loader, versions = StubLoader(), StubLoader(result=(2, 7, 't1'))
+        store = ReferenceStore(loader, version_loader=versions, revalidate_s=0.0)
+
+        first = store.get('BC')
+        assert store.get('BC') is first  # 같은 버전 → 적중
+        assert loader.calls == ['BC']
+
+        versions.result = (3, 8, 't2')
+        second = store.get('BC')
+
+        assert loader.calls == ['BC', 'BC']
+        assert second is not first
+        stats = store.get_stats()
+        assert stats['version_changes'] == 1
+        assert store.get('BC') is second  # 새 버전으로 저장됨
+
+    def test_version_lookup_failure_keeps_cached_entry(self):
+        """버전 조회가 None(DB 오류)이면 캐시 유지"""
+        loader, versions = StubLoader(), StubLoader(result=(2, 7, 't1'))
+        store = ReferenceStore(loader, version_loader=versions, revalidate_s=0.0)
+
+        first = store.get('BC')
+        versions.result = None
+
+        for _ in range(3):
+            assert store.get('BC') is first
+        assert loader.calls == ['BC']
+        assert store.get_stats()['version_changes'] == 0
+
+
+class TestInvalidation:
+    """명시적 무효화"""
+
+    def test_invalidate_forces_reload(self):
+        loader = StubLoader()
+        store = ReferenceStore(loader)
+
+        store.get('BC')
+        store.invalidate('BC')
+        store.get('BC')
+
+        assert loader.calls == ['BC', 'BC']
+
+    def test_invalidate_all(self):
+        loader = StubLoader()
+        store = ReferenceStore(loader)
+
+        store.get('BC')
+        store.get('AA')
+        store.invalidate()
+        store.get('BC')
+        store.get('AA')
+
+        assert loader.calls == ['BC', 'AA', 'BC', 'AA']
+
+    def test_invalidate_during_load_discards_stale_result(self):
+        """로드 도중 무효화(기준 배치 저장)되면 로드한 결과는 캐시에 저장하지 않음"""
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_loader(product_code):
+            calls.append(product_code)
+            if len(calls) == 1:
+                started.set()
+                release.wait(5)
+                return [{'class_name': 'stale', 'center': [0, 0]}]
+            return COMPONENTS
+
+        store = ReferenceStore(slow_loader)
+        results = {}
+        loading = threading.Thread(target=lambda: results.setdefault('first', store.get('BC')))
+        loading.start()
+        assert started.wait(5)
+
+        store.invalidate('BC')  # 로드 도중 저장
+        release.set()
+        loading.join(5)
+
+        # 진행 중이던 호출은 읽은 값을 그대로 돌려받지만, 캐시에는 남지 않음
+        assert results['first'].class_names == ['stale']
+        assert store.get_stats()['products'] == {}
+
+        fresh = store.get('BC')
+        assert calls == ['BC', 'BC']
+        assert fresh.class_names == ['resistor', 'capacitor']
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+부품 위치 매칭 벤치마크 (기존 탐욕 최근접 매칭 vs 클래스별 최적 배정)
+
+합성 보드(부품 20 / 200 / 2000개, 약 10개 클래스, 위치 흔들림 + 누락 + 추가 부품)에서
+- 기존: 기준 순서대로 같은 클래스 검출 중 가장 가까운 것을 골라 목록에서 제거 (dict 리스트)
+- 현재: ComponentVerifier.verify_components (gate 안 쌍 수 최대 → 거리 합 최소 배정)
+를 실행해서 보드당 지연 시간과 정상 / 위치 오류 / 누락 / 추가 개수, 매칭 거리 합을 비교합니다.
+탐욕 매칭은 기준 순서에 따라 먼저 가까운 검출을 가져가 이웃 부품을 위치 오류로 만드는 경우가 있습니다.
+
+사용법:
+    python tools/benchmarks/bench_component_matching.py
+    python tools/benchmarks/bench_component_matching.py --sizes 20 200 2000 --boards 10 --jitter 6
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+SERVER_DIR = Path(__file__).resolve().parents[2] / 'server'
+sys.path.append(str(SERVER_DIR))
+
+from component_verification import ComponentVerifier
+
+POSITION_THRESHOLD = 20.0
+
+
+def legacy_verify(reference_components, detected_components, threshold=POSITION_THRESHOLD):
+    """기존 verify_components 매칭 (비교 기준: 기준 순서대로 최근접 검출을 골라 제거)"""
+    detected_by_class = {}
+    for comp in detected_components:
+        detected_by_class.setdefault(comp['class_name'], []).append(comp)
+
+    counts = {'correct': 0, 'misplaced': 0, 'missing': 0, 'extra': 0}
+    total_offset = 0.0
+    for ref_comp in reference_components:
+        ref_center = np.array(ref_comp['center'])
+        candidates = detected_by_class.get(ref_comp['class_name'], [])
+        if not candidates:
+            counts['missing'] += 1
+            continue
+        distances = [np.linalg.norm(np.array(det['center']) - ref_center) for det in candidates]
+        closest = int(np.argmin(distances))
+        counts['misplaced' if distances[closest] > threshold else 'correct'] += 1
+        total_offset += distances[closest]
+        candidates.remove(candidates[closest])
+
+    counts['extra'] = sum(len(v) for v in detected_by_class.values())
+    return counts, total_offset
+
+
+def make_board(size, rng, jitter, n_classes=10, missing_rate=0.03, extra_rate=0.03):
+    """합성 보드: (기준 컴포넌트, 검출 컴포넌트) dict 리스트 - 부품 간격은 부품 수에 맞춰 촘촘해짐"""
+    side = 640.0 * max(1.0, np.sqrt(size / 200.0))  # 부품 밀도를 비슷하게 유지
+    centers = rng.uniform(0, side, size=(size, 2))
+    classes = rng.integers(0, n_classes, size=size)
+    reference = [{'class_name': f'c{k}', 'center': [float(x), float(y)], 'bbox': [x - 5, y - 5, x + 5, y + 5]}
+                 for (x, y), k in zip(centers, classes)]
+
+    keep = rng.random(size) >= missing_rate
+    det_centers = centers[keep] + rng.normal(0, jitter, size=(int(keep.sum()), 2))
+    det_classes = classes[keep]
+    n_extra = rng.binomial(size, extra_rate)
+    det_centers = np.vstack([det_centers, rng.uniform(0, side, size=(n_extra, 2))])
+    det_classes = np.concatenate([det_classes, rng.integers(0, n_classes, size=n_extra)])
+    order = rng.permutation(len(det_centers))  # YOLO 출력 순서는 기준 순서와 무관
+    detected = [{'class_name': f'c{det_classes[i]}', 'center': [float(det_centers[i, 0]), float(det_centers[i, 1])],
+                 'bbox': [0, 0, 1, 1], 'confidence': 0.9} for i in order]
+    return reference, detected
+
+
+def time_call(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times)), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='부품 위치 매칭 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 200, 2000], help='보드당 부품 수')
+    parser.add_argument('--boards', type=int, default=5, help='크기별 합성 보드 수')
+    parser.add_argument('--repeat', type=int, default=5, help='보드당 반복 횟수 (중앙값)')
+    parser.add_argument('--jitter', type=float, default=6.0, help='검출 위치 흔들림 표준편차 (픽셀)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rng = np.random.default_rng(args.seed)
+
+    print("=" * 96)
+    print(f"위치 임계값: {POSITION_THRESHOLD}px, 흔들림: {args.jitter}px, 보드: 크기별 {args.boards}개, 반복: {args.repeat}")
+    print("-" * 96)
+    print(f"{'부품':>5} {'구현':<10} {'중앙값(ms)':>10} {'정상':>7} {'위치오류':>8} {'누락':>6} {'추가':>6} {'거리 합(px)':>12}")
+    for size in args.sizes:
+        rows = {'기존 탐욕': [], '최적 배정': []}
+        for _ in range(args.boards):
+            reference, detected = make_board(size, rng, args.jitter)
+            verifier = ComponentVerifier(reference, position_threshold=POSITION_THRESHOLD)
+
+            legacy_ms, (legacy_counts, legacy_offset) = time_call(
+                lambda: legacy_verify(reference, detected), args.repeat)
+            optimal_ms, result = time_call(lambda: verifier.verify_components(detected), args.repeat)
+            summary = result['summary']
+            optimal_counts = {key: summary[f'{key}_count'] for key in ('correct', 'misplaced', 'missing', 'extra')}
+            optimal_offset = sum(m['offset'] for m in result['correct'] + result['misplaced'])
+
+            rows['기존 탐욕'].append((legacy_ms, legacy_counts, legacy_offset))
+            rows['최적 배정'].append((optimal_ms, optimal_counts, optimal_offset))
+
+        for label, runs in rows.items():
+            ms = np.mean([r[0] for r in runs])
+            counts = {key: np.mean([r[1][key] for r in runs]) for key in runs[0][1]}
+            offset = np.mean([r[2] for r in runs])
+            print(f"{size:>5} {label:<10} {ms:10.2f} {counts['correct']:7.1f} {counts['misplaced']:8.1f} "
+                  f"{counts['missing']:6.1f} {counts['extra']:6.1f} {offset:12.1f}")
+    print("=" * 96)
+
+
+if __name__ == '__main__':
+    main()
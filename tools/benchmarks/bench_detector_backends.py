@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+부품 검출기 백엔드 벤치마크 (PyTorch vs ONNX Runtime / OpenVINO)
+
+검증 세트(YOLO 형식 데이터셋 YAML의 val split)로 각 백엔드를 실행해서
+- 정확도: 정답 라벨 기준 Precision / Recall / F1 (IoU ≥ 0.5, 같은 클래스)
+- PyTorch 대비 일치도: PyTorch 검출 재현율 / 백엔드 검출 정밀도, 매칭된 박스의 평균 IoU / 신뢰도 차이
+- 처리량: 이미지 1장 추론 지연 (p50 / p95 / 평균) 및 FPS
+를 비교합니다. 서버와 같은 detector_backends.create_detector 경로를 사용합니다.
+
+사용법:
+    python tools/benchmarks/bench_detector_backends.py --data data/pcb_defects.yaml \
+        --pt models/component_detector_v5_best.pt \
+        --onnx models/component_detector_v5_best.onnx models/component_detector_v5_best_int8.onnx \
+        --openvino models/component_detector_v5_best_openvino_model
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import yaml
+
+# 서버 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'server'))
+
+from detections import Detections, iou_matrix
+from detector_backends import create_detector
+
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def load_validation_set(data_yaml: str, split: str, limit: int):
+    """
+    YOLO 형식 검증 세트 로드
+
+    Returns:
+        [(이미지, 정답 박스 (N, 4) xyxy 픽셀, 정답 클래스 (N,)), ...]
+    """
+    with open(data_yaml, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f)
+    image_dir = Path(data.get('path', '.')) / data[split]
+    label_dir = Path(str(image_dir).replace('images', 'labels'))
+
+    samples = []
+    for image_path in sorted(p for p in image_dir.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)[:limit]:
+        image = cv2.imread(str(image_path))
+        if image is None:
+            continue
+        h, w = image.shape[:2]
+
+        label_path = label_dir / f"{image_path.stem}.txt"
+        labels = np.loadtxt(label_path, ndmin=2) if label_path.exists() else np.zeros((0, 5))
+        labels = labels.reshape(-1, 5)
+        cx, cy, bw, bh = labels[:, 1] * w, labels[:, 2] * h, labels[:, 3] * w, labels[:, 4] * h
+        boxes = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1)
+        samples.append((image, boxes, labels[:, 0].astype(np.int32)))
+    return samples
+
+
+def match(boxes_a, class_a, conf_a, boxes_b, class_b, iou_threshold=0.5):
+    """
+    같은 클래스끼리 IoU 기준 그리디 1:1 매칭 (a의 신뢰도 내림차순)
+
+    Returns:
+        [(a 인덱스, b 인덱스, IoU), ...]
+    """
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return []
+    ious = iou_matrix(boxes_a, boxes_b)
+    ious[class_a[:, None] != class_b[None, :]] = 0.0
+
+    pairs, used = [], set()
+    for i in np.argsort(-conf_a):
+        candidates = [j for j in np.argsort(-ious[i]) if ious[i, j] >= iou_threshold and j not in used]
+        if candidates:
+            j = candidates[0]
+            used.add(j)
+            pairs.append((i, j, float(ious[i, j])))
+    return pairs
+
+
+def run_backend(detector, samples, conf, iou, warmup):
+    """검증 세트 전체 추론 (이미지별 Detections, 지연 시간 ms)"""
+    for image, _, _ in samples[:warmup]:
+        detector.predict(image, conf=conf, iou=iou, verbose=False)
+
+    outputs, latencies = [], []
+    for image, _, _ in samples:
+        start = time.perf_counter()
+        result = detector.predict(image, conf=conf, iou=iou, verbose=False)[0]
+        latencies.append((time.perf_counter() - start) * 1000)
+        outputs.append(Detections.from_yolo(result))
+    return outputs, np.array(latencies)
+
+
+def accuracy(outputs, samples):
+    """정답 라벨 기준 Precision / Recall / F1"""
+    tp = fp = fn = 0
+    for det, (_, gt_boxes, gt_class) in zip(outputs, samples):
+        n_match = len(match(det.boxes, det.class_id, det.confidence, gt_boxes, gt_class))
+        tp += n_match
+        fp += len(det) - n_match
+        fn += len(gt_boxes) - n_match
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def parity(reference, outputs):
+    """PyTorch 검출 대비 일치도 (재현율, 정밀도, 평균 IoU, 평균 |신뢰도 차이|)"""
+    n_ref = n_out = 0
+    ious, conf_diffs = [], []
+    for ref, det in zip(reference, outputs):
+        pairs = match(ref.boxes, ref.class_id, ref.confidence, det.boxes, det.class_id)
+        n_ref += len(ref)
+        n_out += len(det)
+        ious.extend(p[2] for p in pairs)
+        conf_diffs.extend(abs(float(ref.confidence[i]) - float(det.confidence[j])) for i, j, _ in pairs)
+    return (
+        len(ious) / n_ref if n_ref else 1.0,
+        len(ious) / n_out if n_out else 1.0,
+        float(np.mean(ious)) if ious else 0.0,
+        float(np.mean(conf_diffs)) if conf_diffs else 0.0
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='부품 검출기 백엔드 정확도 / 처리량 벤치마크')
+    parser.add_argument('--data', required=True, help='YOLO 데이터셋 YAML (val split 사용)')
+    parser.add_argument('--split', default='val', help='데이터셋 split')
+    parser.add_argument('--pt', default='models/component_detector_v5_best.pt', help='PyTorch 기준 모델')
+    parser.add_argument('--onnx', nargs='*', default=[], help='ONNX 모델 경로 (FP32 / FP16 / INT8)')
+    parser.add_argument('--openvino', nargs='*', default=[], help='OpenVINO 모델 경로 (.xml 또는 폴더)')
+    parser.add_argument('--imgsz', type=int, default=640, help='입력 크기')
+    parser.add_argument('--conf', type=float, default=0.3, help='confidence threshold (서버 기본값 0.3)')
+    parser.add_argument('--iou', type=float, default=0.7, help='NMS IoU threshold')
+    parser.add_argument('--limit', type=int, default=500, help='최대 이미지 수')
+    parser.add_argument('--warmup', type=int, default=5, help='워밍업 추론 횟수')
+    parser.add_argument('--cpu-threads', type=int, default=0, help='ONNX 백엔드 추론 스레드 수')
+    args = parser.parse_args()
+
+    samples = load_validation_set(args.data, args.split, args.limit)
+    if not samples:
+        print(f"❌ 검증 이미지가 없습니다: {args.data} ({args.split})")
+        sys.exit(1)
+
+    candidates = [('pytorch', args.pt)]
+    candidates += [('onnxruntime', path) for path in args.onnx]
+    candidates += [('openvino', path) for path in args.openvino]
+
+    print("=" * 110)
+    print(f"검출기 백엔드 벤치마크 (검증 이미지 {len(samples)}장, conf {args.conf}, iou {args.iou})")
+    print("=" * 110)
+    print(f"{'백엔드':<12}{'모델':<36}{'P':>7}{'R':>7}{'F1':>7}"
+          f"{'PT재현':>8}{'PT정밀':>8}{'IoU':>7}{'Δconf':>8}{'p50 ms':>9}{'p95 ms':>9}{'FPS':>8}")
+
+    reference = None
+    for backend, path in candidates:
+        detector = create_detector(backend, path, imgsz=args.imgsz, cpu_threads=args.cpu_threads)
+        outputs, latencies = run_backend(detector, samples, args.conf, args.iou, args.warmup)
+        if reference is None:
+            reference = outputs
+
+        precision, recall, f1 = accuracy(outputs, samples)
+        ref_recall, ref_precision, mean_iou, conf_diff = parity(reference, outputs)
+        print(
+            f"{backend:<12}{Path(path).name[:35]:<36}{precision:>7.3f}{recall:>7.3f}{f1:>7.3f}"
+            f"{ref_recall:>8.3f}{ref_precision:>8.3f}{mean_iou:>7.3f}{conf_diff:>8.3f}"
+            f"{np.percentile(latencies, 50):>9.1f}{np.percentile(latencies, 95):>9.1f}"
+            f"{1000.0 / latencies.mean():>8.1f}"
+        )
+    print("=" * 110)
+    print("PT재현 / PT정밀: PyTorch 검출과 IoU ≥ 0.5로 매칭된 비율 (PyTorch 기준 / 백엔드 기준)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+PCB 테두리 엣지 스캔 벤치마크 (기존 파이썬 루프 vs NumPy 벡터화)
+
+녹화된 프레임(기본: server/reference_images)을 서버와 같은 640x640으로 크롭/리사이즈한 뒤
+PCBEdgeDetector의 네 방향 ROI 엣지 스캔을
+- 기존 구현: 스캔라인마다 픽셀 단위 파이썬 루프 (int(roi_img[r, c]) 비교)
+- 현재 구현: gradients() + scan_edge_points() (argmax 기반 첫 교차 지점)
+로 실행해서 스캔 지연 시간과 detect_edges() 전체 지연 시간, 검출 점 일치 여부를 비교합니다.
+
+사용법:
+    python tools/benchmarks/bench_edge_detector.py
+    python tools/benchmarks/bench_edge_detector.py --images /path/to/recorded_frames --repeat 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+SERVER_DIR = Path(__file__).resolve().parents[2] / 'server'
+sys.path.append(str(SERVER_DIR))
+
+from pcb_edge_detector import PCBEdgeDetector
+
+DIRECTIONS = ('top', 'bottom', 'left', 'right')
+
+
+def legacy_scan(gray, direction, roi, th):
+    """기존 detect_edges()의 방향별 스캔 루프 (비교 기준)"""
+    x, y, roi_w, roi_h = roi
+    roi_img = gray[y:y + roi_h, x:x + roi_w]
+    points = []
+
+    if direction == 'top':
+        for c in range(roi_w):
+            for r in range(1, roi_h):
+                if abs(int(roi_img[r, c]) - int(roi_img[r-1, c])) > th:
+                    points.append([x + c, y + r])
+                    break
+    elif direction == 'bottom':
+        for c in range(roi_w):
+            for r in range(roi_h - 2, -1, -1):
+                if abs(int(roi_img[r, c]) - int(roi_img[r+1, c])) > th:
+                    points.append([x + c, y + r])
+                    break
+    elif direction == 'left':
+        for r in range(roi_h):
+            for c in range(1, roi_w):
+                if abs(int(roi_img[r, c]) - int(roi_img[r, c-1])) > th:
+                    points.append([x + c, y + r])
+                    break
+    elif direction == 'right':
+        for r in range(roi_h):
+            for c in range(roi_w - 2, -1, -1):
+                if abs(int(roi_img[r, c]) - int(roi_img[r, c+1])) > th:
+                    points.append([x + c, y + r])
+                    break
+    return points
+
+
+def load_frames(image_dir: Path):
+    """녹화 프레임 → 서버 엣지 검출 입력 (640x640 BGR, 블러된 그레이스케일)"""
+    frames = []
+    for path in sorted(image_dir.glob('*.jpg')) + sorted(image_dir.glob('*.png')):
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        image = cv2.resize(image, (640, 640))
+        gray = cv2.GaussianBlur(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        frames.append((path.name, image, gray))
+    if not frames:
+        raise SystemExit(f"이미지 없음: {image_dir}")
+    return frames
+
+
+def time_ms(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return np.asarray(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PCB 테두리 엣지 스캔 벤치마크')
+    parser.add_argument('--images', type=Path, default=SERVER_DIR / 'reference_images',
+                        help='녹화 프레임 디렉토리 (*.jpg / *.png)')
+    parser.add_argument('--repeat', type=int, default=10, help='프레임당 반복 횟수')
+    args = parser.parse_args()
+
+    detector = PCBEdgeDetector()
+    frames = load_frames(args.images)
+    rois = {}
+    for direction in DIRECTIONS:
+        x, y, roi_w, roi_h = detector.rois[direction]
+        rois[direction] = (x, y, min(roi_w, 640 - x), min(roi_h, 640 - y))
+    thresholds = detector.default_thresholds
+
+    def run_legacy(gray):
+        return {d: legacy_scan(gray, d, rois[d], thresholds[d]) for d in DIRECTIONS}
+
+    def run_vectorized(gray):
+        grad_y, grad_x = detector.gradients(gray)
+        return {d: detector.scan_edge_points(grad_y, grad_x, d, rois[d], thresholds[d]) for d in DIRECTIONS}
+
+    legacy_times, vector_times, full_times = [], [], []
+    mismatches = 0
+    for name, image, gray in frames:
+        legacy, vectorized = run_legacy(gray), run_vectorized(gray)
+        for d in DIRECTIONS:
+            if legacy[d] != vectorized[d].tolist():
+                mismatches += 1
+                print(f"⚠️  불일치: {name} [{d}] 루프 {len(legacy[d])}개 / 벡터화 {len(vectorized[d])}개")
+
+        legacy_times.append(time_ms(lambda: run_legacy(gray), args.repeat))
+        vector_times.append(time_ms(lambda: run_vectorized(gray), args.repeat))
+        full_times.append(time_ms(lambda: detector.detect_edges(image, draw_debug=False), args.repeat))
+
+    legacy_times = np.concatenate(legacy_times)
+    vector_times = np.concatenate(vector_times)
+    full_times = np.concatenate(full_times)
+
+    print("=" * 64)
+    print(f"프레임: {len(frames)} ({args.images}), 반복: {args.repeat}")
+    print(f"검출 점 일치: {len(frames) * len(DIRECTIONS) - mismatches}/{len(frames) * len(DIRECTIONS)} (프레임 x 방향)")
+    print("-" * 64)
+    print(f"{'구현':<28} {'평균(ms)':>9} {'p95(ms)':>9}")
+    for label, times in (('4방향 스캔 - 파이썬 루프', legacy_times),
+                         ('4방향 스캔 - NumPy 벡터화', vector_times),
+                         ('detect_edges() 전체', full_times)):
+        print(f"{label:<28} {times.mean():9.3f} {np.percentile(times, 95):9.3f}")
+    print(f"스캔 속도 향상: {legacy_times.mean() / vector_times.mean():.1f}x")
+    print("=" * 64)
+
+
+if __name__ == '__main__':
+    main()
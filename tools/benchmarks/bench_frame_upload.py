@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+프레임 업로드 방식 벤치마크 (JSON Base64 vs multipart vs octet-stream)
+
+/predict_dual 요청 본문을 세 가지 방식으로 만들어서
+- 전송 바이트 수 (요청 본문 크기)
+- 서버 측 파싱 + JPEG 디코딩 시간 (frame_codec.parse_frame_upload + decode_jpeg)
+을 비교합니다. 서버 측 시간은 Flask test_request_context로 실제 요청 파싱 경로를 재현합니다.
+
+사용법:
+    python tools/benchmarks/bench_frame_upload.py
+    python tools/benchmarks/bench_frame_upload.py --images server/reference_images --repeat 200
+"""
+
+import argparse
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+from flask import Flask, request
+from urllib3.filepost import encode_multipart_formdata
+
+# 서버 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'server'))
+
+from frame_codec import parse_frame_upload, LEFT_LENGTH_HEADER
+
+
+def load_jpegs(image_dir: Path, quality: int):
+    """기준 이미지를 JPEG 바이트로 재인코딩 (클라이언트와 동일한 품질)"""
+    jpegs = []
+    for path in sorted(image_dir.glob('*.jpg')):
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if ok:
+            jpegs.append(buffer.tobytes())
+    return jpegs
+
+
+def build_requests(left_jpeg: bytes, right_jpeg: bytes):
+    """업로드 방식별 (본문, 헤더) 생성"""
+    json_body = json.dumps({
+        'left_image': base64.b64encode(left_jpeg).decode('utf-8'),
+        'right_image': base64.b64encode(right_jpeg).decode('utf-8')
+    }).encode('utf-8')
+
+    multipart_body, multipart_type = encode_multipart_formdata({
+        'left_image': ('left.jpg', left_jpeg, 'image/jpeg'),
+        'right_image': ('right.jpg', right_jpeg, 'image/jpeg')
+    })
+
+    binary_body = left_jpeg + right_jpeg
+
+    return {
+        'json': (json_body, {'Content-Type': 'application/json'}),
+        'multipart': (multipart_body, {'Content-Type': multipart_type}),
+        'binary': (binary_body, {
+            'Content-Type': 'application/octet-stream',
+            LEFT_LENGTH_HEADER: str(len(left_jpeg))
+        })
+    }
+
+
+def time_decode(app: Flask, body: bytes, headers: dict, repeat: int) -> np.ndarray:
+    """요청 파싱 + 양면 디코딩 시간 측정 (ms)"""
+    samples = []
+    for _ in range(repeat):
+        with app.test_request_context('/predict_dual', method='POST', data=body, headers=headers):
+            start = time.perf_counter()
+            upload = parse_frame_upload(request, ('left_image', 'right_image'))
+            left = upload.decode('left_image')
+            right = upload.decode('right_image')
+            samples.append((time.perf_counter() - start) * 1000)
+            assert left is not None and right is not None
+    return np.array(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='프레임 업로드 방식 벤치마크')
+    parser.add_argument('--images', default='server/reference_images', help='JPEG 이미지 폴더')
+    parser.add_argument('--quality', type=int, default=85, help='JPEG 품질 (클라이언트 기본값 85)')
+    parser.add_argument('--repeat', type=int, default=100, help='방식별 반복 횟수')
+    args = parser.parse_args()
+
+    jpegs = load_jpegs(Path(args.images), args.quality)
+    if len(jpegs) < 1:
+        print(f"❌ 이미지가 없습니다: {args.images}")
+        sys.exit(1)
+
+    left_jpeg = jpegs[0]
+    right_jpeg = jpegs[1] if len(jpegs) > 1 else jpegs[0]
+    app = Flask(__name__)
+
+    print("=" * 70)
+    print(f"프레임 업로드 벤치마크 (좌 {len(left_jpeg)} B + 우 {len(right_jpeg)} B JPEG, 반복 {args.repeat}회)")
+    print("=" * 70)
+    print(f"{'방식':<12}{'전송 바이트':>14}{'JSON 대비':>12}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+
+    built = build_requests(left_jpeg, right_jpeg)
+    json_size = len(built['json'][0])
+    for mode, (body, headers) in built.items():
+        samples = time_decode(app, body, headers, args.repeat)
+        print(
+            f"{mode:<12}{len(body):>14,}{len(body) / json_size:>11.1%}"
+            f"{np.percentile(samples, 50):>10.2f}{np.percentile(samples, 95):>10.2f}{samples.mean():>10.2f}"
+        )
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+PCB ROI 감지 벤치마크 (기존 detect_pcb_roi vs 축소 분할 locate_pcb_roi)
+
+녹화된 프레임(기본: server/reference_images)을 서버와 같은 640x640으로 크롭/리사이즈한 뒤
+- 기존 구현: 원본 해상도 HSV + 매 호출 커널 생성 + 전체 크기 마스크 반환
+- 현재 구현: 축소 프레임에서 분할 → 바운딩 박스만 원본으로 복원, 슬라이스 좌표 반환
+으로 실행해서 지연 시간, 프레임당 메모리 할당(tracemalloc 최대치 / 할당 횟수),
+바운딩 박스 오차를 비교합니다. 오차 기준은 원본 해상도 마스크를 큰 커널(15x15)로 닫아
+만능기판 구멍을 메운 보드 외곽입니다 (기존 구현도 구멍 때문에 보드 일부만 잡는 경우가 있어 함께 표시).
+
+사용법:
+    python tools/benchmarks/bench_pcb_roi.py
+    python tools/benchmarks/bench_pcb_roi.py --images /path/to/recorded_frames --downscale 0.25 0.5 1.0
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+SERVER_DIR = Path(__file__).resolve().parents[2] / 'server'
+sys.path.append(str(SERVER_DIR))
+
+from pcb_roi import (locate_pcb_roi, PCB_COLOR_LOWER_HSV, PCB_COLOR_UPPER_HSV,
+                     PCB_INNER_MARGIN_PERCENT, PCB_EDGE_THRESHOLD)
+
+
+def legacy_detect_pcb_roi(frame):
+    """기존 app.detect_pcb_roi (비교 기준)"""
+    h, w = frame.shape[:2]
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    pcb_mask = cv2.inRange(hsv, PCB_COLOR_LOWER_HSV, PCB_COLOR_UPPER_HSV)
+    kernel = np.ones((5, 5), np.uint8)
+    pcb_mask = cv2.morphologyEx(pcb_mask, cv2.MORPH_CLOSE, kernel)
+    pcb_mask = cv2.morphologyEx(pcb_mask, cv2.MORPH_OPEN, kernel)
+    contours, _ = cv2.findContours(pcb_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return np.ones((h, w), dtype=np.uint8) * 255, None, None
+
+    pcb_x, pcb_y, pcb_w, pcb_h = cv2.boundingRect(max(contours, key=cv2.contourArea))
+    if (pcb_x < PCB_EDGE_THRESHOLD or pcb_y < PCB_EDGE_THRESHOLD or
+            pcb_x + pcb_w > w - PCB_EDGE_THRESHOLD or pcb_y + pcb_h > h - PCB_EDGE_THRESHOLD):
+        return np.ones((h, w), dtype=np.uint8) * 255, None, None
+
+    margin_w = int(pcb_w * PCB_INNER_MARGIN_PERCENT)
+    margin_h = int(pcb_h * PCB_INNER_MARGIN_PERCENT)
+    roi_x, roi_y = max(0, pcb_x + margin_w), max(0, pcb_y + margin_h)
+    roi_w = min(pcb_w - 2 * margin_w, w - roi_x)
+    roi_h = min(pcb_h - 2 * margin_h, h - roi_y)
+    roi_mask = np.zeros((h, w), dtype=np.uint8)
+    roi_mask[roi_y:roi_y + roi_h, roi_x:roi_x + roi_w] = 255
+    return roi_mask, (pcb_x, pcb_y, pcb_w, pcb_h), (roi_x, roi_y, roi_w, roi_h)
+
+
+def filled_board_bbox(frame, kernel_size=15):
+    """오차 기준: 원본 해상도에서 구멍을 메운 보드 외곽 바운딩 박스"""
+    mask = cv2.inRange(cv2.cvtColor(frame, cv2.COLOR_BGR2HSV), PCB_COLOR_LOWER_HSV, PCB_COLOR_UPPER_HSV)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((kernel_size, kernel_size), np.uint8))
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    return cv2.boundingRect(max(contours, key=cv2.contourArea)) if contours else None
+
+
+def load_frames(image_dir: Path):
+    """녹화 프레임 → 640x640 BGR (중앙 크롭 + 축소한 보드가 프레임 안에 들어오는 변형 포함)"""
+    frames = []
+    for path in sorted(image_dir.glob('*.jpg')) + sorted(image_dir.glob('*.png')):
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        image = cv2.resize(image, (640, 640))
+        frames.append((path.name, image))
+        # 보드 전체가 프레임 안에 있는 경우 (경계 검사 통과 → ROI 계산 경로)
+        inset = np.zeros_like(image)
+        inset[80:560, 80:560] = cv2.resize(image, (480, 480))
+        frames.append((f"{path.name} (inset)", inset))
+    if not frames:
+        raise SystemExit(f"이미지 없음: {image_dir}")
+    return frames
+
+
+def measure(func, frames, repeat):
+    """(지연 시간 배열 ms, 프레임당 최대 할당 바이트 평균, 프레임당 할당 횟수 평균)"""
+    times = []
+    for _, frame in frames:
+        func(frame)  # 워밍업 (커널 캐시 등)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(frame)
+            times.append((time.perf_counter() - start) * 1000)
+
+    peaks, counts = [], []
+    for _, frame in frames:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        result = func(frame)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        counts.append(sum(max(0, stat.count_diff) for stat in after.compare_to(before, 'lineno')))
+        peaks.append(peak)
+        del result
+    return np.asarray(times), float(np.mean(peaks)), float(np.mean(counts))
+
+
+def bbox_error(a, b):
+    if a is None or b is None:
+        return 0 if a is None and b is None else None
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]), abs(a[0] + a[2] - b[0] - b[2]), abs(a[1] + a[3] - b[1] - b[3]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PCB ROI 감지 벤치마크')
+    parser.add_argument('--images', type=Path, default=SERVER_DIR / 'reference_images',
+                        help='녹화 프레임 디렉토리 (*.jpg / *.png)')
+    parser.add_argument('--repeat', type=int, default=20, help='프레임당 반복 횟수')
+    parser.add_argument('--downscale', type=float, nargs='+', default=[0.25, 0.5, 1.0])
+    args = parser.parse_args()
+
+    frames = load_frames(args.images)
+    reference = [filled_board_bbox(frame) for _, frame in frames]
+
+    def error_text(results):
+        errors = [bbox_error(ref, res[1]) for ref, res in zip(reference, results)]
+        if any(e is None for e in errors):
+            return f"판정 불일치 {sum(e is None for e in errors)}"
+        return f"{np.mean(errors):.1f} / {max(errors)}px"
+
+    baseline = [legacy_detect_pcb_roi(frame) for _, frame in frames]
+    rows = [('기존 (원본 + 마스크)',) + measure(legacy_detect_pcb_roi, frames, args.repeat)
+            + (error_text(baseline),)]
+    for scale in args.downscale:
+        results = [locate_pcb_roi(frame, downscale=scale) for _, frame in frames]
+        rows.append((f"축소 x{scale} (슬라이스)",)
+                    + measure(lambda f, s=scale: locate_pcb_roi(f, downscale=s), frames, args.repeat)
+                    + (error_text(results),))
+
+    print("=" * 84)
+    print(f"프레임: {len(frames)} ({args.images}), 반복: {args.repeat}, "
+          f"PCB 전체 검출: {sum(b[1] is not None for b in baseline)}/{len(frames)}")
+    print("-" * 84)
+    print(f"{'구현':<22} {'평균(ms)':>9} {'p95(ms)':>9} {'최대 할당(KB)':>14} {'할당 횟수':>9} {'bbox 오차(평균/최대)':>18}")
+    for label, times, peak, count, error in rows:
+        print(f"{label:<22} {times.mean():9.3f} {np.percentile(times, 95):9.3f} "
+              f"{peak / 1024:14.1f} {count:9.1f} {error:>18}")
+    print("=" * 84)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+카메라 프레임 → 모델 입력 전처리 벤치마크 (기존 단계별 처리 vs 1회 리사이즈)
+
+녹화 프레임(기본: server/reference_images, 640x480으로 맞춤)을
+- 기존: crop_to_square (크롭 + 리사이즈 새 배열) → letterbox (copyMakeBorder + blobFromImage)
+        → np.stack + astype (배치 텐서)
+- 현재: FramePreprocessor.prepare (크롭 + 리사이즈 1회) → to_tensor (배치 버퍼 슬롯에 바로 기록)
+로 처리해서 프레임당 지연 시간, tracemalloc 최대 할당량, 결과 텐서 일치 여부를 비교합니다.
+
+사용법:
+    python tools/benchmarks/bench_preprocess.py
+    python tools/benchmarks/bench_preprocess.py --images /path/to/recorded_frames --repeat 50 --batch 2
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+SERVER_DIR = Path(__file__).resolve().parents[2] / 'server'
+sys.path.append(str(SERVER_DIR))
+
+from frame_preprocess import FramePreprocessor, to_tensor
+
+IMGSZ = 640
+
+
+def legacy_crop_to_square(frame, target_size=IMGSZ):
+    """기존 app.crop_to_square (비교 기준)"""
+    h, w = frame.shape[:2]
+    crop = min(h, w)
+    x0, y0 = (w - crop) // 2, (h - crop) // 2
+    cropped = frame[y0:y0 + crop, x0:x0 + crop]
+    if crop != target_size:
+        cropped = cv2.resize(cropped, (target_size, target_size), interpolation=cv2.INTER_LINEAR)
+    return cropped
+
+
+def legacy_letterbox(frame, imgsz=IMGSZ):
+    """기존 detector_backends.letterbox (640 정사각형 입력: 패딩 0 + blobFromImage)"""
+    frame = cv2.copyMakeBorder(frame, 0, 0, 0, 0, cv2.BORDER_CONSTANT, value=(114, 114, 114))
+    return cv2.dnn.blobFromImage(frame, scalefactor=1 / 255.0, swapRB=True)[0]
+
+
+def load_frames(image_dir: Path):
+    frames = []
+    for path in sorted(image_dir.glob('*.jpg')) + sorted(image_dir.glob('*.png')):
+        image = cv2.imread(str(path))
+        if image is not None:
+            frames.append(cv2.resize(image, (640, 480)))  # 카메라 해상도
+    if not frames:
+        raise SystemExit(f"이미지 없음: {image_dir}")
+    return frames
+
+
+def measure(func, batches, repeat):
+    times = []
+    for batch in batches:
+        func(batch)  # 워밍업 (버퍼 할당)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(batch)
+            times.append((time.perf_counter() - start) * 1000 / len(batch))
+
+    peaks = []
+    for batch in batches:
+        tracemalloc.start()
+        result = func(batch)
+        peaks.append(tracemalloc.get_traced_memory()[1] / len(batch))
+        tracemalloc.stop()
+        del result
+    return np.asarray(times), float(np.mean(peaks))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='프레임 전처리 벤치마크')
+    parser.add_argument('--images', type=Path, default=SERVER_DIR / 'reference_images')
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--batch', type=int, default=1, help='배치 크기 (inference.max_batch_size)')
+    args = parser.parse_args()
+
+    frames = load_frames(args.images)
+    batches = [frames[i:i + args.batch] for i in range(0, len(frames) - args.batch + 1, args.batch)]
+
+    preprocessor = FramePreprocessor(IMGSZ)
+    input_buffer = np.empty((args.batch, 3, IMGSZ, IMGSZ), np.float32)
+
+    def run_legacy(batch):
+        return np.stack([legacy_letterbox(legacy_crop_to_square(f)) for f in batch]).astype(np.float32, copy=False)
+
+    def run_fused(batch):
+        tensor = input_buffer[:len(batch)]
+        for frame, slot in zip(batch, tensor):
+            square, _ = preprocessor.prepare(frame)
+            to_tensor(square, out=slot)
+        return tensor
+
+    max_diff = max(float(np.abs(run_legacy(b) - run_fused(b)).max()) for b in batches)
+    legacy_times, legacy_peak = measure(run_legacy, batches, args.repeat)
+    fused_times, fused_peak = measure(run_fused, batches, args.repeat)
+
+    print("=" * 68)
+    print(f"프레임: {len(frames)} (640x480 → {IMGSZ}x{IMGSZ}), 배치: {args.batch}, 반복: {args.repeat}")
+    print(f"텐서 최대 차이: {max_diff:.2e}, 전처리: {preprocessor.get_stats()}")
+    print("-" * 68)
+    print(f"{'구현':<26} {'평균(ms/장)':>11} {'p95(ms/장)':>11} {'최대 할당(KB/장)':>16}")
+    for label, times, peak in (('기존 (크롭→레터박스→stack)', legacy_times, legacy_peak),
+                               ('현재 (1회 리사이즈)', fused_times, fused_peak)):
+        print(f"{label:<26} {times.mean():11.3f} {np.percentile(times, 95):11.3f} {peak / 1024:16.1f}")
+    print(f"속도 향상: {legacy_times.mean() / fused_times.mean():.1f}x")
+    print("=" * 68)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+시리얼 넘버 OCR 벤치마크 (전체 프레임 전처리 / OCR vs 라벨 영역만 전처리 / OCR)
+
+뒷면 프레임(기본: 합성 프레임 - 초록 기판 + 구멍 격자 + 부품 + 실크 글자 + 흰 라벨 'S/N MBXX-########',
+카메라 원본처럼 90도 눕힘)을
+- 전체: rotate_to_text → enhance_for_ocr (프레임 전체 3배 업스케일) [→ EasyOCR]
+- 라벨: rotate_to_text → locate_text_line → pad_region → 잘라낸 영역만 enhance_for_ocr [→ EasyOCR]
+로 처리해서 전처리 지연 시간, OCR 입력 픽셀 수, 라벨 위치 적중률(합성 프레임의 실제 라벨 박스 포함 여부)을 비교합니다.
+EasyOCR이 설치되어 있으면 SerialNumberDetector(label_mode='full' / 'auto')로 전체 지연 시간과
+시리얼 인식 정확도, 라벨 영역 / 전체 프레임 재시도 횟수도 측정합니다.
+
+사용법:
+    python tools/benchmarks/bench_serial_ocr.py
+    python tools/benchmarks/bench_serial_ocr.py --frames 200 --no-ocr
+    python tools/benchmarks/bench_serial_ocr.py --images /path/to/back_frames   # 파일 이름에 MBXX-######## 포함 시 정확도 측정
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+SERVER_DIR = Path(__file__).resolve().parents[2] / 'server'
+sys.path.append(str(SERVER_DIR))
+
+from serial_label import rotate_to_text, enhance_for_ocr, locate_text_line, pad_region
+
+SERIAL_IN_NAME = re.compile(r'MB[A-Z]{2}-\d{8}')
+PRODUCT_CODES = ('BC', 'FT', 'RS', 'XT', 'LP')
+
+
+def synthetic_frame(rng, serial):
+    """합성 뒷면 프레임 (640x480 카메라 원본) + 회전된 프레임 기준 라벨 글자 박스 (x, y, w, h)"""
+    height, width = 640, 480  # 회전된 프레임 (텍스트 가로 방향)
+    board = np.empty((height, width, 3), np.uint8)
+    board[:] = (40, 120, 50)
+    board = np.clip(board + rng.normal(0, 6, board.shape), 0, 255).astype(np.uint8)
+    for y in range(8, height, 16):  # 만능기판 구멍 격자
+        for x in range(8, width, 16):
+            cv2.circle(board, (x, y), 3, (30, 60, 40), -1)
+    for _ in range(8):  # 부품 / 납땜 덩어리
+        x, y = int(rng.integers(20, width - 80)), int(rng.integers(20, height - 80))
+        cv2.rectangle(board, (x, y), (x + int(rng.integers(20, 60)), y + int(rng.integers(10, 40))), (20, 20, 20), -1)
+    for _ in range(5):  # 실크 인쇄 글자
+        cv2.putText(board, f"R{rng.integers(1, 99)}", (int(rng.integers(10, width - 60)), int(rng.integers(20, height - 10))),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.4, (230, 230, 230), 1)
+
+    text = f"S/N {serial}"
+    scale = float(rng.uniform(0.45, 0.7))
+    (tw, th), base = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, 1)
+    lx, ly = int(rng.integers(20, width - tw - 40)), int(rng.integers(60, height - 60))
+    cv2.rectangle(board, (lx - 8, ly - th - 8), (lx + tw + 8, ly + base + 8), (235, 235, 235), -1)
+    cv2.putText(board, text, (lx, ly), cv2.FONT_HERSHEY_SIMPLEX, scale, (15, 15, 15), 1, cv2.LINE_AA)
+    return cv2.rotate(board, cv2.ROTATE_90_COUNTERCLOCKWISE), (lx, ly - th, tw, th + base)
+
+
+def load_frames(args, rng):
+    """[(프레임, 정답 시리얼 또는 None, 라벨 박스 또는 None)]"""
+    if args.images is None:
+        frames = []
+        for i in range(args.frames):
+            serial = f"MB{PRODUCT_CODES[i % len(PRODUCT_CODES)]}-{int(rng.integers(0, 10 ** 8)):08d}"
+            frame, box = synthetic_frame(rng, serial)
+            frames.append((frame, serial, box))
+        return frames
+
+    frames = []
+    for path in sorted(args.images.glob('*.jpg')) + sorted(args.images.glob('*.png')):
+        image = cv2.imread(str(path))
+        if image is not None:
+            match = SERIAL_IN_NAME.search(path.name.upper())
+            frames.append((image, match.group(0) if match else None, None))
+    if not frames:
+        raise SystemExit(f"이미지 없음: {args.images}")
+    return frames
+
+
+def contains(region, box):
+    x, y, w, h = region
+    bx, by, bw, bh = box
+    return x <= bx and y <= by and x + w >= bx + bw and y + h >= by + bh
+
+
+def preprocess_full(frame):
+    return enhance_for_ocr(rotate_to_text(frame))
+
+
+def preprocess_label(frame):
+    gray = rotate_to_text(frame)
+    region = locate_text_line(gray)
+    if region is None:
+        return enhance_for_ocr(gray), None  # 전체 프레임 재시도와 같은 비용
+    x, y, w, h = pad_region(region, gray.shape)
+    return enhance_for_ocr(gray[y:y + h, x:x + w]), (x, y, w, h)
+
+
+def measure(func, frames, repeat):
+    times = []
+    for frame, _, _ in frames:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(frame)
+            times.append((time.perf_counter() - start) * 1000)
+    return np.asarray(times)
+
+
+def run_ocr(frames):
+    """EasyOCR 전체 / 라벨 영역 비교 (EasyOCR 미설치 시 None)"""
+    try:
+        from serial_number_detector import SerialNumberDetector
+    except ImportError as e:
+        print(f"EasyOCR 측정 생략: {e}")
+        return None
+
+    rows = []
+    for mode in ('full', 'auto'):
+        detector = SerialNumberDetector(label_mode=mode)
+        detector.detect_serial_number(frames[0][0])  # 워밍업
+        detector.forget_label()
+        times, correct, labeled = [], 0, 0
+        for frame, serial, _ in frames:
+            start = time.perf_counter()
+            result = detector.detect_serial_number(frame)
+            times.append((time.perf_counter() - start) * 1000)
+            correct += serial is not None and result.get('serial_number') == serial
+            labeled += result.get('ocr_region') == 'label'
+        rows.append((mode, np.asarray(times), correct, labeled, detector.get_label_stats()['counts']))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='시리얼 넘버 OCR 벤치마크')
+    parser.add_argument('--images', type=Path, help='녹화한 뒷면 프레임 디렉토리 (없으면 합성 프레임)')
+    parser.add_argument('--frames', type=int, default=100, help='합성 프레임 수')
+    parser.add_argument('--repeat', type=int, default=5, help='전처리 반복 횟수')
+    parser.add_argument('--no-ocr', action='store_true', help='EasyOCR 측정 생략 (전처리만)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    frames = load_frames(args, rng)
+
+    full_times = measure(preprocess_full, frames, args.repeat)
+    label_times = measure(preprocess_label, frames, args.repeat)
+    full_pixels = np.mean([preprocess_full(frame).size for frame, _, _ in frames])
+    label_results = [preprocess_label(frame) for frame, _, _ in frames]
+    label_pixels = np.mean([enhanced.size for enhanced, _ in label_results])
+    found = sum(region is not None for _, region in label_results)
+    boxes = [(region, box) for (_, region), (_, _, box) in zip(label_results, frames) if box is not None]
+    hits = sum(region is not None and contains(region, box) for region, box in boxes)
+
+    print("=" * 78)
+    print(f"프레임: {len(frames)} ({args.images or '합성'}), 전처리 반복: {args.repeat}")
+    print(f"라벨 검출: {found}/{len(frames)}" + (f", 실제 라벨 포함: {hits}/{len(boxes)}" if boxes else "")
+          + " (미검출은 전체 프레임으로 처리)")
+    print("-" * 78)
+    print(f"{'전처리':<24} {'평균(ms)':>9} {'p95(ms)':>9} {'OCR 입력(MP)':>13}")
+    for label, times, pixels in (('전체 프레임 (3배)', full_times, full_pixels),
+                                 ('라벨 영역 (찾기 + 3배)', label_times, label_pixels)):
+        print(f"{label:<24} {times.mean():9.3f} {np.percentile(times, 95):9.3f} {pixels / 1e6:13.3f}")
+
+    if not args.no_ocr:
+        rows = run_ocr(frames)
+        if rows:
+            labeled_frames = sum(serial is not None for _, serial, _ in frames)
+            print("-" * 78)
+            print(f"{'OCR (label_mode)':<24} {'평균(ms)':>9} {'p95(ms)':>9} {'정확도':>9} {'라벨 영역':>9}")
+            for mode, times, correct, labeled, counts in rows:
+                accuracy = f"{correct}/{labeled_frames}" if labeled_frames else "-"
+                print(f"{mode:<24} {times.mean():9.1f} {np.percentile(times, 95):9.1f} {accuracy:>9} {labeled:>9}")
+                print(f"    {counts}")
+    print("=" * 78)
+
+
+if __name__ == '__main__':
+    main()
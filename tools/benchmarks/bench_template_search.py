@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+템플릿 매칭 검색 모드 벤치마크 (full vs pyramid vs tracking)
+
+기준 이미지를 640x640 정사각형으로 크롭한 뒤 작은 평행이동(컨베이어 / 카메라 흔들림)을
+누적해서 연속 프레임 시퀀스를 만들고, 검색 모드별로
+- find_reference_point 지연 시간 (평균 / p95)
+- full 모드 결과와의 일치율 (기준점 차이 ≤ tolerance 픽셀, 검출 여부 포함)
+- 전체 매칭 재시도(fallback) 횟수
+를 비교합니다.
+
+사용법:
+    python tools/benchmarks/bench_template_search.py
+    python tools/benchmarks/bench_template_search.py --images server/reference_images \
+        --template server/reference_hole.jpg --frames 300 --max-shift 3 --threshold 0.78
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+SERVER_DIR = Path(__file__).resolve().parents[2] / 'server'
+sys.path.append(str(SERVER_DIR))
+
+from template_based_alignment import TemplateBasedAlignment, SEARCH_MODES
+
+
+def crop_to_square(frame, size=640):
+    """서버와 같은 정사각형 중앙 크롭 (부족한 쪽은 검은색 패딩)"""
+    h, w = frame.shape[:2]
+    canvas = np.zeros((size, size, 3), dtype=frame.dtype)
+    y0, x0 = max(0, (size - h) // 2), max(0, (size - w) // 2)
+    sy, sx = max(0, (h - size) // 2), max(0, (w - size) // 2)
+    ch, cw = min(h, size), min(w, size)
+    canvas[y0:y0 + ch, x0:x0 + cw] = frame[sy:sy + ch, sx:sx + cw]
+    return canvas
+
+
+def build_sequence(image_dir: Path, frames: int, max_shift: float, seed: int = 0):
+    """
+    기준 이미지별로 흔들림을 누적한 연속 프레임
+
+    Returns:
+        (프레임 리스트, 새 보드 진입 여부 리스트 - 이미지가 바뀌는 첫 프레임)
+    """
+    rng = np.random.default_rng(seed)
+    images = [crop_to_square(cv2.imread(str(p))) for p in sorted(image_dir.glob('*.jpg'))]
+    images = [img for img in images if img is not None]
+    if not images:
+        raise SystemExit(f"이미지 없음: {image_dir}")
+
+    per_image = max(1, frames // len(images))
+    sequence, board_starts = [], []
+    for image in images:
+        offset = np.zeros(2)
+        for i in range(per_image):
+            board_starts.append(i == 0)
+            offset = np.clip(offset + rng.uniform(-max_shift, max_shift, 2), -30, 30)
+            matrix = np.float32([[1, 0, offset[0]], [0, 1, offset[1]]])
+            sequence.append(cv2.warpAffine(image, matrix, (image.shape[1], image.shape[0]),
+                                           borderMode=cv2.BORDER_REPLICATE))
+    return sequence, board_starts
+
+
+def run_mode(mode, template_path, threshold, sequence, board_starts, args):
+    alignment = TemplateBasedAlignment(str(template_path), threshold=threshold, search_mode=mode,
+                                       pyramid_levels=args.pyramid_levels,
+                                       tracking_margin=args.tracking_margin,
+                                       tracking_refresh=args.tracking_refresh)
+    points, times = [], []
+    for frame, board_start in zip(sequence, board_starts):
+        if board_start:
+            # 서버는 모션 감지(새 보드 진입) 시 tracking 기준점을 초기화함
+            alignment.reset_tracking('left')
+        start = time.perf_counter()
+        points.append(alignment.find_reference_point(frame, method=cv2.TM_CCORR_NORMED, track_key='left'))
+        times.append((time.perf_counter() - start) * 1000)
+    return points, np.asarray(times), alignment.get_search_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='템플릿 매칭 검색 모드 벤치마크')
+    parser.add_argument('--images', type=Path, default=SERVER_DIR / 'reference_images')
+    parser.add_argument('--template', type=Path, default=SERVER_DIR / 'reference_hole.jpg')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--max-shift', type=float, default=2.0, help='프레임당 최대 흔들림 (픽셀)')
+    parser.add_argument('--threshold', type=float, default=0.82, help='매칭 신뢰도 임계값 (서버 기본 0.82)')
+    parser.add_argument('--pyramid-levels', type=int, default=1)
+    parser.add_argument('--tracking-margin', type=int, default=40)
+    parser.add_argument('--tracking-refresh', type=int, default=30)
+    parser.add_argument('--tolerance', type=int, default=1, help='일치 판정 허용 오차 (픽셀)')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # 신뢰도 미달 경고 생략
+
+    sequence, board_starts = build_sequence(args.images, args.frames, args.max_shift)
+    results = {mode: run_mode(mode, args.template, args.threshold, sequence, board_starts, args)
+               for mode in SEARCH_MODES}
+    baseline = results['full'][0]
+
+    print("=" * 72)
+    print(f"프레임: {len(sequence)}, 템플릿: {args.template.name}, 임계값: {args.threshold}")
+    print(f"full 모드 검출: {sum(p is not None for p in baseline)}/{len(sequence)}")
+    print("-" * 72)
+    print(f"{'모드':<10} {'평균(ms)':>9} {'p95(ms)':>9} {'일치율':>8} {'full 매칭':>10} {'재시도':>7}")
+    for mode, (points, times, stats) in results.items():
+        agree = 0
+        for ref, point in zip(baseline, points):
+            if ref is None or point is None:
+                agree += ref is None and point is None
+            else:
+                agree += max(abs(ref[0] - point[0]), abs(ref[1] - point[1])) <= args.tolerance
+        print(f"{mode:<10} {times.mean():9.3f} {np.percentile(times, 95):9.3f} "
+              f"{agree / len(sequence):8.1%} {stats['full']:10d} {stats['fallbacks']:7d}")
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
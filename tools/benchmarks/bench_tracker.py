@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+검출 평활화(추적) 벤치마크: 기존 smooth_detections vs ObjectTracker
+
+기존 구현(객체별 dict + 검출/추적 쌍마다 calculate_iou 호출, 그리디 매칭)을 그대로 옮겨 두고
+server/object_tracker.py의 배열 기반 추적기(클래스별 IOU 행렬 + 헝가리안 매칭)와
+- 프레임당 처리 시간 (tracking_lock을 잡고 있는 시간에 해당)
+- 출력 일치율 (표시 객체 수 / 박스가 같은 프레임 비율)
+을 비교합니다.
+
+검출 시퀀스 형식 (JSON Lines, 한 줄 = 한 프레임):
+    [[x1, y1, x2, y2, conf, class_id], ...]
+
+사용법:
+    # 합성 시퀀스 (부품 60개 보드, 박스 흔들림 / 미검출 / 오검출 포함)
+    python tools/benchmarks/bench_tracker.py --components 60 --frames 300
+
+    # 이미지 폴더(연속 프레임)를 설정된 검출기로 돌려 시퀀스 기록
+    python tools/benchmarks/bench_tracker.py --record captures/left --output left_seq.jsonl
+
+    # 기록된 시퀀스로 비교
+    python tools/benchmarks/bench_tracker.py --sequence left_seq.jsonl
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 서버 모듈 경로 추가
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'server'))
+
+from detections import Detections
+from object_tracker import ObjectTracker
+
+# server/app.py 평활화 파라미터
+MIN_DETECTION_FRAMES = 5
+MAX_MISSING_FRAMES = 3
+IOU_THRESHOLD = 0.05
+FREEZE_AFTER_FRAMES = 9999
+
+
+# ----------------------------------------------------------------------
+# 기존 구현 (server/app.py smooth_detections, dict 기반)
+# ----------------------------------------------------------------------
+def calculate_iou(box1, box2):
+    x1_inter = max(box1['x1'], box2['x1'])
+    y1_inter = max(box1['y1'], box2['y1'])
+    x2_inter = min(box1['x2'], box2['x2'])
+    y2_inter = min(box1['y2'], box2['y2'])
+    if x2_inter < x1_inter or y2_inter < y1_inter:
+        return 0.0
+    inter_area = (x2_inter - x1_inter) * (y2_inter - y1_inter)
+    box1_area = (box1['x2'] - box1['x1']) * (box1['y2'] - box1['y1'])
+    box2_area = (box2['x2'] - box2['x1']) * (box2['y2'] - box2['y1'])
+    union_area = box1_area + box2_area - inter_area
+    if union_area == 0:
+        return 0.0
+    return inter_area / union_area
+
+
+class LegacySmoother:
+    """기존 smooth_detections (카메라 1대분)"""
+
+    def __init__(self):
+        self.tracked = {}
+        self.next_object_id = 0
+
+    def update(self, current_detections):
+        tracked = self.tracked
+        matched_ids = set()
+
+        for detection in current_detections:
+            best_match_id = None
+            best_iou = 0.0
+            for obj_id, tracked_obj in tracked.items():
+                iou = calculate_iou(detection, tracked_obj['box'])
+                if (detection['class_id'] == tracked_obj['class_id'] and
+                        iou > IOU_THRESHOLD and
+                        iou > best_iou):
+                    best_iou = iou
+                    best_match_id = obj_id
+
+            if best_match_id is not None:
+                tracked[best_match_id]['count'] += 1
+                tracked[best_match_id]['missing'] = 0
+                if not tracked[best_match_id]['frozen']:
+                    tracked[best_match_id]['box'] = detection
+                    tracked[best_match_id]['confidence'] = detection['confidence']
+                    if tracked[best_match_id]['count'] >= FREEZE_AFTER_FRAMES:
+                        tracked[best_match_id]['frozen'] = True
+                matched_ids.add(best_match_id)
+            else:
+                new_id = self.next_object_id
+                self.next_object_id += 1
+                tracked[new_id] = {
+                    'box': detection,
+                    'class_id': detection['class_id'],
+                    'class_name': detection['class_name'],
+                    'confidence': detection['confidence'],
+                    'count': 1,
+                    'missing': 0,
+                    'frozen': False
+                }
+                matched_ids.add(new_id)
+
+        to_remove = []
+        for obj_id in list(tracked.keys()):
+            if obj_id not in matched_ids:
+                if tracked[obj_id]['frozen']:
+                    continue
+                tracked[obj_id]['missing'] += 1
+                if tracked[obj_id]['missing'] > MAX_MISSING_FRAMES:
+                    to_remove.append(obj_id)
+        for obj_id in to_remove:
+            del tracked[obj_id]
+
+        smoothed = []
+        for obj_id in sorted(tracked.keys()):
+            tracked_obj = tracked[obj_id]
+            if tracked_obj['frozen'] or tracked_obj['count'] >= MIN_DETECTION_FRAMES:
+                smoothed.append({
+                    'x1': tracked_obj['box']['x1'],
+                    'y1': tracked_obj['box']['y1'],
+                    'x2': tracked_obj['box']['x2'],
+                    'y2': tracked_obj['box']['y2'],
+                    'confidence': tracked_obj['confidence'],
+                    'class_id': tracked_obj['class_id'],
+                    'class_name': tracked_obj['class_name']
+                })
+        return smoothed
+
+
+# ----------------------------------------------------------------------
+# 검출 시퀀스
+# ----------------------------------------------------------------------
+def synthetic_sequence(components: int, frames: int, classes: int, seed: int = 0):
+    """
+    합성 검출 시퀀스 (정지된 보드 위 부품 격자)
+
+    - 박스 좌표 ±2px 흔들림
+    - 검출별 10% 미검출, 프레임당 0~2개 오검출
+    """
+    rng = np.random.default_rng(seed)
+    cols = int(np.ceil(np.sqrt(components)))
+    grid = np.arange(components)
+    x1 = 40 + (grid % cols) * 70.0
+    y1 = 40 + (grid // cols) * 55.0
+    w = rng.uniform(20, 50, components)
+    h = rng.uniform(15, 40, components)
+    base = np.stack([x1, y1, x1 + w, y1 + h], axis=1)
+    cls = rng.integers(0, classes, components)
+
+    sequence = []
+    for _ in range(frames):
+        keep = rng.random(components) > 0.1
+        boxes = base[keep] + rng.normal(0, 2.0, (keep.sum(), 4))
+        conf = rng.uniform(0.3, 0.95, keep.sum())
+        rows = np.column_stack([boxes, conf, cls[keep]])
+
+        false_count = rng.integers(0, 3)
+        if false_count:
+            fx = rng.uniform(0, 600, false_count)
+            fy = rng.uniform(0, 600, false_count)
+            false_rows = np.column_stack([fx, fy, fx + 25, fy + 20,
+                                          rng.uniform(0.25, 0.4, false_count),
+                                          rng.integers(0, classes, false_count)])
+            rows = np.vstack([rows, false_rows])
+        sequence.append(rows[rng.permutation(len(rows))].astype(np.float32))
+    return sequence
+
+
+def load_sequence(path: Path):
+    """JSON Lines 시퀀스 로드"""
+    sequence = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                sequence.append(np.asarray(json.loads(line), dtype=np.float32).reshape(-1, 6))
+    return sequence
+
+
+def record_sequence(image_dir: Path, output: Path, conf: float):
+    """이미지 폴더(파일명 순 = 프레임 순)를 설정된 검출기로 돌려 시퀀스 저장"""
+    import cv2
+    from detector_backends import load_configured_detector
+
+    detector, model_path, backend = load_configured_detector()
+    print(f"검출기: {backend} ({model_path})")
+
+    paths = sorted(p for p in image_dir.iterdir() if p.suffix.lower() in ('.jpg', '.jpeg', '.png', '.bmp'))
+    with open(output, 'w', encoding='utf-8') as f:
+        for path in paths:
+            frame = cv2.imread(str(path))
+            if frame is None:
+                continue
+            result = detector.predict(frame, conf=conf, verbose=False)[0]
+            data = result.boxes.data
+            if not isinstance(data, np.ndarray):
+                data = data.cpu().numpy()
+            f.write(json.dumps(np.round(data, 2).tolist()) + '\n')
+    print(f"기록 완료: {output} ({len(paths)}프레임)")
+
+
+def to_dicts(rows: np.ndarray):
+    """기존 구현 입력 형식 (검출 dict 리스트)"""
+    return [
+        {'x1': float(r[0]), 'y1': float(r[1]), 'x2': float(r[2]), 'y2': float(r[3]),
+         'confidence': float(r[4]), 'class_id': int(r[5]), 'class_name': str(int(r[5]))}
+        for r in rows
+    ]
+
+
+def to_detections(rows: np.ndarray):
+    return Detections(rows[:, :4], rows[:, 4], rows[:, 5].astype(np.int32))
+
+
+# ----------------------------------------------------------------------
+# 비교
+# ----------------------------------------------------------------------
+def run(sequence):
+    legacy_inputs = [to_dicts(rows) for rows in sequence]
+    tracker_inputs = [to_detections(rows) for rows in sequence]
+
+    legacy = LegacySmoother()
+    legacy_times, legacy_outputs = [], []
+    for detections in legacy_inputs:
+        start = time.perf_counter()
+        legacy_outputs.append(legacy.update(detections))
+        legacy_times.append((time.perf_counter() - start) * 1000)
+
+    tracker = ObjectTracker(IOU_THRESHOLD, MIN_DETECTION_FRAMES, MAX_MISSING_FRAMES, FREEZE_AFTER_FRAMES)
+    tracker_times, tracker_outputs = [], []
+    for detections in tracker_inputs:
+        start = time.perf_counter()
+        tracker_outputs.append(tracker.update(detections))
+        tracker_times.append((time.perf_counter() - start) * 1000)
+
+    same_count = 0
+    same_boxes = 0
+    for old, new in zip(legacy_outputs, tracker_outputs):
+        if len(old) != len(new):
+            continue
+        same_count += 1
+        old_rows = np.array([[d['x1'], d['y1'], d['x2'], d['y2'], d['class_id']] for d in old]).reshape(-1, 5)
+        new_rows = np.column_stack([new.boxes, new.class_id]).reshape(-1, 5)
+        old_rows = old_rows[np.lexsort(old_rows.T[::-1])]
+        new_rows = new_rows[np.lexsort(new_rows.T[::-1])]
+        if np.allclose(old_rows, new_rows, atol=1e-3):
+            same_boxes += 1
+
+    frames = len(sequence)
+    dets = np.mean([len(rows) for rows in sequence]) if frames else 0
+    print("=" * 60)
+    print(f"프레임: {frames}, 프레임당 평균 검출: {dets:.1f}")
+    print("-" * 60)
+    for label, times in (('기존 smooth_detections', legacy_times), ('ObjectTracker', tracker_times)):
+        times = np.asarray(times)
+        print(f"{label:<24} 평균 {times.mean():7.3f}ms  p95 {np.percentile(times, 95):7.3f}ms  최대 {times.max():7.3f}ms")
+    print(f"{'속도 향상':<24} {np.mean(legacy_times) / max(np.mean(tracker_times), 1e-9):.1f}x")
+    print("-" * 60)
+    print(f"표시 객체 수 일치: {same_count}/{frames} 프레임")
+    print(f"표시 박스 일치:    {same_boxes}/{frames} 프레임")
+    print("  (불일치는 그리디 매칭이 추적 객체 하나에 검출 여러 개를 몰아주던 경우 등 매칭 순서 차이)")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='검출 평활화(추적) 벤치마크')
+    parser.add_argument('--sequence', type=Path, default=None, help='기록된 검출 시퀀스 (JSON Lines)')
+    parser.add_argument('--record', type=Path, default=None, help='시퀀스를 기록할 이미지 폴더')
+    parser.add_argument('--output', type=Path, default=Path('detections_seq.jsonl'), help='--record 출력 파일')
+    parser.add_argument('--conf', type=float, default=0.25, help='--record 신뢰도 임계값')
+    parser.add_argument('--components', type=int, default=60, help='합성 시퀀스 부품 수')
+    parser.add_argument('--frames', type=int, default=300, help='합성 시퀀스 프레임 수')
+    parser.add_argument('--classes', type=int, default=8, help='합성 시퀀스 클래스 수')
+    args = parser.parse_args()
+
+    if args.record:
+        record_sequence(args.record, args.output, args.conf)
+        return
+
+    if args.sequence:
+        sequence = load_sequence(args.sequence)
+    else:
+        sequence = synthetic_sequence(args.components, args.frames, args.classes)
+    run(sequence)
+
+
+if __name__ == '__main__':
+    main()
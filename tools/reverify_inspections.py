@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+저장된 검사 이력 일괄 재검증 도구
+
+position_threshold / 제품 기준 배치를 바꾼 뒤 과거 보드의 판정이 어떻게 달라지는지
+DB(inspections.yolo_detections)에서 읽어 다시 검증합니다. 검사별 결과는 JSON Lines로
+바로 출력하고, 마지막에 판정 변화 통계를 출력합니다.
+
+사용법:
+    python tools/reverify_inspections.py --product BC --position-threshold 15 --workers 4
+    python tools/reverify_inspections.py --since 2025-12-01 --only-changed --output reverify.jsonl
+    python tools/reverify_inspections.py --input exported_inspections.jsonl --references references.json
+
+DB 접속 정보는 서버와 같은 환경 변수(DB_HOST / DB_PORT / DB_USER / DB_PASSWORD / DB_NAME)를 사용합니다.
+--input은 iter_inspections_v3 형식 행(JSON Lines), --references는 {제품 코드: 기준 부품 리스트} JSON입니다.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parents[1] / 'server'
+sys.path.append(str(SERVER_DIR))
+
+from batch_verification import BatchReverifier
+
+
+def read_jsonl(path: Path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='저장된 검사 이력 일괄 재검증')
+    parser.add_argument('--product', help='제품 코드 필터 (예: BC)')
+    parser.add_argument('--since', help='검사 시간 하한 (포함, YYYY-MM-DD[ HH:MM:SS])')
+    parser.add_argument('--until', help='검사 시간 상한 (미포함)')
+    parser.add_argument('--limit', type=int, help='최대 검사 수')
+    parser.add_argument('--position-threshold', type=float, default=20.0, help='위치 오류 임계값 (픽셀)')
+    parser.add_argument('--confidence-threshold', type=float, default=0.25, help='검출 신뢰도 임계값')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help='워커 프로세스 수 (0: 단일 프로세스)')
+    parser.add_argument('--chunk-size', type=int, default=256, help='워커에 한 번에 넘기는 검사 수')
+    parser.add_argument('--input', type=Path, help='DB 대신 읽을 검사 이력 (JSON Lines)')
+    parser.add_argument('--references', type=Path, help='DB 대신 사용할 기준 배치 ({제품 코드: [부품, ...]} JSON)')
+    parser.add_argument('--only-changed', action='store_true', help='판정이 바뀐 검사만 출력')
+    parser.add_argument('--output', type=Path, help='결과 JSON Lines 파일 (기본: 표준 출력)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='[%(levelname)s] %(message)s')
+
+    db = None
+    if args.input is None or args.references is None:
+        from db_manager import DatabaseManager
+        db = DatabaseManager(
+            host=os.getenv('DB_HOST', 'localhost'),
+            port=int(os.getenv('DB_PORT', 3306)),
+            user=os.getenv('DB_USER', 'root'),
+            password=os.getenv('DB_PASSWORD', 'your_password'),
+            database=os.getenv('DB_NAME', 'pcb_inspection')
+        )
+
+    if args.references is not None:
+        with open(args.references, 'r', encoding='utf-8') as f:
+            references = json.load(f)
+        reference_loader = references.get
+    else:
+        reference_loader = db.get_reference_components
+
+    if args.input is not None:
+        inspections = read_jsonl(args.input)
+        if args.product:
+            inspections = (row for row in inspections if row.get('product_code') == args.product)
+    else:
+        inspections = db.iter_inspections_v3(product_code=args.product, since=args.since,
+                                             until=args.until, limit=args.limit)
+
+    reverifier = BatchReverifier(
+        reference_loader,
+        position_threshold=args.position_threshold,
+        confidence_threshold=args.confidence_threshold,
+        workers=args.workers,
+        chunk_size=args.chunk_size
+    )
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for record in reverifier.run(inspections):
+            if args.only_changed and not record.get('changed'):
+                continue
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    stats = reverifier.stats.to_dict()
+    print("=" * 60, file=sys.stderr)
+    print(f"재검증: {stats['verified']}/{stats['total']}건 (건너뜀: {stats['skipped']}), "
+          f"{stats['elapsed_s']}s, {stats['boards_per_s']}건/s", file=sys.stderr)
+    print(f"판정 변화: {stats['changed']}건 ({stats['changed_ratio'] * 100:.1f}%)", file=sys.stderr)
+    for transition, count in stats['transitions'].items():
+        print(f"  {transition}: {count}", file=sys.stderr)
+    print(f"개수 변화 합: {stats['delta_sums']}", file=sys.stderr)
+    print("=" * 60, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+YOLO 부품 검출 모델 CPU 배포용 내보내기 (ONNX / OpenVINO, FP32 / FP16 / INT8)
+
+서버의 onnxruntime / openvino 백엔드 (server/detector_backends.py)에서 사용할 모델을 만듭니다.
+만든 모델 경로는 configs/server_config.yaml의 model.onnx_model_path / model.openvino_model_path에 지정하세요.
+
+사용법:
+    # ONNX FP32 (동적 배치)
+    python yolo/export_yolo.py --model models/component_detector_v5_best.pt --format onnx
+
+    # ONNX INT8 (검증 이미지로 정적 양자화 캘리브레이션)
+    python yolo/export_yolo.py --model models/component_detector_v5_best.pt --format onnx \
+        --precision int8 --data data/pcb_defects.yaml
+
+    # OpenVINO INT8 (NNCF 양자화)
+    python yolo/export_yolo.py --model models/component_detector_v5_best.pt --format openvino \
+        --precision int8 --data data/pcb_defects.yaml
+
+필수 조건:
+    - ultralytics (모든 형식)
+    - onnxruntime (ONNX INT8 양자화)
+    - openvino, nncf (OpenVINO 형식)
+    - ONNX FP16은 CUDA GPU가 있는 PC에서 내보내야 합니다 (ultralytics half=True 제약)
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+from ultralytics import YOLO
+
+# 서버 전처리(letterbox)를 캘리브레이션에도 그대로 사용
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'server'))
+
+from detector_backends import letterbox
+
+
+def load_calibration_images(data_yaml, split='val', limit=200):
+    """데이터셋 YAML의 split 이미지 경로 목록"""
+    import yaml
+
+    with open(data_yaml, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f)
+    root = Path(data.get('path', '.'))
+    image_dir = root / data[split]
+    paths = sorted(p for p in image_dir.iterdir() if p.suffix.lower() in ('.jpg', '.jpeg', '.png', '.bmp'))
+    return paths[:limit]
+
+
+def quantize_onnx_int8(fp32_path, data_yaml, imgsz=640, limit=200):
+    """
+    ONNX 정적 INT8 양자화 (QDQ, 채널별 가중치)
+
+    Args:
+        fp32_path: FP32 ONNX 모델 경로
+        data_yaml: 캘리브레이션 이미지용 데이터셋 YAML
+        imgsz: 입력 크기
+        limit: 캘리브레이션 이미지 수
+
+    Returns:
+        INT8 ONNX 모델 경로
+    """
+    import cv2
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    image_paths = load_calibration_images(data_yaml, limit=limit)
+    print(f"  - 캘리브레이션 이미지: {len(image_paths)}장")
+
+    class LetterboxReader(CalibrationDataReader):
+        def __init__(self, input_name):
+            self.input_name = input_name
+            self.paths = iter(image_paths)
+
+        def get_next(self):
+            for path in self.paths:
+                image = cv2.imread(str(path))
+                if image is not None:
+                    blob, _ = letterbox(image, imgsz)
+                    return {self.input_name: blob[None].astype(np.float32)}
+            return None
+
+    import onnxruntime as ort
+    input_name = ort.InferenceSession(str(fp32_path), providers=['CPUExecutionProvider']).get_inputs()[0].name
+
+    int8_path = Path(fp32_path).with_name(Path(fp32_path).stem + '_int8.onnx')
+    quantize_static(
+        str(fp32_path),
+        str(int8_path),
+        LetterboxReader(input_name),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        weight_type=QuantType.QInt8,
+        activation_type=QuantType.QUInt8
+    )
+    return int8_path
+
+
+def export_yolo(model_path, export_format='onnx', precision='fp32', data_yaml=None, imgsz=640, calib_limit=200):
+    """
+    YOLO 모델 내보내기
+
+    Args:
+        model_path: 학습된 .pt 모델 경로
+        export_format: 'onnx' 또는 'openvino'
+        precision: 'fp32', 'fp16', 'int8'
+        data_yaml: INT8 캘리브레이션 데이터셋 YAML
+        imgsz: 입력 크기
+        calib_limit: 캘리브레이션 이미지 수
+    """
+    if precision == 'int8' and not data_yaml:
+        raise ValueError("INT8 양자화에는 --data (캘리브레이션 데이터셋)가 필요합니다")
+
+    print(f"모델 로드: {model_path}")
+    model = YOLO(model_path)
+
+    print("\n내보내기 시작:")
+    print(f"  - 형식: {export_format}")
+    print(f"  - 정밀도: {precision}")
+    print(f"  - 이미지 크기: {imgsz}")
+
+    if export_format == 'onnx':
+        # FP16은 GPU에서만 내보낼 수 있음, INT8은 FP32로 내보낸 뒤 onnxruntime으로 양자화
+        output = model.export(
+            format='onnx',
+            imgsz=imgsz,
+            dynamic=True,       # 배칭 스케줄러용 동적 배치
+            simplify=True,
+            half=(precision == 'fp16'),
+            device=0 if precision == 'fp16' else 'cpu'
+        )
+        if precision == 'int8':
+            print("\nINT8 정적 양자화 중...")
+            output = quantize_onnx_int8(output, data_yaml, imgsz=imgsz, limit=calib_limit)
+    elif export_format == 'openvino':
+        output = model.export(
+            format='openvino',
+            imgsz=imgsz,
+            half=(precision == 'fp16'),
+            int8=(precision == 'int8'),
+            data=data_yaml
+        )
+    else:
+        raise ValueError(f"지원하지 않는 형식: {export_format}")
+
+    print("\n" + "="*50)
+    print(f"내보내기 완료: {output}")
+    print("="*50)
+    print("\nconfigs/server_config.yaml 설정 예시:")
+    backend = 'onnxruntime' if export_format == 'onnx' else 'openvino'
+    key = 'onnx_model_path' if export_format == 'onnx' else 'openvino_model_path'
+    print(f"  model:\n    backend: {backend}\n    {key}: {output}")
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='YOLO 모델 CPU 배포용 내보내기')
+    parser.add_argument('--model', type=str, default='models/component_detector_v5_best.pt',
+                        help='학습된 모델 경로')
+    parser.add_argument('--format', type=str, default='onnx', choices=['onnx', 'openvino'],
+                        help='내보내기 형식')
+    parser.add_argument('--precision', type=str, default='fp32', choices=['fp32', 'fp16', 'int8'],
+                        help='정밀도')
+    parser.add_argument('--data', type=str, default=None,
+                        help='INT8 캘리브레이션 데이터셋 YAML')
+    parser.add_argument('--imgsz', type=int, default=640,
+                        help='입력 이미지 크기')
+    parser.add_argument('--calib-limit', type=int, default=200,
+                        help='캘리브레이션 이미지 수')
+
+    args = parser.parse_args()
+
+    export_yolo(
+        model_path=args.model,
+        export_format=args.format,
+        precision=args.precision,
+        data_yaml=args.data,
+        imgsz=args.imgsz,
+        calib_limit=args.calib_limit
+    )